@@ -0,0 +1,48 @@
+# src/callback_local_server/client.py
+"""
+Получение кодов авторизации с callback сервера.
+
+Пример:
+    state = services.hh_auth_service.state_for(user_key)
+    code = await wait_for_code(services.http_session(), state, timeout=25)
+    ...                                     # обмен кода и сохранение токенов
+    await reset_code(services.http_session(), state)
+
+    # Один запрос на много ожидающих входов: {state: code} полученных кодов
+    found = await wait_for_codes(services.http_session(), states, timeout=25)
+"""
+
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from src.callback_local_server.config import settings
+from src.hh.http import client_session
+
+
+def callback_server_url() -> str:
+    return f"{settings.protocol}://{settings.host}:{settings.port}"
+
+
+async def wait_for_code(session: Optional[aiohttp.ClientSession], state: str, timeout: float = 0) -> Optional[str]:
+    """Код авторизации state: long-poll до timeout секунд (0 — только проверить), None — кода нет."""
+    async with client_session(session) as http:
+        async with http.get(f"{callback_server_url()}/api/code", params={"state": state, "timeout": timeout}) as response:
+            if response.status != 200:
+                return None
+            return (await response.json()).get("code")
+
+
+async def wait_for_codes(session: Optional[aiohttp.ClientSession], states: List[str], timeout: float = 0) -> Dict[str, str]:
+    """Коды авторизации набора state: long-poll до timeout секунд или первого полученного кода."""
+    async with client_session(session) as http:
+        async with http.post(f"{callback_server_url()}/api/codes", json={"states": states, "timeout": timeout}) as response:
+            response.raise_for_status()
+            return (await response.json())["codes"]
+
+
+async def reset_code(session: Optional[aiohttp.ClientSession], state: str) -> None:
+    """Удалить код state на сервере (после успешного обмена на токены)."""
+    async with client_session(session) as http:
+        async with http.post(f"{callback_server_url()}/api/reset_code", params={"state": state}):
+            pass
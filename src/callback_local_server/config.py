@@ -9,6 +9,9 @@ class CallbackServerSettings(BaseAppSettings):
     host: str = "0.0.0.0"
     port: int = 8080
     protocol: str = "http"  # http для локальной разработки, https для продакшн
+    code_ttl: int = 600              # Время жизни кода авторизации, секунды
+    long_poll_timeout: float = 30    # Максимальное ожидание кода в /api/code, секунды
+    max_pending: int = 10000         # Максимум кодов и ожидающих state в памяти
     
     model_config = ConfigDict(
         env_file='.env',
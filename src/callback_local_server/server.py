@@ -1,72 +1,173 @@
 # src/callback_local_server/server.py
-import logging
+"""
+Callback сервер OAuth HH.ru.
+
+Коды авторизации хранятся по параметру state, который приложение передает в
+ссылку авторизации (HHAuthService.state_for): одновременные входы разных
+пользователей не перезаписывают друг друга. Код живет CALLBACK_LOCAL_CODE_TTL
+секунд или до /api/reset_code.
+
+GET /api/code?state=...&timeout=25 — long-poll: ответ приходит сразу после
+callback с этим state (или 404 по истечении timeout), без периодического
+опроса. POST /api/codes {"states": [...], "timeout": 25} — тот же long-poll
+для набора state (один запрос на все ожидающие входы, например в боте):
+ответ — полученные коды этих state. Ожидающие запросы и коды хранятся в
+памяти процесса — сервер запускается одним воркером.
+
+Запросы без state (старые клиенты) используют общий код с пустым state.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
 from fastapi import FastAPI, Query
+from pydantic import BaseModel, Field
 from fastapi.responses import HTMLResponse, JSONResponse
 
+from src.callback_local_server.config import settings
 from src.utils import get_logger
 logger = get_logger()
 app = FastAPI(title = "callback_local_server")
 
-# Сохраняем полученный код с timestamp
-auth_code = None
-auth_code_timestamp = None
+
+@dataclass
+class PendingCode:
+    """Код авторизации state и событие для ожидающих его запросов"""
+    code: Optional[str] = None
+    updated_at: float = field(default_factory=time.monotonic)
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class CodeStore:
+    """Коды авторизации по state с временем жизни и ожиданием поступления"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Порядок — время последнего обновления: устаревшие записи в начале
+        self._entries: "OrderedDict[str, PendingCode]" = OrderedDict()
+        # Событие поступления любого кода (заменяется новым после срабатывания)
+        self._received = asyncio.Event()
+
+    def _purge(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        while self._entries:
+            state, entry = next(iter(self._entries.items()))
+            if entry.updated_at >= deadline and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+            if entry.code:
+                logger.info(f"Код авторизации state {state[:8]}… устарел и был очищен")
+
+    def _entry(self, state: str) -> PendingCode:
+        self._purge()
+        entry = self._entries.get(state)
+        if entry is None:
+            entry = self._entries[state] = PendingCode()
+        return entry
+
+    def put(self, state: str, code: str) -> None:
+        """Сохранить код и разбудить ожидающие его запросы."""
+        entry = self._entry(state)
+        entry.code = code
+        entry.updated_at = time.monotonic()
+        self._entries.move_to_end(state)
+        entry.event.set()
+        self._received.set()
+        self._received = asyncio.Event()
+
+    async def wait(self, state: str, timeout: float) -> Optional[str]:
+        """Код state: сразу, если уже получен, иначе ожидание до timeout секунд."""
+        entry = self._entry(state)
+        if entry.code is None and timeout > 0:
+            try:
+                await asyncio.wait_for(entry.event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return entry.code
+
+    def _codes(self, states: List[str]) -> Dict[str, str]:
+        self._purge()
+        entries = ((state, self._entries.get(state)) for state in states)
+        return {state: entry.code for state, entry in entries if entry is not None and entry.code}
+
+    async def wait_any(self, states: List[str], timeout: float) -> Dict[str, str]:
+        """Коды набора state: сразу, если хотя бы один получен, иначе ожидание до timeout секунд."""
+        deadline = time.monotonic() + timeout
+        while not (found := self._codes(states)) and (remaining := deadline - time.monotonic()) > 0:
+            try:
+                await asyncio.wait_for(self._received.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return found
+
+    def reset(self, state: str) -> Optional[str]:
+        entry = self._entries.pop(state, None)
+        return entry.code if entry else None
+
+    def stats(self) -> dict:
+        codes = sum(1 for entry in self._entries.values() if entry.code)
+        return {"pending_codes": codes, "waiting_states": len(self._entries) - codes}
+
+
+codes = CodeStore(ttl=settings.code_ttl, max_entries=settings.max_pending)
+
+
+class CodesRequest(BaseModel):
+    """Запрос кодов набора state"""
+    states: List[str] = Field(default_factory=list)
+    timeout: float = Field(0, ge=0)
+
 
 @app.get("/callback")
-async def callback_handler(code: str = Query(None)):
+async def callback_handler(code: str = Query(None), state: str = Query("")):
     """Обработчик callback запроса от OAuth2."""
-    global auth_code, auth_code_timestamp
-    
     if code:
-        import time
-        auth_code = code
-        auth_code_timestamp = time.time()
-        logger.info(f"Получен код авторизации: {code}")
+        codes.put(state, code)
+        logger.info(f"Получен код авторизации для state {state[:8]}…")
         return HTMLResponse("Авторизация успешно завершена. Вы можете закрыть это окно и вернуться в приложение.")
-    
+
     logger.error("Код авторизации отсутствует в запросе")
     return HTMLResponse("Ошибка авторизации. Пожалуйста, попробуйте снова.", status_code=400)
 
 @app.get("/api/code")
-async def get_auth_code_api():
-    """API эндпоинт для получения кода авторизации."""
-    import time
-    global auth_code, auth_code_timestamp
-    
-    if auth_code:
-        # Проверяем что код не старше 10 минут
-        if auth_code_timestamp and (time.time() - auth_code_timestamp) < 600:
-            return JSONResponse({"code": auth_code})
-        else:
-            # Код устарел, очищаем его
-            auth_code = None
-            auth_code_timestamp = None
-            logger.info("Код авторизации устарел и был очищен")
-    
+async def get_auth_code_api(state: str = Query(""), timeout: float = Query(0, ge=0)):
+    """API эндпоинт для получения кода авторизации (timeout — ожидание кода, секунды)."""
+    code = await codes.wait(state, min(timeout, settings.long_poll_timeout))
+    if code:
+        return JSONResponse({"code": code})
     return JSONResponse({"code": None}, status_code=404)
 
+@app.post("/api/codes")
+async def get_auth_codes_api(request: CodesRequest):
+    """API эндпоинт для получения кодов набора state (long-poll до timeout секунд)."""
+    found = await codes.wait_any(request.states, min(request.timeout, settings.long_poll_timeout))
+    return JSONResponse({"codes": found})
+
 @app.post("/api/reset_code")
-async def reset_auth_code_api():
+async def reset_auth_code_api(state: str = Query("")):
     """API эндпоинт для сброса кода авторизации."""
-    global auth_code, auth_code_timestamp
-    old_code = auth_code
-    auth_code = None
-    auth_code_timestamp = None
-    logger.info(f"Код авторизации сброшен: {old_code}")
+    old_code = codes.reset(state)
+    logger.info(f"Код авторизации state {state[:8]}… сброшен" if old_code else f"Код авторизации state {state[:8]}… не найден")
     return JSONResponse({"status": "success"})
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint для мониторинга"""
-    global auth_code
     try:
+        stats = codes.stats()
         return {
             "status": "healthy",
             "service": "ai-resume-assistant-oauth",
             "version": "1.0.0",
             "port": 8080,
             "checks": {
-                "auth_code_status": "active" if auth_code else "waiting",
-                "callback_handler": "ok"
+                "auth_code_status": "active" if stats["pending_codes"] else "waiting",
+                "callback_handler": "ok",
+                **stats
             }
         }
     except Exception as e:
@@ -74,4 +175,4 @@ async def health_check():
             "status": "unhealthy",
             "service": "ai-resume-assistant-oauth",
             "error": str(e)
-        }
\ No newline at end of file
+        }
@@ -2,23 +2,37 @@
 import logging
 import aiohttp
 from pathlib import Path
-from typing import Dict, Any, Optional
-from src.utils import get_logger
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.hh.config import settings
+from src.hh.http import client_session
+from src.utils import get_logger, trace_span
 logger = get_logger()
 
 
 class HHApiClient:
     """Клиент для работы с API HeadHunter."""
     
-    def __init__(self, access_token: str, refresh_token: str):
-        """Инициализация клиента API."""
+    def __init__(self, access_token: str, refresh_token: str, session: Optional[aiohttp.ClientSession] = None,
+                 renew_tokens: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None):
+        """
+        Инициализация клиента API.
+
+        Args:
+            session: Общая сессия aiohttp (пул соединений контейнера сервисов);
+                None — сессия создается на каждый запрос
+            renew_tokens: Получение новых токенов по ответу 401 через хранилище
+                токенов пользователей (по истекшему access_token); None — обновление
+                своим refresh_token
+        """
         self.access_token = access_token
         self.refresh_token = refresh_token
-        self.base_url = "https://api.hh.ru/"
+        self.session = session
+        self.renew_tokens = renew_tokens
+        self.base_url = settings.api_base_url.rstrip("/") + "/"
         
         # Импортируем здесь, чтобы избежать циклических импортов
         from src.hh.token_refresher import HHTokenRefresher
-        self.token_refresher = HHTokenRefresher(refresh_token)
+        self.token_refresher = HHTokenRefresher(refresh_token, session)
     
     async def request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Выполнение запроса к API с автоматическим обновлением токена."""
@@ -31,44 +45,50 @@ class HHApiClient:
         }
         url = f'{self.base_url}{endpoint}'
         
-        async with aiohttp.ClientSession() as session:
-            # Выбор HTTP метода
-            if method == 'GET':
-                request_func = session.get
-            elif method == 'POST':
-                request_func = session.post
-            elif method == 'PUT':
-                request_func = session.put
-            elif method == 'DELETE':
-                request_func = session.delete
-            else:
-                raise ValueError(f"Неподдерживаемый HTTP метод: {method}")
+        with trace_span("hh.request", method=method, endpoint=endpoint) as span:
+            async with client_session(self.session) as session:
+                # Выбор HTTP метода
+                if method == 'GET':
+                    request_func = session.get
+                elif method == 'POST':
+                    request_func = session.post
+                elif method == 'PUT':
+                    request_func = session.put
+                elif method == 'DELETE':
+                    request_func = session.delete
+                else:
+                    raise ValueError(f"Неподдерживаемый HTTP метод: {method}")
             
-            # Выполнение запроса
-            async with request_func(url, headers=headers, params=params, json=data) as response:
-                logger.info(f"Запрос: {method} {url}, Статус: {response.status}")
+                # Выполнение запроса
+                async with request_func(url, headers=headers, params=params, json=data) as response:
+                    logger.info(f"Запрос: {method} {url}, Статус: {response.status}")
+                    span.set_attribute("status", response.status)
                 
-                # Обработка истекшего токена
-                if response.status == 401:
-                    logger.info("Токен истёк, выполняется обновление")
-                    tokens = await self.token_refresher.refresh()
-                    self.access_token = tokens.get('access_token')
-                    self.refresh_token = tokens.get('refresh_token')
-                    return await self.request(endpoint, method, data, params)
+                    # Обработка истекшего токена
+                    if response.status == 401:
+                        logger.info("Токен истёк, выполняется обновление")
+                        if self.renew_tokens is not None:
+                            tokens = await self.renew_tokens(self.access_token)
+                        else:
+                            tokens = await self.token_refresher.refresh()
+                        self.access_token = tokens.get('access_token')
+                        self.refresh_token = tokens.get('refresh_token')
+                        self.token_refresher.refresh_token = self.refresh_token
+                        return await self.request(endpoint, method, data, params)
                 
-                # Проверка на успешный ответ
-                if response.status >= 400:
-                    error_text = await response.text()
-                    logger.error(f"Ошибка API: {response.status}, {error_text}")
-                    raise Exception(f"Ошибка API {response.status}: {error_text}")
+                    # Проверка на успешный ответ
+                    if response.status >= 400:
+                        error_text = await response.text()
+                        logger.error(f"Ошибка API: {response.status}, {error_text}")
+                        raise Exception(f"Ошибка API {response.status}: {error_text}")
                 
-                # Обработка успешных ответов без тела
-                if response.status == 204:
-                    return {}
+                    # Обработка успешных ответов без тела
+                    if response.status == 204:
+                        return {}
                 
-                # Парсинг JSON ответа
-                try:
-                    return await response.json()
-                except Exception:
-                    logger.info("Получен пустой или невалидный JSON")
-                    return {}
\ No newline at end of file
+                    # Парсинг JSON ответа
+                    try:
+                        return await response.json()
+                    except Exception:
+                        logger.info("Получен пустой или невалидный JSON")
+                        return {}
\ No newline at end of file
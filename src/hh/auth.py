@@ -1,6 +1,10 @@
 # src/hh/auth.py
+import hashlib
+import hmac
 import logging
 from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
 from src.hh.config import settings
 from src.utils import get_logger
 logger = get_logger()
@@ -14,13 +18,24 @@ class HHAuthService:
         self.redirect_uri = settings.redirect_uri
         logger.info("Инициализирован сервис авторизации HH")
         
-    def get_auth_url(self) -> str:
-        """Генерация URL для авторизации пользователя."""
+    def get_auth_url(self, state: Optional[str] = None) -> str:
+        """Генерация URL для авторизации пользователя (state — код вернется на callback сервер под ним)."""
         auth_url = (
-            f'https://hh.ru/oauth/authorize?'
+            f'{settings.authorize_url}?'
             f'response_type=code&'
             f'client_id={self.client_id}&'
             f'redirect_uri={self.redirect_uri}'
         )
+        if state:
+            auth_url += f'&state={quote(state)}'
         logger.info("Сгенерирован URL авторизации")
-        return auth_url
\ No newline at end of file
+        return auth_url
+    
+    def state_for(self, user_key: str) -> str:
+        """
+        Параметр state OAuth пользователя.
+        
+        Подпись ключа пользователя секретом приложения: не угадывается,
+        одинакова во всех процессах (веб-приложения, бот), не требует хранения.
+        """
+        return hmac.new(settings.client_secret.encode(), user_key.encode(), hashlib.sha256).hexdigest()[:32]
\ No newline at end of file
@@ -12,6 +12,27 @@ class HHSettings(BaseAppSettings):
     client_id: str
     client_secret: str
     redirect_uri: str
+    # Базовые адреса API и OAuth (локальный стенд HH — src/hh_local_server)
+    api_base_url: str = "https://api.hh.ru/"
+    oauth_base_url: str = "https://hh.ru/"
+    # Общий пул соединений aiohttp к HH (контейнер сервисов): максимум соединений
+    http_pool_limit: int = 100
+    # Хранилище токенов пользователей (src/hh/token_store.py): SQLite и ключ шифрования
+    # (ключ Fernet или произвольная строка; пусто — ключ создается в файле <token_store_path>.key)
+    token_store_path: str = "data/hh_tokens.sqlite3"
+    token_store_key: str = ""
+    # Фоновое обновление при истечении токенов: проверка базы не реже раза в interval секунд,
+    # повтор через retry секунд, если HH еще не принимает refresh_token (база экспоненциальной паузы после ошибок)
+    token_refresh_interval: float = 30
+    token_refresh_retry: float = 2
+    
+    @property
+    def token_url(self) -> str:
+        return f"{self.oauth_base_url.rstrip('/')}/oauth/token"
+    
+    @property
+    def authorize_url(self) -> str:
+        return f"{self.oauth_base_url.rstrip('/')}/oauth/authorize"
     
     model_config = ConfigDict(
         env_file='.env',
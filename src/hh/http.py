@@ -0,0 +1,17 @@
+# src/hh/http.py
+import contextlib
+from typing import AsyncContextManager, Optional
+
+import aiohttp
+
+
+def client_session(session: Optional[aiohttp.ClientSession] = None) -> AsyncContextManager[aiohttp.ClientSession]:
+    """
+    Сессия для запроса к HH.
+
+    Общая сессия (пул соединений контейнера сервисов) используется как есть и не
+    закрывается; без нее создается отдельная сессия на один запрос.
+    """
+    if session is not None:
+        return contextlib.nullcontext(session)
+    return aiohttp.ClientSession()
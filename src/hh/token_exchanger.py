@@ -6,7 +6,7 @@ from typing import Dict
 
 from src.hh.config import settings
 
-from src.utils import get_logger
+from src.utils import get_logger, traced
 logger = get_logger()
 
 class HHCodeExchanger:
@@ -17,8 +17,9 @@ class HHCodeExchanger:
         self.client_id = settings.client_id
         self.client_secret = settings.client_secret
         self.redirect_uri = settings.redirect_uri
-        self.token_url = "https://hh.ru/oauth/token"
+        self.token_url = settings.token_url
         
+    @traced("hh.exchange_code")
     async def exchange_code(self, code: str) -> Dict[str, str]:
         """Обмен кода авторизации на токены доступа."""
         payload = {
@@ -1,6 +1,7 @@
 # src/hh/token_manager.py
 import logging
 import time
+import aiohttp
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
@@ -11,7 +12,8 @@ logger = get_logger()
 class HHTokenManager:
     """Менеджер для управления токенами доступа HH.ru."""
     
-    def __init__(self, access_token: str, refresh_token: str, expires_in: int):
+    def __init__(self, access_token: str, refresh_token: str, expires_in: int,
+                 refresh_margin: int = 300, session: Optional[aiohttp.ClientSession] = None):
         """
         Инициализация менеджера токенов.
         
@@ -19,11 +21,15 @@ class HHTokenManager:
             access_token: Токен доступа
             refresh_token: Токен обновления
             expires_in: Время жизни токена в секундах
+            refresh_margin: За сколько секунд до истечения обновлять токен
+            session: Общая сессия aiohttp (пул соединений контейнера сервисов)
         """
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.expires_at = time.time() + expires_in
-        self.token_refresher = HHTokenRefresher(refresh_token)
+        self.refresh_margin = refresh_margin
+        self.session = session
+        self.token_refresher = HHTokenRefresher(refresh_token, session)
         
     async def get_valid_tokens(self) -> Tuple[str, str]:
         """
@@ -32,15 +38,15 @@ class HHTokenManager:
         Returns:
             Tuple[str, str]: Пара (access_token, refresh_token)
         """
-        # Проверяем, не истекает ли токен в ближайшие 5 минут
-        if time.time() + 300 >= self.expires_at:
+        # Проверяем, не истекает ли токен в ближайшие refresh_margin секунд
+        if time.time() + self.refresh_margin >= self.expires_at:
             logger.info("Токен скоро истечет, выполняется обновление")
             tokens = await self.token_refresher.refresh()
             
             self.access_token = tokens['access_token']
             self.refresh_token = tokens['refresh_token']
             self.expires_at = time.time() + tokens['expires_in']
-            self.token_refresher = HHTokenRefresher(self.refresh_token)
+            self.token_refresher = HHTokenRefresher(self.refresh_token, self.session)
             
             logger.info("Токены успешно обновлены")
             
@@ -2,22 +2,29 @@
 import logging
 import aiohttp
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from src.hh.config import settings
-from src.utils import get_logger
+from src.hh.http import client_session
+from src.utils import get_logger, traced
 logger = get_logger()
 
+class HHTokenNotExpired(Exception):
+    """HH отклонил обновление: access_token еще не истек (refresh_token принимается только после истечения)."""
+
+
 class HHTokenRefresher:
     """Сервис для обновления токена доступа."""
     
-    def __init__(self, refresh_token: str):
-        """Инициализация с текущим refresh токеном."""
+    def __init__(self, refresh_token: str, session: Optional[aiohttp.ClientSession] = None):
+        """Инициализация с текущим refresh токеном (session — общий пул соединений, если есть)."""
         self.refresh_token = refresh_token
+        self.session = session
         self.client_id = settings.client_id
         self.client_secret = settings.client_secret
-        self.token_url = "https://hh.ru/oauth/token"
+        self.token_url = settings.token_url
     
+    @traced("hh.refresh_token")
     async def refresh(self) -> Dict[str, str]:
         """Обновление токена доступа."""
         if not self.refresh_token:
@@ -30,8 +37,10 @@ class HHTokenRefresher:
             'client_secret': self.client_secret
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with client_session(self.session) as session:
             async with session.post(self.token_url, data=payload) as response:
+                if response.status == 400 and "token not expired" in await response.text():
+                    raise HHTokenNotExpired("Токен доступа еще не истек")
                 if response.status != 200:
                     logger.error(f"Ошибка обновления токена: {response.status}")
                     raise Exception(f"Ошибка обновления токена: {response.status}")
@@ -0,0 +1,366 @@
+# src/hh/token_store.py
+"""
+Хранилище токенов HH пользователей с фоновым обновлением.
+
+Токены хранятся по ключу пользователя ("web:<id сессии>" для веб-приложений,
+"tg:<id пользователя>" для бота) в SQLite (HH_TOKEN_STORE_PATH) и переживают
+перезапуск. Пара access/refresh шифруется Fernet ключом HH_TOKEN_STORE_KEY;
+срок действия хранится открыто, чтобы выбирать токены к обновлению без
+расшифровки.
+
+hh.ru принимает refresh_token только после истечения access_token, поэтому
+фоновая задача (start/stop при запуске и остановке процесса) просыпается к
+ближайшему сроку истечения и сразу обновляет истекшие токены
+(HHTokenRefresher): запрос пользователя берет готовый токен и почти никогда
+не ждет обновления. Ответ HH "token not expired" (расхождение часов) — не
+ошибка: попытка повторяется через HH_TOKEN_REFRESH_RETRY секунд. Новые
+записи других процессов база проверяет не реже раза в
+HH_TOKEN_REFRESH_INTERVAL секунд. Ответ 401 в HHApiClient остается запасным
+путем (renew): если токен уже обновлен фоновой задачей или другим запросом,
+новый берется из базы без обращения к HH.
+
+Базу могут использовать несколько процессов (воркеры, приложения функций,
+бот): токен обновляет процесс, захвативший аренду строки, — refresh_token
+одноразовый и не должен уйти в HH дважды.
+
+Неудачное обновление повторяется с экспоненциальной паузой (от
+HH_TOKEN_REFRESH_RETRY до MAX_REFRESH_BACKOFF секунд); после
+MAX_REFRESH_FAILURES неудач подряд запись удаляется — нужна повторная
+авторизация.
+
+Пример:
+    await services.hh_tokens.save("tg:42", tokens)      # ответ обмена кода
+    tokens = await services.hh_tokens.get("tg:42")      # (access, refresh) или None
+    services.hh_tokens.start()                          # фоновое обновление
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from cryptography.fernet import Fernet, InvalidToken
+
+from src.hh.config import settings
+from src.hh.token_refresher import HHTokenNotExpired, HHTokenRefresher
+from src.utils import get_logger
+from src.utils.metrics import registry
+
+logger = get_logger()
+
+# Неудачных обновлений истекшего токена до удаления записи и максимальная пауза между ними (секунды)
+MAX_REFRESH_FAILURES = 5
+MAX_REFRESH_BACKOFF = 300
+# Аренда строки на время обновления (секунды): упавший процесс не блокирует токен навсегда
+REFRESH_LEASE_SECONDS = 60
+
+hh_token_refreshes = registry.counter(
+    "hh_token_refreshes_total", "Фоновые обновления токенов HH по результату"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hh_tokens (
+    user_key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    lease_until REAL NOT NULL DEFAULT 0,
+    retain_until REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def load_cipher(key: str, key_path: Path) -> Fernet:
+    """
+    Шифр хранилища: ключ Fernet, производный от произвольной строки ключ
+    или ключ из файла рядом с базой (создается при первом запуске).
+    """
+    if not key:
+        if key_path.exists():
+            key = key_path.read_text().strip()
+        else:
+            key = Fernet.generate_key().decode()
+            key_path.parent.mkdir(parents=True, exist_ok=True)
+            key_path.write_text(key)
+            os.chmod(key_path, 0o600)
+            logger.warning(f"HH_TOKEN_STORE_KEY не задан: ключ шифрования токенов создан в {key_path}")
+    try:
+        return Fernet(key)
+    except ValueError:
+        return Fernet(base64.urlsafe_b64encode(hashlib.sha256(key.encode()).digest()))
+
+
+class HHTokenStore:
+    """Токены HH пользователей в зашифрованной SQLite базе с фоновым обновлением"""
+
+    def __init__(self, path: Optional[str] = None, key: Optional[str] = None,
+                 session_factory: Optional[Callable[[], aiohttp.ClientSession]] = None):
+        """
+        Args:
+            path: Файл базы SQLite (по умолчанию HH_TOKEN_STORE_PATH)
+            key: Ключ шифрования (по умолчанию HH_TOKEN_STORE_KEY)
+            session_factory: Общая сессия aiohttp для обновления токенов
+                (пул соединений контейнера сервисов)
+        """
+        self.path = Path(path or settings.token_store_path)
+        self.cipher = load_cipher(settings.token_store_key if key is None else key,
+                                  self.path.with_name(self.path.name + ".key"))
+        self.session_factory = session_factory
+        self.refresh_interval = settings.token_refresh_interval
+        self.refresh_retry = settings.token_refresh_retry
+
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._failures: Dict[str, int] = {}
+        # Пользователь -> время следующей попытки после отказа HH или ошибки
+        self._retry_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ---------- SQLite (вызовы в потоке) ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with sqlite3.connect(self.path) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.execute(SCHEMA)
+                    self._initialized = True
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(sql, params)
+                return cursor.fetchall() if cursor.description else [(cursor.rowcount,)]
+        finally:
+            conn.close()
+
+    async def _run(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    # ---------- токены пользователей ----------
+
+    def _encrypt(self, access_token: str, refresh_token: str) -> bytes:
+        return self.cipher.encrypt(json.dumps({"access_token": access_token, "refresh_token": refresh_token}).encode())
+
+    async def save(self, user_key: str, tokens: Dict[str, Any], retain_until: Optional[float] = None) -> None:
+        """
+        Сохранить токены пользователя (ответ HH: access_token, refresh_token, expires_in).
+
+        retain_until — когда удалить запись (окончание сессии веб-приложения);
+        None — хранить, пока токены обновляются (прежний срок записи сохраняется).
+        """
+        now = time.time()
+        expires_at = now + float(tokens.get("expires_in") or 0)
+        await self._run(
+            "INSERT INTO hh_tokens (user_key, payload, expires_at, lease_until, retain_until, updated_at) "
+            "VALUES (?, ?, ?, 0, ?, ?) "
+            "ON CONFLICT(user_key) DO UPDATE SET payload = excluded.payload, expires_at = excluded.expires_at, "
+            "lease_until = 0, retain_until = COALESCE(excluded.retain_until, hh_tokens.retain_until), "
+            "updated_at = excluded.updated_at",
+            (user_key, self._encrypt(tokens["access_token"], tokens["refresh_token"]), expires_at, retain_until, now)
+        )
+        self._failures.pop(user_key, None)
+        self._retry_at.pop(user_key, None)
+        # Фоновая задача пересчитывает ближайший срок истечения
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _load(self, user_key: str) -> Optional[Tuple[str, str, float]]:
+        rows = await self._run("SELECT payload, expires_at FROM hh_tokens WHERE user_key = ?", (user_key,))
+        if not rows:
+            return None
+        payload, expires_at = rows[0]
+        try:
+            data = json.loads(self.cipher.decrypt(payload))
+        except InvalidToken:
+            logger.error(f"Токены пользователя {user_key} не расшифрованы: изменился HH_TOKEN_STORE_KEY?")
+            return None
+        return data["access_token"], data["refresh_token"], expires_at
+
+    async def get(self, user_key: str) -> Optional[Tuple[str, str]]:
+        """Токены пользователя (access_token, refresh_token) без обновления; None — не авторизован."""
+        stored = await self._load(user_key)
+        return stored[:2] if stored else None
+
+    async def delete(self, user_key: str) -> None:
+        await self._run("DELETE FROM hh_tokens WHERE user_key = ?", (user_key,))
+        self._failures.pop(user_key, None)
+        self._retry_at.pop(user_key, None)
+
+    async def _lease(self, user_key: str, due_before: Optional[float] = None) -> bool:
+        """Аренда строки на обновление: токен обновляет один процесс (due_before — только если токен еще не обновлен)."""
+        now = time.time()
+        if due_before is None:
+            due_before = float("inf")
+        leased = await self._run(
+            "UPDATE hh_tokens SET lease_until = ? WHERE user_key = ? AND lease_until < ? AND expires_at < ?",
+            (now + REFRESH_LEASE_SECONDS, user_key, now, due_before)
+        )
+        return bool(leased[0][0])
+
+    async def _release(self, user_key: str) -> None:
+        await self._run("UPDATE hh_tokens SET lease_until = 0 WHERE user_key = ?", (user_key,))
+
+    async def renew(self, user_key: str, stale_access_token: str) -> Dict[str, Any]:
+        """
+        Токены после ответа 401 на stale_access_token.
+
+        Если токен уже обновлен (фоновой задачей, другим запросом или процессом),
+        возвращается сохраненный; иначе обновление у HH под арендой строки.
+        """
+        deadline = time.monotonic() + REFRESH_LEASE_SECONDS
+        while True:
+            # Сначала аренда, затем чтение: токены не изменятся между проверкой и обновлением
+            leased = await self._lease(user_key)
+            stored = await self._load(user_key)
+            if stored is None:
+                if leased:
+                    await self._release(user_key)
+                raise ValueError("Токены пользователя не найдены, нужна повторная авторизация")
+            access_token, refresh_token, _ = stored
+            if access_token != stale_access_token:
+                if leased:
+                    await self._release(user_key)
+                return {"access_token": access_token, "refresh_token": refresh_token}
+            if leased:
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError("Токены пользователя обновляются другим процессом")
+            # Токен обновляет другой запрос или процесс — ждем результата
+            await asyncio.sleep(0.2)
+
+        try:
+            session = self.session_factory() if self.session_factory else None
+            tokens = await HHTokenRefresher(refresh_token, session).refresh()
+        except Exception:
+            await self._release(user_key)
+            raise
+        await self.save(user_key, tokens)
+        return tokens
+
+    def renewer(self, user_key: str) -> Callable[[str], Awaitable[Dict[str, Any]]]:
+        """Обновление токенов пользователя по ответу 401 (renew_tokens HHApiClient)."""
+        async def renew(stale_access_token: str) -> Dict[str, Any]:
+            return await self.renew(user_key, stale_access_token)
+        return renew
+
+    # ---------- фоновое обновление ----------
+
+    async def refresh_due(self) -> int:
+        """Один цикл: обновить истекшие токены (кроме ожидающих повтора). Возвращает число обновленных."""
+        now = time.time()
+        # Записи завершившихся сессий не обновляются
+        await self._run("DELETE FROM hh_tokens WHERE retain_until IS NOT NULL AND retain_until < ?", (now,))
+        rows = await self._run(
+            "SELECT user_key FROM hh_tokens WHERE expires_at <= ? AND lease_until < ?",
+            (now, now)
+        )
+        self._retry_at = {user_key: retry_at for user_key, retry_at in self._retry_at.items() if retry_at > now}
+        refreshed = 0
+        for (user_key,) in rows:
+            if user_key not in self._retry_at:
+                refreshed += await self._refresh(user_key)
+        return refreshed
+
+    async def next_due(self) -> float:
+        """Время следующего цикла: ближайшее истечение, повтор или проверка базы."""
+        now = time.time()
+        # Токены, истекшие во время цикла, обновляются сразу
+        due = await self._run("SELECT user_key FROM hh_tokens WHERE expires_at <= ? AND lease_until < ?", (now, now))
+        if any(user_key not in self._retry_at for (user_key,) in due):
+            return now
+        rows = await self._run("SELECT MIN(expires_at) FROM hh_tokens WHERE expires_at > ?", (now,))
+        candidates = [now + self.refresh_interval, *self._retry_at.values()]
+        if rows[0][0] is not None:
+            candidates.append(rows[0][0])
+        return min(candidates)
+
+    async def _refresh(self, user_key: str) -> bool:
+        now = time.time()
+        # Только если токен еще не обновлен другим процессом или запросом
+        if not await self._lease(user_key, due_before=now):
+            return False
+
+        stored = await self._load(user_key)
+        if stored is None:
+            # Не расшифрована (другой ключ) или удалена: следующая попытка — при проверке базы
+            self._retry_at[user_key] = time.time() + self.refresh_interval
+            await self._release(user_key)
+            return False
+        _, refresh_token, _ = stored
+        session = self.session_factory() if self.session_factory else None
+        try:
+            tokens = await HHTokenRefresher(refresh_token, session).refresh()
+        except HHTokenNotExpired:
+            # Часы HH отстают от наших: токен еще действует, повтор вскоре
+            logger.debug(f"HH еще не принимает обновление токенов пользователя {user_key}, повтор через {self.refresh_retry:.0f} с")
+            self._retry_at[user_key] = time.time() + self.refresh_retry
+            await self._release(user_key)
+            return False
+        except Exception as e:
+            failures = self._failures.get(user_key, 0) + 1
+            self._failures[user_key] = failures
+            hh_token_refreshes.inc(result="error")
+            if failures >= MAX_REFRESH_FAILURES:
+                logger.warning(f"Токены пользователя {user_key} не обновлены {failures} раз после истечения, запись удалена: {e}")
+                await self.delete(user_key)
+            else:
+                delay = min(MAX_REFRESH_BACKOFF, self.refresh_retry * 2 ** failures)
+                logger.warning(f"Фоновое обновление токенов пользователя {user_key} не выполнено, повтор через {delay:.0f} с: {e}")
+                self._retry_at[user_key] = time.time() + delay
+                await self._release(user_key)
+            return False
+
+        await self.save(user_key, tokens)
+        hh_token_refreshes.inc(result="ok")
+        logger.info(f"Токены пользователя {user_key} обновлены при истечении")
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запуск фонового обновления токенов в текущем event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+        logger.info(
+            f"Фоновое обновление токенов HH запущено: при истечении токенов, "
+            f"проверка базы не реже раза в {self.refresh_interval:.0f} с"
+        )
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wakeup = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh_due()
+                wake_at = await self.next_due()
+            except Exception as e:
+                logger.error(f"Ошибка фонового обновления токенов HH: {e}")
+                wake_at = time.time() + self.refresh_interval
+            # Сохранение токенов в этом процессе будит задачу раньше
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, wake_at - time.time()))
+            except asyncio.TimeoutError:
+                pass
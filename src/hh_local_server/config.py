@@ -0,0 +1,33 @@
+# src/hh_local_server/config.py
+from pydantic import ConfigDict
+from src.config import BaseAppSettings
+
+
+class HHLocalServerSettings(BaseAppSettings):
+    """
+    Настройки локального стенда API HH.ru для нагрузочного тестирования.
+    """
+    host: str = "127.0.0.1"
+    port: int = 8090
+    fixtures_dir: str = "tests/test_models_res_vac"
+    vacancy_fixture: str = "fetched_vacancy_120234346.json"
+    resume_fixture: str = "fetched_resume_6d807532ff0ed6b79f0039ed1f63386d724a62.json"
+    
+    # Латентность ответа: логнормальная с медианой latency_ms и разбросом latency_sigma
+    latency_ms: float = 150
+    latency_sigma: float = 0.4
+    
+    # Время жизни access_token (секунды), после истечения API отвечает 401
+    token_ttl: int = 600
+    # Запросов в секунду на токен, сверх лимита — 429 (0 — без ограничения)
+    rate_limit_rps: float = 0
+    # Принимать неизвестные токены (без прохождения OAuth)
+    accept_unknown_tokens: bool = False
+    
+    model_config = ConfigDict(
+        env_file='.env',
+        env_prefix='HH_LOCAL_',
+        extra='ignore'
+    )
+
+settings = HHLocalServerSettings()
@@ -0,0 +1,20 @@
+# src/hh_local_server/main.py
+
+### ЛОГИРОВАНИЕ ###
+from src.utils import init_logging_from_env, get_logger
+
+# Инициализируем логирование
+init_logging_from_env()
+logger = get_logger()
+
+import uvicorn
+from src.hh_local_server.config import settings
+from src.hh_local_server.server import app
+
+def start_server():
+    """Запуск локального стенда API HH.ru."""
+    logger.info(f"Запуск локального стенда HH на {settings.host}:{settings.port}")
+    uvicorn.run(app, host=settings.host, port=settings.port, access_log=False)
+
+if __name__ == "__main__":
+    start_server()
@@ -0,0 +1,277 @@
+# src/hh_local_server/server.py
+"""
+Локальный стенд API HH.ru для нагрузочного тестирования без сети.
+
+Отдает вакансии и резюме из сохраненных ответов HH (tests/test_models_res_vac)
+с синтетическими вариантами по id, эмулирует латентность, истечение токенов (401),
+ограничение частоты (429) и OAuth (authorize + token).
+
+Подключение приложения и бота к стенду:
+    HH_API_BASE_URL=http://127.0.0.1:8090/
+    HH_OAUTH_BASE_URL=http://127.0.0.1:8090/
+
+Служебные эндпоинты:
+    GET  /__local/stats          — счетчики запросов и выданных токенов
+    POST /__local/expire_tokens  — принудительное истечение всех access_token
+"""
+
+import asyncio
+import copy
+import json
+import random
+import re
+import secrets
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+from fastapi import FastAPI, Form, Query, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+
+from src.hh_local_server.config import settings
+from src.utils import get_logger
+
+logger = get_logger()
+app = FastAPI(title="hh_local_server")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+VACANCY_TITLES = [
+    "Senior/Lead Data Scientist", "ML Engineer", "NLP Engineer", "Python Developer",
+    "Backend Developer", "Data Engineer", "LLM Engineer", "MLOps Engineer",
+]
+EMPLOYERS = ["Сбер Банк", "Яндекс", "Т-Банк", "Ozon", "VK", "Авито", "Лаборатория Касперского"]
+EXTRA_SKILLS = ["Docker", "Kubernetes", "SQL", "FastAPI", "Airflow", "Spark", "Git", "Linux", "Kafka", "Redis"]
+
+
+def _load_fixture(name: str) -> Dict[str, Any]:
+    path = Path(settings.fixtures_dir)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    return json.loads((path / name).read_text(encoding="utf-8"))
+
+
+VACANCY_FIXTURE = _load_fixture(settings.vacancy_fixture)
+RESUME_FIXTURE = _load_fixture(settings.resume_fixture)
+
+# access_token -> (refresh_token, expires_at); refresh_token -> access_token
+access_tokens: Dict[str, tuple] = {}
+refresh_tokens: Dict[str, str] = {}
+auth_codes: Dict[str, float] = {}
+request_times: Dict[str, Deque[float]] = {}
+stats: Counter = Counter()
+
+
+# ================== СИНТЕТИЧЕСКИЕ ДАННЫЕ ==================
+
+def make_vacancy(vacancy_id: str) -> Dict[str, Any]:
+    """Вакансия по id: исходный ответ HH или его детерминированный вариант."""
+    vacancy = copy.deepcopy(VACANCY_FIXTURE)
+    if vacancy_id == str(VACANCY_FIXTURE.get("id")):
+        return vacancy
+
+    rng = random.Random(vacancy_id)
+    vacancy["id"] = vacancy_id
+    vacancy["name"] = rng.choice(VACANCY_TITLES)
+    vacancy["alternate_url"] = f"https://hh.ru/vacancy/{vacancy_id}"
+    if isinstance(vacancy.get("employer"), dict):
+        vacancy["employer"]["name"] = rng.choice(EMPLOYERS)
+
+    skills = [skill["name"] for skill in vacancy.get("key_skills", [])]
+    skills = rng.sample(skills, k=max(1, len(skills) - rng.randint(0, 2))) + rng.sample(EXTRA_SKILLS, k=rng.randint(0, 3))
+    vacancy["key_skills"] = [{"name": name} for name in dict.fromkeys(skills)]
+
+    # Длина описания варьируется от исходной до трехкратной (проверка бюджетов токенов)
+    paragraphs = [part for part in vacancy.get("description", "").split("</p>") if part.strip()]
+    rng.shuffle(paragraphs)
+    vacancy["description"] = "</p>".join(paragraphs * rng.randint(1, 3)) + "</p>"
+    return vacancy
+
+
+def make_resume(resume_id: str) -> Dict[str, Any]:
+    """Резюме по id: исходный ответ HH или его детерминированный вариант."""
+    resume = copy.deepcopy(RESUME_FIXTURE)
+    if resume_id == str(RESUME_FIXTURE.get("id")):
+        return resume
+
+    rng = random.Random(resume_id)
+    resume["id"] = resume_id
+    resume["title"] = rng.choice(VACANCY_TITLES)
+    experience = resume.get("experience") or []
+    if len(experience) > 1:
+        resume["experience"] = experience[:rng.randint(1, len(experience))]
+    return resume
+
+
+# ================== АВТОРИЗАЦИЯ И ЛИМИТЫ ==================
+
+def _hh_error(status_code: int, error_type: str, value: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """Ошибка в формате API HH.ru."""
+    error = {"type": error_type}
+    if value:
+        error["value"] = value
+    return JSONResponse({"errors": [error]}, status_code=status_code, headers=headers)
+
+
+def _issue_tokens() -> Dict[str, Any]:
+    access_token = f"LOCAL{secrets.token_hex(16)}"
+    refresh_token = f"LOCALR{secrets.token_hex(16)}"
+    access_tokens[access_token] = (refresh_token, time.time() + settings.token_ttl)
+    refresh_tokens[refresh_token] = access_token
+    stats["tokens_issued"] += 1
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "expires_in": settings.token_ttl,
+        "token_type": "bearer",
+    }
+
+
+def _check_token(request: Request) -> Optional[JSONResponse]:
+    """401 для неизвестного/истекшего токена, 429 при превышении лимита частоты."""
+    header = request.headers.get("authorization", "")
+    token = header[7:] if header.lower().startswith("bearer ") else ""
+    issued = access_tokens.get(token)
+    if issued is None and not (settings.accept_unknown_tokens and token):
+        return _hh_error(401, "oauth", "bad_authorization")
+    if issued is not None and issued[1] < time.time():
+        return _hh_error(401, "oauth", "token_expired")
+
+    if settings.rate_limit_rps > 0:
+        now = time.monotonic()
+        window = request_times.setdefault(token, deque())
+        while window and now - window[0] > 1.0:
+            window.popleft()
+        if len(window) >= settings.rate_limit_rps:
+            return _hh_error(429, "too_many_requests", headers={"Retry-After": "1"})
+        window.append(now)
+    return None
+
+
+async def _emulate_latency() -> None:
+    if settings.latency_ms > 0:
+        await asyncio.sleep(settings.latency_ms / 1000 * random.lognormvariate(0, settings.latency_sigma))
+
+
+@app.middleware("http")
+async def count_requests(request: Request, call_next):
+    response = await call_next(request)
+    path = re.sub(r"/[^/]*\d[^/]*", "/:id", request.url.path)
+    stats[f"{request.method} {path} {response.status_code}"] += 1
+    return response
+
+
+# ================== API ==================
+
+async def _api_response(request: Request, payload_factory, object_id: str) -> JSONResponse:
+    await _emulate_latency()
+    error = _check_token(request)
+    if error is not None:
+        return error
+    return JSONResponse(payload_factory(object_id))
+
+
+@app.get("/vacancies/{vacancy_id}")
+async def get_vacancy(vacancy_id: str, request: Request):
+    return await _api_response(request, make_vacancy, vacancy_id)
+
+
+@app.get("/resumes/mine")
+async def get_my_resumes(request: Request):
+    await _emulate_latency()
+    error = _check_token(request)
+    if error is not None:
+        return error
+    resume = make_resume(str(RESUME_FIXTURE.get("id")))
+    items = [{"id": resume["id"], "title": resume.get("title"), "alternate_url": resume.get("alternate_url")}]
+    return JSONResponse({"found": len(items), "pages": 1, "page": 0, "per_page": 20, "items": items})
+
+
+@app.get("/resumes/{resume_id}")
+async def get_resume(resume_id: str, request: Request):
+    return await _api_response(request, make_resume, resume_id)
+
+
+@app.get("/me")
+async def get_me(request: Request):
+    await _emulate_latency()
+    error = _check_token(request)
+    if error is not None:
+        return error
+    return JSONResponse({
+        "id": "1", "first_name": RESUME_FIXTURE.get("first_name"), "last_name": RESUME_FIXTURE.get("last_name"),
+        "is_applicant": True, "is_employer": False,
+    })
+
+
+# ================== OAUTH ==================
+
+@app.get("/oauth/authorize")
+async def oauth_authorize(
+    redirect_uri: str = Query(...),
+    client_id: str = Query(None),
+    response_type: str = Query("code"),
+    state: Optional[str] = Query(None),
+):
+    """Авторизация без формы входа: сразу перенаправляет на redirect_uri с кодом."""
+    code = f"LOCALC{secrets.token_hex(12)}"
+    auth_codes[code] = time.time()
+    separator = "&" if "?" in redirect_uri else "?"
+    location = f"{redirect_uri}{separator}code={code}" + (f"&state={state}" if state else "")
+    return RedirectResponse(location, status_code=302)
+
+
+@app.post("/oauth/token")
+async def oauth_token(
+    grant_type: str = Form(...),
+    code: Optional[str] = Form(None),
+    refresh_token: Optional[str] = Form(None),
+    client_id: Optional[str] = Form(None),
+    client_secret: Optional[str] = Form(None),
+    redirect_uri: Optional[str] = Form(None),
+):
+    """Обмен кода и обновление токенов в формате OAuth HH.ru."""
+    await _emulate_latency()
+    if grant_type == "authorization_code":
+        issued_at = auth_codes.pop(code or "", None)
+        if issued_at is None and not (settings.accept_unknown_tokens and code):
+            return JSONResponse({"error": "invalid_grant", "error_description": "code not found"}, status_code=400)
+        return JSONResponse(_issue_tokens())
+
+    if grant_type == "refresh_token":
+        access_token = refresh_tokens.get(refresh_token or "")
+        if access_token is None:
+            return JSONResponse({"error": "invalid_grant", "error_description": "token not found"}, status_code=400)
+        # Как hh.ru: refresh_token принимается только после истечения access_token
+        issued = access_tokens.get(access_token)
+        if issued is not None and issued[1] > time.time():
+            stats["refresh_not_expired"] += 1
+            return JSONResponse({"error": "invalid_grant", "error_description": "token not expired"}, status_code=400)
+        refresh_tokens.pop(refresh_token, None)
+        access_tokens.pop(access_token, None)
+        stats["tokens_refreshed"] += 1
+        return JSONResponse(_issue_tokens())
+
+    return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+
+
+# ================== СЛУЖЕБНЫЕ ЭНДПОИНТЫ ==================
+
+@app.get("/__local/stats")
+async def local_stats():
+    return JSONResponse({"active_tokens": len(access_tokens), "counters": dict(stats)})
+
+
+@app.post("/__local/expire_tokens")
+async def expire_tokens():
+    """Все выданные access_token истекают (следующий запрос получит 401 и обновит токен)."""
+    for token, (refresh, _) in list(access_tokens.items()):
+        access_tokens[token] = (refresh, 0)
+    logger.info(f"Локальный стенд HH: истекли {len(access_tokens)} токенов")
+    return JSONResponse({"expired": len(access_tokens)})
+
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "service": "hh_local_server"}
@@ -4,6 +4,10 @@
 Фокус на персонализации и создании убедительного контента.
 """
 
+from src.utils.token_budget import resume_budget, vacancy_budget
+
+
+@resume_budget("llm_cover_letter")
 def format_resume_for_cover_letter(resume_data: dict) -> str:
     """
     Форматирует данные резюме для создания персонализированного рекомендательного письма.
@@ -126,6 +130,7 @@ def format_resume_for_cover_letter(resume_data: dict) -> str:
     return formatted_text
 
 
+@vacancy_budget("llm_cover_letter")
 def format_vacancy_for_cover_letter(vacancy_data: dict) -> str:
     """
     Форматирует данные вакансии для создания персонализированного рекомендательного письма.
@@ -11,8 +11,9 @@ from src.llm_cover_letter.formatter import (
     format_cover_letter_context
 )
 from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
-from src.utils import get_logger
+from src.utils import get_logger, log_payload, traced
 logger = get_logger()
 
 class EnhancedLLMCoverLetterGenerator:
@@ -21,10 +22,16 @@ class EnhancedLLMCoverLetterGenerator:
     на основе лучших практик HR-экспертов
     """
     
-    def __init__(self, validate_quality: bool = True):
-        """Инициализация клиента OpenAI."""
+    def __init__(self, validate_quality: bool = True, client: Optional[OpenAI] = None):
+        """
+        Инициализация клиента OpenAI.
+
+        Args:
+            validate_quality: Проверять качество письма после генерации
+            client: Общий клиент OpenAI (контейнер сервисов); None — создается свой
+        """
         self.config = settings
-        self.client = OpenAI(api_key=self.config.api_key)
+        self.client = client or OpenAI(api_key=self.config.api_key, max_retries=0, http_client=get_openai_http_client())
         self.model = self.config.model_name
         self.validate_quality = validate_quality
     
@@ -56,22 +63,17 @@ class EnhancedLLMCoverLetterGenerator:
             'position_title': parsed_vacancy.get('title', 'Позиция')
         }
     
-    def _create_system_prompt(self, context: Dict[str, str], resume_dict: Dict[str, Any], vacancy_dict: Dict[str, Any]) -> str:
+    def _create_system_prompt(self) -> str:
         """
-        Создает системный промпт с ролью, инструкцией и полным контекстом.
+        Создает системный промпт с ролью и методологией.
         
-        Args:
-            context: Контекст вакансии (размер компании, тип роли и т.д.)
-            resume_dict: Данные резюме для анализа соответствия
-            vacancy_dict: Данные вакансии для анализа соответствия
+        Промпт полностью статичен: контекст компании и данные кандидата передаются
+        в пользовательском промпте, поэтому префикс кэшируется OpenAI.
         
         Returns:
             str: Системный промпт
         """
-        # Получаем контекст персонализации через форматтер
-        personalization_context = format_cover_letter_context(resume_dict, vacancy_dict)
-        
-        return f"""# РОЛЬ: Ты — эксперт по написанию сопроводительных писем с 10+ летним опытом в IT-рекрутинге
+        return """# РОЛЬ: Ты — эксперт по написанию сопроводительных писем с 10+ летним опытом в IT-рекрутинге
 
             ## КРИТИЧЕСКАЯ СТАТИСТИКА
             - 83% работодателей готовы рассмотреть кандидата с отличным письмом, даже если резюме не идеально
@@ -155,7 +157,7 @@ class EnhancedLLMCoverLetterGenerator:
             **Определение:** Если не подходит ни один из вышеперечисленных.
             **Адаптация:** Опишите ключевые аспекты, специфичные для данной роли.
             
-            Выбери НАИБОЛЕЕ ПОДХОДЯЩИЙ тип роли для позиции: {context['position_title']}
+            Выбери НАИБОЛЕЕ ПОДХОДЯЩИЙ тип роли для позиции из контекста компании
 
             ## ОБЯЗАТЕЛЬНЫЕ КРИТЕРИИ
 
@@ -175,14 +177,6 @@ class EnhancedLLMCoverLetterGenerator:
             - **MEDIUM/LARGE**: баланс профессионализма и человечности
             - **ENTERPRISE**: максимально профессионально, стабильность
 
-            ## КОНТЕКСТ ДЛЯ ПЕРСОНАЛИЗАЦИИ
-
-            ### КОНТЕКСТ КОМПАНИИ:
-            - Размер компании: {context['company_size']}
-            - Название компании: {context['company_name']}
-            - Позиция: {context['position_title']}
-            {personalization_context}
-            
             ## ОБЯЗАТЕЛЬНО ИСПОЛЬЗУЙ СГЕНЕРИРОВАННЫЕ ДАННЫЕ
             ### Обязательно заполни поля company_context на основе описания вакансии:
               - company_culture: особенности культуры компании (если упомянуты)
@@ -194,33 +188,24 @@ class EnhancedLLMCoverLetterGenerator:
               - **value_demonstration** - конкретизируй value_proposition из personalization
             """
 
-    def _create_user_prompt(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> str:
+    def _create_user_prompt(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any], context: Dict[str, str]) -> str:
         """
-        Создает пользовательский промпт с данными резюме и вакансии.
+        Создает пользовательский промпт: инструкция, контекст персонализации и данные.
         
         Args:
             parsed_resume: Словарь с данными резюме
             parsed_vacancy: Словарь с данными вакансии
+            context: Контекст вакансии (размер компании, название, позиция)
         
         Returns:
             str: Пользовательский промпт
         """
         formatted_resume = format_resume_for_cover_letter(parsed_resume)
         formatted_vacancy = format_vacancy_for_cover_letter(parsed_vacancy)
+        # Получаем контекст персонализации через форматтер
+        personalization_context = format_cover_letter_context(parsed_resume, parsed_vacancy)
         
-        return f"""## ИСХОДНЫЕ ДАННЫЕ
-
-    ### РЕЗЮМЕ КАНДИДАТА:
-    <resume_start>
-    {formatted_resume}
-    </resume_end>
-    
-    ### ВАКАНСИЯ:
-    <vacancy_start>
-    {formatted_vacancy}
-    </vacancy_end>
-
-    ## ИНСТРУКЦИЯ
+        return f"""## ИНСТРУКЦИЯ
 
     Создай профессиональное сопроводительное письмо, строго следуя методологии из системного промпта:
 
@@ -231,8 +216,29 @@ class EnhancedLLMCoverLetterGenerator:
     5. **Соблюдай структуру** - зацепка, интерес к компании, ценность, завершение
     6. **Адаптируй тональность** - под размер компании и тип роли
 
-    Верни результат в формате JSON согласно модели **EnhancedCoverLetter**."""
+    Верни результат в формате JSON согласно модели **EnhancedCoverLetter**.
+
+    ## КОНТЕКСТ ДЛЯ ПЕРСОНАЛИЗАЦИИ
+
+    ### КОНТЕКСТ КОМПАНИИ:
+    - Размер компании: {context['company_size']}
+    - Название компании: {context['company_name']}
+    - Позиция: {context['position_title']}
+    {personalization_context}
+
+    ## ИСХОДНЫЕ ДАННЫЕ
+
+    ### РЕЗЮМЕ КАНДИДАТА:
+    <resume_start>
+    {formatted_resume}
+    </resume_end>
+    
+    ### ВАКАНСИЯ:
+    <vacancy_start>
+    {formatted_vacancy}
+    </vacancy_end>"""
     
+    @traced("llm_cover_letter.generate_enhanced_cover_letter")
     async def generate_enhanced_cover_letter(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> Optional[EnhancedCoverLetter]:
         """
         Генерирует профессиональное сопроводительное письмо.
@@ -252,8 +258,8 @@ class EnhancedLLMCoverLetterGenerator:
             context = self._analyze_vacancy_context(parsed_vacancy)
             
             # 2. Создаем системный и пользовательский промпты
-            system_prompt = self._create_system_prompt(context, parsed_resume, parsed_vacancy)
-            user_prompt = self._create_user_prompt(parsed_resume, parsed_vacancy)
+            system_prompt = self._create_system_prompt()
+            user_prompt = self._create_user_prompt(parsed_resume, parsed_vacancy, context)
             
             # 3. Подготавливаем сообщения
             messages = [
@@ -268,7 +274,9 @@ class EnhancedLLMCoverLetterGenerator:
             ]
             
             # 4. Вызов OpenAI API с новой моделью
-            completion = self.client.beta.chat.completions.parse(
+            completion = await openai_controller.acall(
+                self.client.beta.chat.completions.parse,
+                feature="llm_cover_letter.generate_enhanced_cover_letter",
                 model=self.model,
                 messages=messages,
                 response_format=EnhancedCoverLetter,
@@ -281,7 +289,7 @@ class EnhancedLLMCoverLetterGenerator:
             
             # 5. Извлекаем и валидируем ответ
             raw_response_text = completion.choices[0].message.content
-            print(f"Raw response text: {raw_response_text}")  # Для отладки
+            log_payload(logger, "Ответ модели (сопроводительное письмо)", raw_response_text)
             if not raw_response_text:
                 logger.error("Пустой ответ от модели при генерации сопроводительного письма.")
                 openai_controller.record_request(success=False, error="Пустой ответ от модели")
@@ -3,6 +3,10 @@
 Модуль для форматирования данных резюме и вакансии перед отправкой в LLM.
 """
 
+from src.utils.token_budget import resume_budget, vacancy_budget
+
+
+@resume_budget("llm_gap_analyzer")
 def format_resume_data(resume_data: dict) -> str:
     """
     Форматирует данные резюме в читаемый markdown формат.
@@ -220,6 +224,7 @@ def format_resume_data(resume_data: dict) -> str:
     return formatted_text
 
 
+@vacancy_budget("llm_gap_analyzer")
 def format_vacancy_data(vacancy_data: dict) -> str:
     """
     Форматирует данные вакансии в читаемый markdown формат.
@@ -1,55 +1,43 @@
 # src/llm_gap_analyzer/llm_gap_analyzer.py
-import os
 from typing import Optional, Dict, Any
 from openai import OpenAI
 from pydantic import ValidationError
 import instructor
 
-# ДОБАВИТЬ импорты LangSmith
-from langsmith.wrappers import wrap_openai
-from langsmith import traceable, Client
-
-from src.utils import get_logger
+from src.utils import get_logger, traced
+from src.utils.llm_tracing import llm_traceable, llm_trace_exporter
 from src.llm_gap_analyzer import settings
 from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
 from src.llm_gap_analyzer.formatter import format_resume_data, format_vacancy_data
 from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
 logger = get_logger()
 
-# LangSmith клиент (без изменений)
-def create_langsmith_client():
-    """Создаёт клиента LangSmith для трейсинга."""
-    api_key = os.getenv("LANGCHAIN_API_KEY")
-    if not api_key:
-        logger.warning("LANGCHAIN_API_KEY не установлен, трейсинг будет отключен")
-        return None
-    return Client(api_key=api_key)
-
-ls_client = create_langsmith_client()
-
 
 class LLMGapAnalyzer:
     """Сервис для анализа резюме с помощью OpenAI API"""
     
-    def __init__(self):
-        """Инициализация клиента OpenAI с LangSmith трейсингом."""
+    def __init__(self, client: Optional[OpenAI] = None):
+        """
+        Инициализация клиента OpenAI.
+
+        Args:
+            client: Общий клиент OpenAI (контейнер сервисов); None — создается свой
+        """
         self.config = settings
         self.model = self.config.model_name
-        self.client = self._create_traced_client()
+        self.client = client or self._create_traced_client()
         logger.info(f"Инициализирован GAP анализатор с моделью {self.model}")
     
     def _create_traced_client(self) -> OpenAI:
-        """Создает OpenAI клиент с LangSmith трейсингом."""
-        base_client = OpenAI(api_key=self.config.api_key)
-        
-        if ls_client:
-            logger.info("LangSmith трейсинг активирован для GAP анализа")
-            wrapped_client = wrap_openai(base_client)
-            return wrapped_client
-        else:
-            logger.info("LangSmith трейсинг недоступен, используется базовый клиент")
-            return base_client
+        """
+        Создает OpenAI клиент.
+
+        Вызовы модели попадают в трейс LLM (src/utils/llm_tracing.py) из спанов
+        llm.completion, обертка клиента не требуется.
+        """
+        return OpenAI(api_key=self.config.api_key, max_retries=0, http_client=get_openai_http_client())
     
     def _create_system_prompt(self) -> str:
         """ОБНОВЛЕННЫЙ системный промпт с синхронизированной терминологией."""
@@ -136,15 +124,8 @@ class LLMGapAnalyzer:
         formatted_resume = format_resume_data(parsed_resume)
         formatted_vacancy = format_vacancy_data(parsed_vacancy)
         
-        return f"""<resume_data>
-{formatted_resume}
-</resume_data>
-
-<vacancy_data>
-{formatted_vacancy}
-</vacancy_data>
-
-## ИНСТРУКЦИЯ ДЛЯ GAP-АНАЛИЗА
+        # Инструкция статична и идет первой (префикс кэшируется OpenAI), данные — в конце
+        return f"""## ИНСТРУКЦИЯ ДЛЯ GAP-АНАЛИЗА
 
 Проведи профессиональный GAP-анализ по следующим этапам:
 
@@ -157,9 +138,18 @@ class LLMGapAnalyzer:
 
 ⚠️ КРИТИЧНО: Используй ТОЧНУЮ терминологию из enum'ов модели! 
 
-Результат верни в формате JSON согласно модели EnhancedResumeTailoringAnalysis."""
+Результат верни в формате JSON согласно модели EnhancedResumeTailoringAnalysis.
+
+<resume_data>
+{formatted_resume}
+</resume_data>
+
+<vacancy_data>
+{formatted_vacancy}
+</vacancy_data>"""
     
-    @traceable(client=ls_client, project_name="llamaindex_test", run_type="retriever")
+    @llm_traceable(run_type="retriever", project="llamaindex_test")
+    @traced("llm_gap_analyzer.gap_analysis")
     async def gap_analysis(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> Optional[EnhancedResumeTailoringAnalysis]:
         """Выполняет расширенный GAP-анализ резюме относительно вакансии с трейсингом."""
         # Проверка разрешения использования OpenAI API
@@ -187,7 +177,9 @@ class LLMGapAnalyzer:
             logger.debug(f"Отправка запроса к OpenAI API с обновленной моделью {self.model}")
             
             # 3. Вызвать OpenAI API (без изменений)
-            completion = self.client.beta.chat.completions.parse(
+            completion = await openai_controller.acall(
+                self.client.beta.chat.completions.parse,
+                feature="llm_gap_analyzer.gap_analysis",
                 temperature=0.2,
                 model=self.model,
                 messages=messages,
@@ -210,7 +202,7 @@ class LLMGapAnalyzer:
             logger.info("Расширенный GAP-анализ успешно выполнен с обновленной моделью")
             
             # ДОБАВИТЬ: Логирование информации о новых полях
-            if ls_client:
+            if llm_trace_exporter.enabled:
                 # Подсчитаем статистику по новым enum'ам для мониторинга
                 requirement_types = [req.requirement_type for req in gap_result.requirements_analysis]
                 skill_categories = [req.skill_category for req in gap_result.requirements_analysis if req.skill_category]
@@ -230,7 +222,7 @@ class LLMGapAnalyzer:
             openai_controller.record_request(success=False, error=f"Ошибка валидации: {ve}")
             
             # УЛУЧШЕННОЕ логирование ошибок валидации
-            if ls_client:
+            if llm_trace_exporter.enabled:
                 # Логируем детали ошибки для отладки новых enum'ов
                 logger.error(f"Трейсинг: ошибка валидации модели - {ve}")
                 logger.error("Возможно модель использует старую терминологию, проверьте enum значения")
@@ -240,6 +232,6 @@ class LLMGapAnalyzer:
             logger.error(f"Ошибка при расширенном GAP-анализе: {e}", exc_info=True)
             openai_controller.record_request(success=False, error=str(e))
             
-            if ls_client:
+            if llm_trace_exporter.enabled:
                 logger.error(f"Трейсинг: общая ошибка - {e}")
             return None
\ No newline at end of file
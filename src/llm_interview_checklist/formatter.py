@@ -4,6 +4,10 @@
 Объединенная версия с базовым и детальным анализом.
 """
 
+from src.utils.token_budget import resume_budget, vacancy_budget
+
+
+@resume_budget("llm_interview_checklist")
 def format_resume_for_interview_prep(resume_data: dict) -> str:
     """
     Форматирует данные резюме для анализа текущих компетенций кандидата.
@@ -256,6 +260,7 @@ def format_resume_for_interview_prep(resume_data: dict) -> str:
     return formatted_text
 
 
+@vacancy_budget("llm_interview_checklist")
 def format_vacancy_for_interview_prep(vacancy_data: dict) -> str:
     """
     Форматирует данные вакансии для понимания требований к кандидату.
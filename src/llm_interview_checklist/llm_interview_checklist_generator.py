@@ -8,17 +8,260 @@ from src.llm_interview_checklist.config import settings
 from src.models.interview_checklist_models import InterviewChecklist, ProfessionalInterviewChecklist
 from src.llm_interview_checklist.formatter import format_resume_for_interview_prep, format_vacancy_for_interview_prep
 from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
-from src.utils import get_logger
+from src.utils import get_logger, traced
 logger = get_logger()
 
+# Статичная часть промпта профессионального чек-листа. Идет перед данными кандидата,
+# чтобы длинный общий префикс попадал в кэш промптов OpenAI
+PROFESSIONAL_CHECKLIST_INSTRUCTIONS = """# РОЛЬ: Ты — ведущий HR-эксперт с 10+ летним опытом подготовки IT-кандидатов к интервью
+
+## ЭКСПЕРТНАЯ КВАЛИФИКАЦИЯ
+- Специализация: составление персонализированных чек-листов подготовки к IT-интервью
+- Опыт: успешная подготовка 1000+ кандидатов разных уровней
+- Методология: следуешь лучшим практикам HR-индустрии и современным трендам
+- Подход: индивидуальная адаптация под каждого кандидата и вакансию
+
+## МЕТОДОЛОГИЯ СОЗДАНИЯ ПРОФЕССИОНАЛЬНОГО ЧЕК-ЛИСТА
+
+### ЭТАП 1: ПЕРСОНАЛИЗАЦИЯ И СООТВЕТСТВИЕ
+Создай чек-лист ИНДИВИДУАЛЬНО под этого кандидата и конкретную позицию:
+
+1. **Анализ GAP'ов**: выдели требуемые навыки vs имеющиеся у кандидата
+2. **Учет уровня**: адаптируй сложность под уровень кандидата из предварительного анализа
+3. **Фокус на пробелах**: приоритизируй areas where candidate needs improvement
+4. **Leveraging strengths**: используй сильные стороны кандидата как преимущества
+
+### ЭТАП 2: АДАПТАЦИЯ ПОД ТИП РОЛИ
+
+**Для типа вакансии из предварительного анализа:**
+- **DEVELOPER**: технический стек, алгоритмы, код-ревью, архитектурные паттерны
+- **QA_ENGINEER**: методологии тестирования, инструменты, критические баги, процессы QA
+- **DATA_SPECIALIST**: статистика, ML-алгоритмы, визуализация данных, бизнес-метрики
+- **BUSINESS_ANALYST**: требования, процессы, домен знания, коммуникация с бизнесом
+- **DESIGNER**: UX-метрики, портфолио, пользовательские исследования, design thinking
+- **DEVOPS**: автоматизация, надежность, мониторинг, infrastructure as code
+- **MANAGER**: лидерство, планирование, команда, процессы управления
+
+### ЭТАП 3: АДАПТАЦИЯ ПОД ФОРМАТ КОМПАНИИ
+
+**Для формата компании из предварительного анализа:**
+- **STARTUP**: гибкость, многозадачность, готовность к изменениям, ownership
+- **MEDIUM_COMPANY**: баланс процессов и гибкости, teamwork
+- **LARGE_CORP**: корпоративная культура, процессы, compliance, масштабируемость  
+- **INTERNATIONAL**: кросс-культурная коммуникация, английский, remote work
+
+## 7 ОБЯЗАТЕЛЬНЫХ БЛОКОВ ПРОФЕССИОНАЛЬНОГО ЧЕК-ЛИСТА
+
+### БЛОК 1: ТЕХНИЧЕСКАЯ ПОДГОТОВКА
+Включи 5 категорий:
+
+**1.1 Профильные знания** (повторение core knowledge)
+- Определи ключевые темы без которых не обойтись на данной позиции
+- Адаптируй под уровень: junior - основы, senior - углубленные вопросы
+- Укажи конкретные источники для повторения
+
+**1.2 Недостающие технологии** (gap filling)
+- Выяви технологии из вакансии, которых мало/нет в резюме
+- Составь план изучения основ (не стать экспертом, а понимать о чем речь)
+
+**1.3 Практические задачи** (hands-on preparation)
+- Подбери типичные задачи для данной роли и уровня
+- Конкретные платформы: LeetCode, HackerRank, Codewars и др.
+- Примеры задач с разбором решений
+
+**1.4 Проекты и код кандидата** (portfolio preparation)
+- Анализ имеющихся проектов в резюме
+- Подготовка к обсуждению: технические решения, архитектура, challenges
+
+**1.5 Дополнительные материалы** (advanced topics)
+- Специфичные для роли: паттерны, методологии, best practices
+- Актуальные тренды в области
+
+### БЛОК 2: ПОВЕДЕНЧЕСКАЯ ПОДГОТОВКА (SOFT SKILLS)
+Включи 4 категории:
+
+**2.1 Типовые вопросы о кандидате**
+- "Расскажите о себе", сильные/слабые стороны, motivation
+- Подготовка STAR-историй для демонстрации качеств
+- Примеры вопросов и структура ответов
+
+**2.2 Тренировка самопрезентации**
+- 2-3 минутный pitch about experience
+- Презентация ключевого проекта
+- Практика: проговорить вслух, записать на видео
+
+**2.3 Поведенческое интервью**
+- Работа в команде, конфликты, leadership, неудачи, стресс
+- STAR method examples для каждой компетенции
+- Адаптация под культуру компании
+
+**2.4 Storytelling и позитивный настрой**
+- Фокус на достижения и вклад
+- Избегание негатива про предыдущих работодателей
+- Демонстрация growth mindset
+
+### БЛОК 3: ИЗУЧЕНИЕ КОМПАНИИ И ПРОДУКТА
+Включи 3 категории:
+
+**3.1 Исследование компании**
+- Сайт, новости, пресс-релизы, ценности, миссия
+- LinkedIn профили команды и интервьюеров
+- История и достижения компании
+
+**3.2 Продукты и отрасль**
+- Изучение флагманского продукта, установка demo
+- Понимание бизнес-модели и target audience
+- Анализ конкурентов и позиционирования
+
+**3.3 Вопросы для работодателя**
+- 3-5 умных вопросов показывающих интерес и экспертизу
+- Избегание вопросов с очевидными ответами с сайта
+- Фокус на будущем развитии и возможностях
+
+### БЛОК 4: ИЗУЧЕНИЕ ТЕХНИЧЕСКОГО СТЕКА И ПРОЦЕССОВ
+Включи 4 категории:
+
+**4.1 Разбор требований вакансии**
+- Детальный анализ JD, выписать все технологии
+- Сопоставление с experience кандидата
+- Приоритизация областей для изучения
+
+**4.2 Технологии компании**
+- Используемый stack (из вакансии, открытых источников)
+- Изучение основ незнакомых технологий
+- Подготовка к вопросам про architectural choices
+
+**4.3 Рабочие процессы и методологии**
+- Code review, CI/CD, testing practices
+- Agile/Scrum/Kanban processes
+- Development lifecycle в компании
+
+**4.4 Терминология и жаргон**
+- Специфичные термины из вакансии
+- Industry-specific vocabulary
+- Понимание acronyms и technical concepts
+
+### БЛОК 5: ПРАКТИЧЕСКИЕ УПРАЖНЕНИЯ И КЕЙСЫ
+Включи 5 категорий:
+
+**5.1 Тренировочные задачи**
+- Конкретные задачи под уровень и специализацию
+- Платформы и ресурсы для практики
+- Daily practice routine до интервью
+
+**5.2 Кейсы из опыта**
+- 2-3 prepared stories демонстрирующих разные skills
+- STAR format для структурирования
+- Practice delivery: четкость, краткость, impact
+
+**5.3 Мок-интервью**
+- Симуляция с коллегой или другом
+- Запись на камеру для self-review
+- Feedback и iteration on answers
+
+**5.4 Тестовые задания**
+- Если известно о home assignment - подготовка environment
+- Review типичных тестовых заданий для роли
+- Time management и presentation подготовка
+
+**5.5 Портфолио и демо-материалы**
+- Ревизия проектов в GitHub/портфолио
+- Подготовка live demo (если применимо)
+- README и documentation update
+
+### БЛОК 6: НАСТРОЙКА ОКРУЖЕНИЯ ДЛЯ ИНТЕРВЬЮ
+Включи 5 категорий:
+
+**6.1 Оборудование и связь**
+- Тестирование камеры, микрофона, интернета
+- Backup план при technical issues
+- Platform setup (Zoom, Teams, etc.)
+
+**6.2 Место проведения**
+- Quiet, professional environment
+- Lighting и background setup
+- Notifications отключение
+
+**6.3 Аккаунты и доступы**
+- Platform registration и testing
+- Contact information для emergency
+- Link testing и preparation
+
+**6.4 Резервные варианты**
+- Backup internet connection (mobile hotspot)
+- Alternative contact methods
+- Plan B при force majeure
+
+**6.5 Внешний вид и окружение**
+- Professional attire appropriate для company culture
+- Clean, organized space in camera view
+- Professional демeanor preparation
+
+### БЛОК 7: ДОПОЛНИТЕЛЬНЫЕ ДЕЙСТВИЯ КАНДИДАТА
+Включи 5 категорий:
+
+**7.1 Рекомендации**
+- Подготовка списка references
+- Получение согласия на рекомендации
+- Briefing рекомендателей о позиции
+
+**7.2 Профили и онлайн-присутствие**
+- LinkedIn, GitHub, portfolio consistency check
+- Removal/hiding неподходящего content
+- Professional online image curation
+
+**7.3 Документы и сертификаты**
+- Copies сертификатов и дипломов
+- Updated resume final version
+- Portfolio/work samples preparation
+
+**7.4 Резюме и сопроводительное письмо**
+- Final resume review и customization
+- Cover letter адаптация (если требуется)
+- Consistency across materials
+
+**7.5 Настрой и отдых**
+- Mental preparation и confidence building
+- Rest и proper nutrition before interview
+- Stress management techniques
+
+## КРИТЕРИИ КАЧЕСТВЕННОГО ЧЕК-ЛИСТА
+
+✅ **Персонализация**: каждый пункт adapted под кандидата и вакансию
+✅ **Конкретность**: четкие действия, ресурсы, временные рамки
+✅ **Приоритизация**: критично/важно/желательно
+✅ **Реалистичность**: выполнимо в имеющееся время
+✅ **Полнота**: покрывает все аспекты подготовки
+✅ **Actionable**: clear next steps для кандидата
+
+## ИНСТРУКЦИИ ПО РЕЗУЛЬТАТУ
+
+1. **Анализируй контекст**: учитывай специфику кандидата, вакансии, компании
+2. **Персонализируй полностью**: никаких generic советов
+3. **Детализируй конкретно**: что, где, как, сколько времени
+4. **Приоритизируй разумно**: от critical к nice-to-have
+5. **Структурируй четко**: соблюдай все 7 блоков
+6. **Мотивируй кандидата**: positive tone, confidence building
+
+Создай professional interview checklist в формате JSON согласно модели ProfessionalInterviewChecklist.
+Пиши на русском языке. Будь максимально конкретным и практичным.
+"""
+
+
 class LLMInterviewChecklistGenerator:
     """Сервис для создания персонализированного чек-листа подготовки к интервью с помощью OpenAI API"""
     
-    def __init__(self):
-        """Инициализация клиента OpenAI."""
+    def __init__(self, client: Optional[OpenAI] = None):
+        """
+        Инициализация клиента OpenAI.
+
+        Args:
+            client: Общий клиент OpenAI (контейнер сервисов); None — создается свой
+        """
         self.config = settings
-        self.client = OpenAI(api_key=self.config.api_key)
+        self.client = client or OpenAI(api_key=self.config.api_key, max_retries=0, http_client=get_openai_http_client())
         self.model = self.config.model_name
     
     def _analyze_candidate_profile(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> Dict[str, str]:
@@ -72,262 +315,31 @@ class LLMInterviewChecklistGenerator:
     def _create_professional_interview_checklist_prompt(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> str:
         """
         Создает профессиональный промпт на основе методологии HR-экспертов.
+        
+        Методология (статичный префикс) идет первой, данные кандидата и вакансии — в конце.
         """
         formatted_resume = format_resume_for_interview_prep(parsed_resume)
         formatted_vacancy = format_vacancy_for_interview_prep(parsed_vacancy)
         profile_context = self._analyze_candidate_profile(parsed_resume, parsed_vacancy)
         
-        return f"""
-        # РОЛЬ: Ты — ведущий HR-эксперт с 10+ летним опытом подготовки IT-кандидатов к интервью
-
-        ## ЭКСПЕРТНАЯ КВАЛИФИКАЦИЯ
-        - Специализация: составление персонализированных чек-листов подготовки к IT-интервью
-        - Опыт: успешная подготовка 1000+ кандидатов разных уровней
-        - Методология: следуешь лучшим практикам HR-индустрии и современным трендам
-        - Подход: индивидуальная адаптация под каждого кандидата и вакансию
-
-        ## ИСХОДНЫЕ ДАННЫЕ ДЛЯ АНАЛИЗА
-
-        ### ПРОФИЛЬ КАНДИДАТА:
-        <resume_start>
-        {formatted_resume}
-        </resume_end>
-
-        ### ЦЕЛЕВАЯ ВАКАНСИЯ:
-        <vacancy_start>
-        {formatted_vacancy}
-        </vacancy_end>
-
-        ### ПРЕДВАРИТЕЛЬНЫЙ АНАЛИЗ:
-        - Определенный уровень кандидата: {profile_context['candidate_level']}
-        - Тип вакансии: {profile_context['vacancy_type']}
-        - Формат компании: {profile_context['company_format']}
-
-        ## МЕТОДОЛОГИЯ СОЗДАНИЯ ПРОФЕССИОНАЛЬНОГО ЧЕК-ЛИСТА
-
-        ### ЭТАП 1: ПЕРСОНАЛИЗАЦИЯ И СООТВЕТСТВИЕ
-        Создай чек-лист ИНДИВИДУАЛЬНО под этого кандидата и конкретную позицию:
-
-        1. **Анализ GAP'ов**: выдели требуемые навыки vs имеющиеся у кандидата
-        2. **Учет уровня**: адаптируй сложность под {profile_context['candidate_level']} уровень
-        3. **Фокус на пробелах**: приоритизируй areas where candidate needs improvement
-        4. **Leveraging strengths**: используй сильные стороны кандидата как преимущества
-
-        ### ЭТАП 2: АДАПТАЦИЯ ПОД ТИП РОЛИ
-
-        **Для {profile_context['vacancy_type']}:**
-        - **DEVELOPER**: технический стек, алгоритмы, код-ревью, архитектурные паттерны
-        - **QA_ENGINEER**: методологии тестирования, инструменты, критические баги, процессы QA
-        - **DATA_SPECIALIST**: статистика, ML-алгоритмы, визуализация данных, бизнес-метрики
-        - **BUSINESS_ANALYST**: требования, процессы, домен знания, коммуникация с бизнесом
-        - **DESIGNER**: UX-метрики, портфолио, пользовательские исследования, design thinking
-        - **DEVOPS**: автоматизация, надежность, мониторинг, infrastructure as code
-        - **MANAGER**: лидерство, планирование, команда, процессы управления
-
-        ### ЭТАП 3: АДАПТАЦИЯ ПОД ФОРМАТ КОМПАНИИ
-
-        **Для {profile_context['company_format']}:**
-        - **STARTUP**: гибкость, многозадачность, готовность к изменениям, ownership
-        - **MEDIUM_COMPANY**: баланс процессов и гибкости, teamwork
-        - **LARGE_CORP**: корпоративная культура, процессы, compliance, масштабируемость  
-        - **INTERNATIONAL**: кросс-культурная коммуникация, английский, remote work
-
-        ## 7 ОБЯЗАТЕЛЬНЫХ БЛОКОВ ПРОФЕССИОНАЛЬНОГО ЧЕК-ЛИСТА
-
-        ### БЛОК 1: ТЕХНИЧЕСКАЯ ПОДГОТОВКА
-        Включи 5 категорий:
-
-        **1.1 Профильные знания** (повторение core knowledge)
-        - Определи ключевые темы без которых не обойтись на данной позиции
-        - Адаптируй под уровень: junior - основы, senior - углубленные вопросы
-        - Укажи конкретные источники для повторения
-
-        **1.2 Недостающие технологии** (gap filling)
-        - Выяви технологии из вакансии, которых мало/нет в резюме
-        - Составь план изучения основ (не стать экспертом, а понимать о чем речь)
-
-        **1.3 Практические задачи** (hands-on preparation)
-        - Подбери типичные задачи для данной роли и уровня
-        - Конкретные платформы: LeetCode, HackerRank, Codewars и др.
-        - Примеры задач с разбором решений
-
-        **1.4 Проекты и код кандидата** (portfolio preparation)
-        - Анализ имеющихся проектов в резюме
-        - Подготовка к обсуждению: технические решения, архитектура, challenges
-
-        **1.5 Дополнительные материалы** (advanced topics)
-        - Специфичные для роли: паттерны, методологии, best practices
-        - Актуальные тренды в области
-
-        ### БЛОК 2: ПОВЕДЕНЧЕСКАЯ ПОДГОТОВКА (SOFT SKILLS)
-        Включи 4 категории:
-
-        **2.1 Типовые вопросы о кандидате**
-        - "Расскажите о себе", сильные/слабые стороны, motivation
-        - Подготовка STAR-историй для демонстрации качеств
-        - Примеры вопросов и структура ответов
-
-        **2.2 Тренировка самопрезентации**
-        - 2-3 минутный pitch about experience
-        - Презентация ключевого проекта
-        - Практика: проговорить вслух, записать на видео
-
-        **2.3 Поведенческое интервью**
-        - Работа в команде, конфликты, leadership, неудачи, стресс
-        - STAR method examples для каждой компетенции
-        - Адаптация под культуру компании
-
-        **2.4 Storytelling и позитивный настрой**
-        - Фокус на достижения и вклад
-        - Избегание негатива про предыдущих работодателей
-        - Демонстрация growth mindset
-
-        ### БЛОК 3: ИЗУЧЕНИЕ КОМПАНИИ И ПРОДУКТА
-        Включи 3 категории:
-
-        **3.1 Исследование компании**
-        - Сайт, новости, пресс-релизы, ценности, миссия
-        - LinkedIn профили команды и интервьюеров
-        - История и достижения компании
-
-        **3.2 Продукты и отрасль**
-        - Изучение флагманского продукта, установка demo
-        - Понимание бизнес-модели и target audience
-        - Анализ конкурентов и позиционирования
-
-        **3.3 Вопросы для работодателя**
-        - 3-5 умных вопросов показывающих интерес и экспертизу
-        - Избегание вопросов с очевидными ответами с сайта
-        - Фокус на будущем развитии и возможностях
-
-        ### БЛОК 4: ИЗУЧЕНИЕ ТЕХНИЧЕСКОГО СТЕКА И ПРОЦЕССОВ
-        Включи 4 категории:
-
-        **4.1 Разбор требований вакансии**
-        - Детальный анализ JD, выписать все технологии
-        - Сопоставление с experience кандидата
-        - Приоритизация областей для изучения
-
-        **4.2 Технологии компании**
-        - Используемый stack (из вакансии, открытых источников)
-        - Изучение основ незнакомых технологий
-        - Подготовка к вопросам про architectural choices
-
-        **4.3 Рабочие процессы и методологии**
-        - Code review, CI/CD, testing practices
-        - Agile/Scrum/Kanban processes
-        - Development lifecycle в компании
-
-        **4.4 Терминология и жаргон**
-        - Специфичные термины из вакансии
-        - Industry-specific vocabulary
-        - Понимание acronyms и technical concepts
-
-        ### БЛОК 5: ПРАКТИЧЕСКИЕ УПРАЖНЕНИЯ И КЕЙСЫ
-        Включи 5 категорий:
-
-        **5.1 Тренировочные задачи**
-        - Конкретные задачи под уровень и специализацию
-        - Платформы и ресурсы для практики
-        - Daily practice routine до интервью
-
-        **5.2 Кейсы из опыта**
-        - 2-3 prepared stories демонстрирующих разные skills
-        - STAR format для структурирования
-        - Practice delivery: четкость, краткость, impact
-
-        **5.3 Мок-интервью**
-        - Симуляция с коллегой или другом
-        - Запись на камеру для self-review
-        - Feedback и iteration on answers
-
-        **5.4 Тестовые задания**
-        - Если известно о home assignment - подготовка environment
-        - Review типичных тестовых заданий для роли
-        - Time management и presentation подготовка
-
-        **5.5 Портфолио и демо-материалы**
-        - Ревизия проектов в GitHub/портфолио
-        - Подготовка live demo (если применимо)
-        - README и documentation update
-
-        ### БЛОК 6: НАСТРОЙКА ОКРУЖЕНИЯ ДЛЯ ИНТЕРВЬЮ
-        Включи 5 категорий:
-
-        **6.1 Оборудование и связь**
-        - Тестирование камеры, микрофона, интернета
-        - Backup план при technical issues
-        - Platform setup (Zoom, Teams, etc.)
-
-        **6.2 Место проведения**
-        - Quiet, professional environment
-        - Lighting и background setup
-        - Notifications отключение
-
-        **6.3 Аккаунты и доступы**
-        - Platform registration и testing
-        - Contact information для emergency
-        - Link testing и preparation
-
-        **6.4 Резервные варианты**
-        - Backup internet connection (mobile hotspot)
-        - Alternative contact methods
-        - Plan B при force majeure
-
-        **6.5 Внешний вид и окружение**
-        - Professional attire appropriate для company culture
-        - Clean, organized space in camera view
-        - Professional демeanor preparation
-
-        ### БЛОК 7: ДОПОЛНИТЕЛЬНЫЕ ДЕЙСТВИЯ КАНДИДАТА
-        Включи 5 категорий:
-
-        **7.1 Рекомендации**
-        - Подготовка списка references
-        - Получение согласия на рекомендации
-        - Briefing рекомендателей о позиции
-
-        **7.2 Профили и онлайн-присутствие**
-        - LinkedIn, GitHub, portfolio consistency check
-        - Removal/hiding неподходящего content
-        - Professional online image curation
-
-        **7.3 Документы и сертификаты**
-        - Copies сертификатов и дипломов
-        - Updated resume final version
-        - Portfolio/work samples preparation
-
-        **7.4 Резюме и сопроводительное письмо**
-        - Final resume review и customization
-        - Cover letter адаптация (если требуется)
-        - Consistency across materials
-
-        **7.5 Настрой и отдых**
-        - Mental preparation и confidence building
-        - Rest и proper nutrition before interview
-        - Stress management techniques
-
-        ## КРИТЕРИИ КАЧЕСТВЕННОГО ЧЕК-ЛИСТА
-
-        ✅ **Персонализация**: каждый пункт adapted под кандидата и вакансию
-        ✅ **Конкретность**: четкие действия, ресурсы, временные рамки
-        ✅ **Приоритизация**: критично/важно/желательно
-        ✅ **Реалистичность**: выполнимо в имеющееся время
-        ✅ **Полнота**: покрывает все аспекты подготовки
-        ✅ **Actionable**: clear next steps для кандидата
-
-        ## ИНСТРУКЦИИ ПО РЕЗУЛЬТАТУ
-
-        1. **Анализируй контекст**: учитывай специфику кандидата, вакансии, компании
-        2. **Персонализируй полностью**: никаких generic советов
-        3. **Детализируй конкретно**: что, где, как, сколько времени
-        4. **Приоритизируй разумно**: от critical к nice-to-have
-        5. **Структурируй четко**: соблюдай все 7 блоков
-        6. **Мотивируй кандидата**: positive tone, confidence building
-
-        Создай professional interview checklist в формате JSON согласно модели ProfessionalInterviewChecklist.
-        Пиши на русском языке. Будь максимально конкретным и практичным.
-        """
+        return PROFESSIONAL_CHECKLIST_INSTRUCTIONS + f"""
+## ИСХОДНЫЕ ДАННЫЕ ДЛЯ АНАЛИЗА
+
+### ПРОФИЛЬ КАНДИДАТА:
+<resume_start>
+{formatted_resume}
+</resume_end>
+
+### ЦЕЛЕВАЯ ВАКАНСИЯ:
+<vacancy_start>
+{formatted_vacancy}
+</vacancy_end>
+
+### ПРЕДВАРИТЕЛЬНЫЙ АНАЛИЗ:
+- Определенный уровень кандидата: {profile_context['candidate_level']}
+- Тип вакансии: {profile_context['vacancy_type']}
+- Формат компании: {profile_context['company_format']}
+"""
     
     def _create_interview_checklist_prompt(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> str:
         """
@@ -341,15 +353,6 @@ class LLMInterviewChecklistGenerator:
         
         Твоя задача - создать исчерпывающий, детальный чек-лист подготовки к интервью для IT-специалиста на основе анализа его текущих компетенций и требований целевой вакансии.
         
-        ## Исходные данные
-        <Данные резюме>
-        {formatted_resume}
-        </Данные резюме>
-        ============
-        <Данные вакансии>
-        {formatted_vacancy}
-        </Данные вакансии>
-        
         ## Требования к чек-листу
         
         1. **Персонализация**: Учитывай текущий уровень кандидата и конкретные требования вакансии
@@ -408,8 +411,18 @@ class LLMInterviewChecklistGenerator:
         - Указывай реалистичные временные рамки
         - Включай как бесплатные, так и платные ресурсы
         - Адаптируй сложность под уровень кандидата
+        
+        ## Исходные данные
+        <Данные резюме>
+        {formatted_resume}
+        </Данные резюме>
+        ============
+        <Данные вакансии>
+        {formatted_vacancy}
+        </Данные вакансии>
         """
     
+    @traced("llm_interview_checklist.generate_professional_interview_checklist")
     async def generate_professional_interview_checklist(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> Optional[ProfessionalInterviewChecklist]:
         """
         Генерирует профессиональный чек-лист подготовки к интервью на основе HR-экспертизы.
@@ -448,7 +461,9 @@ class LLMInterviewChecklistGenerator:
             ]
             
             # 3. Вызов OpenAI API
-            completion = self.client.beta.chat.completions.parse(
+            completion = await openai_controller.acall(
+                self.client.beta.chat.completions.parse,
+                feature="llm_interview_checklist.generate_professional_interview_checklist",
                 model=self.model,
                 messages=messages,
                 response_format=ProfessionalInterviewChecklist,
@@ -480,6 +495,7 @@ class LLMInterviewChecklistGenerator:
             openai_controller.record_request(success=False, error=str(e))
             return None
     
+    @traced("llm_interview_checklist.generate_interview_checklist")
     async def generate_interview_checklist(self, parsed_resume: Dict[str, Any], parsed_vacancy: Dict[str, Any]) -> Optional[InterviewChecklist]:
         """
         Генерирует персонализированный чек-лист подготовки к интервью (старая версия для совместимости).
@@ -511,7 +527,9 @@ class LLMInterviewChecklistGenerator:
             ]
             
             # 3. Вызов OpenAI API
-            completion = self.client.beta.chat.completions.parse(
+            completion = await openai_controller.acall(
+                self.client.beta.chat.completions.parse,
+                feature="llm_interview_checklist.generate_interview_checklist",
                 model=self.model,
                 messages=messages,
                 response_format=InterviewChecklist
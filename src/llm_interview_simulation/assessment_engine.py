@@ -11,16 +11,27 @@ from src.models.interview_simulation_models import (
     CandidateProfile, CandidateLevel, ITRole, QuestionType
 )
 from src.llm_interview_simulation.config import settings
-from src.utils import get_logger
+from src.utils import get_logger, traced
+from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
 logger = get_logger()
 
 class ProfessionalAssessmentEngine:
     """Система профессиональной оценки результатов интервью."""
     
-    def __init__(self):
+    def __init__(self, client: Optional[OpenAI] = None, model: Optional[str] = None):
+        """
+        Args:
+            client: Общий клиент OpenAI (симулятор, контейнер сервисов); None — создается свой
+            model: Модель оценки; None — из настроек
+        """
+        if client is not None:
+            self.client = client
+            self.model = model or settings.model_name
+            return
         try:
-            self.client = OpenAI(api_key=settings.api_key)
+            self.client = OpenAI(api_key=settings.api_key, max_retries=0, http_client=get_openai_http_client())
             self.model = settings.model_name
         except Exception:
             # Fallback если настройки не найдены
@@ -28,7 +39,7 @@ class ProfessionalAssessmentEngine:
             api_key = os.getenv('OPENAI_API_KEY')
             if not api_key:
                 raise ValueError("OpenAI API key не найден. Установите переменную окружения OPENAI_API_KEY или настройте settings.py")
-            self.client = OpenAI(api_key=api_key)
+            self.client = OpenAI(api_key=api_key, max_retries=0, http_client=get_openai_http_client())
             self.model = os.getenv('OPENAI_MODEL')
     
     async def generate_comprehensive_assessment(self, 
@@ -115,6 +126,7 @@ class ProfessionalAssessmentEngine:
         
         return list(set(competencies))  # Убираем дубликаты
     
+    @traced("llm_interview_simulation.assess_competency")
     async def _assess_single_competency(self, 
                                       competency: CompetencyArea,
                                       dialog_messages: List[DialogMessage],
@@ -132,7 +144,7 @@ class ProfessionalAssessmentEngine:
         
         try:
             # Получаем оценку от LLM
-            response = self._get_llm_assessment(assessment_prompt)
+            response = await self._get_llm_assessment(assessment_prompt)
             
             # Парсим ответ LLM
             score, evidence, improvement_notes = self._parse_competency_response(response)
@@ -244,23 +256,9 @@ class ProfessionalAssessmentEngine:
         vacancy_name = vacancy_data.get('name', 'IT позиция')
         company_name = vacancy_data.get('employer', {}).get('name', 'Компания')
         
+        # Инструкции и формат ответа одинаковы для всех компетенций и идут первыми
         prompt = f"""
-# Задача: Оценка компетенции "{competency.value}"
-
-## Описание компетенции:
-{comp_info['description']}
-
-## Критерии оценки:
-{comp_info['criteria']}
-
-## Контекст кандидата:
-- Уровень: {candidate_profile.detected_level.value}
-- Роль: {candidate_profile.detected_role.value}
-- Опыт: {candidate_profile.years_of_experience or 'не указан'} лет
-- Целевая позиция: {vacancy_name} в {company_name}
-
-## Ответы кандидата для анализа:
-{answers_text}
+# Задача: Оценка компетенции кандидата по ответам в интервью
 
 ## Инструкции по оценке:
 
@@ -280,11 +278,28 @@ class ProfessionalAssessmentEngine:
 SCORE: [число от 1 до 5]
 EVIDENCE: [конкретные примеры и цитаты из ответов]
 IMPROVEMENT: [конкретные рекомендации по улучшению]
+
+## Компетенция: "{competency.value}"
+
+## Описание компетенции:
+{comp_info['description']}
+
+## Критерии оценки:
+{comp_info['criteria']}
+
+## Контекст кандидата:
+- Уровень: {candidate_profile.detected_level.value}
+- Роль: {candidate_profile.detected_role.value}
+- Опыт: {candidate_profile.years_of_experience or 'не указан'} лет
+- Целевая позиция: {vacancy_name} в {company_name}
+
+## Ответы кандидата для анализа:
+{answers_text}
 """
         
         return prompt
     
-    def _get_llm_assessment(self, prompt: str) -> str:
+    async def _get_llm_assessment(self, prompt: str) -> str:
         """Получает оценку от LLM."""
         
         messages = [
@@ -298,7 +313,9 @@ IMPROVEMENT: [конкретные рекомендации по улучшен
             }
         ]
         
-        completion = self.client.chat.completions.create(
+        completion = await openai_controller.acall(
+            self.client.chat.completions.create,
+            feature="llm_interview_simulation._get_llm_assessment",
             model=self.model,
             messages=messages,
             temperature=0.3,  # Низкая температура для консистентности
@@ -385,12 +402,7 @@ IMPROVEMENT: [конкретные рекомендации по улучшен
         
         # Создаем промпт для анализа
         analysis_prompt = f"""
-Проанализируй ответы кандидата уровня {candidate_profile.detected_level.value} {candidate_profile.detected_role.value} и определи:
-
-## Ответы кандидата:
-{chr(10).join([f"{i+1}. {answer}" for i, answer in enumerate(candidate_answers)])}
-
-Определи:
+Проанализируй ответы кандидата и определи:
 1. **Сильные стороны** (3-4 конкретных пункта)
 2. **Слабые стороны** (2-3 конкретных пункта)
 
@@ -404,10 +416,15 @@ IMPROVEMENT: [конкретные рекомендации по улучшен
 Формат ответа:
 STRENGTHS: [список сильных сторон через точку с запятой]
 WEAKNESSES: [список слабых сторон через точку с запятой]
+
+## Кандидат: {candidate_profile.detected_level.value} {candidate_profile.detected_role.value}
+
+## Ответы кандидата:
+{chr(10).join([f"{i+1}. {answer}" for i, answer in enumerate(candidate_answers)])}
 """
         
         try:
-            response = self._get_llm_assessment(analysis_prompt)
+            response = await self._get_llm_assessment(analysis_prompt)
             
             # Парсим ответ
             strengths_match = re.search(r'STRENGTHS:\s*(.+?)(?=WEAKNESSES:|$)', response, re.IGNORECASE | re.DOTALL)
@@ -490,12 +507,7 @@ WEAKNESSES: [список слабых сторон через точку с з
             company_name = vacancy_data.get('employer', {}).get('name', 'компании')
             
             cultural_prompt = f"""
-Оцени культурное соответствие кандидата для работы в {company_name} на основе его ответов:
-
-## Ответы кандидата:
-{chr(10).join([f"Раунд {msg.round_number}: {msg.message}" for msg in relevant_messages])}
-
-Оцени по шкале 1-5:
+Оцени культурное соответствие кандидата компании на основе его ответов по шкале 1-5:
 - 5: Отличное соответствие, разделяет ценности и подход
 - 4: Хорошее соответствие, легко впишется в команду
 - 3: Нейтрально, адаптируется со временем
@@ -509,9 +521,14 @@ WEAKNESSES: [список слабых сторон через точку с з
 - Ценности и принципы
 
 Ответь только числом от 1 до 5.
+
+## Компания: {company_name}
+
+## Ответы кандидата:
+{chr(10).join([f"Раунд {msg.round_number}: {msg.message}" for msg in relevant_messages])}
 """
             
-            response = self._get_llm_assessment(cultural_prompt)
+            response = await self._get_llm_assessment(cultural_prompt)
             score = int(re.search(r'\d+', response).group()) if re.search(r'\d+', response) else 3
             return max(1, min(5, score))
             
@@ -519,6 +536,7 @@ WEAKNESSES: [список слабых сторон через точку с з
             logger.error(f"Ошибка оценки культурного соответствия: {e}")
             return 3
 
+    @traced("llm_interview_simulation.detailed_feedback")
     async def generate_detailed_feedback(self, 
                                        assessment: InterviewAssessment,
                                        candidate_profile: CandidateProfile) -> Dict[str, str]:
@@ -526,16 +544,7 @@ WEAKNESSES: [список слабых сторон через точку с з
         
         try:
             feedback_prompt = f"""
-Создай детальную обратную связь для кандидата уровня {candidate_profile.detected_level.value} {candidate_profile.detected_role.value} на основе результатов интервью:
-
-## Результаты оценки:
-- Общая рекомендация: {assessment.overall_recommendation}
-- Оценки по компетенциям: {[f"{cs.area.value}: {cs.score}/5" for cs in assessment.competency_scores]}
-- Сильные стороны: {', '.join(assessment.strengths)}
-- Слабые стороны: {', '.join(assessment.weaknesses)}
-- Культурное соответствие: {assessment.cultural_fit_score}/5
-
-Создай:
+Создай детальную обратную связь для кандидата на основе результатов интервью:
 1. **HR Assessment** - краткая профессиональная оценка (2-3 предложения)
 2. **Performance Analysis** - детальный анализ выступления (4-5 предложений)  
 3. **Improvement Recommendations** - конкретные рекомендации по улучшению (4-5 пунктов)
@@ -544,9 +553,18 @@ WEAKNESSES: [список слабых сторон через точку с з
 HR_ASSESSMENT: [краткая оценка]
 PERFORMANCE_ANALYSIS: [детальный анализ]
 IMPROVEMENT_RECOMMENDATIONS: [конкретные рекомендации]
+
+## Кандидат: {candidate_profile.detected_level.value} {candidate_profile.detected_role.value}
+
+## Результаты оценки:
+- Общая рекомендация: {assessment.overall_recommendation}
+- Оценки по компетенциям: {[f"{cs.area.value}: {cs.score}/5" for cs in assessment.competency_scores]}
+- Сильные стороны: {', '.join(assessment.strengths)}
+- Слабые стороны: {', '.join(assessment.weaknesses)}
+- Культурное соответствие: {assessment.cultural_fit_score}/5
 """
             
-            response = self._get_llm_assessment(feedback_prompt)
+            response = await self._get_llm_assessment(feedback_prompt)
             
             # Парсим ответ
             hr_assessment = self._extract_section(response, "HR_ASSESSMENT")
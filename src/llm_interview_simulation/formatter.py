@@ -4,11 +4,15 @@
 """
 import re
 from typing import Dict, List, Any, Optional, Tuple
+from src.utils import get_logger
+from src.utils.token_budget import resume_budget, vacancy_budget
 from src.models.interview_simulation_models import (
     CandidateLevel, ITRole, CandidateProfile, InterviewConfiguration, 
     QuestionType, CompetencyArea
 )
 
+logger = get_logger()
+
 class SmartCandidateAnalyzer:
     """Анализатор профиля кандидата на основе резюме."""
     
@@ -119,7 +123,7 @@ class SmartCandidateAnalyzer:
             base_level_by_experience = CandidateLevel.LEAD
             
         result = base_level_by_experience
-        print(f"DEBUG: base_level_by_experience = {result}")
+        logger.debug(f"Уровень кандидата по опыту: {result}")
         return result
     
     def _determine_it_role(self, resume_data: Dict[str, Any]) -> ITRole:
@@ -344,6 +348,7 @@ class InterviewConfigurationBuilder:
             return "hard"
 
 
+@resume_budget("llm_interview_simulation")
 def format_resume_for_interview_simulation(resume_data: Dict[str, Any]) -> str:
     """
     Форматирует данные резюме для симуляции интервью с интеллектуальным анализом.
@@ -442,6 +447,7 @@ def format_resume_for_interview_simulation(resume_data: Dict[str, Any]) -> str:
     return formatted_text
 
 
+@vacancy_budget("llm_interview_simulation")
 def format_vacancy_for_interview_simulation(vacancy_data: Dict[str, Any]) -> str:
     """
     Форматирует данные вакансии для симуляции интервью.
@@ -17,19 +17,26 @@ from src.llm_interview_simulation.formatter import (
     create_candidate_profile_and_config
 )
 from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
-from src.utils import get_logger
+from src.utils import get_logger, traced
 logger = get_logger()
 
 class ProfessionalInterviewSimulator:
     """Профессиональный симулятор интервью с адаптивными промптами и STAR-методикой"""
     
-    def __init__(self):
-        """Инициализация симулятора."""
+    def __init__(self, client: Optional[OpenAI] = None):
+        """
+        Инициализация симулятора.
+
+        Args:
+            client: Общий клиент OpenAI (контейнер сервисов); None — создается свой
+        """
         self.config = settings
-        self.client = OpenAI(api_key=self.config.api_key)
+        self.client = client or OpenAI(api_key=self.config.api_key, max_retries=0, http_client=get_openai_http_client())
         self.model = self.config.model_name
         self.custom_config = None  # Для хранения пользовательских настроек
+        self._assessment_engine = None
         
         # Карта типов вопросов по раундам
         self.round_question_mapping = {
@@ -42,6 +49,15 @@ class ProfessionalInterviewSimulator:
             7: [QuestionType.FINAL]        # Расширенное интервью
         }
     
+    @property
+    def assessment_engine(self):
+        """Движок оценки, общий для всех симуляций (работает через клиент симулятора)."""
+        if self._assessment_engine is None:
+            # Импорт здесь: assessment_engine импортирует пакет, который импортирует этот модуль
+            from src.llm_interview_simulation.assessment_engine import ProfessionalAssessmentEngine
+            self._assessment_engine = ProfessionalAssessmentEngine(client=self.client, model=self.model)
+        return self._assessment_engine
+    
     def set_custom_config(self, config: Dict[str, Any]):
         """Устанавливает пользовательские настройки симуляции."""
         self.custom_config = config
@@ -94,10 +110,33 @@ class ProfessionalInterviewSimulator:
         # Технические детали для IT-роли
         role_specific_guidance = self._get_role_specific_guidance(candidate_profile.detected_role)
         
+        # Порядок блоков: общие правила (одинаковы для всех интервью) → контекст этого интервью
+        # (неизменен между раундами) → растущая история диалога → инструкции текущего раунда.
+        # Так каждый следующий раунд переиспользует кэшированный OpenAI префикс предыдущего.
         prompt = f"""
-# Роль: {hr_persona}
+# Роль: опытный HR-менеджер IT-компании с 10+ лет опыта
+
+## Профессиональные принципы интервьюирования:
+
+1. **Структурированный подход**: Используй методику STAR для поведенческих вопросов
+2. **Глубина vs. Деликатность**: Докапывайся до сути, но дружелюбно
+3. **Конкретика**: Требуй примеры и детали, не принимай общие ответы
+4. **Баланс**: Оценивай как hard skills, так и soft skills
+5. **Уважение**: Поддерживай профессиональный, но теплый тон
+
+## Требования к вопросу:
+- ОДИН конкретный вопрос (2-3 предложения максимум)
+- Соответствует уровню кандидата и типу раунда
+- Позволяет глубоко оценить компетенцию
+- Профессиональный, но дружелюбный тон
+- На русском языке
+- Ответь только текстом вопроса
+
+## Твой стиль в этом интервью: {hr_persona}
 
-Ты — опытный HR-менеджер IT-компании с 10+ лет опыта. {level_adaptation}
+{level_adaptation}
+
+{role_specific_guidance}
 
 ## Контекст интервью:
 
@@ -116,26 +155,7 @@ class ProfessionalInterviewSimulator:
 
 {question_instructions}
 
-{role_specific_guidance}
-
-## Профессиональные принципы интервьюирования:
-
-1. **Структурированный подход**: Используй методику STAR для поведенческих вопросов
-2. **Глубина vs. Деликатность**: Докапывайся до сути, но дружелюбно
-3. **Конкретика**: Требуй примеры и детали, не принимай общие ответы
-4. **Баланс**: Оценивай как hard skills, так и soft skills
-5. **Уважение**: Поддерживай профессиональный, но теплый тон
-
-## Требования к вопросу:
-- ОДИН конкретный вопрос (2-3 предложения максимум)
-- Соответствует уровню кандидата и типу раунда
-- Позволяет глубоко оценить компетенцию
-- Профессиональный, но дружелюбный тон
-- На русском языке
-
 {"Начни интервью с приветствия и первого вопроса." if round_number == 1 else "Задай следующий вопрос, основываясь на предыдущих ответах."}
-
-Ответь только текстом вопроса.
 """
         
         return prompt, question_type
@@ -315,12 +335,35 @@ class ProfessionalInterviewSimulator:
         # Определяем стиль ответа в зависимости от уровня
         response_style = self._get_candidate_response_style(candidate_profile.detected_level)
         
+        # Общие правила ответа идут первыми, затем неизменный контекст кандидата,
+        # растущая история диалога и в конце текущий вопрос (префикс кэшируется OpenAI)
         prompt = f"""
+## Принципы ответа:
+
+1. **Основывайся на резюме**: Используй только информацию из своего профиля
+2. **STAR для поведенческих вопросов**: Структурируй ответы как Ситуация → Задача → Действие → Результат  
+3. **Конкретика**: Приводи числа, технологии, реальные примеры
+4. **Честность**: Если не знаешь чего-то — признайся, но покажи готовность изучать
+5. **Связь с вакансией**: Подчеркивай соответствие требованиям позиции
+6. **Профессионализм**: Говори уверенно, но без высокомерия
+
+## Требования к ответу:
+- Отвечай только на заданный вопрос
+- 3-5 предложений (2-3 для технических деталей)
+- Профессиональная лексика соответствующего уровня
+- На русском языке
+- Не задавай встречных вопросов в этом ответе
+- Ответь только текстом ответа
+
 # Роль: {candidate_profile.detected_level.value.title()} {candidate_profile.detected_role.value.replace('_', ' ').title()}
 
 Ты — IT-специалист уровня {candidate_profile.detected_level.value}, который проходит интервью на позицию, 
 описанную в вакансии. Ты хорошо подготовился и очень заинтересован в получении этой работы.
 
+## Твой стиль ответа:
+
+{response_style}
+
 ## Твоя информация (резюме):
 
 {formatted_resume}
@@ -336,28 +379,6 @@ class ProfessionalInterviewSimulator:
 ## Текущий вопрос от HR-менеджера:
 
 "{hr_question}"
-
-## Твой стиль ответа:
-
-{response_style}
-
-## Принципы ответа:
-
-1. **Основывайся на резюме**: Используй только информацию из своего профиля
-2. **STAR для поведенческих вопросов**: Структурируй ответы как Ситуация → Задача → Действие → Результат  
-3. **Конкретика**: Приводи числа, технологии, реальные примеры
-4. **Честность**: Если не знаешь чего-то — признайся, но покажи готовность изучать
-5. **Связь с вакансией**: Подчеркивай соответствие требованиям позиции
-6. **Профессионализм**: Говори уверенно, но без высокомерия
-
-## Требования к ответу:
-- Отвечай только на заданный вопрос
-- 3-5 предложений (2-3 для технических деталей)
-- Профессиональная лексика соответствующего уровня
-- На русском языке
-- Не задавай встречных вопросов в этом ответе
-
-Ответь только текстом ответа.
 """
         
         return prompt
@@ -422,7 +443,9 @@ class ProfessionalInterviewSimulator:
                 }
             ]
             
-            completion = self.client.chat.completions.create(
+            completion = await openai_controller.acall(
+                self.client.chat.completions.create,
+                feature="llm_interview_simulation._get_hr_question",
                 model=self.model,
                 messages=messages,
                 temperature=0.7,
@@ -455,7 +478,7 @@ class ProfessionalInterviewSimulator:
             messages = [
                 {
                     "role": "system", 
-                    "content": f"Ты — {candidate_profile.detected_level.value} {candidate_profile.detected_role.value} на собеседовании. Отвечай профессионально, основываясь на своем резюме."
+                    "content": "Ты — IT-специалист на собеседовании. Отвечай профессионально, основываясь на своем резюме."
                 },
                 {
                     "role": "user",
@@ -463,7 +486,9 @@ class ProfessionalInterviewSimulator:
                 }
             ]
             
-            completion = self.client.chat.completions.create(
+            completion = await openai_controller.acall(
+                self.client.chat.completions.create,
+                feature="llm_interview_simulation._get_candidate_answer",
                 model=self.model,
                 messages=messages,
                 temperature=0.8,
@@ -505,25 +530,21 @@ class ProfessionalInterviewSimulator:
         
         return max(1, min(5, score))  # Ограничиваем 1-5
     
+    @traced("llm_interview_simulation.comprehensive_assessment")
     async def _generate_comprehensive_assessment(self, resume_data: Dict[str, Any], 
                                                vacancy_data: Dict[str, Any], 
                                                dialog_messages: List[DialogMessage],
                                                candidate_profile: CandidateProfile) -> InterviewAssessment:
         """Генерирует всестороннюю оценку интервью с использованием продвинутого Assessment Engine."""
         
-        # Импортируем Assessment Engine
-        from src.llm_interview_simulation.assessment_engine import ProfessionalAssessmentEngine
-        
-        # Создаем экземпляр движка оценки
-        assessment_engine = ProfessionalAssessmentEngine()
-        
         # Генерируем детальную оценку
-        assessment = await assessment_engine.generate_comprehensive_assessment(
+        assessment = await self.assessment_engine.generate_comprehensive_assessment(
             resume_data, vacancy_data, dialog_messages, candidate_profile
         )
         
         return assessment
     
+    @traced("llm_interview_simulation.simulate_interview")
     async def simulate_interview(self, parsed_resume: Dict[str, Any], 
                            parsed_vacancy: Dict[str, Any],
                            progress_callback: Optional[Callable[[int, int], Awaitable[None]]] = None,
@@ -533,6 +554,7 @@ class ProfessionalInterviewSimulator:
         parsed_resume: Данные резюме
         parsed_vacancy: Данные вакансии
         progress_callback: Функция для обновления прогресса (current_round, total_rounds)
+        config_overrides: Настройки этой симуляции (вместо set_custom_config: экземпляр общий для запросов)
         """
         # Проверка разрешения использования OpenAI API
         openai_controller.check_api_permission()
@@ -545,10 +567,11 @@ class ProfessionalInterviewSimulator:
             )
             
             # Применяем пользовательские настройки, если они есть
-            if self.custom_config:
-                if 'target_rounds' in self.custom_config:
-                    interview_config.target_rounds = self.custom_config['target_rounds']
-                if 'difficulty_level' in self.custom_config:
+            custom_config = config_overrides if config_overrides is not None else self.custom_config
+            if custom_config:
+                if 'target_rounds' in custom_config:
+                    interview_config.target_rounds = custom_config['target_rounds']
+                if 'difficulty_level' in custom_config:
                     # Преобразуем строку в CandidateLevel если нужно
                     from src.models.interview_simulation_models import CandidateLevel
                     level_mapping = {
@@ -556,8 +579,8 @@ class ProfessionalInterviewSimulator:
                         'medium': CandidateLevel.MIDDLE, 
                         'hard': CandidateLevel.SENIOR
                     }
-                    if self.custom_config['difficulty_level'] in level_mapping:
-                        candidate_profile.detected_level = level_mapping[self.custom_config['difficulty_level']]
+                    if custom_config['difficulty_level'] in level_mapping:
+                        candidate_profile.detected_level = level_mapping[custom_config['difficulty_level']]
             
             logger.info(f"Создан профиль: {candidate_profile.detected_level.value} {candidate_profile.detected_role.value}")
             logger.info(f"Конфигурация: {interview_config.target_rounds} раундов")
@@ -628,9 +651,7 @@ class ProfessionalInterviewSimulator:
             )
             
             # Генерируем детальную обратную связь с помощью Assessment Engine
-            from src.llm_interview_simulation.assessment_engine import ProfessionalAssessmentEngine
-            assessment_engine = ProfessionalAssessmentEngine()
-            feedback = await assessment_engine.generate_detailed_feedback(assessment, candidate_profile)
+            feedback = await self.assessment_engine.generate_detailed_feedback(assessment, candidate_profile)
             
             # Извлекаем текстовые рекомендации
             hr_assessment = feedback.get('hr_assessment', 'Оценка не доступна')
@@ -23,13 +23,16 @@ from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics import renderPDF
 
 from src.models.interview_simulation_models import InterviewSimulation, CompetencyArea, QuestionType
-from src.utils import get_logger
+from src.utils import get_logger, traced
 
 logger = get_logger()
 
 class ProfessionalInterviewPDFGenerator:
     """Продвинутый генератор PDF отчетов с визуализацией и современным дизайном."""
     
+    # Версия шаблона отчета: увеличивать при изменении верстки (ключ кэша готовых PDF)
+    VERSION = "1.0"
+    
     # Цветовая схема
     COLORS = {
         'primary': HexColor('#2E4BC6'),      # Синий основной
@@ -558,6 +561,7 @@ class ProfessionalInterviewPDFGenerator:
         else:
             return self.COLORS['reject']
     
+    @traced("pdf.interview_simulation")
     def generate_pdf(self, simulation: InterviewSimulation) -> Optional[BytesIO]:
         """
         Генерирует профессиональный PDF документ симуляции интервью.
@@ -3,6 +3,10 @@
 Модуль для форматирования данных резюме и GAP-анализа перед отправкой в LLM для рерайта.
 """
 
+from src.utils.token_budget import resume_budget
+
+
+@resume_budget("llm_resume_rewriter")
 def format_resume_data(resume_data: dict) -> str:
     """
     Форматирует данные резюме в читаемый markdown формат.
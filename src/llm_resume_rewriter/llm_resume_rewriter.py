@@ -1,55 +1,43 @@
 # src/llm_resume_rewriter/llm_resume_rewriter.py
-import os
 from typing import Optional, Dict, Any
 from openai import OpenAI
 from pydantic import ValidationError
 import instructor
 
-# LangSmith импорты
-from langsmith.wrappers import wrap_openai
-from langsmith import traceable, Client
-
-from src.utils import get_logger
+from src.utils import get_logger, traced
+from src.utils.llm_tracing import llm_traceable
 from src.llm_resume_rewriter.config import settings
 from src.models.resume_models import ResumeInfo
 from src.llm_resume_rewriter.formatter import format_resume_data, format_gap_analysis_data
 from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
 logger = get_logger()
 
-# LangSmith клиент
-def create_langsmith_client():
-    """Создаёт клиента LangSmith для трейсинга."""
-    api_key = os.getenv("LANGCHAIN_API_KEY")
-    if not api_key:
-        logger.warning("LANGCHAIN_API_KEY не установлен, трейсинг будет отключен")
-        return None
-    return Client(api_key=api_key)
-
-ls_client = create_langsmith_client()
-
 
 class LLMResumeRewriter:
     """Сервис для переписывания резюме на основе GAP-анализа с помощью OpenAI API"""
     
-    def __init__(self):
-        """Инициализация клиента OpenAI с LangSmith трейсингом."""
+    def __init__(self, client: Optional[OpenAI] = None):
+        """
+        Инициализация клиента OpenAI.
+
+        Args:
+            client: Общий клиент OpenAI (контейнер сервисов); None — создается свой
+        """
         self.config = settings
         self.model = self.config.model_name
-        self.client = self._create_traced_client()
+        self.client = client or self._create_traced_client()
         logger.info(f"Инициализирован Resume Rewriter с моделью {self.model}")
     
     def _create_traced_client(self) -> OpenAI:
-        """Создает OpenAI клиент с LangSmith трейсингом."""
-        base_client = OpenAI(api_key=self.config.api_key)
-        
-        if ls_client:
-            logger.info("LangSmith трейсинг активирован для Resume Rewriter")
-            wrapped_client = wrap_openai(base_client)
-            return wrapped_client
-        else:
-            logger.info("LangSmith трейсинг недоступен, используется базовый клиент")
-            return base_client
+        """
+        Создает OpenAI клиент.
+
+        Вызовы модели попадают в трейс LLM (src/utils/llm_tracing.py) из спанов
+        llm.completion, обертка клиента не требуется.
+        """
+        return OpenAI(api_key=self.config.api_key, max_retries=0, http_client=get_openai_http_client())
     
     def _create_system_prompt(self) -> str:
         """Системный промпт для рерайта резюме."""
@@ -102,19 +90,10 @@ class LLMResumeRewriter:
         formatted_resume = format_resume_data(resume_data)
         formatted_gap_analysis = format_gap_analysis_data(gap_analysis_data)
         
-        prompt = f"""# ДАННЫЕ ДЛЯ АНАЛИЗА
+        # Инструкции статичны и идут первыми (префикс кэшируется OpenAI), данные — в конце
+        prompt = f"""# ИНСТРУКЦИИ ПО РЕРАЙТУ
 
-{formatted_resume}
-
----
-
-{formatted_gap_analysis}
-
----
-
-# ИНСТРУКЦИИ ПО РЕРАЙТУ
-
-На основе представленных данных, переписать резюме, учитывая следующие ключевые моменты:
+На основе представленных ниже данных, переписать резюме, учитывая следующие ключевые моменты:
 
 1. **Недостающие навыки**: Если в GAP-анализе указаны missing_skills, попытайся найти способы подчеркнуть похожие или смежные навыки в резюме, используя более подходящую терминологию.
 
@@ -127,11 +106,22 @@ class LLMResumeRewriter:
 5. **Компетенции с низкими оценками**: Обрати особое внимание на области с оценкой менее 7/10 в competency_analysis.
 
 ## РЕЗУЛЬТАТ
-Верни улучшенное резюме в формате JSON, полностью соответствующем структуре ResumeInfo."""
+Верни улучшенное резюме в формате JSON, полностью соответствующем структуре ResumeInfo.
+
+---
+
+# ДАННЫЕ ДЛЯ АНАЛИЗА
+
+{formatted_resume}
+
+---
+
+{formatted_gap_analysis}"""
 
         return prompt
 
-    @traceable(client=ls_client, project_name="resume_rewriter", run_type="llm")
+    @llm_traceable(run_type="llm", project="resume_rewriter")
+    @traced("llm_resume_rewriter.rewrite_resume")
     async def rewrite_resume(self, resume_dict: dict, gap_analysis_dict: dict) -> Optional[ResumeInfo]:
         """
         Основной метод для рерайта резюме на основе GAP-анализа.
@@ -159,15 +149,16 @@ class LLMResumeRewriter:
             instructor_client = instructor.from_openai(self.client)
             
             # Вызов OpenAI API
-            response = instructor_client.chat.completions.create(
+            response = await openai_controller.acall(
+                instructor_client.chat.completions.create,
+                feature="llm_resume_rewriter.rewrite_resume",
                 model=self.model,
                 response_model=ResumeInfo,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.1,  # Низкая температура для более консистентных результатов
-                max_tokens=4000
+                temperature=0.1  # Низкая температура для более консистентных результатов
             )
             
             # Учет использования токенов
@@ -194,15 +185,16 @@ class LLMResumeRewriter:
 ВАЖНО: Предыдущий ответ содержал ошибки валидации: {str(ve)}
 Пожалуйста, убедись, что JSON строго соответствует схеме ResumeInfo и все обязательные поля заполнены корректно."""
                 
-                retry_response = instructor_client.chat.completions.create(
+                retry_response = await openai_controller.acall(
+                    instructor_client.chat.completions.create,
+                    feature="llm_resume_rewriter.rewrite_resume",
                     model=self.model,
                     response_model=ResumeInfo,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": retry_prompt}
                     ],
-                    temperature=0.1,
-                    max_tokens=4000
+                    temperature=0.1
                 )
                 
                 if hasattr(retry_response, '_raw_response') and hasattr(retry_response._raw_response, 'usage'):
@@ -15,6 +15,9 @@ from openai import OpenAI
 from pydantic import ValidationError
 
 from src.models.resume_models import ResumeInfo
+from src.utils.tracing import traced
+from src.security.openai_control import openai_controller
+from src.security.openai_transport import get_openai_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +25,18 @@ logger = logging.getLogger(__name__)
 class PDFResumeParser:
     """Парсер PDF резюме с использованием OpenAI structured output"""
     
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None, client: Optional[OpenAI] = None):
         """
         Инициализация парсера
         
         Args:
             openai_api_key: API ключ OpenAI (если None, берется из переменной окружения)
+            client: Общий клиент OpenAI (контейнер сервисов); None — создается свой
         """
-        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = client or OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"), max_retries=0, http_client=get_openai_http_client())
         self.model_name = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini-2024-07-18")
     
+    @traced("parsers.extract_text_from_pdf")
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
         Извлекает текст из PDF файла
@@ -66,6 +71,7 @@ class PDFResumeParser:
             logger.error(f"Ошибка при извлечении текста из PDF {pdf_path}: {e}")
             raise
     
+    @traced("parsers.parse_text_to_resume")
     def parse_text_to_resume(self, text: str) -> ResumeInfo:
         """
         Парсит текст резюме в структурированную модель ResumeInfo
@@ -97,7 +103,9 @@ class PDFResumeParser:
         """
         
         try:
-            completion = self.client.beta.chat.completions.parse(
+            completion = openai_controller.call(
+                self.client.beta.chat.completions.parse,
+                feature="parsers.parse_text_to_resume",
                 model=self.model_name,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -119,6 +127,7 @@ class PDFResumeParser:
             logger.error(f"Ошибка при парсинге текста через OpenAI: {e}")
             raise
     
+    @traced("parsers.parse_pdf_resume")
     def parse_pdf_resume(self, pdf_path: str) -> ResumeInfo:
         """
         Парсит PDF резюме в структурированную модель
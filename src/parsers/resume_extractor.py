@@ -9,7 +9,7 @@ from src.models.resume_models import (
     Certificate, Contact, ContactType, ContactValue, Site, SiteType
 )
 
-from src.utils import get_logger
+from src.utils import get_logger, traced
 logger = get_logger()
 
 class ResumeExtractor:
@@ -134,6 +134,7 @@ class ResumeExtractor:
             logger.error(f"Ошибка при парсинге образования: {e}")
             return None
     
+    @traced("parsers.extract_resume_info")
     def extract_resume_info(self, data: Dict[str, Any]) -> Optional[ResumeInfo]:
         """
         Извлекает информацию из резюме.
@@ -7,7 +7,7 @@ from src.models.vacancy_models import (
     Schedule, Employment, ProfessionalRole
 )
 
-from src.utils import get_logger
+from src.utils import get_logger, traced
 logger = get_logger()
 
 class VacancyExtractor:
@@ -35,6 +35,7 @@ class VacancyExtractor:
         
         return professional_roles
         
+    @traced("parsers.extract_vacancy_info")
     def extract_vacancy_info(self, data: Dict[str, Any]) -> Optional[VacancyInfo]:
         """
         Извлекает информацию из вакансии.
@@ -1,7 +1,13 @@
+import asyncio
+import base64
+import hashlib
+import hmac
 import os
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 from fastapi import Request, HTTPException, status, Depends, Form
 from fastapi.responses import RedirectResponse, HTMLResponse
@@ -9,6 +15,11 @@ from fastapi.templating import Jinja2Templates
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+from src.utils import get_logger
+from src.utils.metrics import metrics_token_valid
+
+logger = get_logger()
+
 
 class SimpleAuthConfig:
     """Конфигурация простой авторизации для демо"""
@@ -17,15 +28,24 @@ class SimpleAuthConfig:
         self.demo_password = os.getenv("DEMO_PASSWORD", "demo2025")
         self.session_timeout_hours = int(os.getenv("SESSION_TIMEOUT_HOURS", "24"))
         self.cookie_name = "auth_session"
-        self.secret_key = os.getenv("AUTH_SECRET_KEY", secrets.token_hex(32))
+        self.secret_key = os.getenv("AUTH_SECRET_KEY", "")
+        # signed — подписанный токен без состояния на сервере, memory — сессии в памяти процесса
+        self.session_mode = os.getenv("AUTH_SESSION_MODE", "signed").lower()
+        self.max_sessions = int(os.getenv("AUTH_MAX_SESSIONS", "10000"))
+        self.cleanup_interval = float(os.getenv("AUTH_SESSION_CLEANUP_INTERVAL", "300"))
+        if not self.secret_key:
+            self.secret_key = secrets.token_hex(32)
+            if self.session_mode == "signed":
+                logger.warning("AUTH_SECRET_KEY не задан: подписи сессий действительны только в этом процессе")
 
 
 class SessionManager:
-    """Менеджер сессий для простой авторизации"""
+    """Менеджер сессий в памяти процесса (AUTH_SESSION_MODE=memory), не больше AUTH_MAX_SESSIONS"""
     
     def __init__(self, config: SimpleAuthConfig):
         self.config = config
-        self.active_sessions = {}
+        # Порядок вставки — порядок создания: при переполнении вытесняются самые старые сессии
+        self.active_sessions = OrderedDict()
     
     def create_session(self) -> str:
         """Создать новую сессию"""
@@ -37,6 +57,8 @@ class SessionManager:
             "expires_at": expires_at,
             "last_accessed": datetime.now()
         }
+        while len(self.active_sessions) > self.config.max_sessions:
+            self.active_sessions.popitem(last=False)
         
         return session_id
     
@@ -60,6 +82,12 @@ class SessionManager:
         if session_id in self.active_sessions:
             del self.active_sessions[session_id]
     
+    def session_key(self, session_id: str, validated: bool = False) -> Optional[str]:
+        """Стабильный ключ действующей сессии для данных пользователя (хэш: cookie — секрет)"""
+        if not validated and not self.validate_session(session_id):
+            return None
+        return hashlib.sha256(session_id.encode()).hexdigest()[:32]
+    
     def cleanup_expired_sessions(self):
         """Очистка истёкших сессий"""
         now = datetime.now()
@@ -72,10 +100,98 @@ class SessionManager:
             del self.active_sessions[sid]
 
 
+class SignedSessionManager:
+    """
+    Сессии в подписанном токене (AUTH_SESSION_MODE=signed).
+
+    Cookie содержит id сессии, срок действия и HMAC-SHA256 подпись ключом
+    AUTH_SECRET_KEY: проверка — только вычисление подписи, без общего
+    состояния, поэтому сессия действительна во всех воркерах и экземплярах
+    с одним ключом. Выход добавляет id в список отзыва процесса до истечения
+    срока токена; список очищается от истекших токенов фоновой задачей и при
+    превышении AUTH_MAX_SESSIONS. Действующий отзыв не вытесняется никогда:
+    иначе токен после выхода снова стал бы действительным (cookie при выходе
+    удаляется и в браузере).
+    """
+
+    VERSION = "v1"
+
+    def __init__(self, config: SimpleAuthConfig):
+        self.config = config
+        self._key = config.secret_key.encode()
+        # id отозванной сессии -> срок действия токена (timestamp)
+        self.revoked = OrderedDict()
+
+    def _sign(self, payload: str) -> str:
+        digest = hmac.new(self._key, payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def _parse(self, token: str) -> Optional[tuple]:
+        """(id сессии, срок действия) подписанного и не истекшего токена, иначе None."""
+        try:
+            version, session_id, expires_at, signature = token.split(".")
+            expires_at = int(expires_at)
+        except (AttributeError, ValueError):
+            return None
+        if version != self.VERSION:
+            return None
+        if not hmac.compare_digest(signature, self._sign(f"{version}.{session_id}.{expires_at}")):
+            return None
+        if time.time() > expires_at:
+            return None
+        return session_id, expires_at
+
+    def create_session(self) -> str:
+        """Создать новую сессию (подписанный токен для cookie)"""
+        session_id = secrets.token_urlsafe(16)
+        expires_at = int(time.time() + self.config.session_timeout_hours * 3600)
+        payload = f"{self.VERSION}.{session_id}.{expires_at}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def validate_session(self, token: str) -> bool:
+        """Проверить подпись, срок действия и отсутствие в списке отзыва"""
+        if not token:
+            return False
+        parsed = self._parse(token)
+        return parsed is not None and parsed[0] not in self.revoked
+
+    def session_key(self, token: str, validated: bool = False) -> Optional[str]:
+        """
+        Стабильный ключ действующей сессии для данных пользователя — id сессии из токена.
+
+        validated — токен уже проверен в этом запросе (middleware): подпись не вычисляется повторно.
+        """
+        if validated:
+            return token.split(".")[1]
+        parsed = self._parse(token) if token else None
+        return parsed[0] if parsed is not None and parsed[0] not in self.revoked else None
+
+    def delete_session(self, token: str):
+        """Отозвать сессию до истечения срока действия токена"""
+        parsed = self._parse(token)
+        if parsed is None:
+            return
+        session_id, expires_at = parsed
+        self.revoked[session_id] = expires_at
+        if len(self.revoked) > self.config.max_sessions:
+            self.cleanup_expired_sessions()
+            if len(self.revoked) > self.config.max_sessions:
+                logger.error(f"Список отзыва сессий превышает AUTH_MAX_SESSIONS ({len(self.revoked)} > "
+                             f"{self.config.max_sessions}): действующие отзывы не вытесняются")
+
+    def cleanup_expired_sessions(self):
+        """Удалить из списка отзыва истекшие токены"""
+        now = time.time()
+        expired = [sid for sid, expires_at in self.revoked.items() if expires_at < now]
+        for sid in expired:
+            del self.revoked[sid]
+
+
 class SimpleAuthMiddleware(BaseHTTPMiddleware):
     """Middleware для простой авторизации"""
     
-    def __init__(self, app, config: SimpleAuthConfig, session_manager: SessionManager, templates: Jinja2Templates):
+    def __init__(self, app, config: SimpleAuthConfig, session_manager: SessionManager, templates: Jinja2Templates,
+                 health_paths: Iterable[str] = ("/health",)):
         super().__init__(app)
         self.config = config
         self.session_manager = session_manager
@@ -84,10 +200,11 @@ class SimpleAuthMiddleware(BaseHTTPMiddleware):
         self.excluded_paths = {
             "/login",
             "/logout",
-            "/health",
             "/static",
             "/favicon.ico"
         }
+        # Проверки здоровья — только точные пути (/health и /apps/<функция>/health)
+        self.health_paths = frozenset(health_paths)
     
     async def dispatch(self, request: Request, call_next):
         """Обработка запроса с проверкой авторизации"""
@@ -96,6 +213,10 @@ class SimpleAuthMiddleware(BaseHTTPMiddleware):
         if self._is_excluded_path(path):
             return await call_next(request)
         
+        # Сборщик метрик — по токену METRICS_TOKEN, без сессии
+        if path == "/metrics" and metrics_token_valid(request.headers.get("authorization")):
+            return await call_next(request)
+        
         session_id = request.cookies.get(self.config.cookie_name)
         
         if not self.session_manager.validate_session(session_id):
@@ -105,10 +226,14 @@ class SimpleAuthMiddleware(BaseHTTPMiddleware):
             redirect_url = f"/login?redirect={path}"
             return RedirectResponse(url=redirect_url, status_code=302)
         
+        # Результат проверки для require_auth: сессия проверяется один раз за запрос
+        request.state.auth_session = session_id
         return await call_next(request)
     
     def _is_excluded_path(self, path: str) -> bool:
         """Проверить, нужно ли исключить путь из авторизации"""
+        if path in self.health_paths:
+            return True
         return any(path.startswith(excluded) for excluded in self.excluded_paths)
 
 
@@ -117,8 +242,12 @@ class SimpleAuth:
     
     def __init__(self, templates_dir: str = "templates"):
         self.config = SimpleAuthConfig()
-        self.session_manager = SessionManager(self.config)
+        if self.config.session_mode == "memory":
+            self.session_manager = SessionManager(self.config)
+        else:
+            self.session_manager = SignedSessionManager(self.config)
         self.templates = Jinja2Templates(directory=templates_dir)
+        self._cleanup_task: Optional[asyncio.Task] = None
     
     def get_middleware(self):
         """Получить middleware для FastAPI приложения"""
@@ -175,6 +304,10 @@ class SimpleAuth:
         """Dependency для проверки авторизации в эндпоинтах"""
         session_id = request.cookies.get(self.config.cookie_name)
         
+        # Сессия уже проверена middleware в этом запросе
+        if session_id and getattr(request.state, "auth_session", None) == session_id:
+            return True
+        
         if not self.session_manager.validate_session(session_id):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -183,9 +316,35 @@ class SimpleAuth:
         
         return True
     
+    def session_key(self, request: Request) -> Optional[str]:
+        """Ключ сессии текущего пользователя (хранилища данных пользователя), None — не авторизован"""
+        session_id = request.cookies.get(self.config.cookie_name)
+        # Сессия уже проверена middleware в этом запросе
+        validated = bool(session_id) and getattr(request.state, "auth_session", None) == session_id
+        return self.session_manager.session_key(session_id, validated=validated)
+    
     def cleanup_sessions(self):
         """Очистка истёкших сессий"""
         self.session_manager.cleanup_expired_sessions()
+    
+    def start_cleanup(self) -> None:
+        """Фоновая очистка истекших сессий раз в AUTH_SESSION_CLEANUP_INTERVAL секунд (lifespan приложения)"""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.get_running_loop().create_task(self._cleanup_loop())
+    
+    async def stop_cleanup(self) -> None:
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            await asyncio.gather(self._cleanup_task, return_exceptions=True)
+            self._cleanup_task = None
+    
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.cleanup_interval)
+            try:
+                self.cleanup_sessions()
+            except Exception as e:
+                logger.error(f"Ошибка очистки сессий: {e}")
 
 
 def create_auth_instance(templates_dir: str = "templates") -> SimpleAuth:
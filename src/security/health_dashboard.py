@@ -1,121 +1,247 @@
+# src/security/health_dashboard.py
+"""
+Панель мониторинга состояния сервисов.
+
+Сервисы опрашиваются фоновой задачей (start/stop в lifespan приложения) через
+одну сессию aiohttp: параллельно, раз в HEALTH_PROBE_INTERVAL секунд, с
+таймаутом HEALTH_PROBE_TIMEOUT на проверку. Результаты хранятся в кэше вместе
+с измеренным временем ответа, возрастом проверки и историей последних
+HEALTH_PROBE_HISTORY проверок — /status и /api/status отдаются из кэша
+без ожидания сети.
+
+Список сервисов задается HEALTH_PROBE_SERVICES ("id=url,id=url"); по
+умолчанию — объединенное приложение, приложения функций (под /apps/... или
+на портах 8000–8003, см. WEB_APP_MOUNT_FEATURE_APPS) и OAuth сервер.
+"""
+
 import asyncio
+import os
+import time
 import aiohttp
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Deque, List, Optional
+from urllib.parse import urlparse
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
-from src.security.openai_control import openai_controller
 from src.utils import get_logger
+from src.utils.metrics import registry
+from src.web_app.config import settings as web_settings
 
 logger = get_logger()
 
+# Приложения функций: id -> (название, порт отдельного процесса, префикс в объединенном приложении)
+FEATURE_APPS = {
+    "gap_analysis": ("Gap Analysis", 8000, "/apps/gap-analysis"),
+    "cover_letter": ("Cover Letter", 8001, "/apps/cover-letter"),
+    "interview_checklist": ("Interview Checklist", 8002, "/apps/interview-checklist"),
+    "interview_simulation": ("Interview Simulation", 8003, "/apps/interview-simulation"),
+}
 
-class HealthDashboard:
-    """Простая панель мониторинга состояния всех сервисов"""
-    
-    def __init__(self):
-        self.services = {
-            "unified_app": {
-                "name": "Unified Web App",
-                "url": "http://localhost:3000/health",
-                "port": 3000
-            },
-            "gap_analysis": {
-                "name": "Gap Analysis",
-                "url": "http://localhost:8000/health",
-                "port": 8000
-            },
-            "cover_letter": {
-                "name": "Cover Letter",
-                "url": "http://localhost:8001/health",
-                "port": 8001
-            },
-            "interview_checklist": {
-                "name": "Interview Checklist",
-                "url": "http://localhost:8002/health",
-                "port": 8002
-            },
-            "interview_simulation": {
-                "name": "Interview Simulation",
-                "url": "http://localhost:8003/health",
-                "port": 8003
-            },
-            "oauth_server": {
-                "name": "OAuth Server",
-                "url": "http://localhost:8080/health",
-                "port": 8080
+service_probe_up = registry.gauge(
+    "service_probe_up", "Результат последней проверки сервиса панелью мониторинга (1 — healthy)"
+)
+service_probe_duration = registry.gauge(
+    "service_probe_duration_seconds", "Время ответа /health сервиса при последней проверке"
+)
+
+
+def default_services() -> Dict[str, Dict[str, Any]]:
+    """Сервисы по умолчанию с учетом режима размещения приложений функций."""
+    unified_port = urlparse(web_settings.unified_app_url).port or 80
+    services = {
+        "unified_app": {
+            "name": "Unified Web App",
+            "url": f"{web_settings.unified_app_url}/health",
+            "port": unified_port
+        }
+    }
+    for service_id, (name, port, prefix) in FEATURE_APPS.items():
+        if web_settings.mount_feature_apps:
+            # Функция подключена в процесс объединенного приложения
+            services[service_id] = {
+                "name": name,
+                "url": f"{web_settings.unified_app_url}{prefix}/health",
+                "port": unified_port
             }
+        else:
+            services[service_id] = {
+                "name": name,
+                "url": f"http://localhost:{port}/health",
+                "port": port
+            }
+    services["oauth_server"] = {
+        "name": "OAuth Server",
+        "url": "http://localhost:8080/health",
+        "port": 8080
+    }
+    return services
+
+
+def parse_services(spec: str) -> Dict[str, Dict[str, Any]]:
+    """HEALTH_PROBE_SERVICES: "unified_app=http://localhost:3000/health,oauth_server=http://localhost:8080/health"."""
+    services = {}
+    for item in spec.split(","):
+        service_id, _, url = item.strip().partition("=")
+        if not service_id or not url:
+            logger.warning(f"Пропущен некорректный сервис в HEALTH_PROBE_SERVICES: {item!r}")
+            continue
+        services[service_id] = {"name": service_id, "url": url, "port": urlparse(url).port}
+    return services
+
+
+class HealthDashboard:
+    """Панель мониторинга: фоновый опрос сервисов и кэш результатов"""
+
+    def __init__(self, services: Optional[Dict[str, Dict[str, Any]]] = None):
+        spec = os.getenv("HEALTH_PROBE_SERVICES", "")
+        self.services = services or (parse_services(spec) if spec else default_services())
+        self.enabled = os.getenv("HEALTH_PROBE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.interval = float(os.getenv("HEALTH_PROBE_INTERVAL", 15))
+        self.timeout = float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))
+        history_size = int(os.getenv("HEALTH_PROBE_HISTORY", 40))
+
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._history: Dict[str, Deque[Dict[str, Any]]] = {
+            service_id: deque(maxlen=history_size) for service_id in self.services
         }
-    
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запуск фонового опроса в текущем event loop."""
+        if not self.enabled or self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._probe_loop())
+        logger.info(
+            f"Опрос сервисов панели мониторинга запущен: {len(self.services)} сервисов, "
+            f"интервал {self.interval:.0f} с, таймаут {self.timeout:.1f} с"
+        )
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _probe_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Ошибка опроса сервисов: {e}")
+            await asyncio.sleep(self.interval)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Одна сессия на все проверки (соединения переиспользуются между циклами)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def refresh(self) -> None:
+        """Один цикл опроса: все сервисы параллельно, результаты — в кэш и историю."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            results = await asyncio.gather(*[
+                self.check_service_health(service_id, service_info)
+                for service_id, service_info in self.services.items()
+            ])
+            for result in results:
+                self._store(result)
+
+    def _store(self, result: Dict[str, Any]) -> None:
+        service_id = result["service_id"]
+        self._results[service_id] = result
+        self._history[service_id].append({
+            "checked_at": result["checked_at"],
+            "status": result["status"],
+            "response_time_ms": result["response_time_ms"]
+        })
+        service_probe_up.set(1 if result["status"] == "healthy" else 0, service=service_id)
+        if result["response_time_ms"] is not None:
+            service_probe_duration.set(result["response_time_ms"] / 1000, service=service_id)
+
     async def check_service_health(self, service_id: str, service_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Проверить состояние одного сервиса"""
+        """Проверить состояние одного сервиса с замером времени ответа"""
+        result = {
+            "service_id": service_id,
+            "name": service_info["name"],
+            "port": service_info["port"],
+            "response_time_ms": None,
+            "checked_at": time.time()
+        }
+        started = time.perf_counter()
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(service_info["url"]) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "service_id": service_id,
-                            "name": service_info["name"],
-                            "status": "healthy",
-                            "port": service_info["port"],
-                            "response_time": "< 5s",
-                            "details": data.get("checks", {}),
-                            "last_check": datetime.now().strftime("%H:%M:%S")
-                        }
-                    else:
-                        return {
-                            "service_id": service_id,
-                            "name": service_info["name"],
-                            "status": "unhealthy",
-                            "port": service_info["port"],
-                            "response_time": "timeout",
-                            "error": f"HTTP {response.status}",
-                            "last_check": datetime.now().strftime("%H:%M:%S")
-                        }
+            async with self._get_session().get(service_info["url"]) as response:
+                data = await response.json(content_type=None) if response.status == 200 else {}
+                result["response_time_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                if response.status == 200:
+                    result.update(status="healthy", details=data.get("checks", {}))
+                else:
+                    result.update(status="unhealthy", error=f"HTTP {response.status}")
+        except asyncio.TimeoutError:
+            result.update(status="offline", error=f"нет ответа за {self.timeout:.1f} с")
         except Exception as e:
+            result.update(status="offline", error=str(e) or type(e).__name__)
+        return result
+
+    def _snapshot(self, service_id: str, now: float) -> Dict[str, Any]:
+        """Результат из кэша с возрастом проверки и историей."""
+        service_info = self.services[service_id]
+        result = self._results.get(service_id)
+        if result is None:
             return {
                 "service_id": service_id,
                 "name": service_info["name"],
-                "status": "offline",
+                "status": "unknown",
                 "port": service_info["port"],
-                "response_time": "timeout",
-                "error": str(e),
-                "last_check": datetime.now().strftime("%H:%M:%S")
+                "response_time": "—",
+                "last_check": "—",
+                "history": []
             }
-    
+        history = list(self._history[service_id])
+        timings = [point["response_time_ms"] for point in history if point["response_time_ms"] is not None]
+        return {
+            **result,
+            "response_time": f"{result['response_time_ms']:.0f} мс" if result["response_time_ms"] is not None else "—",
+            "last_check": datetime.fromtimestamp(result["checked_at"]).strftime("%H:%M:%S"),
+            "age_s": round(now - result["checked_at"], 1),
+            "avg_response_time_ms": round(sum(timings) / len(timings), 1) if timings else None,
+            "availability": round(sum(point["status"] == "healthy" for point in history) / len(history) * 100, 1),
+            "history": history
+        }
+
     async def get_all_services_status(self) -> Dict[str, Any]:
-        """Получить статус всех сервисов"""
-        # Проверяем все сервисы параллельно
-        tasks = [
-            self.check_service_health(service_id, service_info)
-            for service_id, service_info in self.services.items()
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        services_status = []
-        healthy_count = 0
-        
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Ошибка при проверке сервиса: {result}")
-                continue
-            
-            services_status.append(result)
-            if result["status"] == "healthy":
-                healthy_count += 1
-        
-        # Получаем статистику OpenAI API
+        """Статус всех сервисов из кэша (первый опрос — при пустом кэше без фоновой задачи)"""
+        if not self._results and not self.running:
+            await self.refresh()
+
+        now = time.time()
+        services_status: List[Dict[str, Any]] = [self._snapshot(service_id, now) for service_id in self.services]
+        checked = [service for service in services_status if service["status"] != "unknown"]
+        healthy_count = sum(service["status"] == "healthy" for service in checked)
+
+        # Получаем статистику OpenAI API (импорт здесь: openai не нужен для старта приложения)
+        from src.security.openai_control import openai_controller
         openai_stats = openai_controller.get_usage_stats()
-        
+
         return {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "overall_status": "healthy" if healthy_count == len(services_status) else "degraded" if healthy_count > 0 else "critical",
+            "overall_status": "healthy" if checked and healthy_count == len(checked) else "degraded" if healthy_count > 0 else "critical",
             "healthy_services": healthy_count,
             "total_services": len(services_status),
+            "probe_interval_s": self.interval,
             "services": services_status,
             "openai_stats": openai_stats
         }
@@ -127,18 +253,18 @@ health_dashboard = HealthDashboard()
 
 def add_health_dashboard_routes(app: FastAPI, templates: Jinja2Templates):
     """Добавить маршруты панели мониторинга в FastAPI приложение"""
-    
+
     @app.get("/status", response_class=HTMLResponse)
     async def dashboard_page(request: Request):
         """Страница панели мониторинга"""
         status_data = await health_dashboard.get_all_services_status()
-        
+
         return templates.TemplateResponse("dashboard.html", {
             "request": request,
             "status_data": status_data
         })
-    
+
     @app.get("/api/status")
     async def api_status():
         """API эндпоинт для получения статуса сервисов"""
-        return await health_dashboard.get_all_services_status()
\ No newline at end of file
+        return await health_dashboard.get_all_services_status()
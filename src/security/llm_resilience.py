@@ -0,0 +1,140 @@
+# src/security/llm_resilience.py
+"""
+Политика устойчивости вызовов LLM: классификация ошибок, повторы с
+экспоненциальной задержкой и jitter, общий дедлайн вызова и hedging.
+
+Используется OpenAIController.call / acall, поэтому действует для всех
+LLM сервисов сразу. Встроенные повторы SDK OpenAI отключены (max_retries=0
+при создании клиентов), чтобы повторы не умножались.
+
+Переменные окружения:
+    OPENAI_RETRY_MAX_ATTEMPTS   — попыток на временные ошибки (по умолчанию 3)
+    OPENAI_RETRY_BASE_DELAY     — базовая задержка, секунды (0.5)
+    OPENAI_RETRY_MAX_DELAY      — максимальная задержка, секунды (20)
+    OPENAI_CALL_DEADLINE        — дедлайн одного вызова с учетом повторов, секунды (180)
+    OPENAI_HEDGE_ENABLED        — дублирующий запрос после порога p95 (false)
+    OPENAI_HEDGE_PERCENTILE     — перцентиль латентности для порога (0.95)
+    OPENAI_HEDGE_MIN_SAMPLES    — минимум замеров перед включением hedging (20)
+"""
+
+import math
+import os
+import random
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import openai
+
+
+# Классы ошибок
+ERROR_RETRYABLE = "retryable"        # сеть, таймаут, 5xx — повтор с задержкой
+ERROR_RATE_LIMITED = "rate_limited"  # 429 — возврат в очередь регулятора
+ERROR_FATAL = "fatal"                # 4xx, ошибки валидации и прочее — без повторов
+
+# Статусы HTTP, при которых повтор имеет смысл
+RETRYABLE_STATUS_CODES = {408, 409, 500, 502, 503, 504}
+
+
+def classify_error(error: BaseException) -> str:
+    """Определяет класс ошибки вызова OpenAI (с учетом обернутой причины)."""
+    cause = error
+    for _ in range(3):
+        if isinstance(cause, openai.RateLimitError):
+            return ERROR_RATE_LIMITED
+        if isinstance(cause, (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)):
+            return ERROR_RETRYABLE
+        if isinstance(cause, openai.APIStatusError):
+            return ERROR_RETRYABLE if cause.status_code in RETRYABLE_STATUS_CODES else ERROR_FATAL
+        if cause.__cause__ is None:
+            break
+        cause = cause.__cause__
+    return ERROR_FATAL
+
+
+class LatencyTracker:
+    """Скользящее окно латентностей успешных вызовов по ключу (функция/модель)."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Перцентиль латентности или None, если замеров недостаточно."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(percentile * len(samples)) - 1))
+        return samples[index]
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            keys = list(self._samples)
+        return {
+            key: {
+                "samples": len(self._samples[key]),
+                "p50": round(self.percentile(key, 0.5) or 0, 3),
+                "p95": round(self.percentile(key, 0.95) or 0, 3),
+            }
+            for key in keys
+        }
+
+
+class ResiliencePolicy:
+    """Параметры повторов, дедлайна и hedging для вызовов LLM."""
+
+    def __init__(self):
+        self.max_attempts = max(1, int(os.getenv("OPENAI_RETRY_MAX_ATTEMPTS", 3)))
+        self.base_delay = float(os.getenv("OPENAI_RETRY_BASE_DELAY", 0.5))
+        self.max_delay = float(os.getenv("OPENAI_RETRY_MAX_DELAY", 20))
+        self.deadline = float(os.getenv("OPENAI_CALL_DEADLINE", 180))
+        self.hedge_enabled = os.getenv("OPENAI_HEDGE_ENABLED", "false").lower() in ("true", "1", "yes", "on")
+        self.hedge_percentile = float(os.getenv("OPENAI_HEDGE_PERCENTILE", 0.95))
+        self.hedge_min_samples = int(os.getenv("OPENAI_HEDGE_MIN_SAMPLES", 20))
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.hedges_started = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Повтор только для временных ошибок и пока не исчерпаны попытки."""
+        return classify_error(error) == ERROR_RETRYABLE and attempt < self.max_attempts
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Экспоненциальная задержка с полным jitter: U(0, min(max_delay, base * 2^(attempt-1)))."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** max(0, attempt - 1)))
+
+    def hedge_threshold(self, key: str) -> Optional[float]:
+        """Через сколько секунд отправлять дублирующий запрос (None — hedging не применяется)."""
+        if not self.hedge_enabled:
+            return None
+        return self.latency.percentile(key, self.hedge_percentile, self.hedge_min_samples)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_hedge(self, won: bool = False) -> None:
+        with self._lock:
+            if won:
+                self.hedges_won += 1
+            else:
+                self.hedges_started += 1
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "max_attempts": self.max_attempts,
+            "deadline": self.deadline,
+            "hedge_enabled": self.hedge_enabled,
+            "retries": self.retries,
+            "hedges_started": self.hedges_started,
+            "hedges_won": self.hedges_won,
+            "latency": self.latency.get_stats(),
+        }
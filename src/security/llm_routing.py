@@ -0,0 +1,113 @@
+# src/security/llm_routing.py
+"""
+Маршрутизация моделей OpenAI по точкам вызова (feature).
+
+Таблица маршрутов задается переменной OPENAI_MODEL_ROUTES — JSON строкой
+или путем к JSON файлу. Ключ — feature вызова (как в спанах llm.completion),
+значение — основная модель, резервная модель и SLO латентности:
+
+    {
+        "parsers.parse_text_to_resume": {"model": "gpt-4.1-mini", "fallback": "default", "latency_slo": 30},
+        "llm_interview_simulation._get_hr_question": {"model": "gpt-4.1-mini"}
+    }
+
+"default" в fallback — модель, с которой сервис вызвал контроллер (OPENAI_MODEL_NAME).
+Вызовы без маршрута идут на модель сервиса без изменений. При ошибке основной
+модели или превышении latency_slo запрос повторяется на резервной модели.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.security.llm_resilience import LatencyTracker
+from src.utils import get_logger
+
+logger = get_logger()
+
+FALLBACK_SERVICE_MODEL = "default"
+
+
+@dataclass
+class ModelRoute:
+    """Маршрут одной точки вызова."""
+    model: str
+    fallback: Optional[str] = None
+    latency_slo: Optional[float] = None     # секунды; None — только fallback по ошибке
+
+    def resolve_fallback(self, service_model: Optional[str]) -> Optional[str]:
+        """Резервная модель (None, если совпадает с основной или не задана)."""
+        fallback = service_model if self.fallback == FALLBACK_SERVICE_MODEL else self.fallback
+        return fallback if fallback and fallback != self.model else None
+
+
+@dataclass
+class RouteStats:
+    """Счетчики маршрута для подбора моделей и SLO."""
+    calls: int = 0
+    errors: int = 0
+    fallbacks: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0              # часть prompt_tokens из кэша промптов OpenAI
+    completion_tokens: int = 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Доля входных токенов, попавших в кэш промптов."""
+        return round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0
+
+
+class ModelRouter:
+    """Таблица маршрутов и статистика латентности/токенов по маршрутам и моделям."""
+
+    def __init__(self, routes: Optional[Dict[str, ModelRoute]] = None):
+        self.routes = routes or {}
+        self.latency = LatencyTracker()
+        self._stats: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        raw = os.getenv("OPENAI_MODEL_ROUTES", "").strip()
+        if not raw:
+            return cls()
+        try:
+            if not raw.startswith("{"):
+                raw = Path(raw).read_text(encoding="utf-8")
+            routes = {feature: ModelRoute(**params) for feature, params in json.loads(raw).items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Некорректная таблица маршрутов OPENAI_MODEL_ROUTES, маршрутизация отключена: {e}")
+            return cls()
+        logger.info(f"Маршруты моделей OpenAI: {', '.join(f'{name} -> {route.model}' for name, route in routes.items())}")
+        return cls(routes)
+
+    def resolve(self, feature: Optional[str]) -> Optional[ModelRoute]:
+        return self.routes.get(feature) if feature else None
+
+    def record(self, feature: str, model: str, seconds: float, usage: Any = None,
+               error: bool = False, fallback: bool = False) -> None:
+        """Учитывает вызов маршрута: латентность и токены по модели."""
+        key = f"{feature}:{model}"
+        if not error:
+            self.latency.observe(key, seconds)
+        with self._lock:
+            stats = self._stats.setdefault(key, RouteStats())
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.fallbacks += int(fallback)
+            if usage is not None:
+                stats.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+                details = getattr(usage, "prompt_tokens_details", None)
+                stats.cached_tokens += (getattr(details, "cached_tokens", 0) or 0) if details else 0
+                stats.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        latency = self.latency.get_stats()
+        with self._lock:
+            return {
+                key: {**stats.__dict__, "cache_hit_rate": stats.cache_hit_rate, **latency.get(key, {})}
+                for key, stats in self._stats.items()
+            }
@@ -1,10 +1,18 @@
 import os
 import time
-from typing import Dict, Any, Optional
+import asyncio
+import threading
+from typing import Dict, Any, Optional, Callable, List, Tuple, TypeVar
 from dataclasses import dataclass
 from datetime import datetime
 
-from src.utils import get_logger
+import openai
+
+from src.security.llm_resilience import ResiliencePolicy, classify_error, ERROR_RATE_LIMITED
+from src.security.llm_routing import ModelRouter
+from src.security.openai_transport import get_transport_stats
+from src.utils import get_logger, trace_span
+from src.utils.token_budget import count_message_tokens, plan_completion
 
 logger = get_logger()
 
@@ -19,13 +27,350 @@ class APIUsageStats:
     last_request_time: Optional[datetime] = None
 
 
+T = TypeVar("T")
+
+# Оценка ответа модели, если max_tokens не задан (TPM лимит учитывает и completion)
+DEFAULT_COMPLETION_TOKENS_ESTIMATE = 1000
+
+
+def estimate_request_tokens(messages: Optional[List[Dict[str, Any]]], max_tokens: Optional[int] = None) -> int:
+    """
+    Предварительная оценка токенов запроса для TPM бюджета.
+    
+    Входные токены считаются локальным токенизатором (src/utils/token_budget.py),
+    к ним добавляется ожидаемый размер ответа.
+    """
+    return count_message_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS_ESTIMATE)
+
+
+def _extract_usage(result: Any) -> Any:
+    """usage из ответа OpenAI (в т.ч. ответа instructor)."""
+    return getattr(result, "usage", None) or getattr(getattr(result, "_raw_response", None), "usage", None)
+
+
+def _extract_total_tokens(result: Any) -> Optional[int]:
+    """Фактическое количество токенов из ответа."""
+    usage = _extract_usage(result)
+    return getattr(usage, "total_tokens", None) if usage else None
+
+
+def _retry_after_seconds(error: openai.APIStatusError) -> Optional[float]:
+    """Значение retry-after из заголовков ответа OpenAI (секунды)."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _ensure_no_running_loop() -> None:
+    """Синхронный вызов из event loop заморозил бы его на время ожидания слота."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError("Синхронный вызов OpenAI из event loop: используйте acall или asyncio.to_thread")
+
+
+class RateGovernor:
+    """
+    Регулятор нагрузки на OpenAI API.
+    
+    - RPM/TPM token bucket: запрос ждет, пока в бюджете не хватит запросов и
+      оценочных токенов; после ответа оценка корректируется на фактические токены.
+    - AIMD параллелизм: лимит одновременных запросов растет на 1/limit после
+      успешного ответа и делится пополам при 429; retry-after блокирует выдачу.
+    
+    Потокобезопасен: вызовы идут и из event loop, и из рабочих потоков.
+    """
+    
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, rpm_limit: int, tpm_limit: int, max_concurrency: int, min_concurrency: int = 1):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.concurrency_limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.rate_limited_count = 0
+        self._request_budget = float(rpm_limit)
+        self._token_budget = float(tpm_limit)
+        self._blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm_limit:
+            self._request_budget = min(self.rpm_limit, self._request_budget + elapsed * self.rpm_limit / 60)
+        if self.tpm_limit:
+            self._token_budget = min(self.tpm_limit, self._token_budget + elapsed * self.tpm_limit / 60)
+    
+    def try_acquire(self, estimated_tokens: int) -> float:
+        """Пытается занять слот: 0 — слот получен, иначе сколько секунд подождать."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self.in_flight >= int(self.concurrency_limit):
+                return self.POLL_INTERVAL
+            if self.rpm_limit and self._request_budget < 1:
+                return (1 - self._request_budget) * 60 / self.rpm_limit
+            # Запрос больше всего бюджета ждет полного бакета, а не блокируется навсегда
+            needed_tokens = min(estimated_tokens, self.tpm_limit) if self.tpm_limit else 0
+            if self.tpm_limit and self._token_budget < needed_tokens:
+                return (needed_tokens - self._token_budget) * 60 / self.tpm_limit
+            
+            if self.rpm_limit:
+                self._request_budget -= 1
+            if self.tpm_limit:
+                self._token_budget -= needed_tokens
+            self.in_flight += 1
+            return 0.0
+    
+    def headroom(self) -> float:
+        """Доля свободного бюджета (0..1) с учетом занятых слотов параллелизма."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._blocked_until:
+                return 0.0
+            shares = [1 - self.in_flight / max(1, int(self.concurrency_limit))]
+            if self.rpm_limit:
+                shares.append(self._request_budget / self.rpm_limit)
+            if self.tpm_limit:
+                shares.append(self._token_budget / self.tpm_limit)
+            return max(0.0, min(shares))
+    
+    def release(self, estimated_tokens: int, actual_tokens: Optional[int] = None) -> None:
+        """Освобождает слот и корректирует TPM бюджет по фактическому расходу."""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if self.tpm_limit and actual_tokens is not None:
+                charged = min(estimated_tokens, self.tpm_limit)
+                self._token_budget = min(self.tpm_limit, self._token_budget + charged - actual_tokens)
+    
+    def on_success(self) -> None:
+        """Аддитивное увеличение лимита параллелизма."""
+        with self._lock:
+            self.concurrency_limit = min(
+                self.max_concurrency, self.concurrency_limit + 1 / max(1.0, self.concurrency_limit)
+            )
+    
+    def on_rate_limited(self, pause: float) -> None:
+        """Мультипликативное уменьшение лимита и пауза (карантин) на pause секунд."""
+        with self._lock:
+            self.rate_limited_count += 1
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+    
+    def blocked_for(self) -> float:
+        """Сколько секунд осталось до конца паузы после 429."""
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rpm_limit": self.rpm_limit,
+                "tpm_limit": self.tpm_limit,
+                "concurrency_limit": int(self.concurrency_limit),
+                "in_flight": self.in_flight,
+                "rate_limited": self.rate_limited_count,
+            }
+
+
+@dataclass
+class APIKeySlot:
+    """Ключ OpenAI в пуле: собственный регулятор нагрузки и статистика использования."""
+    name: str
+    governor: RateGovernor
+    api_key: Optional[str] = None       # None — ключ, с которым создан клиент сервиса (OPENAI_API_KEY)
+    organization: Optional[str] = None
+    requests: int = 0
+    failed_requests: int = 0
+    rate_limited: int = 0
+    tokens: int = 0
+    exhausted_until: float = 0.0        # карантин после insufficient_quota
+    
+    def apply(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Подставляет ключ (и организацию) в заголовки запроса, клиент сервиса не меняется."""
+        if not self.api_key:
+            return kwargs
+        headers = {**(kwargs.get("extra_headers") or {}), "Authorization": f"Bearer {self.api_key}"}
+        if self.organization:
+            headers["OpenAI-Organization"] = self.organization
+        return {**kwargs, "extra_headers": headers}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "key": self.name,
+            "organization": self.organization,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "rate_limited": self.rate_limited,
+            "tokens": self.tokens,
+            "headroom": round(self.governor.headroom(), 3),
+            "quarantined_for": round(max(self.governor.blocked_for(), self.exhausted_until - time.monotonic(), 0.0), 1),
+            "governor": self.governor.get_stats(),
+        }
+
+
+class APIKeyPool:
+    """
+    Пул ключей OpenAI (в т.ч. разных организаций).
+    
+    Запрос получает ключ с наибольшим свободным RPM/TPM бюджетом. Ключ,
+    получивший 429, уходит в карантин (retry-after или OPENAI_KEY_QUARANTINE);
+    при исчерпанной квоте — на OPENAI_KEY_QUOTA_QUARANTINE.
+    
+    OPENAI_API_KEYS — ключи через запятую, организация через @: "sk-a,sk-b@org-x".
+    Если не задан, используется один ключ клиента сервиса (OPENAI_API_KEY).
+    """
+    
+    def __init__(self, slots: List[APIKeySlot], quarantine_seconds: float = 5.0, quota_quarantine_seconds: float = 600.0):
+        self.slots = slots
+        self.quarantine_seconds = quarantine_seconds
+        self.quota_quarantine_seconds = quota_quarantine_seconds
+        self.waiting = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls) -> "APIKeyPool":
+        def make_governor() -> RateGovernor:
+            # Лимиты задаются на ключ: у каждой организации собственные RPM/TPM
+            return RateGovernor(
+                rpm_limit=int(os.getenv("OPENAI_RPM_LIMIT", 500)),
+                tpm_limit=int(os.getenv("OPENAI_TPM_LIMIT", 200000)),
+                max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", 8)),
+                min_concurrency=int(os.getenv("OPENAI_MIN_CONCURRENCY", 1))
+            )
+        
+        entries = [entry.strip() for entry in os.getenv("OPENAI_API_KEYS", "").split(",") if entry.strip()]
+        slots = []
+        for entry in entries:
+            api_key, _, organization = entry.partition("@")
+            slots.append(APIKeySlot(
+                name=f"...{api_key[-4:]}", governor=make_governor(),
+                api_key=api_key, organization=organization or None
+            ))
+        if not slots:
+            slots.append(APIKeySlot(name="default", governor=make_governor()))
+        
+        return cls(
+            slots,
+            quarantine_seconds=float(os.getenv("OPENAI_KEY_QUARANTINE", 5)),
+            quota_quarantine_seconds=float(os.getenv("OPENAI_KEY_QUOTA_QUARANTINE", 600))
+        )
+    
+    def try_acquire(self, estimated_tokens: int) -> Tuple[Optional[APIKeySlot], float]:
+        """Занимает слот на ключе с наибольшим запасом: (ключ, 0) или (None, сколько подождать)."""
+        now = time.monotonic()
+        available = [slot for slot in self.slots if slot.exhausted_until <= now]
+        if not available:
+            return None, min(slot.exhausted_until for slot in self.slots) - now
+        
+        best_wait = float("inf")
+        for slot in sorted(available, key=lambda item: item.governor.headroom(), reverse=True):
+            wait = slot.governor.try_acquire(estimated_tokens)
+            if wait <= 0:
+                return slot, 0.0
+            best_wait = min(best_wait, wait)
+        return None, best_wait
+    
+    def _check_queue_timeout(self, started: float, queue_timeout: float) -> None:
+        if queue_timeout and time.monotonic() - started > queue_timeout:
+            raise TimeoutError(f"Превышено время ожидания в очереди OpenAI ({queue_timeout} с)")
+    
+    def acquire(self, estimated_tokens: int, queue_timeout: float = 0) -> APIKeySlot:
+        """Блокирующее ожидание слота (для синхронных вызовов вне event loop)."""
+        started = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                slot, wait = self.try_acquire(estimated_tokens)
+                if slot is not None:
+                    return slot
+                self._check_queue_timeout(started, queue_timeout)
+                time.sleep(min(wait, 1.0))
+        finally:
+            with self._lock:
+                self.waiting -= 1
+    
+    async def acquire_async(self, estimated_tokens: int, queue_timeout: float = 0) -> APIKeySlot:
+        """Асинхронное ожидание слота без блокировки event loop."""
+        started = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                slot, wait = self.try_acquire(estimated_tokens)
+                if slot is not None:
+                    return slot
+                self._check_queue_timeout(started, queue_timeout)
+                await asyncio.sleep(min(wait, 1.0))
+        finally:
+            with self._lock:
+                self.waiting -= 1
+    
+    def release(self, slot: APIKeySlot, estimated_tokens: int, actual_tokens: Optional[int], success: bool) -> None:
+        """Освобождает слот ключа и обновляет его статистику."""
+        slot.governor.release(estimated_tokens, actual_tokens)
+        with self._lock:
+            slot.requests += 1
+            if success:
+                slot.tokens += actual_tokens or 0
+            else:
+                slot.failed_requests += 1
+    
+    def on_rate_limited(self, slot: APIKeySlot, error: openai.RateLimitError) -> None:
+        """Карантин ключа после 429."""
+        with self._lock:
+            slot.rate_limited += 1
+        if getattr(error, "code", None) == "insufficient_quota":
+            slot.exhausted_until = time.monotonic() + self.quota_quarantine_seconds
+            logger.error(f"Квота ключа OpenAI {slot.name} исчерпана, карантин {self.quota_quarantine_seconds:.0f} с")
+            return
+        pause = _retry_after_seconds(error) or self.quarantine_seconds
+        slot.governor.on_rate_limited(pause)
+        logger.warning(
+            f"OpenAI 429 на ключе {slot.name}: лимит параллелизма снижен до "
+            f"{int(slot.governor.concurrency_limit)}, карантин {pause:.1f} с"
+        )
+    
+    def has_usable_keys(self) -> bool:
+        """Есть ли ключи не в карантине по исчерпанной квоте."""
+        now = time.monotonic()
+        return any(slot.exhausted_until <= now for slot in self.slots)
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [slot.get_stats() for slot in self.slots]
+
+
 class OpenAIController:
     """Контроллер для управления доступом к OpenAI API"""
     
     def __init__(self):
         self.enabled = self._get_api_enabled_flag()
         self.usage_stats = APIUsageStats()
-        logger.info(f"OpenAI API контроллер инициализирован. Статус: {'ВКЛЮЧЕН' if self.enabled else 'ВЫКЛЮЧЕН'}")
+        self.key_pool = APIKeyPool.from_env()
+        self.queue_timeout = float(os.getenv("OPENAI_QUEUE_TIMEOUT", 300))
+        self.max_rate_limit_retries = int(os.getenv("OPENAI_RATE_LIMIT_RETRIES", 6))
+        self.policy = ResiliencePolicy()
+        self.router = ModelRouter.from_env()
+        logger.info(
+            f"OpenAI API контроллер инициализирован. Статус: {'ВКЛЮЧЕН' if self.enabled else 'ВЫКЛЮЧЕН'}, "
+            f"ключей в пуле: {len(self.key_pool.slots)}"
+        )
     
     def _get_api_enabled_flag(self) -> bool:
         """Получить флаг разрешения использования OpenAI API"""
@@ -56,6 +401,266 @@ class OpenAIController:
             self.usage_stats.failed_requests += 1
             logger.warning(f"OpenAI API запрос неудачен: {error}")
     
+    def _is_retryable_rate_limit(self, error: openai.RateLimitError, attempt: int) -> bool:
+        """429 из-за исчерпанной квоты лечится только другим ключом пула, иначе ошибка пробрасывается сразу."""
+        if getattr(error, "code", None) == "insufficient_quota" and not self.key_pool.has_usable_keys():
+            return False
+        return attempt < self.max_rate_limit_retries
+    
+    def _remaining(self, deadline: float) -> float:
+        """Оставшееся до дедлайна время; по истечении — TimeoutError."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Превышен дедлайн вызова OpenAI ({self.policy.deadline} с)")
+        return remaining
+    
+    def _queue_timeout(self, deadline: float) -> float:
+        remaining = self._remaining(deadline)
+        return min(self.queue_timeout, remaining) if self.queue_timeout else remaining
+    
+    def _with_timeout(self, kwargs: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        """Таймаут HTTP запроса не больше остатка дедлайна вызова."""
+        remaining = self._remaining(deadline)
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, (int, float)):
+            remaining = min(remaining, float(timeout))
+        return {**kwargs, "timeout": remaining}
+    
+    def _on_result(self, slot: APIKeySlot, result: Any, key: str, started: float) -> Optional[int]:
+        self.policy.latency.observe(key, time.monotonic() - started)
+        slot.governor.on_success()
+        return _extract_total_tokens(result)
+    
+    def _attempt_sync(self, fn: Callable[..., T], kwargs: Dict[str, Any], estimated: int, deadline: float, key: str) -> T:
+        """Одна попытка синхронного вызова через пул ключей."""
+        slot = self.key_pool.acquire(estimated, self._queue_timeout(deadline))
+        actual_tokens = None
+        success = False
+        try:
+            started = time.monotonic()
+            result = fn(**slot.apply(self._with_timeout(kwargs, deadline)))
+            actual_tokens = self._on_result(slot, result, key, started)
+            success = True
+            return result
+        except openai.RateLimitError as e:
+            self.key_pool.on_rate_limited(slot, e)
+            raise
+        finally:
+            self.key_pool.release(slot, estimated, actual_tokens, success)
+    
+    async def _single_async(
+        self, fn: Callable[..., T], kwargs: Dict[str, Any], estimated: int, deadline: float, key: str,
+        slot: Optional[APIKeySlot] = None
+    ) -> T:
+        """Один асинхронный запрос (слот ключа может быть уже занят вызывающим кодом)."""
+        if slot is None:
+            slot = await self.key_pool.acquire_async(estimated, self._queue_timeout(deadline))
+        actual_tokens = None
+        success = False
+        try:
+            started = time.monotonic()
+            result = await asyncio.to_thread(fn, **slot.apply(self._with_timeout(kwargs, deadline)))
+            actual_tokens = self._on_result(slot, result, key, started)
+            success = True
+            return result
+        except openai.RateLimitError as e:
+            self.key_pool.on_rate_limited(slot, e)
+            raise
+        finally:
+            self.key_pool.release(slot, estimated, actual_tokens, success)
+    
+    async def _attempt_async(self, fn: Callable[..., T], kwargs: Dict[str, Any], estimated: int, deadline: float, key: str) -> T:
+        """
+        Одна попытка асинхронного вызова с hedging.
+        
+        Если ответ не пришел за p95 латентности этой функции, отправляется
+        дублирующий запрос (только при свободном слоте в пуле ключей); побеждает
+        первый успешный ответ, второй дорабатывает в фоне и игнорируется.
+        """
+        threshold = self.policy.hedge_threshold(key)
+        if threshold is None:
+            return await self._single_async(fn, kwargs, estimated, deadline, key)
+        
+        primary = asyncio.ensure_future(self._single_async(fn, kwargs, estimated, deadline, key))
+        done, _ = await asyncio.wait({primary}, timeout=threshold)
+        if done:
+            return await primary
+        hedge_slot, _ = self.key_pool.try_acquire(estimated)
+        if hedge_slot is None:
+            return await primary
+        
+        self.policy.record_hedge()
+        logger.info(f"Ответ OpenAI ({key}) дольше p95 {threshold:.1f} с, отправлен дублирующий запрос")
+        hedge = asyncio.ensure_future(self._single_async(fn, kwargs, estimated, deadline, key, slot=hedge_slot))
+        
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.policy.record_hedge(won=True)
+                        return task.result()
+                    first_error = first_error or task.exception()
+        finally:
+            for task in pending:
+                # Результат проигравшего запроса не нужен, но исключение не должно теряться в логах loop
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        raise first_error
+    
+    def _should_retry(self, error: Exception, attempt: int, rate_limited: int, deadline: float) -> Optional[float]:
+        """Решение о повторе: задержка перед повтором или None (ошибка пробрасывается)."""
+        error_class = classify_error(error)
+        if error_class == ERROR_RATE_LIMITED:
+            # Пауза по retry-after уже выставлена в регуляторе, запрос просто возвращается в очередь
+            if not self._is_retryable_rate_limit(error, rate_limited):
+                return None
+            logger.info(f"Запрос к OpenAI возвращен в очередь после 429 (попытка {rate_limited})")
+            return 0.0
+        if not self.policy.should_retry(error, attempt):
+            return None
+        delay = self.policy.backoff_delay(attempt)
+        if time.monotonic() + delay >= deadline:
+            return None
+        self.policy.record_retry()
+        logger.warning(f"Временная ошибка OpenAI ({type(error).__name__}: {error}), повтор {attempt} через {delay:.1f} с")
+        return delay
+    
+    def _execute(self, fn: Callable[..., T], kwargs: Dict[str, Any], deadline: float, key: str) -> T:
+        """Синхронный вызов с повторами по политике устойчивости."""
+        estimated = estimate_request_tokens(kwargs.get("messages"), kwargs.get("max_tokens"))
+        attempt = rate_limited = 0
+        while True:
+            try:
+                return self._attempt_sync(fn, kwargs, estimated, deadline, key)
+            except Exception as e:
+                if isinstance(e, openai.RateLimitError):
+                    rate_limited += 1
+                else:
+                    attempt += 1
+                delay = self._should_retry(e, attempt, rate_limited, deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+    
+    async def _execute_async(self, fn: Callable[..., T], kwargs: Dict[str, Any], deadline: float, key: str) -> T:
+        """Асинхронный вызов с повторами и hedging по политике устойчивости."""
+        estimated = estimate_request_tokens(kwargs.get("messages"), kwargs.get("max_tokens"))
+        attempt = rate_limited = 0
+        while True:
+            try:
+                return await self._attempt_async(fn, kwargs, estimated, deadline, key)
+            except Exception as e:
+                if isinstance(e, openai.RateLimitError):
+                    rate_limited += 1
+                else:
+                    attempt += 1
+                delay = self._should_retry(e, attempt, rate_limited, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+    
+    def _record_route(self, span: Any, feature: str, model: str, started: float,
+                      result: Any = None, error: bool = False, fallback: bool = False) -> None:
+        """Токены в спан llm.completion и статистика маршрута."""
+        usage = _extract_usage(result)
+        span.add_tokens(usage)
+        self.router.record(feature, model, time.monotonic() - started, usage, error=error, fallback=fallback)
+    
+    def _plan_route(self, feature: str, kwargs: Dict[str, Any], deadline: float):
+        """Модель основного вызова, резервная модель и дедлайн основного вызова."""
+        route = self.router.resolve(feature)
+        if route is None:
+            return kwargs, None, deadline
+        fallback = route.resolve_fallback(kwargs.get("model"))
+        primary_deadline = deadline
+        if fallback and route.latency_slo:
+            primary_deadline = min(deadline, time.monotonic() + route.latency_slo)
+        return {**kwargs, "model": route.model}, fallback, primary_deadline
+    
+    def _log_fallback(self, feature: str, kwargs: Dict[str, Any], fallback: str, error: Exception) -> None:
+        logger.warning(
+            f"Модель {kwargs.get('model')} для {feature} не ответила в срок или с ошибкой "
+            f"({type(error).__name__}: {error}), запрос переключен на {fallback}"
+        )
+    
+    def _call_route(self, fn: Callable[..., T], feature: str, kwargs: Dict[str, Any], deadline: float, fallback: bool = False) -> T:
+        model = kwargs.get("model", "")
+        with trace_span("llm.completion", feature=feature, model=model, fallback=fallback) as span:
+            started = time.monotonic()
+            try:
+                result = self._execute(fn, kwargs, deadline, f"{feature}:{model}")
+            except Exception:
+                self._record_route(span, feature, model, started, error=True, fallback=fallback)
+                raise
+            self._record_route(span, feature, model, started, result, fallback=fallback)
+            return result
+    
+    async def _acall_route(self, fn: Callable[..., T], feature: str, kwargs: Dict[str, Any], deadline: float, fallback: bool = False) -> T:
+        model = kwargs.get("model", "")
+        with trace_span("llm.completion", feature=feature, model=model, fallback=fallback) as span:
+            started = time.monotonic()
+            try:
+                result = await self._execute_async(fn, kwargs, deadline, f"{feature}:{model}")
+            except Exception:
+                self._record_route(span, feature, model, started, error=True, fallback=fallback)
+                raise
+            self._record_route(span, feature, model, started, result, fallback=fallback)
+            return result
+    
+    def call(self, fn: Callable[..., T], feature: Optional[str] = None, **kwargs) -> T:
+        """
+        Синхронный вызов OpenAI через маршрутизатор моделей, регулятор нагрузки
+        и политику устойчивости. feature — точка вызова (ключ таблицы маршрутов).
+        
+        Ожидание слота и пауз между повторами блокирует поток: из event loop
+        вызывается только через asyncio.to_thread (иначе — acall).
+        
+        Пример:
+            completion = openai_controller.call(self.client.chat.completions.create, feature="parsers.parse_text_to_resume", model=..., messages=...)
+        """
+        _ensure_no_running_loop()
+        self.check_api_permission()
+        feature = feature or getattr(fn, "__qualname__", "llm")
+        kwargs = plan_completion(feature, kwargs)
+        deadline = time.monotonic() + self.policy.deadline
+        primary_kwargs, fallback, primary_deadline = self._plan_route(feature, kwargs, deadline)
+        try:
+            return self._call_route(fn, feature, primary_kwargs, primary_deadline)
+        except Exception as e:
+            if fallback is None:
+                raise
+            self._log_fallback(feature, primary_kwargs, fallback, e)
+            return self._call_route(fn, feature, {**kwargs, "model": fallback}, deadline, fallback=True)
+    
+    async def acall(self, fn: Callable[..., T], feature: Optional[str] = None, **kwargs) -> T:
+        """
+        Асинхронный вызов OpenAI через маршрутизатор моделей, регулятор нагрузки
+        и политику устойчивости. feature — точка вызова (ключ таблицы маршрутов).
+        
+        Ожидание бюджета не блокирует event loop, синхронный клиент OpenAI
+        выполняется в рабочем потоке. При 429 запрос возвращается в очередь,
+        временные ошибки повторяются с задержкой, медленные ответы дублируются,
+        при ошибке или нарушении SLO основной модели используется резервная.
+        
+        Пример:
+            completion = await openai_controller.acall(self.client.beta.chat.completions.parse, feature="llm_gap_analyzer.gap_analysis", model=..., messages=...)
+        """
+        self.check_api_permission()
+        feature = feature or getattr(fn, "__qualname__", "llm")
+        kwargs = plan_completion(feature, kwargs)
+        deadline = time.monotonic() + self.policy.deadline
+        primary_kwargs, fallback, primary_deadline = self._plan_route(feature, kwargs, deadline)
+        try:
+            return await self._acall_route(fn, feature, primary_kwargs, primary_deadline)
+        except Exception as e:
+            if fallback is None:
+                raise
+            self._log_fallback(feature, primary_kwargs, fallback, e)
+            return await self._acall_route(fn, feature, {**kwargs, "model": fallback}, deadline, fallback=True)
+    
     def get_usage_stats(self) -> Dict[str, Any]:
         """Получить статистику использования API"""
         return {
@@ -71,7 +676,12 @@ class OpenAIController:
             "last_request_time": (
                 self.usage_stats.last_request_time.isoformat()
                 if self.usage_stats.last_request_time else None
-            )
+            ),
+            "queue_waiting": self.key_pool.waiting,
+            "api_keys": self.key_pool.get_stats(),
+            "resilience": self.policy.get_stats(),
+            "routes": self.router.get_stats(),
+            "transport": get_transport_stats()
         }
     
     def toggle_api(self, enabled: bool) -> None:
@@ -0,0 +1,389 @@
+# src/security/openai_transport.py
+"""
+Подменяемый HTTP транспорт клиентов OpenAI для офлайн запусков и бенчмарков.
+
+Режим задается переменной OPENAI_TRANSPORT_MODE:
+    live       — обычные запросы к API OpenAI (по умолчанию)
+    record     — реальные запросы с сохранением ответов в кассеты
+    replay     — ответы из кассет по хэшу запроса; при промахе — синтетический
+                 ответ (OPENAI_REPLAY_MISS=synthetic) или ошибка 404 (error)
+    synthetic  — синтетические ответы без сети
+
+Кассета — JSON файл <хэш запроса>.json в OPENAI_CASSETTE_DIR (tests/cassettes).
+Хэш считается по телу запроса без полей, не влияющих на ответ (max_tokens, user).
+
+Синтетический ответ строится по схеме ответа запроса (response_format или tool
+instructor). Для схем с сохраненными ответами (tests/debug_*/debug_response_*.json)
+за основу берется сохраненный ответ, приведенный к текущей схеме. Для текстовых
+запросов с блоком «Формат ответа» заполняются ожидаемые ключи (SCORE:, EVIDENCE: ...).
+
+Латентность:
+    replay    — записанная длительность ответа
+    synthetic — логнормальная задержка до первого токена (OPENAI_SYNTHETIC_TTFT,
+                OPENAI_SYNTHETIC_SIGMA) плюс генерация со скоростью
+                OPENAI_SYNTHETIC_TOKENS_PER_SECOND
+    Обе умножаются на OPENAI_TRANSPORT_LATENCY_SCALE (0 — без задержек, для CI).
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.utils import get_logger, current_span
+from src.utils.token_budget import count_message_tokens, count_tokens
+
+logger = get_logger()
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODE_SYNTHETIC = "synthetic"
+TRANSPORT_MODES = (MODE_LIVE, MODE_RECORD, MODE_REPLAY, MODE_SYNTHETIC)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Поля тела запроса, не влияющие на содержание ответа
+IGNORED_REQUEST_FIELDS = {"max_tokens", "max_completion_tokens", "user", "stream_options"}
+
+# Сохраненные ответы моделей по имени схемы ответа
+SYNTHETIC_FIXTURES = {
+    "EnhancedResumeTailoringAnalysis": "tests/debug_gap/debug_response_gap.json",
+    "EnhancedCoverLetter": "tests/debug_cover/debug_response_cover_letter.json",
+    "ProfessionalInterviewChecklist": "tests/debug_interview_checklist/debug_response_interview_checklist.json",
+}
+
+SYNTHETIC_TEXT = (
+    "Синтетический ответ модели для офлайн запуска. Кандидат уверенно описывает опыт, "
+    "приводит примеры из проектов и объясняет принятые технические решения."
+)
+
+
+def request_hash(body: Dict[str, Any]) -> str:
+    """Хэш запроса к OpenAI для поиска кассеты."""
+    significant = {key: value for key, value in body.items() if key not in IGNORED_REQUEST_FIELDS}
+    canonical = json.dumps(significant, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+# ================== СИНТЕТИЧЕСКИЕ ДАННЫЕ ПО СХЕМЕ ==================
+
+def _resolve_ref(schema: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    while "$ref" in schema:
+        schema = defs.get(schema["$ref"].rsplit("/", 1)[-1], {})
+    return schema
+
+
+def _matches_type(value: Any, schema_type: Any) -> bool:
+    checks = {
+        "object": lambda v: isinstance(v, dict),
+        "array": lambda v: isinstance(v, list),
+        "string": lambda v: isinstance(v, str),
+        "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+        "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+        "boolean": lambda v: isinstance(v, bool),
+        "null": lambda v: v is None,
+    }
+    types = schema_type if isinstance(schema_type, list) else [schema_type]
+    return any(checks.get(item, lambda v: False)(value) for item in types)
+
+
+def conform_to_schema(schema: Dict[str, Any], defs: Dict[str, Any], sample: Any = None, depth: int = 0) -> Any:
+    """
+    Значение, удовлетворяющее JSON схеме.
+
+    sample (сохраненный ответ) используется везде, где он подходит под схему;
+    недостающие и устаревшие части генерируются.
+    """
+    schema = _resolve_ref(schema, defs)
+
+    variants = schema.get("anyOf") or schema.get("oneOf")
+    if variants:
+        resolved = [_resolve_ref(variant, defs) for variant in variants]
+        for variant in resolved:
+            if sample is not None and _matches_type(sample, variant.get("type")) and \
+                    ("enum" not in variant or sample in variant["enum"]):
+                return conform_to_schema(variant, defs, sample, depth)
+        non_null = [variant for variant in resolved if variant.get("type") != "null"]
+        if depth > 6 and len(non_null) < len(resolved):
+            return None
+        return conform_to_schema(non_null[0] if non_null else resolved[0], defs, None, depth)
+
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return sample if sample in schema["enum"] else schema["enum"][0]
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        if sample is not None and _matches_type(sample, schema_type):
+            schema_type = next(item for item in schema_type if _matches_type(sample, item))
+        else:
+            schema_type = next((item for item in schema_type if item != "null"), "null")
+    if schema_type is None:
+        schema_type = "object" if "properties" in schema else "string"
+
+    if schema_type == "object":
+        sample = sample if isinstance(sample, dict) else {}
+        return {
+            name: conform_to_schema(prop, defs, sample.get(name), depth + 1)
+            for name, prop in schema.get("properties", {}).items()
+        }
+
+    if schema_type == "array":
+        items = schema.get("items", {})
+        min_items = schema.get("minItems", 1 if depth <= 6 else 0)
+        max_items = schema.get("maxItems", max(min_items, 3))
+        values = sample if isinstance(sample, list) else []
+        result = [conform_to_schema(items, defs, value, depth + 1) for value in values[:max_items]]
+        while len(result) < min_items:
+            result.append(conform_to_schema(items, defs, None, depth + 1))
+        return result
+
+    if schema_type == "string":
+        value = sample if isinstance(sample, str) else "Синтетическое значение"
+        value = value.ljust(schema.get("minLength", 0), ".")
+        return value[:schema["maxLength"]] if "maxLength" in schema else value
+
+    if schema_type in ("integer", "number"):
+        if _matches_type(sample, schema_type):
+            value = sample
+        else:
+            value = schema.get("minimum", schema.get("exclusiveMinimum", 0) + 1)
+        if "maximum" in schema:
+            value = min(value, schema["maximum"])
+        return int(value) if schema_type == "integer" else value
+
+    if schema_type == "boolean":
+        return sample if isinstance(sample, bool) else True
+
+    return None
+
+
+def synthetic_text(messages: List[Dict[str, Any]]) -> str:
+    """Текстовый ответ; ключи из блока «Формат ответа» промпта заполняются значениями."""
+    prompt = str((messages or [{}])[-1].get("content") or "")
+    keys = re.findall(r"^([A-Z_]{3,}):\s*\[([^\]]*)\]", prompt, re.MULTILINE)
+    if not keys:
+        return SYNTHETIC_TEXT
+    lines = []
+    for key, hint in keys:
+        value = "4" if "числ" in hint or key == "SCORE" else SYNTHETIC_TEXT
+        lines.append(f"{key}: {value}")
+    return "\n".join(lines)
+
+
+# ================== ТРАНСПОРТ ==================
+
+class LLMTransport(httpx.BaseTransport):
+    """httpx транспорт клиентов OpenAI: запись, воспроизведение и синтетические ответы."""
+
+    def __init__(self, mode: str, cassette_dir: Path, replay_miss: str = MODE_SYNTHETIC,
+                 latency_scale: float = 1.0, ttft: float = 0.8, sigma: float = 0.35,
+                 tokens_per_second: float = 80.0):
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.replay_miss = replay_miss
+        self.latency_scale = latency_scale
+        self.ttft = ttft
+        self.sigma = sigma
+        self.tokens_per_second = tokens_per_second
+        self._live = httpx.HTTPTransport() if mode == MODE_RECORD else None
+        self._fixtures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "replay_misses": 0, "synthetic": 0}
+
+    @classmethod
+    def from_env(cls, mode: str) -> "LLMTransport":
+        cassette_dir = Path(os.getenv("OPENAI_CASSETTE_DIR", PROJECT_ROOT / "tests" / "cassettes"))
+        return cls(
+            mode=mode,
+            cassette_dir=cassette_dir,
+            replay_miss=os.getenv("OPENAI_REPLAY_MISS", MODE_SYNTHETIC).lower(),
+            latency_scale=float(os.getenv("OPENAI_TRANSPORT_LATENCY_SCALE", 1.0)),
+            ttft=float(os.getenv("OPENAI_SYNTHETIC_TTFT", 0.8)),
+            sigma=float(os.getenv("OPENAI_SYNTHETIC_SIGMA", 0.35)),
+            tokens_per_second=float(os.getenv("OPENAI_SYNTHETIC_TOKENS_PER_SECOND", 80)),
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b"{}")
+        key = request_hash({"path": request.url.path, **body})
+
+        if self.mode == MODE_RECORD:
+            return self._record(request, body, key)
+
+        if self.mode == MODE_REPLAY:
+            cassette = self._load_cassette(key)
+            if cassette is not None:
+                self._count("replayed")
+                self._sleep(cassette.get("duration", 0))
+                response = cassette["response"]
+                return httpx.Response(response["status"], json=response["body"], request=request)
+            self._count("replay_misses")
+            if self.replay_miss != MODE_SYNTHETIC:
+                logger.warning(f"Кассета OpenAI {key} не найдена ({self._feature()})")
+                return httpx.Response(404, json={"error": {
+                    "message": f"Cassette {key} not found", "type": "cassette_miss", "code": "cassette_miss"
+                }}, request=request)
+
+        return self._synthetic(request, body, key)
+
+    # ---------- запись и воспроизведение ----------
+
+    def _cassette_path(self, key: str) -> Path:
+        return self.cassette_dir / f"{key}.json"
+
+    def _load_cassette(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._cassette_path(key)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.error(f"Поврежденная кассета OpenAI {path}: {e}")
+            return None
+
+    def _record(self, request: httpx.Request, body: Dict[str, Any], key: str) -> httpx.Response:
+        started = time.monotonic()
+        live_response = self._live.handle_request(request)
+        content = live_response.read()
+        duration = time.monotonic() - started
+        # Тело уже распаковано, заголовки сжатия и длины не переносятся
+        headers = {name: value for name, value in live_response.headers.items()
+                   if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        if live_response.status_code < 400:
+            cassette = {
+                "key": key,
+                "feature": self._feature(),
+                "request": {"path": request.url.path, "model": body.get("model")},
+                "duration": round(duration, 3),
+                "response": {"status": live_response.status_code, "body": json.loads(content)},
+            }
+            self.cassette_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._cassette_path(key).with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(cassette, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self._cassette_path(key))
+            self._count("recorded")
+            logger.info(f"Записана кассета OpenAI {key} ({cassette['feature']}, {duration:.2f} с)")
+        return httpx.Response(live_response.status_code, headers=headers, content=content, request=request)
+
+    # ---------- синтетические ответы ----------
+
+    def _fixture(self, schema_name: str) -> Any:
+        with self._lock:
+            if schema_name not in self._fixtures:
+                path = SYNTHETIC_FIXTURES.get(schema_name)
+                data = None
+                if path:
+                    try:
+                        data = json.loads((PROJECT_ROOT / path).read_text(encoding="utf-8"))
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Сохраненный ответ {path} недоступен: {e}")
+                self._fixtures[schema_name] = data
+            return self._fixtures[schema_name]
+
+    def _structured_content(self, name: str, schema: Dict[str, Any]) -> str:
+        value = conform_to_schema(schema, schema.get("$defs", {}), self._fixture(name))
+        return json.dumps(value, ensure_ascii=False)
+
+    def _synthetic(self, request: httpx.Request, body: Dict[str, Any], key: str) -> httpx.Response:
+        messages = body.get("messages") or []
+        message: Dict[str, Any] = {"role": "assistant", "content": None, "refusal": None}
+        finish_reason = "stop"
+
+        response_format = body.get("response_format") or {}
+        tools = body.get("tools") or []
+        if response_format.get("type") == "json_schema":
+            json_schema = response_format.get("json_schema", {})
+            message["content"] = self._structured_content(json_schema.get("name", ""), json_schema.get("schema", {}))
+            generated = message["content"]
+        elif tools:
+            function = tools[0].get("function", {})
+            arguments = self._structured_content(function.get("name", ""), function.get("parameters", {}))
+            message["tool_calls"] = [{
+                "id": f"call_{key[:24]}", "type": "function",
+                "function": {"name": function.get("name", ""), "arguments": arguments},
+            }]
+            finish_reason = "tool_calls"
+            generated = arguments
+        else:
+            message["content"] = synthetic_text(messages)
+            generated = message["content"]
+
+        prompt_tokens = count_message_tokens(messages)
+        completion_tokens = count_tokens(generated)
+        self._count("synthetic")
+        self._sleep(random.lognormvariate(0, self.sigma) * self.ttft + completion_tokens / self.tokens_per_second)
+
+        return httpx.Response(200, json={
+            "id": f"chatcmpl-synthetic-{key[:16]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "synthetic"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        }, request=request)
+
+    # ---------- служебное ----------
+
+    def _sleep(self, seconds: float) -> None:
+        if self.latency_scale > 0 and seconds > 0:
+            time.sleep(seconds * self.latency_scale)
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.stats[kind] += 1
+
+    @staticmethod
+    def _feature() -> str:
+        return getattr(current_span(), "attributes", {}).get("feature", "unknown")
+
+    def close(self) -> None:
+        if self._live is not None:
+            self._live.close()
+
+
+_http_client: Optional[httpx.Client] = None
+_transport: Optional[LLMTransport] = None
+_client_lock = threading.Lock()
+
+
+def get_openai_http_client() -> Optional[httpx.Client]:
+    """
+    Общий httpx клиент для OpenAI(http_client=...) по OPENAI_TRANSPORT_MODE.
+
+    В режиме live возвращает None — клиент OpenAI использует стандартный транспорт.
+    """
+    global _http_client, _transport
+    mode = os.getenv("OPENAI_TRANSPORT_MODE", MODE_LIVE).lower()
+    if mode == MODE_LIVE:
+        return None
+    if mode not in TRANSPORT_MODES:
+        logger.error(f"Неизвестный OPENAI_TRANSPORT_MODE={mode}, используются реальные запросы")
+        return None
+    with _client_lock:
+        if _http_client is None:
+            _transport = LLMTransport.from_env(mode)
+            _http_client = httpx.Client(transport=_transport, timeout=httpx.Timeout(600, connect=5))
+            logger.warning(f"Транспорт OpenAI в режиме {mode}: кассеты в {_transport.cassette_dir}")
+        return _http_client
+
+
+def get_transport_stats() -> Optional[Dict[str, Any]]:
+    """Счетчики транспорта (None в режиме live)."""
+    if _transport is None:
+        return None
+    return {"mode": _transport.mode, **_transport.stats}
@@ -0,0 +1 @@
+from src.services.container import ServiceContainer, lazy_service, services
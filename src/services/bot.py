@@ -0,0 +1,54 @@
+# src/services/bot.py
+"""
+Внедрение контейнера сервисов в обработчики aiogram.
+
+Middleware кладет контейнер в данные обработчика под именем services: его
+получает любой обработчик с параметром services и передает дальше в
+специализированные обработчики.
+
+Пример:
+    dp.update.outer_middleware(ServicesMiddleware(services))
+
+    async def handle_gap_analysis_button(message, state, services: ServiceContainer):
+        await start_gap_analysis(message, state, services)
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.services.container import ServiceContainer
+
+# Сервисы, которые использует бот (прогрев при запуске)
+BOT_SERVICES = [
+    "hh_auth_service",
+    "token_exchanger",
+    "resume_extractor",
+    "vacancy_extractor",
+    "llm_gap_analyzer",
+    "cover_letter_generator",
+    "checklist_generator",
+    "interview_simulator",
+]
+
+
+def hh_user_key(user_id: int) -> str:
+    """Ключ токенов HH пользователя бота в хранилище (services.hh_tokens)."""
+    return f"tg:{user_id}"
+
+
+class ServicesMiddleware(BaseMiddleware):
+    """Передает контейнер сервисов в обработчики (data["services"])."""
+
+    def __init__(self, container: ServiceContainer):
+        self.container = container
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        data["services"] = self.container
+        return await handler(event, data)
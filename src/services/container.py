@@ -0,0 +1,341 @@
+# src/services/container.py
+"""
+Контейнер сервисов процесса с ленивым созданием.
+
+Один контейнер на процесс (веб-приложения и Telegram бот) владеет общими
+ресурсами: клиентом OpenAI с его пулом соединений, шлюзом LLM (openai_controller),
+пулом соединений aiohttp к HH, хранилищем токенов HH пользователей, сервисом
+рендеринга PDF с кэшем и сервисами поверх них. Обработчики получают контейнер через зависимость FastAPI
+(src/services/web.py) или middleware aiogram (src/services/bot.py), а не
+создают собственные экземпляры сервисов.
+
+Сервисы и их тяжелые зависимости (openai, instructor, pdfplumber, настройки
+пакетов из .env) импортируются и создаются при первом обращении к атрибуту
+контейнера, а не при импорте приложения, — процесс раньше начинает отвечать
+на /health.
+
+Прогрев создает все сервисы заранее в потоке (lifespan FastAPI), чтобы первый
+пользовательский запрос не платил за импорт. Режим задается APP_WARMUP:
+    background — прогрев через APP_WARMUP_DELAY секунд после старта, /health
+                 отвечает сразу (по умолчанию; задержка нужна, чтобы импорт
+                 в потоке прогрева не конкурировал за GIL с запуском сервера)
+    blocking   — приложение начинает принимать запросы после прогрева
+    none       — без прогрева, сервисы создаются при первом запросе
+
+Пример:
+    from src.services import services
+
+    parsed = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, path)    # синхронный вызов — вне event loop
+    vacancy = await services.hh_client(access_token, refresh_token).request("vacancies/1")
+    hh_client = await services.hh_user_client("tg:42")    # токены из хранилища пользователей
+    services.warm_up()      # создать все сервисы (блокирующий вызов)
+    services.stats()        # состояние прогрева и время создания сервисов
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils import get_logger
+
+logger = get_logger()
+
+WARMUP_MODES = ("background", "blocking", "none")
+# Ожидание закрытия сессии HH другого работающего event loop при остановке, секунд
+HTTP_SESSION_CLOSE_TIMEOUT = 5
+
+
+class lazy_service:
+    """
+    Дескриптор сервиса контейнера: фабрика вызывается один раз при первом обращении.
+
+    Создание защищено блокировкой этого сервиса: параллельные обращения (поток
+    прогрева и обработчик запроса) получают один и тот же экземпляр, а
+    блокировка контейнера берется лишь на время публикации экземпляра, так что
+    stats() (/health) не ждет создания сервисов.
+    """
+
+    def __init__(self, factory: Callable[[Any], Any]):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, container, owner=None):
+        if container is None:
+            return self
+        instance = container._instances.get(self.name)
+        if instance is None:
+            instance = container._create(self.name, self.factory)
+        return instance
+
+
+class ServiceContainer:
+    """Сервисы процесса, создаваемые при первом обращении."""
+
+    def __init__(self):
+        self.warmup_mode = os.getenv("APP_WARMUP", "background").lower()
+        if self.warmup_mode not in WARMUP_MODES:
+            logger.warning(f"Неизвестный режим APP_WARMUP={self.warmup_mode}, используется background")
+            self.warmup_mode = "background"
+        self.warmup_delay = float(os.getenv("APP_WARMUP_DELAY", 1.0))
+        self.warmup_state = "disabled" if self.warmup_mode == "none" else "pending"
+        self._instances: Dict[str, Any] = {}
+        self._build_ms: Dict[str, float] = {}
+        # Короткая блокировка словарей контейнера; создание сервиса — под блокировкой сервиса
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Сессии aiohttp к HH по event loop (сессия привязана к loop, в котором создана)
+        self._http_sessions: Dict[asyncio.AbstractEventLoop, Any] = {}
+        # Блокировка словаря сессий HH
+        self._http_lock = threading.Lock()
+
+    # ---------- общие ресурсы ----------
+
+    @lazy_service
+    def openai_client(self):
+        """Клиент OpenAI всех LLM сервисов процесса: один пул соединений вместо клиента на сервис."""
+        from openai import OpenAI
+        from src.security.openai_transport import get_openai_http_client
+        return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0, http_client=get_openai_http_client())
+
+    @lazy_service
+    def llm_gateway(self):
+        """Шлюз вызовов LLM: маршрутизация моделей, лимиты ключей, повторы."""
+        from src.security.openai_control import openai_controller
+        return openai_controller
+
+    @lazy_service
+    def pdf_renderer(self):
+        """Рендеринг PDF отчетов в пуле процессов с кэшем готовых файлов."""
+        from src.web_app.pdf_rendering import pdf_render_service
+        return pdf_render_service
+
+    def http_session(self):
+        """
+        Общая сессия aiohttp к HH для текущего event loop (пул соединений).
+
+        Сессия привязана к event loop, в котором создана, поэтому создается при
+        первом запросе внутри loop, а не при прогреве в потоке. У каждого loop
+        своя сессия, все они закрываются в shutdown(); сессии уже закрытых loop
+        отсоединяются при создании новой (await close() в них невозможен,
+        соединения освобождаются вместе с транспортами loop).
+        """
+        import aiohttp
+        from src.hh.config import settings as hh_settings
+
+        loop = asyncio.get_running_loop()
+        with self._http_lock:
+            session = self._http_sessions.get(loop)
+            if session is None or session.closed:
+                self._detach_stale_http_sessions()
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=hh_settings.http_pool_limit)
+                )
+                self._http_sessions[loop] = session
+        return session
+
+    def _detach_stale_http_sessions(self) -> None:
+        """Отсоединить сессии закрытых event loop."""
+        for loop, session in list(self._http_sessions.items()):
+            if loop.is_closed():
+                del self._http_sessions[loop]
+                session.detach()
+
+    def hh_client(self, access_token: str, refresh_token: str, renew_tokens=None):
+        """Клиент HH API пользователя поверх общего пула соединений."""
+        from src.hh.api_client import HHApiClient
+        return HHApiClient(access_token, refresh_token, session=self.http_session(), renew_tokens=renew_tokens)
+
+    @lazy_service
+    def hh_tokens(self):
+        """Хранилище токенов HH пользователей (зашифрованная SQLite база) с фоновым обновлением."""
+        from src.hh.token_store import HHTokenStore
+        return HHTokenStore(session_factory=self.http_session)
+
+    async def hh_user_client(self, user_key: str):
+        """
+        Клиент HH API по токенам пользователя из хранилища (None — пользователь не авторизован в HH).
+
+        Обновление по ответу 401 идет через хранилище: токен, уже обновленный
+        фоновой задачей или параллельным запросом, берется из базы без обращения к HH.
+        """
+        tokens = await self.hh_tokens.get(user_key)
+        if tokens is None:
+            return None
+        access_token, refresh_token = tokens
+        return self.hh_client(access_token, refresh_token, renew_tokens=self.hh_tokens.renewer(user_key))
+
+    # ---------- сервисы ----------
+
+    @lazy_service
+    def pdf_parser(self):
+        from src.parsers.pdf_resume_parser import PDFResumeParser
+        return PDFResumeParser(client=self.openai_client)
+
+    @lazy_service
+    def resume_extractor(self):
+        from src.parsers.resume_extractor import ResumeExtractor
+        return ResumeExtractor()
+
+    @lazy_service
+    def vacancy_extractor(self):
+        from src.parsers.vacancy_extractor import VacancyExtractor
+        return VacancyExtractor()
+
+    @lazy_service
+    def hh_auth_service(self):
+        from src.hh.auth import HHAuthService
+        return HHAuthService()
+
+    @lazy_service
+    def token_exchanger(self):
+        from src.hh.token_exchanger import HHCodeExchanger
+        return HHCodeExchanger()
+
+    @lazy_service
+    def llm_gap_analyzer(self):
+        from src.llm_gap_analyzer.llm_gap_analyzer import LLMGapAnalyzer
+        return LLMGapAnalyzer(client=self.openai_client)
+
+    @lazy_service
+    def cover_letter_generator(self):
+        from src.llm_cover_letter.llm_cover_letter_generator import EnhancedLLMCoverLetterGenerator
+        return EnhancedLLMCoverLetterGenerator(validate_quality=False, client=self.openai_client)
+
+    @lazy_service
+    def checklist_generator(self):
+        from src.llm_interview_checklist.llm_interview_checklist_generator import LLMInterviewChecklistGenerator
+        return LLMInterviewChecklistGenerator(client=self.openai_client)
+
+    @lazy_service
+    def interview_simulator(self):
+        from src.llm_interview_simulation.llm_interview_simulator import ProfessionalInterviewSimulator
+        return ProfessionalInterviewSimulator(client=self.openai_client)
+
+    @lazy_service
+    def resume_rewriter(self):
+        from src.llm_resume_rewriter.llm_resume_rewriter import LLMResumeRewriter
+        return LLMResumeRewriter(client=self.openai_client)
+
+    # ---------- создание и прогрев ----------
+
+    @classmethod
+    def service_names(cls) -> List[str]:
+        return [name for name, value in vars(cls).items() if isinstance(value, lazy_service)]
+
+    def _create(self, name: str, factory: Callable[[Any], Any]) -> Any:
+        with self._lock:
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+        with build_lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                started = time.perf_counter()
+                instance = factory(self)
+                build_ms = round((time.perf_counter() - started) * 1000, 1)
+                with self._lock:
+                    self._build_ms[name] = build_ms
+                    self._instances[name] = instance
+                logger.info(f"Сервис {name} создан за {build_ms:.0f} мс")
+            return instance
+
+    def warm_up(self, names: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Создание сервисов заранее (блокирующий вызов, для потока прогрева).
+
+        Ошибка создания одного сервиса не прерывает прогрев остальных: она
+        пишется в лог и повторится при первом обращении к сервису.
+        """
+        self.warmup_state = "running"
+        started = time.perf_counter()
+        failed = []
+        for name in names or self.service_names():
+            try:
+                getattr(self, name)
+            except Exception as e:
+                failed.append(name)
+                logger.error(f"Прогрев сервиса {name} завершился ошибкой: {e}")
+        # Кодировка tiktoken загружается при первом подсчете токенов (возможно, по сети) — заранее, вне event loop
+        from src.utils.token_budget import load_tokenizer
+        load_tokenizer()
+        # Модули генераторов PDF (ReportLab) импортируются ради версии отчета — тоже заранее
+        if "pdf_renderer" in self._instances:
+            try:
+                self.pdf_renderer.load_generator_versions()
+            except Exception as e:
+                logger.error(f"Не удалось загрузить генераторы PDF при прогреве: {e}")
+        self.warmup_state = "failed" if failed else "done"
+        logger.info(f"Прогрев сервисов завершен за {time.perf_counter() - started:.2f} с"
+                    + (f", с ошибками: {', '.join(failed)}" if failed else ""))
+        return dict(self._build_ms)
+
+    async def start_warm_up(self, names: Optional[List[str]] = None) -> None:
+        """Прогрев по режиму APP_WARMUP (names — только эти сервисы); вызывается при старте процесса."""
+        if self.warmup_mode == "none" or self._warmup_task is not None:
+            return
+        if self.warmup_mode == "blocking":
+            self._warmup_task = asyncio.get_running_loop().create_task(asyncio.to_thread(self.warm_up, names))
+            await self._warmup_task
+        else:
+            self._warmup_task = asyncio.get_running_loop().create_task(self._delayed_warm_up(names))
+
+    async def _delayed_warm_up(self, names: Optional[List[str]]) -> None:
+        await asyncio.sleep(self.warmup_delay)
+        await asyncio.to_thread(self.warm_up, names)
+
+    async def shutdown(self) -> None:
+        """
+        Освобождение общих ресурсов при остановке процесса.
+
+        Отменяет отложенный прогрев или дожидается его потока (поток прервать
+        нельзя), останавливает фоновое обновление токенов HH, закрывает пулы
+        соединений HH всех event loop и пул процессов рендеринга PDF.
+        """
+        if self._warmup_task is not None:
+            if self.warmup_state == "pending":
+                self._warmup_task.cancel()
+            await asyncio.gather(self._warmup_task, return_exceptions=True)
+            self._warmup_task = None
+        if "hh_tokens" in self._instances:
+            await self.hh_tokens.stop()
+        await self._close_http_sessions()
+        if "pdf_renderer" in self._instances:
+            await self.pdf_renderer.shutdown()
+
+    async def _close_http_sessions(self) -> None:
+        """Закрыть сессии aiohttp всех event loop процесса."""
+        with self._http_lock:
+            sessions, self._http_sessions = self._http_sessions, {}
+        current_loop = asyncio.get_running_loop()
+        for loop, session in sessions.items():
+            if session.closed:
+                continue
+            if loop is current_loop:
+                await session.close()
+            elif loop.is_running():
+                # Сессия другого работающего loop закрывается в нем самом
+                future = asyncio.run_coroutine_threadsafe(session.close(), loop)
+                try:
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout=HTTP_SESSION_CLOSE_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Не удалось закрыть сессию HH другого event loop: {e}")
+            else:
+                session.detach()
+
+    def stats(self) -> Dict[str, Any]:
+        """Состояние прогрева и время создания сервисов (мс) для /health."""
+        with self._lock:
+            created = dict(self._build_ms)
+        return {
+            "warmup": self.warmup_state,
+            "created_ms": created,
+            "pending": [name for name in self.service_names() if name not in created],
+        }
+
+
+services = ServiceContainer()
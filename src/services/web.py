@@ -0,0 +1,31 @@
+# src/services/web.py
+"""
+Внедрение контейнера сервисов в обработчики FastAPI.
+
+Пример:
+    from src.services.web import get_services, install_services
+
+    install_services(app)
+
+    @app.post("/gap-analysis")
+    async def gap_analysis(services: ServiceContainer = Depends(get_services)):
+        return await services.llm_gap_analyzer.gap_analysis(resume, vacancy)
+
+Контейнер берется из app.state.services, поэтому его можно подменить для
+конкретного приложения (тесты, несколько приложений в одном процессе).
+"""
+
+from fastapi import FastAPI, Request
+
+from src.services.container import ServiceContainer, services as default_services
+
+
+def install_services(app: FastAPI, container: ServiceContainer = default_services) -> ServiceContainer:
+    """Привязывает контейнер к приложению (app.state.services)."""
+    app.state.services = container
+    return container
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """Зависимость FastAPI: контейнер сервисов приложения."""
+    return getattr(request.app.state, "services", default_services)
@@ -7,6 +7,8 @@ class TelegramBotSettings(BaseAppSettings):
     Настройки для Telegram бота.
     """
     bot_token: str
+    metrics_host: str = "127.0.0.1"  # снаружи — только вместе с METRICS_TOKEN
+    metrics_port: int = 9100  # 0 — HTTP сервер метрик отключен
     
     model_config = ConfigDict(
         env_file='.env',
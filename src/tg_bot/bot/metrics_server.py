@@ -0,0 +1,98 @@
+# src/tg_bot/bot/metrics_server.py
+"""
+Эндпоинт /metrics для процесса Telegram бота.
+
+Бот не имеет собственного HTTP сервера, поэтому метрики отдаются небольшим
+aiohttp приложением на отдельном порту (TG_BOT_METRICS_PORT, 0 — отключено).
+Там же /health с задержкой event loop бота (src/utils/loop_monitor.py).
+
+Сервер слушает TG_BOT_METRICS_HOST (по умолчанию localhost); если задан
+METRICS_TOKEN, /metrics отдается только с заголовком "Authorization: Bearer <токен>".
+"""
+
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import TelegramObject
+from aiohttp import web
+
+from src.tg_bot.bot.config import settings
+from src.utils import get_logger
+from src.utils.loop_monitor import loop_monitor
+from src.utils.metrics import registry, metrics_token_valid, CONTENT_TYPE_LATEST
+
+logger = get_logger()
+
+update_duration = registry.histogram(
+    "bot_update_duration_seconds", "Длительность обработки обновлений Telegram по типам"
+)
+updates_in_flight = registry.gauge(
+    "bot_updates_in_flight", "Обновления Telegram в обработке (глубина очереди обработчиков)"
+)
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Outer-middleware: длительность и количество одновременно обрабатываемых обновлений."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        event_type = getattr(event, "event_type", type(event).__name__)
+        updates_in_flight.inc()
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            return await handler(event, data)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            updates_in_flight.dec()
+            update_duration.observe(time.perf_counter() - started, type=event_type, status=status)
+
+
+def _fsm_storage_size(dp: Dispatcher) -> int:
+    """Количество пользовательских записей в FSM хранилище."""
+    storage = dp.storage
+    if isinstance(storage, MemoryStorage):
+        return len(storage.storage)
+    return 0
+
+
+async def start_metrics_server(dp: Dispatcher) -> Optional[web.AppRunner]:
+    """Подключает метрики к диспетчеру, запускает мониторинг event loop и HTTP сервер /metrics."""
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    loop_monitor.start("tg_bot")
+    registry.register_gauge_callback(
+        "bot_fsm_storage_size", "Количество пользователей в FSM хранилище бота",
+        lambda: _fsm_storage_size(dp)
+    )
+
+    if not settings.metrics_port:
+        logger.info("HTTP сервер метрик бота отключен (TG_BOT_METRICS_PORT=0)")
+        return None
+
+    async def metrics_handler(request: web.Request) -> web.Response:
+        if os.getenv("METRICS_TOKEN") and not metrics_token_valid(request.headers.get("Authorization")):
+            return web.Response(status=401, text="Требуется METRICS_TOKEN")
+        return web.Response(body=registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+    async def health_handler(request: web.Request) -> web.Response:
+        return web.json_response({"status": "healthy", "service": "tg_bot", "event_loop": loop_monitor.stats()})
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    app.router.add_get("/health", health_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, settings.metrics_host, settings.metrics_port).start()
+    if settings.metrics_host not in ("127.0.0.1", "localhost", "::1") and not os.getenv("METRICS_TOKEN"):
+        logger.warning(f"Метрики бота доступны без авторизации на {settings.metrics_host}: задайте METRICS_TOKEN")
+    logger.info(f"Метрики бота доступны на http://{settings.metrics_host}:{settings.metrics_port}/metrics")
+    return runner
@@ -5,40 +5,45 @@ from aiogram import types
 from pathlib import Path
 from aiogram.fsm.context import FSMContext
 import asyncio
-from src.tg_bot.handlers.spec_handlers.auth_handler import start_auth_polling
+from src.tg_bot.handlers.spec_handlers.auth_handler import auth_dispatcher
 
-from src.tg_bot.utils import UserState, UNAUTHORIZED_STATE_MESSAGES, AUTH_WAITING_MESSAGES, auth_keyboard, auth_waiting_keyboard
-from src.hh.auth import HHAuthService
+from src.tg_bot.utils import UserState, UNAUTHORIZED_STATE_MESSAGES, AUTH_WAITING_MESSAGES, AUTHORIZED_STATE_MESSAGES, auth_keyboard, auth_waiting_keyboard, authorized_keyboard
+from src.services import ServiceContainer
+from src.services.bot import hh_user_key
 
 from src.utils import get_logger
 logger = get_logger()
 
-# Создаём экземпляр сервиса авторизации
-hh_auth_service = HHAuthService()
-# Получаем URL для авторизации
-auth_url = hh_auth_service.get_auth_url()
 
-
-async def cmd_start(message: types.Message, state: FSMContext):
+async def cmd_start(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик команды /start."""
     user_id = message.from_user.id
     logger.info(f"Пользователь {user_id} выполнил команду /start")
     
+    # Токены HH сохранены с прошлой авторизации (в том числе до перезапуска бота)
+    if await services.hh_tokens.get(hh_user_key(user_id)) is not None:
+        await message.answer(f"{AUTHORIZED_STATE_MESSAGES['auth_restored']}\n\n{AUTHORIZED_STATE_MESSAGES['resume_instructions']}", reply_markup=authorized_keyboard)
+        await state.set_state(UserState.AUTHORIZED)
+        logger.info(f"Пользователь {user_id} переведен в состояние AUTHORIZED (сохраненные токены)")
+        return
+    
     await message.answer(UNAUTHORIZED_STATE_MESSAGES["greeting"], reply_markup=auth_keyboard)
     await state.set_state(UserState.UNAUTHORIZED)
     logger.info(f"Пользователь {user_id} переведен в состояние UNAUTHORIZED")
 
 
-async def cmd_auth(message: types.Message, state: FSMContext):
+async def cmd_auth(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик команды авторизации."""
     user_id = message.from_user.id
     logger.info(f"Пользователь {user_id} запросил авторизацию")
     
     # Формируем сообщение с инструкциями и ссылкой
+    auth_url = services.hh_auth_service.get_auth_url(services.hh_auth_service.state_for(hh_user_key(user_id)))
     auth_message = f"{AUTH_WAITING_MESSAGES['auth_instructions']}\n🔗 Ссылка для авторизации: {auth_url}"
     
     await message.answer(auth_message, reply_markup=auth_waiting_keyboard )
     await state.set_state(UserState.AUTH_WAITING)
     logger.info(f"Пользователь {user_id} переведен в состояние AUTH_WAITING")
     
-    asyncio.create_task(start_auth_polling(user_id, state))
\ No newline at end of file
+    # Код авторизации получает общая фоновая задача бота
+    auth_dispatcher.register(user_id, state, services)
\ No newline at end of file
@@ -16,16 +16,12 @@ from src.tg_bot.utils import (UserState,
     authorized_keyboard,
     resume_preparation_keyboard)
 
-from src.hh.auth import HHAuthService
+from src.services import ServiceContainer
+from src.services.bot import hh_user_key
 
 from src.utils import get_logger
 logger = get_logger()
 
-# Создаём экземпляр сервиса
-hh_auth_service = HHAuthService()
-# Получаем URL для авторизации
-auth_url = hh_auth_service.get_auth_url()
-
 
 async def initial_greeting(message: types.Message, state: FSMContext):
     """Приветственное сообщение при первом входе."""
@@ -43,9 +39,9 @@ async def handle_initial_message(message: types.Message):
     
     await message.answer(INITIAL_STATE_MESSAGES["unauthorized"], reply_markup=start_keyboard)
 
-async def handle_start_button(message: types.Message, state: FSMContext):
+async def handle_start_button(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик нажатия кнопки 'Старт'."""
-    await cmd_start(message, state)
+    await cmd_start(message, state, services)
 
 async def handle_unauthorized_message(message: types.Message):
     """Обработчик сообщений в неавторизованном состоянии."""
@@ -54,16 +50,17 @@ async def handle_unauthorized_message(message: types.Message):
     
     await message.answer(UNAUTHORIZED_STATE_MESSAGES["need_auth"], reply_markup=auth_keyboard)
 
-async def handle_auth_button(message: types.Message, state: FSMContext):
+async def handle_auth_button(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик нажатия кнопки 'Авторизация'."""
-    await cmd_auth(message, state)
+    await cmd_auth(message, state, services)
 
-async def handle_auth_waiting_message(message: types.Message):
+async def handle_auth_waiting_message(message: types.Message, services: ServiceContainer):
     """Обработчик сообщений в состоянии ожидания авторизации."""
     user_id = message.from_user.id
     logger.info(f"Пользователь {user_id} отправил сообщение в состоянии ожидания авторизации")
     
      # Формируем сообщение с инструкциями и ссылкой
+    auth_url = services.hh_auth_service.get_auth_url(services.hh_auth_service.state_for(hh_user_key(user_id)))
     auth_message = f"{AUTH_WAITING_MESSAGES['reply_auth_instructions']}\n🔗 Ссылка для авторизации: {auth_url}"
     
     await message.answer(auth_message, reply_markup=auth_waiting_keyboard)
@@ -88,34 +85,34 @@ async def handle_edit_resume_button(message: types.Message, state: FSMContext):
     logger.info(f"Пользователь {user_id} переведен в состояние RESUME_PREPARATION")
     
     
-async def handle_resume_preparation_message(message: types.Message, state: FSMContext):
+async def handle_resume_preparation_message(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик текстовых сообщений в состоянии подготовки резюме."""
     # Делегируем обработку специализированному обработчику из resume_handler
     from src.tg_bot.handlers.spec_handlers.resume_handler import handle_resume_link
-    await handle_resume_link(message, state)
+    await handle_resume_link(message, state, services)
     
-async def handle_vacancy_preparation_message(message: types.Message, state: FSMContext):
+async def handle_vacancy_preparation_message(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик текстовых сообщений в состоянии подготовки вакансии."""
     # Делегируем обработку специализированному обработчику
     from src.tg_bot.handlers.spec_handlers.vacancy_handler import handle_vacancy_link
-    await handle_vacancy_link(message, state)
+    await handle_vacancy_link(message, state, services)
     
-async def handle_gap_analysis_button(message: types.Message, state: FSMContext):
+async def handle_gap_analysis_button(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик нажатия кнопки 'GAP-анализ резюме'."""
     from src.tg_bot.handlers.spec_handlers.gap_analyzer_handler import start_gap_analysis
-    await start_gap_analysis(message, state)
+    await start_gap_analysis(message, state, services)
 
-async def handle_cover_letter_button(message: types.Message, state: FSMContext):
+async def handle_cover_letter_button(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик нажатия кнопки 'Рекомендательное письмо'."""
     from src.tg_bot.handlers.spec_handlers.cover_letter_handler import start_cover_letter_generation
-    await start_cover_letter_generation(message, state)
+    await start_cover_letter_generation(message, state, services)
     
-async def handle_interview_checklist_button(message: types.Message, state: FSMContext):
+async def handle_interview_checklist_button(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик нажатия кнопки 'Чек-лист подготовки к интервью'."""
     from src.tg_bot.handlers.spec_handlers.interview_checklist_handler import start_interview_checklist_generation
-    await start_interview_checklist_generation(message, state)
+    await start_interview_checklist_generation(message, state, services)
     
-async def handle_interview_simulation_button(message: types.Message, state: FSMContext):
+async def handle_interview_simulation_button(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик нажатия кнопки 'Симуляция интервью'."""
     from src.tg_bot.handlers.spec_handlers.interview_simulation_handler import start_interview_simulation
-    await start_interview_simulation(message, state)
\ No newline at end of file
+    await start_interview_simulation(message, state, services)
\ No newline at end of file
@@ -1,76 +1,156 @@
 # src/tg_bot/handlers/auth_handler.py
-import logging
+"""
+Получение кодов авторизации HH для пользователей бота.
+
+Одна фоновая задача (auth_dispatcher) ждет коды всех ожидающих входов одним
+long-poll запросом к callback серверу (POST /api/codes по state
+пользователей) и передает каждый код своему пользователю: обмен на токены,
+сохранение в хранилище, состояние AUTHORIZED в его FSMContext. Ожидающий
+вход — запись в словаре, без своего цикла и запросов; без ожидающих входов
+задача не обращается к серверу.
+"""
+
 import asyncio
-import aiohttp
-from aiogram import types
-from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Optional
+
 from aiogram.fsm.context import FSMContext
 
 from src.tg_bot.utils import UserState, authorized_keyboard
 from src.tg_bot.utils.text_constants import AUTHORIZED_STATE_MESSAGES
 from src.tg_bot.bot.instance import bot
-from src.hh.token_exchanger import HHCodeExchanger
-from src.callback_local_server.config import settings as callback_settings
+from src.callback_local_server.client import reset_code, wait_for_codes
+from src.services import ServiceContainer
+from src.services.bot import hh_user_key
 from src.utils import get_logger
 logger = get_logger()
 
-# Инициализация обменщика кодов
-code_exchanger = HHCodeExchanger()
-
-# Переменная для отслеживания использованного кода
-last_processed_code = None
-
-async def check_auth_code(user_id: int, state: FSMContext):
-    """Проверяет наличие кода авторизации на callback-сервере."""
-    global last_processed_code
-    callback_url = f"http://{callback_settings.host}:{callback_settings.port}/api/code"
-    
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(callback_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    code = data.get("code")
-                    
-                    # Проверяем, что код новый и не был обработан ранее
-                    if code and code != last_processed_code:
-                        logger.info(f"Получен новый код авторизации для пользователя {user_id}")
-                        last_processed_code = code
-                        
-                        try:
-                            # Обмен кода на токены
-                            tokens = await code_exchanger.exchange_code(code)
-                            
-                            # Сохранение токенов в состоянии пользователя
-                            await state.update_data(access_token=tokens["access_token"], refresh_token=tokens["refresh_token"], expires_in=tokens["expires_in"])
-                            
-                            # Переключение состояния пользователя
-                            await state.set_state(UserState.AUTHORIZED)
-                            
-                            # Отправляем сообщение об успешной авторизации
-                            await bot.send_message(user_id, f"{AUTHORIZED_STATE_MESSAGES['auth_success']}\n\n{AUTHORIZED_STATE_MESSAGES['resume_instructions']}", reply_markup=authorized_keyboard)
-                            
-                            # После успешной обработки кода, очищаем его на сервере
-                            async with session.post(f"http://{callback_settings.host}:{callback_settings.port}/api/reset_code") as reset_response:
-                                if reset_response.status == 200:
-                                    logger.info("Код авторизации успешно сброшен на сервере")
-                                
-                            return True
-                        except Exception as e:
-                            logger.error(f"Ошибка при обмене кода: {e}")
-                            
-    except Exception as e:
-        logger.error(f"Ошибка при проверке кода авторизации: {e}")
-    
-    return False
-
-async def start_auth_polling(user_id: int, state: FSMContext):
-    """Запускает периодическую проверку статуса авторизации."""
-    # Запускаем проверку кода с интервалом в 3 секунды, максимум 300 секунд (100 попыток)
-    for _ in range(100):
-        if await check_auth_code(user_id, state):
+# Ожидание кода авторизации на callback сервере: секунд на запрос (long-poll) и всего
+AUTH_CODE_WAIT_SECONDS = 25
+AUTH_TIMEOUT_SECONDS = 300
+
+
+@dataclass
+class PendingLogin:
+    """Ожидающий вход пользователя"""
+    user_id: int
+    state: FSMContext
+    deadline: float
+
+
+class AuthCodeDispatcher:
+    """Фоновое получение кодов авторизации всех ожидающих пользователей"""
+
+    def __init__(self):
+        # state OAuth -> ожидающий вход (повторный запрос пользователя заменяет запись)
+        self._pending: Dict[str, PendingLogin] = {}
+        self._services: Optional[ServiceContainer] = None
+        self._task: Optional[asyncio.Task] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, services: ServiceContainer) -> None:
+        """Запуск фоновой задачи в текущем event loop."""
+        self._services = services
+        if self.running:
             return
-        await asyncio.sleep(3)
-    
-    # Если код не был получен за отведенное время
-    await bot.send_message(user_id, AUTHORIZED_STATE_MESSAGES["auth_timeout"])
+        self._changed = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Получение кодов авторизации HH запущено")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def register(self, user_id: int, state: FSMContext, services: ServiceContainer) -> None:
+        """Ожидать код авторизации пользователя (до AUTH_TIMEOUT_SECONDS)."""
+        self.start(services)
+        oauth_state = services.hh_auth_service.state_for(hh_user_key(user_id))
+        deadline = asyncio.get_running_loop().time() + AUTH_TIMEOUT_SECONDS
+        self._pending[oauth_state] = PendingLogin(user_id, state, deadline)
+        # Текущий запрос к серверу не знает нового state — перезапуск ожидания
+        self._changed.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._expire(loop.time())
+            if not self._pending:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            self._changed.clear()
+            nearest_deadline = min(login.deadline for login in self._pending.values())
+            timeout = max(0.0, min(AUTH_CODE_WAIT_SECONDS, nearest_deadline - loop.time()))
+            poll = asyncio.create_task(wait_for_codes(self._services.http_session(), list(self._pending), timeout=timeout))
+            changed = asyncio.create_task(self._changed.wait())
+            await asyncio.wait({poll, changed}, return_when=asyncio.FIRST_COMPLETED)
+            changed.cancel()
+            if not poll.done():
+                poll.cancel()
+                await asyncio.gather(poll, return_exceptions=True)
+                continue
+
+            try:
+                found = poll.result()
+            except Exception as e:
+                logger.error(f"Ошибка при проверке кодов авторизации: {e}")
+                # Пауза перед повтором (ошибка сети или callback сервера)
+                await asyncio.sleep(1)
+                continue
+
+            logins = [(oauth_state, code, self._pending.pop(oauth_state)) for oauth_state, code in found.items() if oauth_state in self._pending]
+            await asyncio.gather(*(self._complete(oauth_state, code, login) for oauth_state, code, login in logins))
+
+    async def _expire(self, now: float) -> None:
+        """Уведомить пользователей, не завершивших вход за отведенное время."""
+        expired = [oauth_state for oauth_state, login in self._pending.items() if login.deadline <= now]
+        for oauth_state in expired:
+            login = self._pending.pop(oauth_state)
+            try:
+                await bot.send_message(login.user_id, AUTHORIZED_STATE_MESSAGES["auth_timeout"])
+            except Exception as e:
+                logger.error(f"Ошибка при отправке сообщения пользователю {login.user_id}: {e}")
+
+    async def _complete(self, oauth_state: str, code: str, login: PendingLogin) -> None:
+        """Обмен кода пользователя на токены и переход в AUTHORIZED."""
+        services = self._services
+        user_id = login.user_id
+        logger.info(f"Получен новый код авторизации для пользователя {user_id}")
+        authorized = False
+        try:
+            # Обмен кода на токены
+            tokens = await services.token_exchanger.exchange_code(code)
+
+            # Сохранение токенов пользователя в хранилище (переживает перезапуск, обновляется заранее)
+            await services.hh_tokens.save(hh_user_key(user_id), tokens)
+
+            # Переключение состояния пользователя
+            await login.state.set_state(UserState.AUTHORIZED)
+            authorized = True
+
+            # Отправляем сообщение об успешной авторизации
+            await bot.send_message(user_id, f"{AUTHORIZED_STATE_MESSAGES['auth_success']}\n\n{AUTHORIZED_STATE_MESSAGES['resume_instructions']}", reply_markup=authorized_keyboard)
+        except Exception as e:
+            logger.error(f"Ошибка при обмене кода: {e}")
+
+        # Обработанный код очищаем на сервере (код одноразовый, повторный обмен невозможен)
+        try:
+            await reset_code(services.http_session(), oauth_state)
+            logger.info("Код авторизации успешно сброшен на сервере")
+        except Exception as e:
+            logger.error(f"Ошибка при сбросе кода авторизации: {e}")
+
+        # После ошибки обмена пользователь может снова открыть ссылку до истечения ожидания
+        if not authorized and oauth_state not in self._pending:
+            self._pending[oauth_state] = login
+            self._changed.set()
+
+
+auth_dispatcher = AuthCodeDispatcher()
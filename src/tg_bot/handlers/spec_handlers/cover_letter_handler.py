@@ -5,15 +5,12 @@ from aiogram.fsm.context import FSMContext
 from src.tg_bot.utils import UserState
 from src.tg_bot.utils import COVER_LETTER_MESSAGES
 from src.tg_bot.utils import authorized_keyboard
-from src.llm_cover_letter.llm_cover_letter_generator import EnhancedLLMCoverLetterGenerator
 from src.models.cover_letter_models import EnhancedCoverLetter
+from src.services import ServiceContainer
 
 from src.utils import get_logger
 logger = get_logger()
 
-# Создаем экземпляр генератора
-enhanced_cover_letter_generator = EnhancedLLMCoverLetterGenerator(validate_quality=False)
-
 def format_enhanced_cover_letter_preview(cover_letter: EnhancedCoverLetter) -> str:
     """Форматирует краткий предварительный просмотр письма с оценками."""
     result = "📧 <b>ПЕРСОНАЛИЗИРОВАННОЕ СОПРОВОДИТЕЛЬНОЕ ПИСЬМО</b>\n\n"
@@ -90,7 +87,7 @@ def format_improvement_tips(cover_letter: EnhancedCoverLetter) -> str:
     
     return result
 
-async def start_cover_letter_generation(message: types.Message, state: FSMContext):
+async def start_cover_letter_generation(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Запускает процесс генерации улучшенного сопроводительного письма."""
     user_id = message.from_user.id
     logger.info(f"Запуск генерации улучшенного cover letter для пользователя {user_id}")
@@ -120,7 +117,7 @@ async def start_cover_letter_generation(message: types.Message, state: FSMContex
     
     try:
         # Запускаем генерацию улучшенного cover letter
-        cover_letter_result = await enhanced_cover_letter_generator.generate_enhanced_cover_letter(
+        cover_letter_result = await services.cover_letter_generator.generate_enhanced_cover_letter(
             parsed_resume, parsed_vacancy
         )
         
@@ -1,16 +1,15 @@
 # src/tg_bot/handlers/gap_analyzer_handler.py
 from aiogram import types
 from aiogram.fsm.context import FSMContext
-from langsmith import traceable, Client
-import os
 
 from src.tg_bot.utils import UserState
 from src.tg_bot.utils import GAP_ANALYZE_MESSAGES
 from src.tg_bot.utils import authorized_keyboard
-from src.llm_gap_analyzer import LLMGapAnalyzer
 from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
+from src.services import ServiceContainer
 
 from src.utils import get_logger
+from src.utils.llm_tracing import llm_traceable
 logger = get_logger()
 
 # ===============================================
@@ -47,18 +46,6 @@ DISPLAY_SYMBOLS = {
 
 # ===============================================
 
-# Создаём клиент LangSmith
-def create_langsmith_client():
-    api_key = os.getenv("LANGCHAIN_API_KEY")
-    if not api_key:
-        return print("LANGCHAIN_API_KEY не установлен, трейсинг будет отключен")
-    return Client(api_key=api_key)
-
-ls_client = create_langsmith_client()
-
-# Создаем экземпляр анализатора
-llm_analyzer = LLMGapAnalyzer()
-
 def truncate_text(text: str, max_length: int) -> str:
     """Обрезает текст до указанной длины с добавлением многоточия."""
     if len(text) <= max_length:
@@ -279,8 +266,8 @@ def format_enhanced_gap_analysis_preview(analysis) -> str:
     
     return result
 
-@traceable(client=ls_client, project_name="llamaindex_test", run_type = "retriever")
-async def start_gap_analysis(message: types.Message, state: FSMContext):
+@llm_traceable(run_type="retriever", project="llamaindex_test")
+async def start_gap_analysis(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Запускает процесс расширенного gap-анализа резюме."""
     user_id = message.from_user.id
     logger.info(f"Запуск расширенного gap-анализа для пользователя {user_id}")
@@ -302,7 +289,7 @@ async def start_gap_analysis(message: types.Message, state: FSMContext):
     
     try:
         # Запускаем расширенный gap-анализ
-        gap_analysis_result = await llm_analyzer.gap_analysis(parsed_resume, parsed_vacancy)
+        gap_analysis_result = await services.llm_gap_analyzer.gap_analysis(parsed_resume, parsed_vacancy)
         
         if not gap_analysis_result:
             logger.error(f"Не удалось выполнить расширенный gap-анализ для пользователя {user_id}")
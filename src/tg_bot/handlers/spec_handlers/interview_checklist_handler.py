@@ -6,7 +6,6 @@ from aiogram.fsm.context import FSMContext
 from src.tg_bot.utils import UserState
 from src.tg_bot.utils import INTERVIEW_CHECKLIST_MESSAGES
 from src.tg_bot.utils import authorized_keyboard
-from src.llm_interview_checklist import LLMInterviewChecklistGenerator
 from src.models.interview_checklist_models import (
     InterviewChecklist, 
     ProfessionalInterviewChecklist,
@@ -16,12 +15,10 @@ from src.models.interview_checklist_models import (
     Priority
 )
 
+from src.services import ServiceContainer
 from src.utils import get_logger
 logger = get_logger()
 
-# Создаем экземпляр генератора
-llm_interview_checklist_generator = LLMInterviewChecklistGenerator()
-
 # =============================================================================
 # Форматирование профессионального чек-листа
 # =============================================================================
@@ -472,7 +469,7 @@ def format_final_recommendations(checklist: InterviewChecklist) -> str:
 # Основные функции обработки
 # =============================================================================
 
-async def start_interview_checklist_generation(message: types.Message, state: FSMContext):
+async def start_interview_checklist_generation(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Запускает процесс генерации профессионального чек-листа подготовки к интервью."""
     user_id = message.from_user.id
     logger.info(f"Запуск генерации профессионального чек-листа интервью для пользователя {user_id}")
@@ -503,7 +500,7 @@ async def start_interview_checklist_generation(message: types.Message, state: FS
     try:
         # Пробуем сначала новую профессиональную версию
         try:
-            checklist_result = await llm_interview_checklist_generator.generate_professional_interview_checklist(
+            checklist_result = await services.checklist_generator.generate_professional_interview_checklist(
                 parsed_resume, parsed_vacancy
             )
             
@@ -525,7 +522,7 @@ async def start_interview_checklist_generation(message: types.Message, state: FS
         logger.info(f"Использование старой версии чек-листа для пользователя {user_id}")
         await progress_msg.edit_text("📋 Создаю чек-лист подготовки к интервью...")
         
-        checklist_result = await llm_interview_checklist_generator.generate_interview_checklist(
+        checklist_result = await services.checklist_generator.generate_interview_checklist(
             parsed_resume, parsed_vacancy
         )
         
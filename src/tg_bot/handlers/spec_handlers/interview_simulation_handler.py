@@ -8,15 +8,14 @@ from src.tg_bot.utils import INTERVIEW_SIMULATION_MESSAGES
 from src.tg_bot.utils import authorized_keyboard
 
 # Обновленные импорты
-from src.llm_interview_simulation.llm_interview_simulator import ProfessionalInterviewSimulator
 from src.llm_interview_simulation.pdf_generator import ProfessionalInterviewPDFGenerator
 from src.models.interview_simulation_models import InterviewSimulation
 
+from src.services import ServiceContainer
 from src.utils import get_logger
 logger = get_logger()
 
-# Создаем экземпляры обновленных сервисов
-llm_interview_simulator = ProfessionalInterviewSimulator()
+# PDF генератор симуляции (без состояния)
 pdf_generator = ProfessionalInterviewPDFGenerator()
 
 def format_simulation_preview(simulation: InterviewSimulation) -> str:
@@ -84,7 +83,7 @@ def _translate_competency_name(competency) -> str:
     }
     return translations.get(competency, competency.value)
 
-async def start_interview_simulation(message: types.Message, state: FSMContext):
+async def start_interview_simulation(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Запускает процесс профессиональной симуляции интервью."""
     user_id = message.from_user.id
     logger.info(f"Запуск профессиональной симуляции интервью для пользователя {user_id}")
@@ -113,7 +112,7 @@ async def start_interview_simulation(message: types.Message, state: FSMContext):
             await send_simulation_progress_update(progress_msg, current_round, total_rounds)
         
         # Запускаем профессиональную симуляцию интервью с колбеком прогресса
-        simulation_result = await llm_interview_simulator.simulate_interview(
+        simulation_result = await services.interview_simulator.simulate_interview(
             parsed_resume, 
             parsed_vacancy,
             progress_callback=progress_callback
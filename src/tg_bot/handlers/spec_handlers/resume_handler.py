@@ -7,16 +7,14 @@ from aiogram.fsm.context import FSMContext
 
 from src.tg_bot.utils import UserState, vacancy_preparation_keyboard
 from src.tg_bot.utils import RESUME_PREPARATION_MESSAGES, VACANCY_PREPARATION_MESSAGES
-from src.hh.api_client import HHApiClient
-from src.parsers.resume_extractor import ResumeExtractor 
+from src.services import ServiceContainer
+from src.services.bot import hh_user_key
 
 from src.utils import get_logger
 logger = get_logger()
-# Создаем экземпляр экстрактора
-entity_extractor = ResumeExtractor()
 
 
-async def handle_resume_link(message: types.Message, state: FSMContext):
+async def handle_resume_link(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик ссылки на резюме."""
     user_id = message.from_user.id
     link = message.text.strip()
@@ -31,26 +29,23 @@ async def handle_resume_link(message: types.Message, state: FSMContext):
     resume_id = extract_resume_id(link)
     logger.info(f"Пользователь {user_id} отправил корректную ссылку на резюме. ID резюме: {resume_id}")
     
-    # Получение данных пользователя из состояния
-    user_data = await state.get_data()
-    access_token = user_data.get("access_token")
-    refresh_token = user_data.get("refresh_token")
+    # Клиент HH по токенам пользователя из хранилища
+    hh_client = await services.hh_user_client(hh_user_key(user_id))
     
-    if not access_token or not refresh_token:
+    if hh_client is None:
         logger.error(f"Отсутствуют токены доступа для пользователя {user_id}")
         await message.answer(f"{RESUME_PREPARATION_MESSAGES['auth_error']}")
         await state.set_state(UserState.UNAUTHORIZED)
         return
     
-    # Создание клиента API и получение данных резюме
+    # Получение данных резюме
     try:
-        hh_client = HHApiClient(access_token, refresh_token)
         resume_data = await hh_client.request(f'resumes/{resume_id}')
         
         logger.info(f"Успешно получены данные резюме {resume_id} для пользователя {user_id}")
         
         # Парсинг данных резюме с помощью ResumeExtractor
-        parsed_resume = entity_extractor.extract_resume_info(resume_data)
+        parsed_resume = services.resume_extractor.extract_resume_info(resume_data)
         
         if not parsed_resume:
             logger.error(f"Не удалось распарсить данные резюме {resume_id}")
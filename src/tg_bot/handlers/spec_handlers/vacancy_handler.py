@@ -5,16 +5,13 @@ from aiogram.fsm.context import FSMContext
 
 from src.tg_bot.utils import UserState
 from src.tg_bot.utils.text_constants import VACANCY_PREPARATION_MESSAGES
-from src.hh.api_client import HHApiClient
-from src.parsers.vacancy_extractor import VacancyExtractor
+from src.services import ServiceContainer
+from src.services.bot import hh_user_key
 
 from src.utils import get_logger
 logger = get_logger()
 
-# Используем тот же экземпляр экстрактора
-entity_extractor = VacancyExtractor()
-
-async def handle_vacancy_link(message: types.Message, state: FSMContext):
+async def handle_vacancy_link(message: types.Message, state: FSMContext, services: ServiceContainer):
     """Обработчик ссылки на вакансию."""
     user_id = message.from_user.id
     link = message.text.strip()
@@ -29,26 +26,23 @@ async def handle_vacancy_link(message: types.Message, state: FSMContext):
     vacancy_id = extract_vacancy_id(link)
     logger.info(f"Пользователь {user_id} отправил корректную ссылку на вакансию. ID вакансии: {vacancy_id}")
     
-    # Получение данных пользователя из состояния
-    user_data = await state.get_data()
-    access_token = user_data.get("access_token")
-    refresh_token = user_data.get("refresh_token")
+    # Клиент HH по токенам пользователя из хранилища
+    hh_client = await services.hh_user_client(hh_user_key(user_id))
     
-    if not access_token or not refresh_token:
+    if hh_client is None:
         logger.error(f"Отсутствуют токены доступа для пользователя {user_id}")
         await message.answer(VACANCY_PREPARATION_MESSAGES["auth_error"])
         await state.set_state(UserState.UNAUTHORIZED)
         return
     
-    # Создание клиента API и получение данных вакансии
+    # Получение данных вакансии
     try:
-        hh_client = HHApiClient(access_token, refresh_token)
         vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
         
         logger.info(f"Успешно получены данные вакансии {vacancy_id} для пользователя {user_id}")
         
         # Парсинг данных вакансии с помощью EntityExtractor
-        parsed_vacancy = entity_extractor.extract_vacancy_info(vacancy_data)
+        parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
         
         if not parsed_vacancy:
             logger.error(f"Не удалось распарсить данные вакансии {vacancy_id}")
@@ -13,6 +13,11 @@ logger = get_logger()
 
 from src.tg_bot.bot.instance import bot, dp
 from src.tg_bot.handlers.router import register_handlers
+from src.tg_bot.bot.metrics_server import start_metrics_server
+from src.services import services
+from src.services.bot import BOT_SERVICES, ServicesMiddleware
+from src.tg_bot.handlers.spec_handlers.auth_handler import auth_dispatcher
+from src.utils.loop_monitor import loop_monitor
 
 
 async def main():
@@ -21,9 +26,28 @@ async def main():
     
     # Регистрация обработчиков
     register_handlers(dp)
+    # Общий контейнер сервисов в данных обработчиков (параметр services)
+    dp.update.outer_middleware(ServicesMiddleware(services))
+    
+    # Метрики Prometheus (/metrics на отдельном порту)
+    metrics_runner = await start_metrics_server(dp)
+    
+    # Сервисы создаются лениво; прогрев в потоке по APP_WARMUP
+    await services.start_warm_up(BOT_SERVICES)
+    # Фоновое обновление токенов HH пользователей до истечения
+    services.hh_tokens.start()
+    # Получение кодов авторизации HH всех пользователей одной фоновой задачей
+    auth_dispatcher.start(services)
     
     # Запуск бота
-    await dp.start_polling(bot, storage=MemoryStorage())
+    try:
+        await dp.start_polling(bot, storage=MemoryStorage())
+    finally:
+        await auth_dispatcher.stop()
+        await services.shutdown()
+        await loop_monitor.stop()
+        if metrics_runner:
+            await metrics_runner.cleanup()
 
 if __name__ == "__main__":
     try:
@@ -42,6 +42,7 @@ AUTH_WAITING_MESSAGES = {
 # Сообщения для авторизованного состояния
 AUTHORIZED_STATE_MESSAGES = {
     "auth_success": "✅ Авторизация успешно завершена! Теперь вы можете использовать все функции бота.",
+    "auth_restored": "✅ Вы уже авторизованы в hh.ru, повторная авторизация не нужна.",
     "auth_timeout": "⏱ Время ожидания авторизации истекло. Пожалуйста, попробуйте снова.",
     "resume_instructions": "Теперь вам доступна функция редактирования резюме с помощью ИИ. Нажмите кнопку «Редактировать резюме», чтобы начать.",
     "text_message_reply": "Чтобы начать пользоваться ИИ для редактирования резюме, нажмите кнопку «Редактировать резюме»."
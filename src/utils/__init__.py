@@ -9,12 +9,26 @@ from .logging_config import (
     setup_logging,
     get_logger,
     init_logging_from_env,
-    configure_external_loggers
+    configure_external_loggers,
+    log_payload
+)
+from .tracing import (
+    trace_span,
+    traced,
+    current_span,
+    record_token_usage,
+    add_span_listener
 )
 
 __all__ = [
     'setup_logging',
     'get_logger', 
     'init_logging_from_env',
-    'configure_external_loggers'
+    'configure_external_loggers',
+    'log_payload',
+    'trace_span',
+    'traced',
+    'current_span',
+    'record_token_usage',
+    'add_span_listener'
 ]
\ No newline at end of file
@@ -0,0 +1,362 @@
+# src/utils/llm_tracing.py
+"""
+Трейсинг LLM сценариев (LangSmith или локальный JSONL) с head-сэмплированием.
+
+Решение о записи трейса принимается один раз в корне (LLM_TRACING_SAMPLE_RATE)
+и наследуется вложенными вызовами. Для несэмплированных вызовов декоратор
+не делает ничего, кроме проверки ContextVar. Сэмплированные запуски
+складываются в очередь и отправляются пачками фоновым потоком: сериализация
+входов/выходов и сетевой экспорт не выполняются на пути запроса.
+
+Дочерние запуски типа "llm" строятся из спанов llm.completion
+(src/utils/tracing.py): модель, токены, длительность, статус. Поэтому
+обертка клиента OpenAI (wrap_openai) не нужна.
+
+Экспортеры (LLM_TRACING_EXPORTER):
+    langsmith — Client.batch_ingest_runs (по умолчанию при LANGCHAIN_API_KEY)
+    jsonl     — LOGS/llm_traces.jsonl, формат запусков LangSmith
+    none      — трейсинг отключен (по умолчанию без LANGCHAIN_API_KEY)
+
+Пример:
+    @llm_traceable(run_type="chain", project="resume_rewriter")
+    async def rewrite_resume(...): ...
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.logging_config import get_logger, rotating_file_handler
+from src.utils.metrics import registry
+from src.utils.tracing import Span, add_span_listener
+
+logger = get_logger()
+
+# Ограничение размера сериализованных входов/выходов одного запуска
+MAX_FIELD_CHARS = 20000
+
+trace_overhead = registry.histogram(
+    "llm_trace_overhead_seconds", "Время, добавляемое трейсингом LLM к пути запроса",
+    (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+)
+trace_runs = registry.counter(
+    "llm_trace_runs_total", "Запуски трейсинга LLM по результату (sampled/not_sampled/exported/dropped/failed)"
+)
+trace_export_duration = registry.histogram(
+    "llm_trace_export_duration_seconds", "Длительность экспорта пачки запусков", (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+# Текущий сэмплированный запуск (родитель вложенных) и решение сэмплирования трейса
+_current_run: ContextVar[Optional["_Run"]] = ContextVar("llm_trace_run", default=None)
+_sampled: ContextVar[Optional[bool]] = ContextVar("llm_trace_sampled", default=None)
+
+
+def _timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value, tz=timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def _serialize(value: Any) -> Any:
+    """JSON-совместимое представление входов/выходов (выполняется в потоке экспорта)."""
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json")
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    if len(text) > MAX_FIELD_CHARS:
+        return {"truncated": text[:MAX_FIELD_CHARS], "total_chars": len(text)}
+    return json.loads(text)
+
+
+class _Run:
+    """Запуск (run) в терминах LangSmith; сериализуется только при экспорте."""
+
+    __slots__ = ("id", "trace_id", "parent", "dotted_order", "name", "run_type", "project",
+                 "inputs", "outputs", "error", "start_time", "end_time", "extra")
+
+    def __init__(self, name: str, run_type: str, project: str, inputs: Any,
+                 parent: Optional["_Run"] = None, start_time: Optional[float] = None):
+        self.id = str(uuid.uuid4())
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else self.id
+        self.start_time = start_time or time.time()
+        order = f"{_timestamp(self.start_time)}{self.id}"
+        self.dotted_order = f"{parent.dotted_order}.{order}" if parent else order
+        self.name = name
+        self.run_type = run_type
+        self.project = project
+        self.inputs = inputs
+        self.outputs: Any = None
+        self.error: Optional[str] = None
+        self.end_time: Optional[float] = None
+        self.extra: Dict[str, Any] = {}
+
+    def _outputs(self) -> Dict[str, Any]:
+        if self.outputs is None:
+            return {}
+        outputs = _serialize(self.outputs)
+        return outputs if isinstance(outputs, dict) else {"output": outputs}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "trace_id": self.trace_id,
+            "parent_run_id": self.parent.id if self.parent else None,
+            "dotted_order": self.dotted_order,
+            "session_name": self.project,
+            "name": self.name,
+            "run_type": self.run_type,
+            "start_time": datetime.fromtimestamp(self.start_time, tz=timezone.utc).isoformat(),
+            "end_time": datetime.fromtimestamp(self.end_time or time.time(), tz=timezone.utc).isoformat(),
+            "inputs": _serialize(self.inputs) if self.inputs is not None else {},
+            "outputs": self._outputs(),
+            "error": self.error,
+            "extra": {"metadata": self.extra},
+        }
+
+
+class LLMTraceExporter:
+    """Очередь запусков и фоновый поток пакетного экспорта."""
+
+    def __init__(self):
+        default_exporter = "langsmith" if os.getenv("LANGCHAIN_API_KEY") else "none"
+        self.exporter = os.getenv("LLM_TRACING_EXPORTER", default_exporter).lower()
+        self.sample_rate = float(os.getenv("LLM_TRACING_SAMPLE_RATE", 0.1))
+        self.batch_size = int(os.getenv("LLM_TRACING_BATCH_SIZE", 50))
+        self.flush_interval = float(os.getenv("LLM_TRACING_FLUSH_INTERVAL", 5))
+        self._queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LLM_TRACING_QUEUE_SIZE", 1000)))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._client = None
+        self._file_logger: Optional[logging.Logger] = None
+
+        if self.exporter == "langsmith" and not os.getenv("LANGCHAIN_API_KEY"):
+            logger.warning("LANGCHAIN_API_KEY не установлен, трейсинг LLM будет отключен")
+            self.exporter = "none"
+        if self.exporter not in ("langsmith", "jsonl", "none"):
+            logger.warning(f"Неизвестный LLM_TRACING_EXPORTER={self.exporter}, трейсинг LLM отключен")
+            self.exporter = "none"
+        if self.enabled:
+            logger.info(f"Трейсинг LLM: экспорт {self.exporter}, доля сэмплирования {self.sample_rate:.0%}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter != "none" and self.sample_rate > 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, run: _Run) -> None:
+        """Постановка завершенного запуска в очередь (без блокировки)."""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(run)
+        except queue.Full:
+            trace_runs.inc(exporter=self.exporter, result="dropped")
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._worker, name="llm-trace-exporter", daemon=True)
+                    self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            batch: List[_Run] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._export(batch)
+                    return
+                batch.append(item)
+            self._export(batch)
+
+    def _export(self, batch: List[_Run]) -> None:
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            runs = [run.to_dict() for run in batch]
+            if self.exporter == "langsmith":
+                self._langsmith_client().batch_ingest_runs(create=runs)
+            else:
+                jsonl = self._jsonl_logger()
+                for run in runs:
+                    jsonl.info(json.dumps(run, ensure_ascii=False, default=str))
+            trace_runs.inc(len(batch), exporter=self.exporter, result="exported")
+        except Exception as e:
+            trace_runs.inc(len(batch), exporter=self.exporter, result="failed")
+            logger.warning(f"Не удалось экспортировать {len(batch)} запусков трейсинга LLM: {e}")
+        finally:
+            trace_export_duration.observe(time.perf_counter() - started, exporter=self.exporter)
+
+    def _langsmith_client(self):
+        if self._client is None:
+            from langsmith import Client
+            # Собственная пакетная отправка вместо фонового батчинга клиента
+            self._client = Client(api_key=os.getenv("LANGCHAIN_API_KEY"), auto_batch_tracing=False)
+        return self._client
+
+    def _jsonl_logger(self) -> logging.Logger:
+        # Запись уже идет в фоновом потоке экспорта, очередь логирования не нужна
+        if self._file_logger is None:
+            logs_path = Path(os.getenv("LOGS_PATH", "LOGS"))
+            legacy_path = logs_path / "legacy"
+            legacy_path.mkdir(parents=True, exist_ok=True)
+            handler = rotating_file_handler(
+                os.getenv("LLM_TRACING_JSONL", str(logs_path / "llm_traces.jsonl")),
+                max_bytes=int(os.getenv("TRACING_MAX_BYTES", 10 * 1024 * 1024)),
+                backup_count=int(os.getenv("TRACING_BACKUP_COUNT", 5)),
+                legacy_path=legacy_path
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            file_logger = logging.getLogger("llm_traces")
+            file_logger.setLevel(logging.INFO)
+            file_logger.addHandler(handler)
+            file_logger.propagate = False
+            self._file_logger = file_logger
+        return self._file_logger
+
+    def flush(self, timeout: float = 10) -> None:
+        """Отправка накопленных запусков и остановка потока (при завершении процесса)."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+
+llm_trace_exporter = LLMTraceExporter()
+atexit.register(llm_trace_exporter.flush)
+
+registry.register_gauge_callback(
+    "llm_trace_queue_depth", "Запуски трейсинга LLM в очереди экспорта",
+    lambda: llm_trace_exporter.queue_depth
+)
+
+
+def _start_run(name: str, run_type: str, project: str, args: tuple, kwargs: dict):
+    """Решение сэмплирования и создание запуска; (run, токены ContextVar) или None."""
+    sampled = _sampled.get()
+    if sampled is None:
+        sampled = random.random() < llm_trace_exporter.sample_rate
+        trace_runs.inc(exporter=llm_trace_exporter.exporter, result="sampled" if sampled else "not_sampled")
+        if not sampled:
+            return None, _sampled.set(False), None
+    elif not sampled:
+        return None, None, None
+    # Входы сохраняются ссылками, сериализация — в потоке экспорта
+    inputs = {"args": args, **kwargs} if args else dict(kwargs)
+    run = _Run(name, run_type, project, inputs, parent=_current_run.get())
+    return run, _sampled.set(True), _current_run.set(run)
+
+
+def _finish_run(run: _Run, outputs: Any = None, error: Optional[BaseException] = None) -> None:
+    run.end_time = time.time()
+    run.outputs = outputs
+    if error is not None:
+        run.error = f"{type(error).__name__}: {error}"
+    llm_trace_exporter.submit(run)
+
+
+def llm_traceable(name: Optional[str] = None, run_type: str = "chain", project: str = "default"):
+    """
+    Декоратор трейсинга LLM сценария (замена langsmith.traceable).
+
+    Первый аргумент методов (self) в трейс не попадает.
+    """
+
+    def decorator(func):
+        run_name = name or func.__name__
+        skip_self = "self" in inspect.signature(func).parameters
+
+        def begin(args, kwargs):
+            started = time.perf_counter()
+            run, sampled_token, run_token = _start_run(
+                run_name, run_type, project, args[1:] if skip_self else args, kwargs
+            )
+            trace_overhead.observe(time.perf_counter() - started, exporter=llm_trace_exporter.exporter)
+            return run, sampled_token, run_token
+
+        def end(run, sampled_token, run_token, outputs=None, error=None):
+            if run_token is not None:
+                _current_run.reset(run_token)
+            if sampled_token is not None:
+                _sampled.reset(sampled_token)
+            if run is not None:
+                started = time.perf_counter()
+                _finish_run(run, outputs, error)
+                trace_overhead.observe(time.perf_counter() - started, exporter=llm_trace_exporter.exporter)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not llm_trace_exporter.enabled:
+                    return await func(*args, **kwargs)
+                state = begin(args, kwargs)
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as e:
+                    end(*state, error=e)
+                    raise
+                end(*state, outputs=result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not llm_trace_exporter.enabled:
+                return func(*args, **kwargs)
+            state = begin(args, kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                end(*state, error=e)
+                raise
+            end(*state, outputs=result)
+            return result
+        return wrapper
+
+    return decorator
+
+
+def _on_llm_span_finish(span: Span) -> None:
+    """Вызов OpenAI внутри сэмплированного трейса — дочерний запуск типа llm."""
+    if span.name != "llm.completion":
+        return
+    parent = _current_run.get()
+    if parent is None:
+        return
+    attributes = dict(span.attributes)
+    run = _Run(attributes.get("feature", span.name), "llm", parent.project,
+               {"model": attributes.get("model"), "feature": attributes.get("feature")},
+               parent=parent, start_time=span.start_time)
+    run.end_time = span.start_time + (span.duration_ms or 0) / 1000
+    run.outputs = {
+        "usage": {key: attributes[key] for key in ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens")
+                  if key in attributes},
+    }
+    run.error = span.error
+    run.extra = {"ls_model_name": attributes.get("model"), "ls_provider": "openai", "fallback": attributes.get("fallback")}
+    llm_trace_exporter.submit(run)
+
+
+add_span_listener(_on_llm_span_finish)
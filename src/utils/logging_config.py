@@ -1,195 +1,306 @@
 # src/utils/logging_config.py
+"""
+Централизованное логирование приложения.
+
+Логгеры модулей пишут записи в очередь (QueueHandler), а файловые и консольный
+handler работают в фоновом потоке QueueListener — запись на диск и
+форматирование не выполняются в потоке event loop. Формат вывода — текст
+(LOG_FORMAT=text) или JSON по строке на запись (LOG_FORMAT=json).
+
+Объемные данные (ответы моделей, промпты) логируются только через
+log_payload: уровень DEBUG и выборка LOG_PAYLOAD_SAMPLE_RATE.
+"""
+
+import atexit
+import functools
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import random
+import sys
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
-from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, List, Optional, Union
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+# Модули приложения: у каждого свой файл LOGS/<module>.log.
+# Порядок важен для get_logger: первое вхождение в путь файла определяет модуль.
+MODULES = [
+    "callback_local_server",
+    "tg_bot",
+    "llm_cover_letter",
+    "llm_gap_analyzer",
+    "llm_interview_checklist",
+    "llm_interview_simulation",
+    "parsers",
+    "hh",
+]
+
+# Поля LogRecord, которые не считаются пользовательскими (extra=...)
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "module_path"}
+
+# Выборка и обрезка объемных данных в log_payload
+_PAYLOAD_SAMPLE_RATE = float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', 0))
+_PAYLOAD_MAX_CHARS = int(os.getenv('LOG_PAYLOAD_MAX_CHARS', 2000))
+
+_listeners: List[QueueListener] = []
+# Очередь логов модулей, созданная setup_logging (заменяется при повторной настройке)
+_modules_queue_handler: Optional[QueueHandler] = None
+
+
+def _module_path(pathname: str) -> str:
+    """/path/to/src/tg_bot/handlers/message_handlers.py -> src.tg_bot.handlers.message_handlers"""
+    if pathname.endswith('.py'):
+        pathname = pathname[:-3]
+    src_index = pathname.find('src')
+    if src_index != -1:
+        pathname = pathname[src_index:].replace(os.sep, '.')
+    return pathname
 
 
 class ModulePathFormatter(logging.Formatter):
     """Кастомный форматтер для логов с полным путем модуля без расширения."""
-    
+
     def format(self, record):
-        # Получаем полный путь к файлу
-        pathname = record.pathname
-        
-        # Убираем расширение .py
-        if pathname.endswith('.py'):
-            pathname = pathname[:-3]
-        
-        # Заменяем разделители на точки для читаемости
-        # /path/to/src/tg_bot/handlers/message_handlers.py -> src.tg_bot.handlers.message_handlers
-        if 'src' in pathname:
-            # Берем только часть после src/
-            src_index = pathname.find('src')
-            if src_index != -1:
-                pathname = pathname[src_index:].replace(os.sep, '.')
-        
-        # Добавляем отформатированный путь в record
-        record.module_path = pathname
-        
+        record.module_path = _module_path(record.pathname)
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """Одна запись — одна JSON строка; поля из extra=... попадают в запись как есть."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module_path": _module_path(record.pathname),
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler без подготовки записи в вызывающем потоке.
+
+    Стандартный prepare() форматирует сообщение и traceback до постановки в
+    очередь (нужно для межпроцессных очередей). Очередь здесь внутрипроцессная,
+    поэтому вся работа по форматированию переносится в поток QueueListener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class _ModuleRouter(logging.Handler):
+    """Распределяет записи из очереди: логгеры модулей — в свои файлы, остальные — в консоль."""
+
+    def __init__(self, file_handlers: Dict[str, logging.Handler], console_handler: logging.Handler):
+        super().__init__()
+        self.file_handlers = file_handlers
+        self.console_handler = console_handler
+
+    def handle(self, record):
+        handler = self.file_handlers.get(record.name.partition('.')[0], self.console_handler)
+        if record.levelno >= handler.level:
+            handler.handle(record)
+        return True
+
+    def close(self):
+        for handler in [*self.file_handlers.values(), self.console_handler]:
+            handler.close()
+        super().close()
+
+
+def queued(handler: logging.Handler) -> QueueHandler:
+    """
+    Оборачивает handler в очередь с фоновым потоком записи.
+
+    Возвращает QueueHandler, который нужно добавить к логгеру; поток
+    останавливается (с дозаписью очереди) при завершении процесса.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=False)
+    listener.start()
+    _listeners.append(listener)
+    queue_handler = _InProcessQueueHandler(log_queue)
+    queue_handler.listener = listener
+    return queue_handler
+
+
+def _stop_listener(listener: QueueListener) -> None:
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def stop_logging() -> None:
+    """Останавливает фоновые потоки записи логов, дописав накопленные записи."""
+    for listener in list(_listeners):
+        _stop_listener(listener)
+
+
+atexit.register(stop_logging)
+
+
+def rotating_file_handler(filename: Union[str, Path], max_bytes: int, backup_count: int,
+                          legacy_path: Path) -> RotatingFileHandler:
+    """RotatingFileHandler с переносом ротированных файлов в legacy папку."""
+    handler = RotatingFileHandler(filename=str(filename), maxBytes=max_bytes, backupCount=backup_count,
+                                  encoding="utf-8", delay=True)
+    handler.namer = lambda default_name: str(legacy_path / os.path.basename(default_name))
+    return handler
+
+
 def setup_logging(
-    log_level: str = "DEBUG",
+    log_level: str = "INFO",
     max_bytes: int = 10 * 1024 * 1024,  # 10MB
     backup_count: int = 5,
-    logs_dir: str = "LOGS"
+    logs_dir: str = "LOGS",
+    log_format: str = "text"
 ) -> None:
     """
     Настройка централизованного логирования для всего приложения.
-    
+
     Args:
         log_level: Уровень логирования (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         max_bytes: Максимальный размер файла лога в байтах
         backup_count: Количество backup файлов для ротации
         logs_dir: Директория для файлов логов
+        log_format: text — строки "дата - модуль - функция:строка - уровень - сообщение", json — JSON строки
     """
+    global _modules_queue_handler
+
     # Создаем директории для логов
     logs_path = Path(logs_dir)
-    logs_path.mkdir(exist_ok=True)
-    
     legacy_path = logs_path / "legacy"
-    legacy_path.mkdir(exist_ok=True)
-    
-    # Определяем модули приложения
-    modules = [
-        "callback_local_server",
-        "hh", 
-        "llm_cover_letter",
-        "llm_gap_analyzer", 
-        "llm_interview_checklist",
-        "llm_interview_simulation",
-        "parsers",
-        "tg_bot"
-    ]
-    
+    legacy_path.mkdir(parents=True, exist_ok=True)
+
     # Уровень логирования
     level = getattr(logging, log_level.upper(), logging.INFO)
-    
-    # Формат логов: дата время, полный путь, функция, строка, уровень, сообщение
-    log_format = "%(asctime)s - %(module_path)s - %(funcName)s:%(lineno)d - %(levelname)s - %(message)s"
-    
+
+    if log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        # Формат логов: дата время, полный путь, функция, строка, уровень, сообщение
+        formatter = ModulePathFormatter(
+            "%(asctime)s - %(module_path)s - %(funcName)s:%(lineno)d - %(levelname)s - %(message)s"
+        )
+
+    # Файлы модулей и консоль обслуживаются одним фоновым потоком
+    file_handlers = {}
+    for module in MODULES:
+        handler = rotating_file_handler(logs_path / f"{module}.log", max_bytes, backup_count, legacy_path)
+        handler.setFormatter(formatter)
+        file_handlers[module] = handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    queue_handler = queued(_ModuleRouter(file_handlers, console_handler))
+    # Повторная настройка заменяет предыдущую
+    previous, _modules_queue_handler = _modules_queue_handler, queue_handler
+
     # Удаляем существующие handlers у root logger
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-    
+
     # Настраиваем логгеры для каждого модуля
-    for module in modules:
+    for module in MODULES:
         logger = logging.getLogger(module)
         logger.setLevel(level)
-        
-        # Убираем старые handlers
         for handler in logger.handlers[:]:
             logger.removeHandler(handler)
-        
-        # Файл для логов модуля
-        log_file = logs_path / f"{module}.log"
-        
-        # Создаем RotatingFileHandler с переносом в legacy
-        file_handler = RotatingFileHandler(
-            filename=str(log_file),
-            maxBytes=max_bytes,
-            backupCount=backup_count
-        )
-        
-        # Переносим ротированные файлы в legacy папку
-        def namer(default_name):
-            """Кастомная функция именования для перенаса в legacy папку."""
-            base_name = os.path.basename(default_name)
-            return str(legacy_path / base_name)
-        
-        file_handler.namer = namer
-        
-        # Устанавливаем форматтер
-        formatter = ModulePathFormatter(log_format)
-        file_handler.setFormatter(formatter)
-        
-        # Добавляем handler к логгеру
-        logger.addHandler(file_handler)
-        
+        logger.addHandler(queue_handler)
         # Отключаем propagation чтобы избежать дублирования
         logger.propagate = False
-    
-    # Создаем консольный handler для вывода в терминал (опционально)
-    console_handler = logging.StreamHandler()
-    console_formatter = ModulePathFormatter(
-        "%(asctime)s - %(module_path)s - %(funcName)s:%(lineno)d - %(levelname)s - %(message)s"
-    )
-    console_handler.setFormatter(console_formatter)
-    
-    # Добавляем консольный handler только к root logger для общих сообщений
-    root_logger.addHandler(console_handler)
+
+    # Root logger — общие сообщения в консоль
+    root_logger.addHandler(queue_handler)
     root_logger.setLevel(level)
 
+    if previous is not None:
+        _stop_listener(previous.listener)
+
+
+@functools.lru_cache(maxsize=None)
+def _module_for_file(filename: str) -> str:
+    """Имя логгера модуля по пути файла (кэшируется на файл)."""
+    for module in MODULES:
+        if module in filename:
+            return module
+    return 'app'  # fallback
+
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Получение логгера для модуля.
-    
+
     Args:
         name: Имя логгера. Если None, определяется автоматически по имени модуля.
-        
+
     Returns:
         Настроенный логгер
-        
+
     Examples:
         # В модуле src/tg_bot/handlers/message_handlers.py
         logger = get_logger("tg_bot")
-        
+
         # Или автоматическое определение
         logger = get_logger()  # автоматически определит tg_bot
     """
     if name is None:
-        # Автоматическое определение модуля по стеку вызовов
-        import inspect
-        
-        frame = inspect.currentframe()
-        try:
-            caller_frame = frame.f_back
-            caller_filename = caller_frame.f_code.co_filename
-            
-            # Определяем модуль по пути к файлу
-            if 'callback_local_server' in caller_filename:
-                name = 'callback_local_server'
-            elif 'tg_bot' in caller_filename:
-                name = 'tg_bot'
-            elif 'llm_cover_letter' in caller_filename:
-                name = 'llm_cover_letter'
-            elif 'llm_gap_analyzer' in caller_filename:
-                name = 'llm_gap_analyzer'
-            elif 'llm_interview_checklist' in caller_filename:
-                name = 'llm_interview_checklist'
-            elif 'llm_interview_simulation' in caller_filename:
-                name = 'llm_interview_simulation'
-            elif 'parsers' in caller_filename:
-                name = 'parsers'
-            elif 'hh' in caller_filename:
-                name = 'hh'
-            else:
-                name = 'app'  # fallback
-        finally:
-            del frame
-    
+        # Автоматическое определение модуля по файлу вызывающего кода
+        name = _module_for_file(sys._getframe(1).f_code.co_filename)
     return logging.getLogger(name)
 
 
+def log_payload(logger: logging.Logger, label: str, payload: Union[Any, Callable[[], Any]]) -> None:
+    """
+    Логирование объемных данных (ответы моделей, промпты) для отладки.
+
+    Запись делается только при уровне DEBUG и с вероятностью
+    LOG_PAYLOAD_SAMPLE_RATE (по умолчанию 0 — никогда); текст обрезается
+    до LOG_PAYLOAD_MAX_CHARS. payload может быть функцией — тогда данные
+    строятся только для попавших в выборку записей.
+    """
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= _PAYLOAD_SAMPLE_RATE:
+        return
+    text = str(payload() if callable(payload) else payload)
+    if len(text) > _PAYLOAD_MAX_CHARS:
+        text = f"{text[:_PAYLOAD_MAX_CHARS]}… (+{len(text) - _PAYLOAD_MAX_CHARS} символов)"
+    logger.debug(f"{label}: {text}", stacklevel=2)
+
+
 # Функция для инициализации логирования с настройками из переменных окружения
 def init_logging_from_env():
     """Инициализация логирования с настройками из переменных окружения."""
-    log_level = os.getenv('LOG_LEVEL', 'DEBUG')
+    log_level = os.getenv('LOG_LEVEL', 'INFO')
     max_bytes = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))  # 10MB по умолчанию
     backup_count = int(os.getenv('LOG_BACKUP_COUNT', 5))
     logs_dir = os.getenv('LOGS_PATH', 'LOGS')
-    
+    log_format = os.getenv('LOG_FORMAT', 'text').lower()
+
     setup_logging(
         log_level=log_level,
         max_bytes=max_bytes,
         backup_count=backup_count,
-        logs_dir=logs_dir
+        logs_dir=logs_dir,
+        log_format=log_format
     )
 
 
@@ -206,13 +317,13 @@ def configure_external_loggers():
 if __name__ == "__main__":
     # Тестирование конфигурации
     setup_logging(log_level="DEBUG")
-    
+
     # Тестируем разные модули
     tg_logger = get_logger("tg_bot")
     tg_logger.info("Тестовое сообщение от tg_bot")
-    
+
     hh_logger = get_logger("hh")
     hh_logger.warning("Тестовое предупреждение от hh")
-    
+
     llm_logger = get_logger("llm_gap_analyzer")
-    llm_logger.error("Тестовая ошибка от llm_gap_analyzer")
\ No newline at end of file
+    llm_logger.error("Тестовая ошибка от llm_gap_analyzer")
@@ -0,0 +1,218 @@
+# src/utils/loop_monitor.py
+"""
+Мониторинг задержки event loop и поиск блокирующих вызовов.
+
+Heartbeat-корутина засыпает на EVENT_LOOP_MONITOR_INTERVAL и измеряет, насколько
+позже срока она проснулась — это и есть задержка (lag) event loop. Сторожевой
+поток следит за временем последнего heartbeat: если loop не отвечает дольше
+EVENT_LOOP_BLOCK_THRESHOLD, он снимает стек потока event loop (то место, где
+выполняется синхронный код) и пишет его в лог.
+
+Метрики (src/utils/metrics.py):
+    event_loop_lag_seconds{service}                — гистограмма задержек
+    event_loop_lag_quantile_seconds{service,quantile} — p50/p95/p99 скользящего окна
+    event_loop_blocked_total{service,location}     — блокировки по месту в коде
+
+Пример:
+    from src.utils.loop_monitor import loop_monitor
+
+    loop_monitor.start("unified_app")   # внутри работающего event loop
+    loop_monitor.stats()                # перцентили для /health
+    await loop_monitor.stop()
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from src.utils.logging_config import get_logger
+from src.utils.metrics import registry
+
+logger = get_logger()
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+lag_histogram = registry.histogram(
+    "event_loop_lag_seconds", "Задержка event loop относительно запланированного heartbeat", LAG_BUCKETS
+)
+blocked_counter = registry.counter(
+    "event_loop_blocked_total", "Блокировки event loop дольше порога по месту в коде"
+)
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def _blocking_location(stack: List[traceback.FrameSummary]) -> str:
+    """Самый глубокий кадр кода проекта (src/...) — вероятный источник блокировки."""
+    for frame in reversed(stack):
+        path = Path(frame.filename)
+        if PROJECT_ROOT in path.parents and path.parts[len(PROJECT_ROOT.parts)] == "src":
+            return f"{path.relative_to(PROJECT_ROOT)}:{frame.name}"
+    if stack:
+        return f"{Path(stack[-1].filename).name}:{stack[-1].name}"
+    return "unknown"
+
+
+class EventLoopMonitor:
+    """Heartbeat задержки event loop и сторожевой поток со снятием стека."""
+
+    def __init__(self):
+        self.enabled = os.getenv("EVENT_LOOP_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.interval = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL", 0.1))
+        self.threshold = float(os.getenv("EVENT_LOOP_BLOCK_THRESHOLD", 0.25))
+        self.stack_depth = int(os.getenv("EVENT_LOOP_BLOCK_STACK_DEPTH", 30))
+        # Окно перцентилей: последние N heartbeat (600 x 0.1 с — минута)
+        self._samples: Deque[float] = deque(maxlen=int(os.getenv("EVENT_LOOP_LAG_WINDOW", 600)))
+        self._blocks: Deque[Dict[str, Any]] = deque(maxlen=int(os.getenv("EVENT_LOOP_BLOCK_HISTORY", 20)))
+
+        self.service = ""
+        self.blocked_total = 0
+        self.max_lag = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._captured_beat = 0.0
+        self._open_block: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, service: str) -> None:
+        """Запуск heartbeat в текущем event loop и сторожевого потока."""
+        if not self.enabled or self.running:
+            return
+        self.service = service
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        registry.register_gauge_callback(
+            "event_loop_lag_quantile_seconds", "Перцентили задержки event loop за скользящее окно",
+            self._quantile_metrics
+        )
+        logger.info(
+            f"Мониторинг event loop запущен ({service}): heartbeat {self.interval * 1000:.0f} мс, "
+            f"порог блокировки {self.threshold * 1000:.0f} мс"
+        )
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    # ---------- heartbeat ----------
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, time.perf_counter() - expected))
+
+    def _record(self, lag: float) -> None:
+        lag_histogram.observe(lag, service=self.service)
+        with self._lock:
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            block, self._open_block = self._open_block, None
+        if block is not None:
+            # Блокировка закончилась: фиксируем полную длительность
+            block["duration_ms"] = round(lag * 1000, 1)
+            logger.warning(
+                f"Event loop был заблокирован {block['duration_ms']:.0f} мс ({self.service}), "
+                f"место: {block['location']}"
+            )
+
+    # ---------- сторожевой поток ----------
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(min(self.interval, self.threshold) / 2):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled >= self.threshold and beat != self._captured_beat:
+                self._captured_beat = beat
+                self._capture(stalled)
+
+    def _capture(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame, limit=self.stack_depth)
+        location = _blocking_location(stack)
+        block = {
+            "detected_at": datetime.now().isoformat(timespec="seconds"),
+            "location": location,
+            "duration_ms": round(stalled * 1000, 1),
+            "stack": "".join(traceback.format_list(stack)),
+        }
+        with self._lock:
+            self.blocked_total += 1
+            self._blocks.append(block)
+            self._open_block = block
+        blocked_counter.inc(service=self.service, location=location)
+        logger.warning(
+            f"Event loop заблокирован дольше {self.threshold * 1000:.0f} мс ({self.service}), "
+            f"место: {location}\nСтек потока event loop:\n{block['stack']}"
+        )
+
+    # ---------- статистика ----------
+
+    def _quantile_metrics(self) -> Dict[tuple, float]:
+        ordered = sorted(self._samples)
+        return {
+            (("service", self.service), ("quantile", str(q))): round(_percentile(ordered, q), 6)
+            for q in (0.5, 0.95, 0.99)
+        }
+
+    def stats(self, include_stacks: bool = False) -> Dict[str, Any]:
+        """Перцентили задержки (мс) за окно и последние блокировки."""
+        if not self.running:
+            return {"enabled": False}
+        with self._lock:
+            ordered = sorted(self._samples)
+            blocks = [dict(block) for block in self._blocks]
+        to_ms = lambda value: round(value * 1000, 1)
+        if not include_stacks:
+            for block in blocks:
+                block.pop("stack", None)
+        return {
+            "enabled": True,
+            "window_samples": len(ordered),
+            "lag_ms": {
+                "p50": to_ms(_percentile(ordered, 0.5)),
+                "p95": to_ms(_percentile(ordered, 0.95)),
+                "p99": to_ms(_percentile(ordered, 0.99)),
+                "max": to_ms(ordered[-1]) if ordered else 0.0,
+                "max_since_start": to_ms(self.max_lag),
+            },
+            "block_threshold_ms": to_ms(self.threshold),
+            "blocked_total": self.blocked_total,
+            "recent_blocks": blocks,
+        }
+
+
+loop_monitor = EventLoopMonitor()
@@ -0,0 +1,321 @@
+# src/utils/metrics.py
+"""
+Метрики приложения в текстовом формате Prometheus (exposition format 0.0.4).
+
+Метрики LLM и HH собираются из спанов трассировки (src/utils/tracing.py),
+поэтому отдельная инструментализация вызовов не нужна; спаны создаются и при
+TRACING_ENABLED=false (отключается только их экспорт). Размеры хранилищ
+и очередей регистрируются как gauge-колбэки и вычисляются при каждом scrape.
+
+Доступ к /metrics: METRICS_TOKEN — токен для сборщика (заголовок
+"Authorization: Bearer <токен>"); без него /metrics веб-приложения доступен
+только после входа, а HTTP сервер метрик бота слушает localhost.
+
+Пример:
+    from src.utils.metrics import registry
+    registry.register_gauge_callback(
+        "app_result_store_size", "Размер хранилищ результатов",
+        lambda: {(("store", "analysis"),): len(analysis_storage)}
+    )
+    text = registry.render()
+"""
+
+import hmac
+import os
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.tracing import Span, add_span_listener
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Границы бакетов по умолчанию (секунды): от быстрых HH запросов до длинных LLM генераций
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def metrics_token_valid(authorization: Optional[str]) -> bool:
+    """Заголовок Authorization запроса /metrics содержит METRICS_TOKEN."""
+    token = os.getenv("METRICS_TOKEN", "")
+    if not token or not authorization:
+        return False
+    return hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode())
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Базовая метрика с набором значений по меткам."""
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик."""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Значение, которое может расти и уменьшаться."""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Гистограмма с кумулятивными бакетами, суммой и количеством."""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(round(self._sums[key], 6))}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {counts[-1]}")
+        return lines
+
+
+class _CallbackGauge(_Metric):
+    """Gauge, значения которого вычисляются функцией в момент scrape."""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], object]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        try:
+            result = self.callback()
+        except Exception:
+            return []
+        if isinstance(result, dict):
+            items = [(_label_key(dict(labels)), value) for labels, value in result.items()]
+        else:
+            items = [((), result)]
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._register(Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._register(Gauge(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, buckets))
+
+    def register_gauge_callback(self, name: str, documentation: str, callback: Callable[[], object]) -> None:
+        """
+        Регистрирует gauge, вычисляемый при scrape.
+
+        Колбэк возвращает число либо словарь {((метка, значение), ...): число}.
+        Повторная регистрация с тем же именем заменяет колбэк.
+        """
+        with self._lock:
+            self._metrics[name] = _CallbackGauge(name, documentation, callback)
+
+    def render(self) -> str:
+        """Текст всех метрик в формате Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ================== МЕТРИКИ ИЗ СПАНОВ ==================
+
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds", "Длительность вызовов LLM по функциям и моделям"
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total", "Токены LLM по функциям, моделям и типу (prompt/completion/cached)"
+)
+llm_in_flight = registry.gauge(
+    "llm_requests_in_flight", "Выполняющиеся вызовы LLM по функциям"
+)
+hh_request_duration = registry.histogram(
+    "hh_request_duration_seconds", "Длительность запросов к API HH.ru"
+)
+hh_responses = registry.counter(
+    "hh_responses_total", "Ответы API HH.ru по эндпоинтам и статусам"
+)
+hh_in_flight = registry.gauge(
+    "hh_requests_in_flight", "Выполняющиеся запросы к API HH.ru"
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Длительность обработки HTTP запросов веб-приложения"
+)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "Обрабатываемые HTTP запросы веб-приложения"
+)
+
+
+def _normalize_endpoint(endpoint: object) -> str:
+    """vacancies/120234346 -> vacancies/:id (ограничение кардинальности меток)."""
+    return re.sub(r"\d+", ":id", str(endpoint or ""))
+
+
+def _on_span_start(span: Span) -> None:
+    if span.name == "llm.completion":
+        llm_in_flight.inc(feature=span.attributes.get("feature", "unknown"))
+    elif span.name == "hh.request":
+        hh_in_flight.inc()
+    elif span.name == "http.request":
+        http_in_flight.inc()
+
+
+def _on_span_finish(span: Span) -> None:
+    seconds = (span.duration_ms or 0) / 1000
+    attributes = span.attributes
+
+    if span.name == "llm.completion":
+        feature = attributes.get("feature", "unknown")
+        model = attributes.get("model", "unknown")
+        llm_in_flight.dec(feature=feature)
+        llm_request_duration.observe(seconds, feature=feature, model=model, status=span.status)
+        for token_type in ("prompt", "completion", "cached"):
+            count = attributes.get(f"{token_type}_tokens")
+            if count:
+                llm_tokens.inc(count, feature=feature, model=model, type=token_type)
+
+    elif span.name == "hh.request":
+        endpoint = _normalize_endpoint(attributes.get("endpoint"))
+        hh_in_flight.dec()
+        hh_request_duration.observe(seconds, endpoint=endpoint)
+        hh_responses.inc(endpoint=endpoint, status=attributes.get("status", "error"))
+
+    elif span.name == "http.request":
+        http_in_flight.dec()
+        http_request_duration.observe(
+            seconds, method=attributes.get("method", ""), status_code=attributes.get("status_code", "")
+        )
+
+
+add_span_listener(_on_span_finish, on_start=_on_span_start)
+
+
+def _openai_usage_metrics() -> Dict[LabelKey, float]:
+    """Счетчики OpenAIController в виде gauge (накопленные значения процесса)."""
+    from src.security.openai_control import openai_controller
+
+    stats = openai_controller.get_usage_stats()
+    return {
+        (("kind", "total"),): stats["total_requests"],
+        (("kind", "successful"),): stats["successful_requests"],
+        (("kind", "failed"),): stats["failed_requests"],
+        (("kind", "retries"),): stats["resilience"]["retries"],
+        (("kind", "hedges_started"),): stats["resilience"]["hedges_started"],
+        (("kind", "hedges_won"),): stats["resilience"]["hedges_won"],
+    }
+
+
+registry.register_gauge_callback(
+    "openai_controller_requests", "Запросы к OpenAI по данным OpenAIController", _openai_usage_metrics
+)
+
+
+def _openai_key_headroom() -> Dict[LabelKey, float]:
+    """Свободный RPM/TPM бюджет по ключам пула OpenAI (0 — ключ в карантине)."""
+    from src.security.openai_control import openai_controller
+
+    return {(("key", slot["key"]),): slot["headroom"] for slot in openai_controller.get_usage_stats()["api_keys"]}
+
+
+registry.register_gauge_callback(
+    "openai_key_headroom", "Доля свободного бюджета по ключам OpenAI", _openai_key_headroom
+)
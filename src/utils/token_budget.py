@@ -0,0 +1,315 @@
+# src/utils/token_budget.py
+"""
+Учет токенов и бюджеты промптов по LLM сервисам.
+
+Токены считаются локальным токенизатором tiktoken (requirements.txt). Кодировка
+загружается при первом использовании (по сети или из TIKTOKEN_CACHE_DIR),
+поэтому прогрев сервисов загружает ее заранее в потоке (load_tokenizer).
+Если tiktoken или кодировка недоступны, используется эвристика ~3 символа на
+токен для смешанного русского/английского текста (с предупреждением в логе).
+
+Бюджеты задаются по сервису (префикс feature до точки, например llm_gap_analyzer):
+    resume           — токены отформатированного резюме (0 — без ограничения)
+    vacancy          — токены отформатированной вакансии (0 — без ограничения)
+    completion       — базовый max_tokens ответа (None — не задавать: большие
+                       структурированные ответы не обрезаются)
+    completion_ratio — доля входных токенов, добавляемая к max_tokens
+                       (ответ, пропорциональный входу: парсинг и рерайт резюме)
+    completion_cap   — верхняя граница max_tokens
+
+Переопределение через LLM_TOKEN_BUDGETS (JSON строка или путь к файлу):
+    {"llm_gap_analyzer": {"resume": 8000, "completion": 10000}}
+
+Если резюме не помещается в бюджет, оно сокращается по приоритету:
+сначала удаляются самые старые места работы, затем укорачиваются длинные
+описания, затем убирается дополнительное образование и сертификаты.
+Сокращение детерминировано, поэтому префикс промпта остается стабильным
+для кэша промптов OpenAI.
+"""
+
+import copy
+import functools
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .logging_config import get_logger
+
+logger = get_logger()
+
+try:
+    import tiktoken
+except ImportError:  # без tiktoken — эвристика (см. requirements.txt)
+    tiktoken = None
+
+# Кодировка моделей семейства gpt-4o / gpt-4.1
+TIKTOKEN_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 3
+# Служебные токены на сообщение чата и на ответ
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_OVERHEAD_TOKENS = 3
+
+# Сколько последних мест работы сохраняется при любом сокращении
+MIN_RECENT_EXPERIENCE = 2
+# Последовательные лимиты длины описаний (токены) при сокращении
+DESCRIPTION_LIMITS = (600, 300, 150)
+TRUNCATION_MARK = " […]"
+# Даты начала работы: HH — "2015-03-01", резюме из PDF (LLM) — свободный текст ("03.2015", "Январь 2019")
+_YEAR_RE = re.compile(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)")
+_YEAR_MONTH_RE = re.compile(r"(?<!\d)(?:(19\d{2}|20\d{2})[-./](\d{1,2})|(\d{1,2})[-./](19\d{2}|20\d{2}))(?!\d)")
+_MONTH_PREFIXES = (
+    ("янв", 1), ("фев", 2), ("мар", 3), ("апр", 4), ("май", 5), ("мая", 5), ("июн", 6), ("июл", 7),
+    ("авг", 8), ("сен", 9), ("окт", 10), ("ноя", 11), ("дек", 12),
+    ("jan", 1), ("feb", 2), ("mar", 3), ("apr", 4), ("may", 5), ("jun", 6), ("jul", 7),
+    ("aug", 8), ("sep", 9), ("oct", 10), ("nov", 11), ("dec", 12),
+)
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    """Бюджет токенов одного LLM сервиса."""
+    resume: int = 6000
+    vacancy: int = 3000
+    completion: Optional[int] = None
+    completion_ratio: float = 0.0
+    completion_cap: int = 16000
+
+
+DEFAULT_BUDGETS: Dict[str, TokenBudget] = {
+    # Структурированные ответы instructor: max_tokens не задается, обрезанный JSON не пройдет валидацию
+    "llm_gap_analyzer": TokenBudget(resume=6000, vacancy=3000),
+    "llm_cover_letter": TokenBudget(resume=4000, vacancy=3000),
+    "llm_interview_checklist": TokenBudget(resume=5000, vacancy=3000),
+    # max_tokens вопросов, ответов и оценок задается в точках вызова симуляции
+    "llm_interview_simulation": TokenBudget(resume=3000, vacancy=2000),
+    "llm_resume_rewriter": TokenBudget(resume=6000, vacancy=0, completion=2000, completion_ratio=0.8),
+    "parsers": TokenBudget(resume=0, vacancy=0, completion=2000, completion_ratio=1.2),
+}
+
+
+def _load_budgets() -> Dict[str, TokenBudget]:
+    """Бюджеты по умолчанию с переопределениями из LLM_TOKEN_BUDGETS."""
+    budgets = dict(DEFAULT_BUDGETS)
+    raw = os.getenv("LLM_TOKEN_BUDGETS", "").strip()
+    if not raw:
+        return budgets
+    try:
+        if not raw.startswith("{"):
+            raw = Path(raw).read_text(encoding="utf-8")
+        for service, params in json.loads(raw).items():
+            budgets[service] = replace(budgets.get(service, TokenBudget()), **params)
+    except (OSError, ValueError, TypeError) as e:
+        logger.error(f"Некорректные бюджеты LLM_TOKEN_BUDGETS, используются значения по умолчанию: {e}")
+        return dict(DEFAULT_BUDGETS)
+    return budgets
+
+
+_budgets = _load_budgets()
+
+
+def get_budget(feature: str) -> TokenBudget:
+    """Бюджет сервиса по feature вызова или имени сервиса."""
+    return _budgets.get(feature.split(".", 1)[0], TokenBudget())
+
+
+# ================== ПОДСЧЕТ ТОКЕНОВ ==================
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    if tiktoken is None:
+        logger.warning("tiktoken не установлен, токены считаются эвристикой")
+        return None
+    try:
+        return tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception as e:
+        logger.warning(f"Токенизатор tiktoken недоступен, используется эвристика: {e}")
+        return None
+
+
+def load_tokenizer() -> bool:
+    """Загрузка кодировки токенизатора (блокирующий вызов, для потока прогрева)."""
+    return _get_encoding() is not None
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Количество токенов текста."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def count_message_tokens(messages: Optional[List[Dict[str, Any]]]) -> int:
+    """Входные токены сообщений чата с учетом служебных токенов."""
+    if not messages:
+        return 0
+    return sum(
+        count_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD_TOKENS for message in messages
+    ) + REPLY_OVERHEAD_TOKENS
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Обрезает текст до max_tokens по границе абзаца, предложения или слова."""
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    # Не обрываем текст посередине предложения, если граница недалеко
+    boundary = max(cut.rfind("\n"), cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+    if boundary < len(cut) // 2:
+        boundary = cut.rfind(" ")
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + TRUNCATION_MARK
+
+
+# ================== СОКРАЩЕНИЕ РЕЗЮМЕ И ВАКАНСИИ ==================
+
+def _parse_year_month(value: Any) -> Optional[tuple]:
+    """(год, месяц) даты начала работы; месяц 0 — не указан; None — дата не распознана."""
+    text = str(value or "").strip().lower()
+    match = _YEAR_MONTH_RE.search(text)
+    if match:
+        year, month = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+        if 1 <= int(month) <= 12:
+            return int(year), int(month)
+    match = _YEAR_RE.search(text)
+    if not match:
+        return None
+    words = re.findall(r"[a-zа-яё]+", text)
+    month = next((number for word in words for prefix, number in _MONTH_PREFIXES if word.startswith(prefix)), 0)
+    return int(match.group(1)), month
+
+
+def _experience_age_order(experience: List[Dict[str, Any]]) -> List[int]:
+    """
+    Индексы мест работы от самого старого к самому новому.
+
+    По датам начала, если распознаны все; иначе по позиции в списке
+    (HH и парсер PDF перечисляют места работы от новых к старым).
+    """
+    starts = [_parse_year_month(item.get("start")) for item in experience]
+    if any(start is None for start in starts):
+        return list(reversed(range(len(experience))))
+    # При равенстве дат — порядок списка (новые выше)
+    return sorted(range(len(experience)), key=lambda index: (starts[index], -index))
+
+
+def _resume_trim_steps(data: Dict[str, Any]) -> Iterator[str]:
+    """Шаги сокращения резюме по приоритету; каждый шаг изменяет data."""
+    experience = data.get("experience") or []
+
+    # 1. Самые старые места работы
+    while len(experience) > MIN_RECENT_EXPERIENCE:
+        experience.pop(_experience_age_order(experience)[0])
+        yield "old_experience"
+
+    # 2. Длинные описания (опыт и раздел «о себе»), начиная с самых длинных
+    for limit in DESCRIPTION_LIMITS:
+        texts = [(item, "description") for item in experience] + [(data, "skills")]
+        texts.sort(key=lambda pair: len(str(pair[0].get(pair[1]) or "")), reverse=True)
+        for owner, key in texts:
+            value = owner.get(key)
+            if isinstance(value, str) and count_tokens(value) > limit:
+                owner[key] = truncate_text(value, limit)
+                yield "long_description"
+
+    # 3. Дополнительное образование и сертификаты
+    education = data.get("education") or {}
+    if education.get("additional"):
+        education["additional"] = []
+        yield "additional_education"
+    if data.get("certificate"):
+        data["certificate"] = []
+        yield "certificate"
+
+
+def fit_resume_to_budget(resume_data: Dict[str, Any], format_fn: Callable[..., str],
+                         budget: int, service: str) -> str:
+    """Форматирует резюме, при превышении бюджета сокращая данные по приоритету."""
+    text = format_fn(resume_data)
+    tokens = count_tokens(text)
+    if not budget or tokens <= budget or not isinstance(resume_data, dict):
+        return text
+
+    data = copy.deepcopy(resume_data)
+    applied: Dict[str, int] = {}
+    for step in _resume_trim_steps(data):
+        applied[step] = applied.get(step, 0) + 1
+        text = format_fn(data)
+        if count_tokens(text) <= budget:
+            break
+
+    trimmed_tokens = count_tokens(text)
+    summary = ", ".join(f"{step}={count}" for step, count in applied.items())
+    if trimmed_tokens > budget:
+        logger.warning(f"Резюме для {service} превышает бюджет после сокращения: {tokens} -> {trimmed_tokens} > {budget} токенов ({summary})")
+    else:
+        logger.info(f"Резюме для {service} сокращено до бюджета: {tokens} -> {trimmed_tokens} токенов ({summary})")
+    return text
+
+
+def fit_vacancy_to_budget(vacancy_data: Dict[str, Any], format_fn: Callable[..., str],
+                          budget: int, service: str) -> str:
+    """Форматирует вакансию, при превышении бюджета укорачивая описание."""
+    text = format_fn(vacancy_data)
+    tokens = count_tokens(text)
+    description = vacancy_data.get("description") if isinstance(vacancy_data, dict) else None
+    if not budget or tokens <= budget or not isinstance(description, str):
+        return text
+
+    # Описание урезается на величину превышения, остальные разделы вакансии сохраняются
+    description_budget = max(200, count_tokens(description) - (tokens - budget))
+    text = format_fn({**vacancy_data, "description": truncate_text(description, description_budget)})
+    logger.info(f"Описание вакансии для {service} сокращено до бюджета: {tokens} -> {count_tokens(text)} токенов")
+    return text
+
+
+def resume_budget(service: str) -> Callable:
+    """Декоратор форматтера резюме: результат укладывается в бюджет сервиса."""
+    def decorator(format_fn: Callable[..., str]) -> Callable[..., str]:
+        @functools.wraps(format_fn)
+        def wrapper(resume_data, *args, **kwargs):
+            formatter = functools.partial(format_fn, *args, **kwargs) if args or kwargs else format_fn
+            return fit_resume_to_budget(resume_data, formatter, get_budget(service).resume, service)
+        return wrapper
+    return decorator
+
+
+def vacancy_budget(service: str) -> Callable:
+    """Декоратор форматтера вакансии: описание укладывается в бюджет сервиса."""
+    def decorator(format_fn: Callable[..., str]) -> Callable[..., str]:
+        @functools.wraps(format_fn)
+        def wrapper(vacancy_data, *args, **kwargs):
+            formatter = functools.partial(format_fn, *args, **kwargs) if args or kwargs else format_fn
+            return fit_vacancy_to_budget(vacancy_data, formatter, get_budget(service).vacancy, service)
+        return wrapper
+    return decorator
+
+
+# ================== РАЗМЕР ОТВЕТА ==================
+
+def plan_completion(feature: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Оценивает входные токены запроса и задает max_tokens по бюджету сервиса.
+
+    Явно переданный max_tokens сохраняется. Возвращает новые kwargs вызова.
+    """
+    prompt_tokens = count_message_tokens(kwargs.get("messages"))
+    max_tokens = kwargs.get("max_tokens")
+    if max_tokens is None:
+        budget = get_budget(feature)
+        if budget.completion is not None:
+            max_tokens = min(budget.completion_cap, budget.completion + int(prompt_tokens * budget.completion_ratio))
+            kwargs = {**kwargs, "max_tokens": max_tokens}
+    logger.info(f"Оценка запроса {feature}: ~{prompt_tokens} входных токенов, max_tokens={max_tokens or 'по умолчанию'}")
+    return kwargs
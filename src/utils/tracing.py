@@ -0,0 +1,297 @@
+# src/utils/tracing.py
+"""
+Легковесная трассировка этапов обработки запроса.
+
+Вложенные спаны с длительностью и счетчиками токенов записываются в
+ротируемый JSONL лог (LOGS/spans.jsonl) и отдаются в заголовке Server-Timing
+веб-приложения. Внешний backend не требуется, LangSmith не используется.
+
+TRACING_ENABLED=false отключает только экспорт (JSONL и Server-Timing): спаны
+создаются всегда, потому что по ним подписчики считают метрики /metrics
+(src/utils/metrics.py) и дочерние запуски LLM трейсинга (src/utils/llm_tracing.py).
+
+Пример:
+    with trace_span("hh.request", endpoint=endpoint) as span:
+        ...
+        span.set_attribute("status", response.status)
+
+    @traced("parsers.extract_text")
+    def extract_text_from_pdf(...): ...
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logging_config import queued, rotating_file_handler
+
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Текущий спан (родитель для вложенных) и список спанов текущего HTTP запроса
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_request_spans: ContextVar[Optional[List["Span"]]] = ContextVar("request_spans", default=None)
+
+# Подписчики на начало и завершение спанов (например, сбор метрик)
+_span_start_listeners: List[Callable[["Span"], None]] = []
+_span_listeners: List[Callable[["Span"], None]] = []
+
+_span_logger: Optional[logging.Logger] = None
+
+
+@dataclass
+class Span:
+    """Один этап обработки с длительностью и атрибутами."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)
+    duration_ms: Optional[float] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    _start_perf: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_tokens(self, usage: Any) -> None:
+        """Суммирует счетчики токенов из usage ответа OpenAI."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        counters = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+            "total_tokens": getattr(usage, "total_tokens", 0),
+            "cached_tokens": getattr(details, "cached_tokens", 0) if details else 0,
+        }
+        for key, value in counters.items():
+            self.attributes[key] = self.attributes.get(key, 0) + (value or 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Заглушка спана вне трассируемого контекста (current_span без открытого спана)."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_tokens(self, usage: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _get_span_logger() -> logging.Logger:
+    """Ленивое создание логгера JSONL спанов с ротацией в legacy и фоновой записью, как у логов модулей."""
+    global _span_logger
+    if _span_logger is None:
+        logs_path = Path(os.getenv("LOGS_PATH", "LOGS"))
+        legacy_path = logs_path / "legacy"
+        legacy_path.mkdir(parents=True, exist_ok=True)
+
+        handler = rotating_file_handler(
+            os.getenv("TRACING_SPAN_LOG", str(logs_path / "spans.jsonl")),
+            max_bytes=int(os.getenv("TRACING_MAX_BYTES", 10 * 1024 * 1024)),
+            backup_count=int(os.getenv("TRACING_BACKUP_COUNT", 5)),
+            legacy_path=legacy_path
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        span_logger = logging.getLogger("spans")
+        span_logger.setLevel(logging.INFO)
+        # Запись в файл — в фоновом потоке, как у логов модулей
+        span_logger.addHandler(queued(handler))
+        span_logger.propagate = False
+        _span_logger = span_logger
+    return _span_logger
+
+
+def _finish_span(span: Span) -> None:
+    """Фиксирует спан: JSONL лог, спаны запроса и подписчики."""
+    request_spans = _request_spans.get()
+    if request_spans is not None:
+        request_spans.append(span)
+
+    if TRACING_ENABLED:
+        try:
+            _get_span_logger().info(json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+        except Exception:
+            pass
+
+    for listener in _span_listeners:
+        try:
+            listener(span)
+        except Exception:
+            pass
+
+
+class trace_span:
+    """Контекстный менеджер спана (поддерживает with и async with)."""
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self._span = Span(
+            name=self.name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            attributes=dict(self.attributes)
+        )
+        self._token = _current_span.set(self._span)
+        for listener in _span_start_listeners:
+            try:
+                listener(self._span)
+            except Exception:
+                pass
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        span.duration_ms = round((time.perf_counter() - span._start_perf) * 1000, 2)
+        if exc is not None:
+            span.status = "error"
+            span.error = f"{exc_type.__name__}: {exc}"
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Спан закрыт в другом контексте (например, в генераторе потокового ответа)
+            _current_span.set(None)
+        _finish_span(span)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def traced(name: Optional[str] = None, **attributes: Any):
+    """Декоратор спана для синхронных и асинхронных функций."""
+
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with trace_span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def current_span():
+    """Текущий спан (или заглушка, если спана нет)."""
+    return _current_span.get() or _NOOP_SPAN
+
+
+def record_token_usage(usage: Any) -> None:
+    """Добавляет счетчики токенов ответа OpenAI к текущему спану."""
+    current_span().add_tokens(usage)
+
+
+def add_span_listener(listener: Callable[[Span], None], on_start: Optional[Callable[[Span], None]] = None) -> None:
+    """Подписка на завершение (и опционально на начало) спанов."""
+    if listener not in _span_listeners:
+        _span_listeners.append(listener)
+    if on_start is not None and on_start not in _span_start_listeners:
+        _span_start_listeners.append(on_start)
+
+
+def format_server_timing(spans: List[Span], limit: int = 20) -> str:
+    """Формирует значение заголовка Server-Timing, суммируя спаны с одинаковым именем."""
+    totals: Dict[str, List[float]] = {}
+    for span in spans:
+        if span.duration_ms is None:
+            continue
+        entry = totals.setdefault(span.name, [0.0, 0])
+        entry[0] += span.duration_ms
+        entry[1] += 1
+
+    metrics = []
+    for span_name, (duration, count) in sorted(totals.items(), key=lambda item: -item[1][0])[:limit]:
+        metric_name = "".join(ch if ch.isalnum() or ch in "._-" else "_" for ch in span_name)
+        metric = f"{metric_name};dur={duration:.1f}"
+        if count > 1:
+            metric += f';desc="x{count}"'
+        metrics.append(metric)
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware: корневой спан запроса и заголовок Server-Timing в ответе (при TRACING_ENABLED)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Span] = []
+        spans_token = _request_spans.set(spans)
+        root = trace_span("http.request", method=scope.get("method"), path=scope.get("path"))
+        root_span = root.__enter__()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                root_span.set_attribute("status_code", message["status"])
+                if not TRACING_ENABLED:
+                    await send(message)
+                    return
+                total_ms = (time.perf_counter() - root_span._start_perf) * 1000
+                header = format_server_timing(spans)
+                header = f"total;dur={total_ms:.1f}" + (f", {header}" if header else "")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", header.encode("latin-1", errors="replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except BaseException as e:
+            root.__exit__(type(e), e, e.__traceback__)
+            raise
+        else:
+            root.__exit__(None, None, None)
+        finally:
+            _request_spans.reset(spans_token)
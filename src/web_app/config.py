@@ -0,0 +1,20 @@
+# src/web_app/config.py
+from pydantic import ConfigDict
+from src.config import BaseAppSettings
+
+
+class WebAppSettings(BaseAppSettings):
+    """
+    Настройки размещения веб-приложений функций.
+    """
+    mount_feature_apps: bool = True        # Маршруты приложений функций в объединенном приложении (/apps/...)
+    unified_app_url: str = "http://localhost:3000"  # Адрес объединенного приложения (для панели мониторинга)
+
+    model_config = ConfigDict(
+        env_file='.env',
+        env_prefix='WEB_APP_',
+        extra='ignore'
+    )
+
+
+settings = WebAppSettings()
@@ -17,10 +17,15 @@ from reportlab.pdfbase.ttfonts import TTFont
 from typing import Any, Dict, List
 import os
 
+from src.utils.tracing import traced
+
 
 class CoverLetterPDFGenerator:
     """Генератор PDF для сопроводительных писем"""
     
+    # Версия шаблона отчета: увеличивать при изменении верстки (ключ кэша готовых PDF)
+    VERSION = "1.0"
+    
     def __init__(self):
         # Цветовая схема (должна быть первой!)
         self.colors = {
@@ -142,6 +147,7 @@ class CoverLetterPDFGenerator:
             leading=12
         ))
     
+    @traced("pdf.cover_letter")
     def generate_pdf(self, cover_letter_result) -> io.BytesIO:
         """Генерация PDF сопроводительного письма"""
         buffer = io.BytesIO()
@@ -0,0 +1,298 @@
+"""
+Маршруты веб-приложения для генерации сопроводительного письма
+
+Простая веб-форма для загрузки PDF резюме и генерации персонализированного сопроводительного письма.
+
+Монтируются в объединенное приложение под /apps/cover-letter (src/web_app/shared.py)
+или запускаются отдельным приложением на порту 8001 (main.py).
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Request, Depends, Query
+from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.templating import Jinja2Templates
+
+# Импорты проекта
+from src.callback_local_server.client import reset_code, wait_for_code
+from src.services import ServiceContainer
+from src.services.web import get_services
+from src.utils import get_logger
+
+# Общие авторизация и токены HH приложений процесса
+from src.web_app.shared import auth_system, hh_tokens_retain_until, hh_user_key
+
+logger = get_logger()
+
+router = APIRouter()
+
+# Сервисы функции в общем контейнере (прогрев при старте отдельного приложения)
+SERVICE_NAMES = ["pdf_parser", "vacancy_extractor", "hh_auth_service", "token_exchanger", "cover_letter_generator"]
+
+# Настройка шаблонов
+templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
+
+# Временное хранилище для результатов анализа (для PDF генерации)
+cover_letter_storage = {}
+
+# ================== ГЛАВНАЯ СТРАНИЦА ==================
+
+@router.get("/", response_class=HTMLResponse)
+async def index(request: Request, _: bool = Depends(auth_system.require_auth)):
+    """Главная страница с формой генерации сопроводительного письма"""
+    # base_path — префикс маршрутов функции в объединенном приложении ("" для отдельного приложения)
+    return templates.TemplateResponse("index.html", {"request": request, "base_path": request.url.path.rstrip("/")})
+
+# ================== HH.RU АВТОРИЗАЦИЯ ==================
+
+@router.post("/auth/hh")
+async def start_hh_auth(request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Начало авторизации HH.ru (state связывает код на callback сервере с сессией пользователя)"""
+    state = services.hh_auth_service.state_for(hh_user_key(request))
+    auth_url = services.hh_auth_service.get_auth_url(state)
+    return {"auth_url": auth_url}
+
+@router.get("/auth/tokens")
+async def get_tokens_from_callback(
+    request: Request,
+    wait: float = Query(0, ge=0, le=30),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Получение токенов по коду с callback сервера (wait — ожидание кода, секунды)"""
+    try:
+        user_key = hh_user_key(request)
+        
+        # Сначала проверяем, есть ли уже сохраненные токены
+        if await services.hh_tokens.get(user_key) is not None:
+            return {
+                "success": True,
+                "message": "Авторизация уже выполнена"
+            }
+        
+        # Код этого пользователя: ответ сразу после callback, без периодического опроса
+        state = services.hh_auth_service.state_for(user_key)
+        code = await wait_for_code(services.http_session(), state, timeout=wait)
+        
+        if code:
+            logger.info(f"Получен код авторизации, обмениваем на токены...")
+            
+            # Обмениваем код на токены
+            tokens = await services.token_exchanger.exchange_code(code)
+            
+            # Сохраняем токены пользователя в хранилище (на время сессии)
+            await services.hh_tokens.save(user_key, tokens, retain_until=hh_tokens_retain_until())
+            
+            logger.info("Токены успешно сохранены")
+            
+            # Только после успешного сохранения очищаем код на сервере
+            await reset_code(services.http_session(), state)
+            
+            return {
+                "success": True,
+                "message": "Авторизация успешна"
+            }
+        
+        return {"success": False, "message": "Код авторизации не найден"}
+        
+    except Exception as e:
+        logger.error(f"Ошибка получения токенов: {e}")
+        return {"success": False, "message": f"Ошибка: {str(e)}"}
+
+# ================== COVER LETTER GENERATION ==================
+
+@router.post("/generate-cover-letter")
+async def generate_cover_letter(
+    request: Request,
+    resume_file: UploadFile = File(...),
+    vacancy_url: str = Form(...),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Генерация сопроводительного письма"""
+    
+    try:
+        # Валидация файла
+        if not resume_file.filename.endswith('.pdf'):
+            raise HTTPException(400, "Файл должен быть в формате PDF")
+        
+        # Сохранение загруженного файла
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            content = await resume_file.read()
+            tmp_file.write(content)
+            tmp_file_path = tmp_file.name
+
+        try:
+            # Парсинг PDF резюме
+            logger.info("Парсинг PDF резюме...")
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
+            
+            # Извлечение ID вакансии из URL
+            vacancy_id = extract_vacancy_id(vacancy_url)
+            if not vacancy_id:
+                raise HTTPException(400, "Некорректная ссылка на вакансию")
+            
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
+                raise HTTPException(400, "Необходима авторизация HH.ru")
+            
+            # Получение данных вакансии
+            logger.info(f"Получение данных вакансии {vacancy_id}...")
+            vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
+            
+            # Парсинг данных вакансии
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
+            
+            # Генерация сопроводительного письма (преобразуем модели в словари)
+            logger.info("Генерация сопроводительного письма...")
+            resume_dict = parsed_resume.model_dump()
+            vacancy_dict = parsed_vacancy.model_dump()
+            cover_letter_result = await services.cover_letter_generator.generate_enhanced_cover_letter(resume_dict, vacancy_dict)
+            
+            if not cover_letter_result:
+                logger.error("Не удалось сгенерировать сопроводительное письмо")
+                raise HTTPException(500, "Не удалось сгенерировать сопроводительное письмо")
+            
+            # Сохраняем результат для генерации PDF
+            letter_id = f"letter_{hash(str(resume_dict) + str(vacancy_dict))}"
+            cover_letter_storage[letter_id] = cover_letter_result
+            
+            # Форматирование результатов для веб-отображения
+            formatted_result = format_cover_letter_for_web(cover_letter_result)
+            
+            return JSONResponse({
+                "status": "success",
+                "cover_letter": formatted_result,
+                "letter_id": letter_id
+            })
+            
+        finally:
+            # Удаляем временный файл
+            os.unlink(tmp_file_path)
+            
+    except Exception as e:
+        logger.error(f"Ошибка при генерации сопроводительного письма: {e}")
+        raise HTTPException(500, f"Ошибка генерации: {str(e)}")
+
+@router.get("/download-cover-letter/{letter_id}")
+async def download_cover_letter_pdf(letter_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Скачивание PDF сопроводительного письма"""
+    try:
+        # Проверяем наличие результата
+        if letter_id not in cover_letter_storage:
+            raise HTTPException(404, "Сопроводительное письмо не найдено")
+        
+        cover_letter_result = cover_letter_storage[letter_id]
+        
+        # Рендерим PDF вне event loop (или берем готовый из общего кэша)
+        rendered = await services.pdf_renderer.get_or_render("cover_letter", letter_id, cover_letter_result)
+        
+        # Определяем имя файла для скачивания
+        filename = f"Cover_Letter_{letter_id[:8]}.pdf"
+        
+        return services.pdf_renderer.build_response(rendered, filename, request)
+        
+    except Exception as e:
+        logger.error(f"Ошибка при генерации PDF: {e}")
+        raise HTTPException(500, f"Ошибка генерации PDF: {str(e)}")
+
+def extract_vacancy_id(vacancy_url: str) -> str:
+    """Извлечение ID вакансии из URL"""
+    import re
+    # Учитываем префиксы городов (например: nn.hh.ru, spb.hh.ru, ekb.hh.ru)
+    pattern = r'https?://(?:(?:www\.|[a-z]+\.)?)?hh\.ru/vacancy/(\d+)'
+    match = re.search(pattern, vacancy_url)
+    return match.group(1) if match else None
+
+def assemble_full_letter_text(cover_letter) -> str:
+    """Собирает полный текст письма из отдельных компонентов"""
+    parts = [
+        f"Тема: {cover_letter.subject_line}",
+        "",
+        cover_letter.personalized_greeting,
+        "",
+        cover_letter.opening_hook,
+        "",
+        cover_letter.company_interest,
+        "",
+        cover_letter.relevant_experience,
+        "",
+        cover_letter.value_demonstration,
+    ]
+    
+    if cover_letter.growth_mindset:
+        parts.extend(["", cover_letter.growth_mindset])
+    
+    parts.extend([
+        "",
+        cover_letter.professional_closing,
+        "",
+        cover_letter.signature
+    ])
+    
+    return "\n".join(parts)
+
+def format_cover_letter_for_web(cover_letter) -> dict:
+    """Форматирование результатов сопроводительного письма для веб-отображения"""
+    return {
+        "company_context": {
+            "company_name": cover_letter.company_context.company_name,
+            "position_title": cover_letter.subject_line,  # Используем тему как позицию
+            "company_size": cover_letter.company_context.company_size,
+            "role_type": cover_letter.role_type,
+            "key_requirements": [cover_letter.skills_match.relevant_experience]  # Используем как требования
+        },
+        "skills_match": {
+            "matching_skills": cover_letter.skills_match.matched_skills,
+            "relevant_achievements": [cover_letter.skills_match.quantified_achievement] if cover_letter.skills_match.quantified_achievement else [],
+            "unique_selling_points": [cover_letter.personalization.value_proposition],
+            "experience_relevance_score": cover_letter.relevance_score
+        },
+        "personalization": {
+            "tone": "профессиональный",  # Дефолтное значение
+            "key_motivations": [cover_letter.personalization.role_motivation],
+            "company_research_points": [cover_letter.personalization.company_knowledge] if cover_letter.personalization.company_knowledge else [],
+            "customization_level": "высокий" if cover_letter.personalization_score >= 8 else "средний"
+        },
+        "letter_structure": {
+            "opening_hook": cover_letter.opening_hook,
+            "value_proposition": cover_letter.personalization.value_proposition,
+            "specific_examples": [cover_letter.relevant_experience],  # Используем как примеры
+            "company_alignment": cover_letter.company_interest,
+            "call_to_action": cover_letter.professional_closing
+        },
+        "final_letter": assemble_full_letter_text(cover_letter),
+        "quality_assessment": {
+            "personalization_score": cover_letter.personalization_score,
+            "relevance_score": cover_letter.relevance_score,
+            "engagement_score": cover_letter.professional_tone_score,  # Используем как аналог
+            "overall_quality": "EXCELLENT" if cover_letter.personalization_score >= 8 else "GOOD" if cover_letter.personalization_score >= 6 else "AVERAGE",
+            "improvement_suggestions": cover_letter.improvement_suggestions
+        }
+    }
+
+# ================== МОНИТОРИНГ ==================
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint для мониторинга"""
+    try:
+        return {
+            "status": "healthy",
+            "service": "ai-resume-assistant-cover-letter",
+            "version": "1.0.0",
+            "checks": {
+                "auth_system": "ok",
+                "templates": "ok",
+                "storage": "ok"
+            }
+        }
+    except Exception as e:
+        return {
+            "status": "unhealthy",
+            "service": "ai-resume-assistant-cover-letter",
+            "error": str(e)
+        }
@@ -17,10 +17,15 @@ from reportlab.pdfbase.ttfonts import TTFont
 from typing import Any, Dict, List
 import os
 
+from src.utils.tracing import traced
+
 
 class GapAnalysisPDFGenerator:
     """Генератор PDF отчетов для гап-анализа резюме"""
     
+    # Версия шаблона отчета: увеличивать при изменении верстки (ключ кэша готовых PDF)
+    VERSION = "1.0"
+    
     def __init__(self):
         # Цветовая схема (должна быть первой!)
         self.colors = {
@@ -133,6 +138,7 @@ class GapAnalysisPDFGenerator:
             leading=12
         ))
     
+    @traced("pdf.gap_analysis")
     def generate_pdf(self, analysis_result) -> io.BytesIO:
         """Генерация PDF отчета"""
         buffer = io.BytesIO()
@@ -443,6 +449,7 @@ class GapAnalysisPDFGenerator:
         
         return elements
     
+    @traced("pdf.adapted_resume")
     def generate_adapted_resume_pdf(self, adapted_resume) -> io.BytesIO:
         """
         Генерирует PDF для адаптированного резюме
@@ -0,0 +1,297 @@
+"""
+Маршруты веб-приложения для гап-анализа резюме
+
+Простая веб-форма для загрузки PDF резюме и анализа вакансий.
+
+Монтируются в объединенное приложение под /apps/gap-analysis (src/web_app/shared.py)
+или запускаются отдельным приложением на порту 8000 (main.py).
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Request, Depends, Query
+from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+
+# Импорты проекта
+from src.callback_local_server.client import reset_code, wait_for_code
+from src.services import ServiceContainer
+from src.services.web import get_services
+from src.utils import get_logger
+from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
+
+# Общие авторизация и токены HH приложений процесса
+from src.web_app.shared import auth_system, hh_tokens_retain_until, hh_user_key
+
+logger = get_logger()
+
+router = APIRouter()
+
+# Сервисы функции в общем контейнере (прогрев при старте отдельного приложения)
+SERVICE_NAMES = ["pdf_parser", "vacancy_extractor", "hh_auth_service", "token_exchanger", "llm_gap_analyzer"]
+
+# Настройка шаблонов
+templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
+
+# Временное хранилище для результатов анализа (для PDF генерации)
+analysis_storage = {}
+
+# ================== ГЛАВНАЯ СТРАНИЦА ==================
+
+@router.get("/", response_class=HTMLResponse)
+async def index(request: Request, _: bool = Depends(auth_system.require_auth)):
+    """Главная страница с формой гап-анализа"""
+    # base_path — префикс маршрутов функции в объединенном приложении ("" для отдельного приложения)
+    return templates.TemplateResponse("index.html", {"request": request, "base_path": request.url.path.rstrip("/")})
+
+# ================== HH.RU АВТОРИЗАЦИЯ ==================
+
+@router.post("/auth/hh")
+async def start_hh_auth(request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Начало авторизации HH.ru (state связывает код на callback сервере с сессией пользователя)"""
+    state = services.hh_auth_service.state_for(hh_user_key(request))
+    auth_url = services.hh_auth_service.get_auth_url(state)
+    return {"auth_url": auth_url}
+
+@router.get("/auth/tokens")
+async def get_tokens_from_callback(
+    request: Request,
+    wait: float = Query(0, ge=0, le=30),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Получение токенов по коду с callback сервера (wait — ожидание кода, секунды)"""
+    try:
+        user_key = hh_user_key(request)
+        
+        # Сначала проверяем, есть ли уже сохраненные токены
+        if await services.hh_tokens.get(user_key) is not None:
+            return {
+                "success": True,
+                "message": "Авторизация уже выполнена"
+            }
+        
+        # Код этого пользователя: ответ сразу после callback, без периодического опроса
+        state = services.hh_auth_service.state_for(user_key)
+        code = await wait_for_code(services.http_session(), state, timeout=wait)
+        
+        if code:
+            logger.info(f"Получен код авторизации, обмениваем на токены...")
+            
+            # Обмениваем код на токены
+            tokens = await services.token_exchanger.exchange_code(code)
+            
+            # Сохраняем токены пользователя в хранилище (на время сессии)
+            await services.hh_tokens.save(user_key, tokens, retain_until=hh_tokens_retain_until())
+            
+            logger.info("Токены успешно сохранены")
+            
+            # Только после успешного сохранения очищаем код на сервере
+            await reset_code(services.http_session(), state)
+            
+            return {
+                "success": True,
+                "message": "Авторизация успешна"
+            }
+        
+        return {"success": False, "message": "Код авторизации не найден"}
+        
+    except Exception as e:
+        logger.error(f"Ошибка получения токенов: {e}")
+        return {"success": False, "message": f"Ошибка: {str(e)}"}
+
+# ================== GAP ANALYSIS ==================
+
+@router.post("/gap-analysis")
+async def perform_gap_analysis(
+    request: Request,
+    resume_file: UploadFile = File(...),
+    vacancy_url: str = Form(...),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Выполнение гап-анализа резюме"""
+    
+    try:
+        # Валидация файла
+        if not resume_file.filename.endswith('.pdf'):
+            raise HTTPException(400, "Файл должен быть в формате PDF")
+        
+        # Сохранение загруженного файла
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            content = await resume_file.read()
+            tmp_file.write(content)
+            tmp_file_path = tmp_file.name
+
+        try:
+            # Парсинг PDF резюме
+            logger.info("Парсинг PDF резюме...")
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
+            
+            # Извлечение ID вакансии из URL
+            vacancy_id = extract_vacancy_id(vacancy_url)
+            if not vacancy_id:
+                raise HTTPException(400, "Некорректная ссылка на вакансию")
+            
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
+                raise HTTPException(400, "Необходима авторизация HH.ru")
+            
+            # Получение данных вакансии
+            logger.info(f"Получение данных вакансии {vacancy_id}...")
+            vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
+            
+            # Парсинг данных вакансии
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
+            
+            # Выполнение гап-анализа (преобразуем модели в словари)
+            logger.info("Выполнение гап-анализа...")
+            resume_dict = parsed_resume.model_dump()
+            vacancy_dict = parsed_vacancy.model_dump()
+            analysis_result = await services.llm_gap_analyzer.gap_analysis(resume_dict, vacancy_dict)
+            
+            # Сохраняем результат для генерации PDF
+            analysis_id = f"gap_{hash(str(resume_dict) + str(vacancy_dict))}"
+            analysis_storage[analysis_id] = analysis_result
+            
+            # Форматирование результатов для веб-отображения
+            formatted_result = format_analysis_for_web(analysis_result)
+            
+            return JSONResponse({
+                "status": "success",
+                "analysis": formatted_result,
+                "analysis_id": analysis_id
+            })
+            
+        finally:
+            # Удаляем временный файл
+            os.unlink(tmp_file_path)
+            
+    except Exception as e:
+        logger.error(f"Ошибка при выполнении гап-анализа: {e}")
+        raise HTTPException(500, f"Ошибка анализа: {str(e)}")
+
+@router.get("/download-gap-analysis/{analysis_id}")
+async def download_gap_analysis_pdf(analysis_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Скачивание PDF отчета гап-анализа"""
+    try:
+        # Проверяем наличие результата
+        if analysis_id not in analysis_storage:
+            raise HTTPException(404, "Анализ не найден")
+        
+        analysis_result = analysis_storage[analysis_id]
+        
+        # Рендерим PDF вне event loop (или берем готовый из общего кэша)
+        rendered = await services.pdf_renderer.get_or_render("gap_analysis", analysis_id, analysis_result)
+        
+        # Определяем имя файла для скачивания
+        filename = f"Gap_Analysis_Report_{analysis_id[:8]}.pdf"
+        
+        return services.pdf_renderer.build_response(rendered, filename, request)
+        
+    except Exception as e:
+        logger.error(f"Ошибка при генерации PDF: {e}")
+        raise HTTPException(500, f"Ошибка генерации PDF: {str(e)}")
+
+def extract_vacancy_id(vacancy_url: str) -> str:
+    """Извлечение ID вакансии из URL"""
+    import re
+    # Учитываем префиксы городов (например: nn.hh.ru, spb.hh.ru, ekb.hh.ru)
+    pattern = r'https?://(?:(?:www\.|[a-z]+\.)?)?hh\.ru/vacancy/(\d+)'
+    match = re.search(pattern, vacancy_url)
+    return match.group(1) if match else None
+
+def format_analysis_for_web(analysis: EnhancedResumeTailoringAnalysis) -> dict:
+    """Форматирование результатов анализа для веб-отображения"""
+    return {
+        "primary_screening": {
+            "overall_result": analysis.primary_screening.overall_screening_result,
+            "job_title_match": analysis.primary_screening.job_title_match,
+            "experience_match": analysis.primary_screening.experience_years_match,
+            "skills_visible": analysis.primary_screening.key_skills_visible,
+            "location_suitable": analysis.primary_screening.location_suitable,
+            "salary_match": analysis.primary_screening.salary_expectations_match,
+            "notes": analysis.primary_screening.screening_notes
+        },
+        "requirements_analysis": [
+            {
+                "requirement_text": req.requirement_text,
+                "requirement_type": req.requirement_type,
+                "skill_category": req.skill_category,
+                "compliance_status": req.compliance_status,
+                "evidence_in_resume": req.evidence_in_resume,
+                "gap_description": req.gap_description,
+                "impact_on_decision": req.impact_on_decision
+            } for req in analysis.requirements_analysis
+        ],
+        "quality_assessment": {
+            "structure_clarity": analysis.quality_assessment.structure_clarity,
+            "content_relevance": analysis.quality_assessment.content_relevance,
+            "achievement_focus": analysis.quality_assessment.achievement_focus,
+            "adaptation_quality": analysis.quality_assessment.adaptation_quality,
+            "overall_impression": analysis.quality_assessment.overall_impression,
+            "quality_notes": analysis.quality_assessment.quality_notes
+        },
+        "critical_recommendations": [
+            {
+                "section": rec.section,
+                "criticality": rec.criticality,
+                "issue_description": rec.issue_description,
+                "specific_actions": rec.specific_actions,
+                "example_wording": rec.example_wording,
+                "business_rationale": rec.business_rationale
+            } for rec in analysis.critical_recommendations
+        ],
+        "important_recommendations": [
+            {
+                "section": rec.section,
+                "criticality": rec.criticality,
+                "issue_description": rec.issue_description,
+                "specific_actions": rec.specific_actions,
+                "example_wording": rec.example_wording,
+                "business_rationale": rec.business_rationale
+            } for rec in analysis.important_recommendations
+        ],
+        "optional_recommendations": [
+            {
+                "section": rec.section,
+                "criticality": rec.criticality,
+                "issue_description": rec.issue_description,
+                "specific_actions": rec.specific_actions,
+                "example_wording": rec.example_wording,
+                "business_rationale": rec.business_rationale
+            } for rec in analysis.optional_recommendations
+        ],
+        "match_percentage": analysis.overall_match_percentage,
+        "hiring_recommendation": analysis.hiring_recommendation,
+        "key_strengths": analysis.key_strengths,
+        "major_gaps": analysis.major_gaps,
+        "next_steps": analysis.next_steps
+    }
+
+# ================== МОНИТОРИНГ ==================
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint для мониторинга"""
+    try:
+        return {
+            "status": "healthy",
+            "service": "ai-resume-assistant-gap-analysis",
+            "version": "1.0.0",
+            "checks": {
+                "auth_system": "ok",
+                "templates": "ok",
+                "storage": "ok"
+            }
+        }
+    except Exception as e:
+        return {
+            "status": "unhealthy",
+            "service": "ai-resume-assistant-gap-analysis",
+            "error": str(e)
+        }
@@ -17,10 +17,15 @@ from reportlab.pdfbase.ttfonts import TTFont
 from typing import Any, Dict, List
 import os
 
+from src.utils.tracing import traced
+
 
 class InterviewChecklistPDFGenerator:
     """Генератор PDF для чек-листов подготовки к интервью"""
     
+    # Версия шаблона отчета: увеличивать при изменении верстки (ключ кэша готовых PDF)
+    VERSION = "1.0"
+    
     def __init__(self):
         # Цветовая схема (должна быть первой!)
         self.colors = {
@@ -167,6 +172,7 @@ class InterviewChecklistPDFGenerator:
             leading=12
         ))
     
+    @traced("pdf.interview_checklist")
     def generate_pdf(self, checklist_result) -> io.BytesIO:
         """Генерация PDF чек-листа"""
         buffer = io.BytesIO()
@@ -0,0 +1,354 @@
+"""
+Маршруты веб-приложения для генерации чек-листа подготовки к интервью
+
+Простая веб-форма для загрузки PDF резюме и генерации персонализированного 
+чек-листа подготовки к интервью на основе целевой вакансии.
+
+Монтируются в объединенное приложение под /apps/interview-checklist (src/web_app/shared.py)
+или запускаются отдельным приложением на порту 8002 (main.py).
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Request, Depends, Query
+from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.templating import Jinja2Templates
+
+# Импорты проекта
+from src.callback_local_server.client import reset_code, wait_for_code
+from src.services import ServiceContainer
+from src.services.web import get_services
+from src.utils import get_logger
+
+# Общие авторизация и токены HH приложений процесса
+from src.web_app.shared import auth_system, hh_tokens_retain_until, hh_user_key
+
+logger = get_logger()
+
+router = APIRouter()
+
+# Сервисы функции в общем контейнере (прогрев при старте отдельного приложения)
+SERVICE_NAMES = ["pdf_parser", "vacancy_extractor", "hh_auth_service", "token_exchanger", "checklist_generator"]
+
+# Настройка шаблонов
+templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
+
+# Временное хранилище для результатов
+checklist_storage = {}
+
+# ================== ГЛАВНАЯ СТРАНИЦА ==================
+
+@router.get("/", response_class=HTMLResponse)
+async def index(request: Request, _: bool = Depends(auth_system.require_auth)):
+    """Главная страница с формой генерации чек-листа"""
+    # base_path — префикс маршрутов функции в объединенном приложении ("" для отдельного приложения)
+    return templates.TemplateResponse("index.html", {"request": request, "base_path": request.url.path.rstrip("/")})
+
+# ================== HH.RU АВТОРИЗАЦИЯ ==================
+
+@router.post("/auth/hh")
+async def start_hh_auth(request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Начало авторизации HH.ru (state связывает код на callback сервере с сессией пользователя)"""
+    state = services.hh_auth_service.state_for(hh_user_key(request))
+    auth_url = services.hh_auth_service.get_auth_url(state)
+    return {"auth_url": auth_url}
+
+@router.get("/auth/tokens")
+async def get_tokens_from_callback(
+    request: Request,
+    wait: float = Query(0, ge=0, le=30),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Получение токенов по коду с callback сервера (wait — ожидание кода, секунды)"""
+    try:
+        user_key = hh_user_key(request)
+        
+        # Сначала проверяем, есть ли уже сохраненные токены
+        if await services.hh_tokens.get(user_key) is not None:
+            return {
+                "success": True,
+                "message": "Авторизация уже выполнена"
+            }
+        
+        # Код этого пользователя: ответ сразу после callback, без периодического опроса
+        state = services.hh_auth_service.state_for(user_key)
+        code = await wait_for_code(services.http_session(), state, timeout=wait)
+        
+        if code:
+            logger.info(f"Получен код авторизации, обмениваем на токены...")
+            
+            # Обмениваем код на токены
+            tokens = await services.token_exchanger.exchange_code(code)
+            
+            # Сохраняем токены пользователя в хранилище (на время сессии)
+            await services.hh_tokens.save(user_key, tokens, retain_until=hh_tokens_retain_until())
+            
+            logger.info("Токены успешно сохранены")
+            
+            # Только после успешного сохранения очищаем код на сервере
+            await reset_code(services.http_session(), state)
+            
+            return {
+                "success": True,
+                "message": "Авторизация успешна"
+            }
+        
+        return {"success": False, "message": "Код авторизации не найден"}
+        
+    except Exception as e:
+        logger.error(f"Ошибка получения токенов: {e}")
+        return {"success": False, "message": f"Ошибка: {str(e)}"}
+
+# ================== CHECKLIST GENERATION ==================
+
+@router.post("/generate-checklist")
+async def generate_interview_checklist(
+    request: Request,
+    resume_file: UploadFile = File(...),
+    vacancy_url: str = Form(...),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Генерация чек-листа подготовки к интервью"""
+    
+    try:
+        # Валидация файла
+        if not resume_file.filename.endswith('.pdf'):
+            raise HTTPException(400, "Файл должен быть в формате PDF")
+        
+        # Сохранение загруженного файла
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            content = await resume_file.read()
+            tmp_file.write(content)
+            tmp_file_path = tmp_file.name
+
+        try:
+            # Парсинг PDF резюме
+            logger.info("Парсинг PDF резюме...")
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
+            
+            # Извлечение ID вакансии из URL
+            vacancy_id = extract_vacancy_id(vacancy_url)
+            if not vacancy_id:
+                raise HTTPException(400, "Некорректная ссылка на вакансию")
+            
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
+                raise HTTPException(400, "Необходима авторизация HH.ru")
+            
+            # Получение данных вакансии
+            logger.info(f"Получение данных вакансии {vacancy_id}...")
+            vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
+            
+            # Парсинг данных вакансии
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
+            
+            # Генерация чек-листа (преобразуем модели в словари)
+            logger.info("Генерация чек-листа подготовки к интервью...")
+            resume_dict = parsed_resume.model_dump()
+            vacancy_dict = parsed_vacancy.model_dump()
+            
+            # Пробуем новую профессиональную версию, fallback на старую
+            try:
+                checklist_result = await services.checklist_generator.generate_professional_interview_checklist(resume_dict, vacancy_dict)
+            except Exception as e:
+                logger.warning(f"Не удалось использовать профессиональную версию: {e}")
+                checklist_result = await services.checklist_generator.generate_interview_checklist(resume_dict, vacancy_dict)
+            
+            if not checklist_result:
+                logger.error("Не удалось сгенерировать чек-лист")
+                raise HTTPException(500, "Не удалось сгенерировать чек-лист")
+            
+            # Сохраняем результат для генерации PDF
+            checklist_id = f"checklist_{hash(str(resume_dict) + str(vacancy_dict))}"
+            checklist_storage[checklist_id] = checklist_result
+            
+            # Форматирование результатов для веб-отображения
+            formatted_result = format_checklist_for_web(checklist_result)
+            
+            return JSONResponse({
+                "status": "success",
+                "checklist": formatted_result,
+                "checklist_id": checklist_id
+            })
+            
+        finally:
+            # Удаляем временный файл
+            os.unlink(tmp_file_path)
+            
+    except Exception as e:
+        logger.error(f"Ошибка при генерации чек-листа: {e}")
+        raise HTTPException(500, f"Ошибка генерации: {str(e)}")
+
+@router.get("/download-checklist/{checklist_id}")
+async def download_checklist_pdf(checklist_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Скачивание PDF чек-листа подготовки к интервью"""
+    try:
+        # Проверяем наличие результата
+        if checklist_id not in checklist_storage:
+            raise HTTPException(404, "Чек-лист не найден")
+        
+        checklist_result = checklist_storage[checklist_id]
+        
+        # Рендерим PDF вне event loop (или берем готовый из общего кэша)
+        rendered = await services.pdf_renderer.get_or_render("interview_checklist", checklist_id, checklist_result)
+        
+        # Определяем имя файла для скачивания
+        filename = f"Interview_Checklist_{checklist_id[:8]}.pdf"
+        
+        return services.pdf_renderer.build_response(rendered, filename, request)
+        
+    except Exception as e:
+        logger.error(f"Ошибка при генерации PDF: {e}")
+        raise HTTPException(500, f"Ошибка генерации PDF: {str(e)}")
+
+def extract_vacancy_id(vacancy_url: str) -> str:
+    """Извлечение ID вакансии из URL"""
+    import re
+    # Учитываем префиксы городов (например: nn.hh.ru, spb.hh.ru, ekb.hh.ru)
+    pattern = r'https?://(?:(?:www\.|[a-z]+\.)?)?hh\.ru/vacancy/(\d+)'
+    match = re.search(pattern, vacancy_url)
+    return match.group(1) if match else None
+
+def format_checklist_for_web(checklist) -> dict:
+    """Форматирование результатов чек-листа для веб-отображения"""
+    
+    # Проверяем тип модели - профессиональная или старая версия
+    if hasattr(checklist, 'executive_summary'):
+        # Профессиональная версия
+        return {
+            "type": "professional",
+            "candidate_level": checklist.personalization_context.candidate_level,
+            "vacancy_type": checklist.personalization_context.vacancy_type,
+            "company_format": checklist.personalization_context.company_format,
+            "executive_summary": {
+                "preparation_strategy": checklist.preparation_strategy,
+                "key_focus_areas": checklist.personalization_context.critical_focus_areas,
+                "estimated_prep_time": checklist.time_estimates.total_time_needed,
+                "priority_recommendations": checklist.personalization_context.key_gaps_identified
+            },
+            "technical_preparation": [
+                {
+                    "category": item.category,
+                    "priority": item.priority,
+                    "tasks": [item.task_title, item.description],
+                    "time_estimate": item.estimated_time,
+                    "resources": item.specific_resources
+                } for item in checklist.technical_preparation
+            ],
+            "behavioral_preparation": [
+                {
+                    "category": item.category,
+                    "priority": "ВАЖНО",  # По умолчанию для поведенческой подготовки
+                    "tasks": [item.task_title, item.description] + item.example_questions,
+                    "time_estimate": "1-2 часа",  # По умолчанию
+                    "resources": [item.practice_tips]
+                } for item in checklist.behavioral_preparation
+            ],
+            "company_research": [
+                {
+                    "category": item.category,
+                    "priority": item.priority,
+                    "tasks": [item.task_title] + item.specific_actions,
+                    "time_estimate": item.time_required,
+                    "resources": []
+                } for item in checklist.company_research
+            ],
+            "technical_stack_study": [
+                {
+                    "category": item.category,
+                    "priority": "ВАЖНО",  # По умолчанию
+                    "tasks": [item.task_title, item.description, item.study_approach],
+                    "time_estimate": "2-4 часа",  # По умолчанию
+                    "resources": []
+                } for item in checklist.technical_stack_study
+            ],
+            "practical_exercises": [
+                {
+                    "category": item.category,
+                    "priority": "ВАЖНО",  # По умолчанию
+                    "tasks": [item.exercise_title, item.description, f"Уровень: {item.difficulty_level}"],
+                    "time_estimate": "3-5 часов",  # По умолчанию
+                    "resources": item.practice_resources
+                } for item in checklist.practical_exercises
+            ],
+            "interview_setup": [
+                {
+                    "category": item.category,
+                    "priority": "КРИТИЧНО",  # По умолчанию для настройки
+                    "tasks": [item.task_title] + item.checklist_items,
+                    "time_estimate": "30 минут",  # По умолчанию
+                    "resources": []
+                } for item in checklist.interview_setup
+            ],
+            "additional_actions": [
+                {
+                    "category": item.category,
+                    "priority": item.urgency,
+                    "tasks": [item.action_title, item.description] + item.implementation_steps,
+                    "time_estimate": "1-2 часа",  # По умолчанию
+                    "resources": []
+                } for item in checklist.additional_actions
+            ],
+            "critical_success_factors": checklist.critical_success_factors
+        }
+    else:
+        # Старая версия (совместимость)
+        return {
+            "type": "basic",
+            "technical_preparation": [
+                {
+                    "category": "техническая_подготовка",
+                    "priority": skill.priority,
+                    "tasks": [skill.skill_name, skill.study_plan, f"Текущий уровень: {skill.current_level_assessment}"],
+                    "time_estimate": getattr(skill, 'estimated_time', 'Не указано'),
+                    "resources": [r.title for r in skill.resources]
+                } for skill in checklist.technical_skills
+            ],
+            "behavioral_preparation": [
+                {
+                    "category": q.question_category,
+                    "priority": "ВАЖНО",
+                    "tasks": q.example_questions + [q.preparation_tips],
+                    "time_estimate": "1-2 часа",
+                    "resources": [q.star_method_examples] if q.star_method_examples else []
+                } for q in checklist.behavioral_questions
+            ],
+            "company_research": [
+                {
+                    "category": "исследование_компании",
+                    "priority": "ВАЖНО",
+                    "tasks": [checklist.company_research_tips],
+                    "time_estimate": "2-3 часа",
+                    "resources": []
+                }
+            ],
+            "general_recommendations": [checklist.final_recommendations] if hasattr(checklist, 'final_recommendations') else []
+        }
+
+# ================== МОНИТОРИНГ ==================
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint для мониторинга"""
+    try:
+        return {
+            "status": "healthy",
+            "service": "ai-resume-assistant-interview-checklist",
+            "version": "1.0.0",
+            "checks": {
+                "auth_system": "ok",
+                "templates": "ok",
+                "storage": "ok"
+            }
+        }
+    except Exception as e:
+        return {
+            "status": "unhealthy",
+            "service": "ai-resume-assistant-interview-checklist",
+            "error": str(e)
+        }
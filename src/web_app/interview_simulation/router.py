@@ -0,0 +1,393 @@
+"""
+Маршруты веб-приложения для симуляции интервью
+
+Интерактивная веб-форма для настройки и проведения симуляции интервью
+с персонализированными настройками и генерацией PDF отчета.
+
+Монтируются в объединенное приложение под /apps/interview-simulation (src/web_app/shared.py)
+или запускаются отдельным приложением на порту 8003 (main.py).
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Request, Depends, Query
+from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.templating import Jinja2Templates
+from typing import List, Optional
+
+# Импорты проекта
+from src.callback_local_server.client import reset_code, wait_for_code
+from src.services import ServiceContainer
+from src.services.web import get_services
+from src.utils import get_logger
+
+# Общая авторизация приложений процесса
+from src.web_app.shared import auth_system, hh_tokens_retain_until, hh_user_key
+
+logger = get_logger()
+
+router = APIRouter()
+
+# Сервисы функции в общем контейнере (прогрев при старте отдельного приложения)
+SERVICE_NAMES = ["pdf_parser", "vacancy_extractor", "hh_auth_service", "token_exchanger", "interview_simulator"]
+
+# Настройка шаблонов
+templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
+
+# ================== ГЛАВНАЯ СТРАНИЦА ==================
+
+@router.get("/", response_class=HTMLResponse)
+async def index(request: Request, _: bool = Depends(auth_system.require_auth)):
+    """Главная страница с формой настройки симуляции интервью"""
+    # base_path — префикс маршрутов функции в объединенном приложении ("" для отдельного приложения)
+    return templates.TemplateResponse("index.html", {"request": request, "base_path": request.url.path.rstrip("/")})
+
+# ================== HH.RU АВТОРИЗАЦИЯ ==================
+
+@router.post("/auth/hh")
+async def start_hh_auth(request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Начало авторизации HH.ru (state связывает код на callback сервере с сессией пользователя)"""
+    state = services.hh_auth_service.state_for(hh_user_key(request))
+    auth_url = services.hh_auth_service.get_auth_url(state)
+    return {"auth_url": auth_url}
+
+@router.get("/auth/tokens")
+async def get_tokens_from_callback(
+    request: Request,
+    wait: float = Query(0, ge=0, le=30),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Получение токенов по коду с callback сервера (wait — ожидание кода, секунды)"""
+    try:
+        user_key = hh_user_key(request)
+        
+        # Сначала проверяем, есть ли уже сохраненные токены
+        if await services.hh_tokens.get(user_key) is not None:
+            return {
+                "success": True,
+                "message": "Авторизация уже выполнена"
+            }
+        
+        # Код этого пользователя: ответ сразу после callback, без периодического опроса
+        state = services.hh_auth_service.state_for(user_key)
+        code = await wait_for_code(services.http_session(), state, timeout=wait)
+        
+        if code:
+            logger.info(f"Получен код авторизации, обмениваем на токены...")
+            
+            # Обмениваем код на токены
+            tokens = await services.token_exchanger.exchange_code(code)
+            
+            # Сохраняем токены пользователя в хранилище (на время сессии)
+            await services.hh_tokens.save(user_key, tokens, retain_until=hh_tokens_retain_until())
+            
+            logger.info("Токены успешно сохранены")
+            
+            # Только после успешного сохранения очищаем код на сервере
+            await reset_code(services.http_session(), state)
+            
+            return {
+                "success": True,
+                "message": "Авторизация успешна"
+            }
+        
+        return {"success": False, "message": "Код авторизации не найден"}
+        
+    except Exception as e:
+        logger.error(f"Ошибка получения токенов: {e}")
+        return {"success": False, "message": f"Ошибка: {str(e)}"}
+
+# ================== СИМУЛЯЦИЯ ИНТЕРВЬЮ ==================
+
+@router.post("/start-simulation")
+async def start_interview_simulation(
+    request: Request,
+    _: bool = Depends(auth_system.require_auth),
+    resume_file: UploadFile = File(...),
+    vacancy_url: str = Form(...),
+    # Настройки симуляции
+    target_rounds: int = Form(5, ge=3, le=7),
+    difficulty_level: str = Form("medium"),
+    hr_persona: str = Form("professional"),
+    focus_areas: Optional[str] = Form(None),  # JSON строка с массивом
+    include_behavioral: bool = Form(True),
+    include_technical: bool = Form(True),
+    temperature: float = Form(0.7, ge=0.1, le=1.0),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Запуск симуляции интервью с настройками"""
+    
+    try:
+        # Валидация файла
+        if not resume_file.filename.endswith('.pdf'):
+            raise HTTPException(400, "Файл должен быть в формате PDF")
+        
+        # Сохранение загруженного файла
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            content = await resume_file.read()
+            tmp_file.write(content)
+            tmp_file_path = tmp_file.name
+
+        try:
+            # Парсинг PDF резюме
+            logger.info("Парсинг PDF резюме...")
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
+            logger.info(f"Тип parsed_resume: {type(parsed_resume)}")
+            logger.info(f"Содержимое parsed_resume: {parsed_resume}")
+            
+            # Извлечение ID вакансии из URL
+            vacancy_id = extract_vacancy_id(vacancy_url)
+            if not vacancy_id:
+                raise HTTPException(400, "Некорректная ссылка на вакансию")
+            
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
+                raise HTTPException(400, "Необходима авторизация HH.ru")
+            
+            # Получение данных вакансии
+            logger.info(f"Получение данных вакансии {vacancy_id}...")
+            vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
+            logger.info(f"Тип vacancy_data: {type(vacancy_data)}")
+            
+            # Парсинг данных вакансии
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
+            logger.info(f"Тип parsed_vacancy: {type(parsed_vacancy)}")
+            
+            # Проверяем, что парсинг прошел успешно
+            if parsed_vacancy is None:
+                raise HTTPException(400, "Не удалось распарсить данные вакансии")
+            
+            # Подготовка настроек симуляции
+            simulation_config = prepare_simulation_config(
+                target_rounds=target_rounds,
+                difficulty_level=difficulty_level,
+                hr_persona=hr_persona,
+                focus_areas=focus_areas,
+                include_behavioral=include_behavioral,
+                include_technical=include_technical,
+                temperature=temperature
+            )
+            
+            # Запуск симуляции
+            logger.info("Запуск симуляции интервью...")
+            
+            # Преобразуем в словари с проверкой типов
+            if hasattr(parsed_resume, 'model_dump'):
+                resume_dict = parsed_resume.model_dump()
+            elif isinstance(parsed_resume, dict):
+                resume_dict = parsed_resume
+            else:
+                resume_dict = dict(parsed_resume) if parsed_resume else {}
+                
+            if hasattr(parsed_vacancy, 'model_dump'):
+                vacancy_dict = parsed_vacancy.model_dump()
+            elif isinstance(parsed_vacancy, dict):
+                vacancy_dict = parsed_vacancy
+            else:
+                vacancy_dict = dict(parsed_vacancy) if parsed_vacancy else {}
+            
+            
+            # Возвращаем идентификатор для отслеживания прогресса
+            try:
+                simulation_id = f"sim_{hash(str(resume_dict) + str(vacancy_dict))}"
+                logger.info(f"Создан simulation_id: {simulation_id}")
+            except Exception as e:
+                logger.error(f"Ошибка создания simulation_id: {e}")
+                simulation_id = f"sim_{hash(str(type(resume_dict)) + str(type(vacancy_dict)))}"
+            
+            # Запускаем симуляцию в фоне
+            import asyncio
+            asyncio.create_task(run_simulation_background(
+                simulation_id, resume_dict, vacancy_dict, simulation_config, services
+            ))
+            
+            return JSONResponse({
+                "status": "started",
+                "simulation_id": simulation_id,
+                "config": simulation_config
+            })
+            
+        finally:
+            # Удаляем временный файл
+            os.unlink(tmp_file_path)
+            
+    except Exception as e:
+        logger.error(f"Ошибка при запуске симуляции: {e}")
+        raise HTTPException(500, f"Ошибка симуляции: {str(e)}")
+
+@router.get("/simulation-progress/{simulation_id}")
+async def get_simulation_progress(simulation_id: str, _: bool = Depends(auth_system.require_auth)):
+    """Получение прогресса симуляции"""
+    # Проверяем статус из временного хранилища
+    progress = simulation_progress_storage.get(simulation_id, {})
+    return JSONResponse(progress)
+
+@router.get("/download-report/{simulation_id}")
+async def download_report(simulation_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Скачивание PDF отчета симуляции"""
+    try:
+        # Проверяем готовность отчета
+        if simulation_id not in simulation_storage:
+            raise HTTPException(404, "Отчет не найден или еще не готов")
+        
+        # PDF уже в кэше после симуляции (при вытеснении из кэша рендерится заново)
+        rendered = await services.pdf_renderer.get_or_render("interview_simulation", simulation_id, simulation_storage[simulation_id])
+        
+        # Определяем имя файла для скачивания
+        filename = f"Interview_Simulation_Report_{simulation_id[:8]}.pdf"
+        
+        return services.pdf_renderer.build_response(rendered, filename, request)
+        
+    except Exception as e:
+        logger.error(f"Ошибка при скачивании отчета: {e}")
+        raise HTTPException(500, f"Ошибка скачивания: {str(e)}")
+
+# Временное хранилище для прогресса и результатов симуляций (в продакшене использовать Redis)
+simulation_progress_storage = {}
+simulation_storage = {}
+
+async def run_simulation_background(simulation_id: str, resume_dict: dict, vacancy_dict: dict, config: dict, services: ServiceContainer):
+    """Фоновое выполнение симуляции интервью"""
+    try:
+        
+        
+        # Обновляем прогресс
+        simulation_progress_storage[simulation_id] = {
+            "status": "analyzing",
+            "progress": 10,
+            "message": "Анализ профиля кандидата..."
+        }
+        
+        # Создаем прогресс-колбэк
+        async def progress_callback(current_round: int, total_rounds: int):
+            progress = int((current_round / total_rounds) * 80)  # 80% для симуляции
+            simulation_progress_storage[simulation_id] = {
+                "status": "simulating",
+                "progress": 10 + progress,
+                "message": f"Раунд {current_round} из {total_rounds}..."
+            }
+        
+        # Запускаем симуляцию с пользовательскими настройками
+        simulation_result = await services.interview_simulator.simulate_interview(
+            resume_dict, vacancy_dict, progress_callback, config_overrides=config
+        )
+        
+        # Проверяем результат симуляции
+        if simulation_result is None:
+            raise Exception("Симуляция вернула пустой результат")
+        
+        simulation_progress_storage[simulation_id] = {
+            "status": "generating_pdf",
+            "progress": 90,
+            "message": "Генерация PDF отчета..."
+        }
+        
+        # Рендерим PDF отчет вне event loop в общий кэш
+        simulation_storage[simulation_id] = simulation_result
+        await services.pdf_renderer.get_or_render("interview_simulation", simulation_id, simulation_result)
+        
+        # Завершаем
+        simulation_progress_storage[simulation_id] = {
+            "status": "completed",
+            "progress": 100,
+            "message": "Симуляция завершена!",
+            "report_ready": True,
+            "simulation_summary": format_simulation_summary(simulation_result)
+        }
+        
+    except Exception as e:
+        logger.error(f"Ошибка в фоновой симуляции: {e}")
+        simulation_progress_storage[simulation_id] = {
+            "status": "error",
+            "progress": 0,
+            "message": f"Ошибка: {str(e)}"
+        }
+
+def extract_vacancy_id(vacancy_url: str) -> str:
+    """Извлечение ID вакансии из URL"""
+    import re
+    # Учитываем префиксы городов (например: nn.hh.ru, spb.hh.ru, ekb.hh.ru)
+    pattern = r'https?://(?:(?:www\.|[a-z]+\.)?)?hh\.ru/vacancy/(\d+)'
+    match = re.search(pattern, vacancy_url)
+    return match.group(1) if match else None
+
+def prepare_simulation_config(
+    target_rounds: int,
+    difficulty_level: str,
+    hr_persona: str,
+    focus_areas: Optional[str],
+    include_behavioral: bool,
+    include_technical: bool,
+    temperature: float
+) -> dict:
+    """Подготовка конфигурации симуляции"""
+    
+    # Парсинг областей фокуса
+    focus_areas_list = []
+    if focus_areas:
+        import json
+        try:
+            focus_areas_list = json.loads(focus_areas)
+        except json.JSONDecodeError:
+            focus_areas_list = []
+    
+    return {
+        "target_rounds": target_rounds,
+        "difficulty_level": difficulty_level,
+        "hr_persona": hr_persona,
+        "focus_areas": focus_areas_list,
+        "include_behavioral": include_behavioral,
+        "include_technical": include_technical,
+        "temperature": temperature
+    }
+
+def format_simulation_summary(simulation_result) -> dict:
+    """Форматирование краткого резюме симуляции"""
+    try:
+        assessment = simulation_result.assessment
+        return {
+            "overall_recommendation": assessment.overall_recommendation,
+            "total_rounds": len(simulation_result.dialog_messages) // 2,
+            "average_score": sum(msg.response_quality for msg in simulation_result.dialog_messages 
+                               if hasattr(msg, 'response_quality') and msg.response_quality) / 
+                           max(1, len([msg for msg in simulation_result.dialog_messages 
+                                     if hasattr(msg, 'response_quality') and msg.response_quality])),
+            "top_competencies": [comp.area.value for comp in assessment.competency_scores[:3]],
+            "red_flags_count": len(assessment.red_flags) if hasattr(assessment, 'red_flags') else 0
+        }
+    except Exception as e:
+        logger.error(f"Ошибка форматирования резюме: {e}")
+        return {
+            "overall_recommendation": "Не определено",
+            "total_rounds": 0,
+            "average_score": 0,
+            "top_competencies": [],
+            "red_flags_count": 0
+        }
+
+# ================== HEALTH CHECK ==================
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint для мониторинга"""
+    try:
+        return {
+            "status": "healthy",
+            "service": "ai-resume-assistant-interview-simulation",
+            "version": "1.0.0",
+            "checks": {
+                "auth_system": "ok",
+                "templates": "ok",
+                "storage": "ok"
+            }
+        }
+    except Exception as e:
+        return {
+            "status": "unhealthy",
+            "service": "ai-resume-assistant-interview-simulation",
+            "error": str(e)
+        }
@@ -0,0 +1,2 @@
+from src.web_app.pdf_rendering.config import settings
+from src.web_app.pdf_rendering.renderer import PDFRenderService, RenderedPDF, pdf_render_service
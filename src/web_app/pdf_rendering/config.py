@@ -0,0 +1,22 @@
+# src/web_app/pdf_rendering/config.py
+from pydantic import ConfigDict
+from src.config import BaseAppSettings
+
+
+class PDFRenderSettings(BaseAppSettings):
+    """
+    Настройки рендеринга PDF отчетов веб-приложения.
+    """
+    workers: int = 2                       # Размер пула процессов (0 — рендер в потоке без пула)
+    start_method: str = ""                 # Способ запуска процессов пула: spawn / fork / forkserver ("" — по умолчанию для ОС)
+    cache_max_bytes: int = 64 * 1024 * 1024  # Лимит памяти под готовые PDF (байты)
+    prerender: bool = False                # Фоновый пре-рендер отчета сразу после анализа
+
+    model_config = ConfigDict(
+        env_file='.env',
+        env_prefix='PDF_RENDER_',
+        extra='ignore'
+    )
+
+
+settings = PDFRenderSettings()
@@ -0,0 +1,261 @@
+# src/web_app/pdf_rendering/renderer.py
+"""
+Рендеринг PDF отчетов вне event loop с кэшированием готовых байтов.
+
+ReportLab выполняет рендеринг синхронно и нагружает CPU, поэтому генерация
+выносится в пул процессов. Готовые PDF хранятся в памяти (ключ — id результата,
+тип отчета и версия генератора) с ограничением по суммарному размеру и отдаются
+напрямую из памяти с корректными Content-Length и ETag.
+
+id результатов строятся из входных данных, поэтому повторный анализ тех же
+резюме и вакансии сохраняет новый результат под прежним id: запись кэша
+хранит дайджест данных, из которых отрендерена, и при их изменении PDF
+рендерится заново.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.utils import get_logger, trace_span
+from src.web_app.pdf_rendering.config import settings as render_settings, PDFRenderSettings
+
+logger = get_logger()
+
+# Тип отчета -> (модуль генератора, класс генератора, метод генерации)
+REPORT_GENERATORS: Dict[str, Tuple[str, str, str]] = {
+    "gap_analysis": ("src.web_app.gap_analysis.pdf_generator", "GapAnalysisPDFGenerator", "generate_pdf"),
+    "adapted_resume": ("src.web_app.gap_analysis.pdf_generator", "GapAnalysisPDFGenerator", "generate_adapted_resume_pdf"),
+    "cover_letter": ("src.web_app.cover_letter.pdf_generator", "CoverLetterPDFGenerator", "generate_pdf"),
+    "interview_checklist": ("src.web_app.interview_checklist.pdf_generator", "InterviewChecklistPDFGenerator", "generate_pdf"),
+    "interview_simulation": ("src.llm_interview_simulation.pdf_generator", "ProfessionalInterviewPDFGenerator", "generate_pdf"),
+}
+
+
+def _load_generator_class(kind: str):
+    """Возвращает класс генератора для указанного типа отчета."""
+    if kind not in REPORT_GENERATORS:
+        raise ValueError(f"Неизвестный тип отчета: {kind}")
+    module_name, class_name, _ = REPORT_GENERATORS[kind]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_generator_version(kind: str) -> str:
+    """Версия генератора отчета (атрибут VERSION класса генератора)."""
+    return str(getattr(_load_generator_class(kind), "VERSION", "0"))
+
+
+def render_report(kind: str, payload: Any) -> bytes:
+    """
+    Синхронный рендеринг отчета в байты.
+
+    Выполняется в процессе пула, поэтому функция находится на уровне модуля
+    и принимает только сериализуемые аргументы.
+    """
+    generator_class = _load_generator_class(kind)
+    method_name = REPORT_GENERATORS[kind][2]
+    buffer = getattr(generator_class(), method_name)(payload)
+    if buffer is None:
+        raise RuntimeError(f"Генератор не вернул PDF для отчета {kind}")
+    return buffer.getvalue()
+
+
+def payload_digest(payload: Any) -> str:
+    """Дайджест данных отчета (модели pydantic и вложенные в словари модели)."""
+    if hasattr(payload, "model_dump_json"):
+        data = payload.model_dump_json()
+    else:
+        data = json.dumps(
+            payload, sort_keys=True, ensure_ascii=False,
+            default=lambda value: value.model_dump(mode="json") if hasattr(value, "model_dump") else str(value)
+        )
+    return hashlib.sha256(data.encode()).hexdigest()[:32]
+
+
+@dataclass
+class RenderedPDF:
+    """Готовый PDF отчет в памяти."""
+    content: bytes
+    etag: str
+    digest: str = ""    # Дайджест данных, из которых отрендерен отчет
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+@dataclass
+class RenderedPDFCache:
+    """LRU кэш готовых PDF с ограничением по суммарному размеру в байтах."""
+    max_bytes: int
+    _entries: "OrderedDict[Tuple[str, str, str], RenderedPDF]" = field(default_factory=OrderedDict)
+    _total_bytes: int = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[RenderedPDF]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Tuple[str, str, str], entry: RenderedPDF) -> None:
+        if entry.size > self.max_bytes:
+            logger.warning(f"PDF {key} ({entry.size} байт) превышает лимит кэша, не кэшируется")
+            return
+        if key in self._entries:
+            self._total_bytes -= self._entries.pop(key).size
+        self._entries[key] = entry
+        self._total_bytes += entry.size
+        while self._total_bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            logger.debug(f"PDF {evicted_key} вытеснен из кэша")
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PDFRenderService:
+    """Асинхронный сервис рендеринга PDF отчетов через пул процессов."""
+
+    def __init__(self, config: Optional[PDFRenderSettings] = None):
+        self.config = config or render_settings
+        self.cache = RenderedPDFCache(max_bytes=self.config.cache_max_bytes)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[Tuple[str, str, str, str], asyncio.Task] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Тип отчета -> версия генератора (чтение требует импорта модуля ReportLab)
+        self._versions: Dict[str, str] = {}
+
+    @property
+    def in_flight_count(self) -> int:
+        """Количество PDF, рендеринг которых выполняется прямо сейчас."""
+        return len(self._in_flight)
+
+    def load_generator_versions(self) -> None:
+        """Импорт генераторов и чтение их версий заранее (блокирующий вызов, для потока прогрева)."""
+        for kind in REPORT_GENERATORS:
+            self._versions[kind] = get_generator_version(kind)
+
+    async def _generator_version(self, kind: str) -> str:
+        version = self._versions.get(kind)
+        if version is None:
+            version = await asyncio.to_thread(get_generator_version, kind)
+            self._versions[kind] = version
+        return version
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Ленивое создание пула процессов (None — рендер в потоке)."""
+        if self.config.workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.workers,
+                mp_context=multiprocessing.get_context(self.config.start_method or None)
+            )
+            logger.info(f"Создан пул рендеринга PDF: {self.config.workers} процессов")
+        return self._executor
+
+    async def _render_off_loop(self, kind: str, payload: Any) -> bytes:
+        """Рендеринг вне event loop: пул процессов, при сбое пула — отдельный поток."""
+        executor = self._get_executor()
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(executor, render_report, kind, payload)
+            except BrokenProcessPool:
+                logger.error("Пул рендеринга PDF поврежден, пересоздаем и рендерим в потоке")
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+        return await asyncio.to_thread(render_report, kind, payload)
+
+    async def get_or_render(self, kind: str, result_id: str, payload: Any) -> RenderedPDF:
+        """Возвращает PDF из кэша или рендерит его, объединяя параллельные запросы."""
+        key = (result_id, kind, await self._generator_version(kind))
+        digest = await asyncio.to_thread(payload_digest, payload)
+
+        cached = self.cache.get(key)
+        if cached is not None and cached.digest == digest:
+            logger.debug(f"PDF {kind}/{result_id} отдан из кэша")
+            return cached
+
+        # Рендеринг — отдельная задача: отключение клиента, запустившего его,
+        # не прерывает рендеринг для остальных ожидающих
+        render_key = (*key, digest)
+        task = self._in_flight.get(render_key)
+        if task is None:
+            task = asyncio.create_task(self._render(kind, result_id, payload, key, digest))
+            self._in_flight[render_key] = task
+            task.add_done_callback(lambda done: self._in_flight.pop(render_key, None))
+            # Ошибка доставляется ожидающим; без них не попадает в лог loop как необработанная
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            return await asyncio.shield(task)
+
+        with trace_span("pdf.render_wait", kind=kind):
+            return await asyncio.shield(task)
+
+    async def _render(self, kind: str, result_id: str, payload: Any,
+                      key: Tuple[str, str, str], digest: str) -> RenderedPDF:
+        with trace_span("pdf.render", kind=kind) as span:
+            content = await self._render_off_loop(kind, payload)
+            span.set_attribute("bytes", len(content))
+        rendered = RenderedPDF(content=content, etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"', digest=digest)
+        self.cache.put(key, rendered)
+        logger.info(f"PDF {kind}/{result_id} отрендерен: {rendered.size} байт, в кэше {self.cache.total_bytes} байт")
+        return rendered
+
+    def schedule_prerender(self, kind: str, result_id: str, payload: Any) -> None:
+        """Фоновый пре-рендер отчета сразу после завершения анализа (если включен)."""
+        if not self.config.prerender or payload is None:
+            return
+
+        async def _prerender():
+            try:
+                await self.get_or_render(kind, result_id, payload)
+            except Exception as e:
+                logger.warning(f"Фоновый пре-рендер PDF {kind}/{result_id} не удался: {e}")
+
+        task = asyncio.create_task(_prerender())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @staticmethod
+    def build_response(rendered: RenderedPDF, filename: str, request: Optional[Request] = None) -> Response:
+        """Формирует ответ с PDF из памяти; при совпадении If-None-Match — 304."""
+        headers = {
+            "ETag": rendered.etag,
+            "Cache-Control": "private, no-cache",
+        }
+        if request is not None:
+            if_none_match = request.headers.get("if-none-match", "")
+            if rendered.etag in [tag.strip() for tag in if_none_match.split(",")]:
+                return Response(status_code=304, headers=headers)
+
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        headers["Content-Length"] = str(rendered.size)
+        return Response(content=rendered.content, media_type="application/pdf", headers=headers)
+
+    async def shutdown(self) -> None:
+        """Остановка фоновых задач и пула процессов."""
+        for task in [*self._background_tasks, *self._in_flight.values()]:
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Пул рендеринга PDF остановлен")
+
+
+pdf_render_service = PDFRenderService()
@@ -0,0 +1,143 @@
+# src/web_app/shared.py
+"""
+Общие ресурсы веб-приложений процесса и сборка приложений функций.
+
+Приложения функций (gap_analysis, cover_letter, interview_checklist,
+interview_simulation) определяют маршруты в APIRouter (router.py функции)
+и запускаются в одном из режимов:
+    в составе объединенного приложения — mount_feature_apps() подключает
+        маршруты под /apps/<функция> в том же процессе: одна авторизация,
+        один контейнер сервисов (клиент OpenAI, пул соединений HH, пул и кэш
+        рендеринга PDF);
+    отдельным процессом на своем порту — create_feature_app() в main.py
+        функции (python -m src.web_app.gap_analysis.main), если нужна
+        изоляция процессов.
+
+Токены HH хранятся по сессии авторизации пользователя (hh_user_key) в
+хранилище контейнера сервисов (services.hh_tokens, src/hh/token_store.py).
+
+Пример:
+    app = FastAPI(lifespan=lifespan)
+    install_services(app)
+    install_auth(app)
+    mount_feature_apps(app)    # ["/apps/gap-analysis", ...]
+"""
+
+import time
+from contextlib import asynccontextmanager
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, FastAPI, Form, HTTPException, Request
+from fastapi.responses import HTMLResponse
+
+from src.security.auth import SimpleAuth
+from src.services import ServiceContainer, services as default_services
+from src.services.web import get_services, install_services
+from src.web_app.config import settings as web_settings
+
+# Авторизация веб-приложений процесса (одно хранилище сессий)
+auth_system = SimpleAuth(templates_dir=str(Path(__file__).parent.parent / "security" / "templates"))
+
+
+# Приложения функций: префикс в объединенном приложении -> модуль с router и SERVICE_NAMES
+FEATURE_APPS: Dict[str, str] = {
+    "/apps/gap-analysis": "src.web_app.gap_analysis.router",
+    "/apps/cover-letter": "src.web_app.cover_letter.router",
+    "/apps/interview-checklist": "src.web_app.interview_checklist.router",
+    "/apps/interview-simulation": "src.web_app.interview_simulation.router",
+}
+
+auth_router = APIRouter()
+
+
+def hh_user_key(request: Request) -> str:
+    """Ключ токенов HH пользователя веб-приложений — сессия авторизации."""
+    session_key = auth_system.session_key(request)
+    if session_key is None:
+        raise HTTPException(401, "Требуется авторизация")
+    return f"web:{session_key}"
+
+
+def hh_tokens_retain_until() -> float:
+    """Срок хранения токенов HH сессии: не дольше срока действия сессии."""
+    return time.time() + auth_system.config.session_timeout_hours * 3600
+
+
+@auth_router.get("/login", response_class=HTMLResponse)
+async def login_page(request: Request):
+    """Страница авторизации"""
+    return await auth_system.login_page(request)
+
+
+@auth_router.post("/login")
+async def login_post(request: Request, password: str = Form(...)):
+    """Обработка авторизации"""
+    return await auth_system.login_post(request, password)
+
+
+@auth_router.get("/logout")
+async def logout(request: Request, services: ServiceContainer = Depends(get_services)):
+    """Выход из системы (токены HH сессии удаляются)"""
+    session_key = auth_system.session_key(request)
+    if session_key is not None:
+        await services.hh_tokens.delete(f"web:{session_key}")
+    return await auth_system.logout(request)
+
+
+def install_auth(app: FastAPI) -> None:
+    """Middleware авторизации и страницы входа/выхода приложения."""
+    app.add_middleware(
+        auth_system.get_middleware().__class__,
+        config=auth_system.config,
+        session_manager=auth_system.session_manager,
+        templates=auth_system.templates,
+        health_paths=["/health", *(f"{prefix}/health" for prefix in FEATURE_APPS)]
+    )
+    app.include_router(auth_router)
+
+
+def mount_feature_apps(app: FastAPI) -> List[str]:
+    """
+    Подключение маршрутов приложений функций под /apps/<функция>.
+
+    Отключается WEB_APP_MOUNT_FEATURE_APPS=false (функции запущены отдельными
+    процессами). Возвращает список подключенных префиксов.
+    """
+    if not web_settings.mount_feature_apps:
+        return []
+    for prefix, module_name in FEATURE_APPS.items():
+        app.include_router(import_module(module_name).router, prefix=prefix)
+    return list(FEATURE_APPS)
+
+
+def create_feature_app(router: APIRouter, title: str, service_names: List[str],
+                       container: ServiceContainer = default_services) -> FastAPI:
+    """
+    Отдельное приложение функции (режим процесса на своем порту).
+
+    Args:
+        router: Маршруты функции
+        title: Заголовок приложения
+        service_names: Сервисы контейнера, которые прогреваются при старте
+        container: Контейнер сервисов процесса
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Жизненный цикл приложения: прогрев сервисов, очистка сессий, обновление токенов HH, освобождение общих ресурсов при остановке"""
+        services: ServiceContainer = app.state.services
+        await services.start_warm_up(service_names)
+        auth_system.start_cleanup()
+        services.hh_tokens.start()
+        yield
+        await auth_system.stop_cleanup()
+        await services.shutdown()
+
+    app = FastAPI(title=title, lifespan=lifespan)
+    # Контейнер сервисов процесса: обработчики получают его через Depends(get_services)
+    install_services(app, container)
+    install_auth(app)
+    app.include_router(router)
+    return app
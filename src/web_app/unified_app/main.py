@@ -7,64 +7,79 @@
 - Чек-лист подготовки к интервью
 - Симуляция интервью
 
+Отдельные приложения функций подключены в этот же процесс под /apps/<функция>
+(src/web_app/shared.py, отключение: WEB_APP_MOUNT_FEATURE_APPS=false).
+
 Запуск: python -m src.web_app.unified_app.main
 URL: http://localhost:3000
 """
 
 import os
+import io
+import json
+import zipfile
 import tempfile
 import asyncio
 from pathlib import Path
-from fastapi import FastAPI, Form, File, UploadFile, HTTPException, Request, Depends
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi import FastAPI, Form, File, UploadFile, HTTPException, Request, Depends, Query
+from contextlib import asynccontextmanager
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 import uvicorn
-import aiohttp
 from typing import List, Optional
 
 # Импорты проекта
-from src.parsers.pdf_resume_parser import PDFResumeParser
-from src.parsers.vacancy_extractor import VacancyExtractor
-from src.hh.api_client import HHApiClient
-from src.hh.auth import HHAuthService
-from src.hh.token_exchanger import HHCodeExchanger
-from src.callback_local_server.config import settings as callback_settings
-from src.llm_gap_analyzer.llm_gap_analyzer import LLMGapAnalyzer
-from src.llm_cover_letter.llm_cover_letter_generator import EnhancedLLMCoverLetterGenerator
-from src.llm_interview_checklist.llm_interview_checklist_generator import LLMInterviewChecklistGenerator
-from src.llm_interview_simulation.llm_interview_simulator import ProfessionalInterviewSimulator
-from src.llm_resume_rewriter.llm_resume_rewriter import LLMResumeRewriter
-from src.utils import get_logger
+from src.callback_local_server.client import reset_code, wait_for_code
+from src.services import ServiceContainer, services as default_services
+from src.services.web import get_services, install_services
+from src.utils import get_logger, trace_span, traced
+from src.utils.tracing import ServerTimingMiddleware
+from src.utils.metrics import registry as metrics_registry, CONTENT_TYPE_LATEST
+from src.utils.loop_monitor import loop_monitor
 from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
 from src.models.resume_models import ResumeInfo
 
-# Импорт системы авторизации
-from src.security.auth import SimpleAuth
-from src.security.health_dashboard import add_health_dashboard_routes
-
-# PDF генераторы
-from src.web_app.gap_analysis.pdf_generator import GapAnalysisPDFGenerator
-from src.web_app.cover_letter.pdf_generator import CoverLetterPDFGenerator
-from src.web_app.interview_checklist.pdf_generator import InterviewChecklistPDFGenerator
+# Общие авторизация и токены HH приложений процесса, приложения функций
+from src.web_app.shared import auth_system, hh_tokens_retain_until, hh_user_key, install_auth, mount_feature_apps
+from src.security.health_dashboard import add_health_dashboard_routes, health_dashboard
 
 logger = get_logger()
 
-app = FastAPI(title="AI Resume Assistant - Unified Web App")
 
-# Настройка системы авторизации
-current_dir = Path(__file__).parent
-auth_system = SimpleAuth(templates_dir=str(current_dir.parent.parent / "security" / "templates"))
-
-# Добавляем middleware авторизации
-app.add_middleware(
-    auth_system.get_middleware().__class__,
-    config=auth_system.config,
-    session_manager=auth_system.session_manager,
-    templates=auth_system.templates
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Жизненный цикл приложения: мониторинг event loop и сервисов, прогрев сервисов, освобождение общих ресурсов при остановке"""
+    services: ServiceContainer = app.state.services
+    loop_monitor.start("unified_app")
+    # Фоновый опрос сервисов панели /status (страница отдается из кэша)
+    health_dashboard.start()
+    # Фоновая очистка истекших сессий и списка отзыва
+    auth_system.start_cleanup()
+    # Фоновое обновление токенов HH пользователей до истечения (запросы не ждут обновления)
+    services.hh_tokens.start()
+    # Сервисы создаются лениво; прогрев в потоке по APP_WARMUP, /health отвечает сразу
+    await services.start_warm_up()
+    yield
+    # Общие ресурсы контейнера: обновление токенов HH, пул соединений HH, пул рендеринга PDF
+    await services.shutdown()
+    await health_dashboard.stop()
+    await auth_system.stop_cleanup()
+    await loop_monitor.stop()
+
+
+app = FastAPI(title="AI Resume Assistant - Unified Web App", lifespan=lifespan)
+# Контейнер сервисов процесса: обработчики получают его через Depends(get_services)
+install_services(app, default_services)
+
+# Middleware авторизации и страницы входа/выхода
+install_auth(app)
+
+# Замер этапов обработки: заголовок Server-Timing и JSONL лог спанов
+app.add_middleware(ServerTimingMiddleware)
 
 # Настройка шаблонов
+current_dir = Path(__file__).parent
 templates = Jinja2Templates(directory=str(current_dir / "templates"))
 
 # Статические файлы (если нужны)
@@ -72,44 +87,17 @@ static_dir = current_dir / "static"
 if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
-# Создание экземпляров сервисов
-pdf_parser = PDFResumeParser()
-vacancy_extractor = VacancyExtractor()
-hh_auth_service = HHAuthService()
-token_exchanger = HHCodeExchanger()
-
-# LLM сервисы
-llm_gap_analyzer = LLMGapAnalyzer()
-cover_letter_generator = EnhancedLLMCoverLetterGenerator(validate_quality=False)
-checklist_generator = LLMInterviewChecklistGenerator()
-interview_simulator = ProfessionalInterviewSimulator()
-resume_rewriter = LLMResumeRewriter()
-
-# Временное хранилище для токенов и результатов
-user_tokens = {}
+# Временное хранилище для результатов (токены HH — общие, src/web_app/shared.py)
 analysis_storage = {}
 cover_letter_storage = {}
 checklist_storage = {}
 simulation_storage = {}
 simulation_progress_storage = {}
 adapted_resume_storage = {}
+application_package_storage = {}
 
-# ================== АВТОРИЗАЦИЯ ==================
-
-@app.get("/login", response_class=HTMLResponse)
-async def login_page(request: Request):
-    """Страница авторизации"""
-    return await auth_system.login_page(request)
-
-@app.post("/login")
-async def login_post(request: Request, password: str = Form(...)):
-    """Обработка авторизации"""
-    return await auth_system.login_post(request, password)
-
-@app.get("/logout")
-async def logout(request: Request):
-    """Выход из системы"""
-    return await auth_system.logout(request)
+# Ссылки на фоновые задачи пакета документов (чтобы задачи не собирал GC)
+package_tasks = set()
 
 # ================== ГЛАВНАЯ СТРАНИЦА ==================
 
@@ -121,52 +109,55 @@ async def index(request: Request, _: bool = Depends(auth_system.require_auth)):
 # ================== HH.RU АВТОРИЗАЦИЯ ==================
 
 @app.post("/auth/hh")
-async def start_hh_auth(_: bool = Depends(auth_system.require_auth)):
-    """Начало авторизации HH.ru"""
-    auth_url = hh_auth_service.get_auth_url()
+async def start_hh_auth(request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Начало авторизации HH.ru (state связывает код на callback сервере с сессией пользователя)"""
+    state = services.hh_auth_service.state_for(hh_user_key(request))
+    auth_url = services.hh_auth_service.get_auth_url(state)
     return {"auth_url": auth_url}
 
 @app.get("/auth/tokens")
-async def get_tokens_from_callback(_: bool = Depends(auth_system.require_auth)):
-    """Получение токенов из callback сервера"""
+async def get_tokens_from_callback(
+    request: Request,
+    wait: float = Query(0, ge=0, le=30),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """Получение токенов по коду с callback сервера (wait — ожидание кода, секунды)"""
     try:
+        user_key = hh_user_key(request)
+        
         # Сначала проверяем, есть ли уже сохраненные токены
-        if "hh_access_token" in user_tokens and "hh_refresh_token" in user_tokens:
+        if await services.hh_tokens.get(user_key) is not None:
             return {
                 "success": True,
                 "message": "Авторизация уже выполнена"
             }
         
-        callback_url = f"{callback_settings.protocol}://{callback_settings.host}:{callback_settings.port}/api/code"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(callback_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    code = data.get("code")
-                    
-                    if code:
-                        logger.info(f"Получен код авторизации, обмениваем на токены...")
-                        
-                        # Обмениваем код на токены
-                        tokens = await token_exchanger.exchange_code(code)
-                        
-                        # Сохраняем токены во временном хранилище
-                        user_tokens["hh_access_token"] = tokens["access_token"]
-                        user_tokens["hh_refresh_token"] = tokens["refresh_token"]
-                        
-                        logger.info("Токены успешно сохранены")
-                        
-                        # Только после успешного сохранения очищаем код на сервере
-                        await session.post(f"http://{callback_settings.host}:{callback_settings.port}/api/reset_code")
-                        
-                        return {
-                            "success": True,
-                            "message": "Авторизация успешна"
-                        }
-                    
-                return {"success": False, "message": "Код авторизации не найден"}
-                
+        # Код этого пользователя: ответ сразу после callback, без периодического опроса
+        state = services.hh_auth_service.state_for(user_key)
+        code = await wait_for_code(services.http_session(), state, timeout=wait)
+        
+        if code:
+            logger.info(f"Получен код авторизации, обмениваем на токены...")
+            
+            # Обмениваем код на токены
+            tokens = await services.token_exchanger.exchange_code(code)
+            
+            # Сохраняем токены пользователя в хранилище (на время сессии)
+            await services.hh_tokens.save(user_key, tokens, retain_until=hh_tokens_retain_until())
+            
+            logger.info("Токены успешно сохранены")
+            
+            # Только после успешного сохранения очищаем код на сервере
+            await reset_code(services.http_session(), state)
+            
+            return {
+                "success": True,
+                "message": "Авторизация успешна"
+            }
+        
+        return {"success": False, "message": "Код авторизации не найден"}
+        
     except Exception as e:
         logger.error(f"Ошибка получения токенов: {e}")
         return {"success": False, "message": f"Ошибка: {str(e)}"}
@@ -197,9 +188,11 @@ async def interview_simulation_page(request: Request, _: bool = Depends(auth_sys
 
 @app.post("/gap-analysis")
 async def perform_gap_analysis(
+    request: Request,
     resume_file: UploadFile = File(...),
     vacancy_url: str = Form(...),
-    _: bool = Depends(auth_system.require_auth)
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
 ):
     """Выполнение гап-анализа резюме"""
     try:
@@ -208,7 +201,7 @@ async def perform_gap_analysis(
             raise HTTPException(400, "Файл должен быть в формате PDF")
         
         # Сохранение загруженного файла
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file, trace_span("upload.resume_pdf"):
             content = await resume_file.read()
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
@@ -216,30 +209,30 @@ async def perform_gap_analysis(
         try:
             # Парсинг PDF резюме
             logger.info("Парсинг PDF резюме...")
-            parsed_resume = pdf_parser.parse_pdf_resume(tmp_file_path)
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
             
             # Извлечение ID вакансии из URL
             vacancy_id = extract_vacancy_id(vacancy_url)
             if not vacancy_id:
                 raise HTTPException(400, "Некорректная ссылка на вакансию")
             
-            # Проверяем наличие токенов
-            if "hh_access_token" not in user_tokens or "hh_refresh_token" not in user_tokens:
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
                 raise HTTPException(400, "Необходима авторизация HH.ru")
             
             # Получение данных вакансии
             logger.info(f"Получение данных вакансии {vacancy_id}...")
-            hh_client = HHApiClient(user_tokens["hh_access_token"], user_tokens["hh_refresh_token"])
             vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
             
             # Парсинг данных вакансии
-            parsed_vacancy = vacancy_extractor.extract_vacancy_info(vacancy_data)
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
             
             # Выполнение гап-анализа
             logger.info("Выполнение гап-анализа...")
             resume_dict = parsed_resume.model_dump()
             vacancy_dict = parsed_vacancy.model_dump()
-            analysis_result = await llm_gap_analyzer.gap_analysis(resume_dict, vacancy_dict)
+            analysis_result = await services.llm_gap_analyzer.gap_analysis(resume_dict, vacancy_dict)
             
             # Сохраняем результат для генерации PDF и адаптации резюме
             analysis_id = f"gap_{hash(str(resume_dict) + str(vacancy_dict))}"
@@ -249,6 +242,9 @@ async def perform_gap_analysis(
                 'vacancy_data': vacancy_dict
             }
             
+            # Фоновый пре-рендер PDF, чтобы скачивание было мгновенным
+            services.pdf_renderer.schedule_prerender("gap_analysis", analysis_id, analysis_result)
+            
             # Форматирование результатов для веб-отображения
             formatted_result = format_gap_analysis_for_web(analysis_result)
             
@@ -267,7 +263,7 @@ async def perform_gap_analysis(
         raise HTTPException(500, f"Ошибка анализа: {str(e)}")
 
 @app.get("/download-gap-analysis/{analysis_id}")
-async def download_gap_analysis_pdf(analysis_id: str, _: bool = Depends(auth_system.require_auth)):
+async def download_gap_analysis_pdf(analysis_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
     """Скачивание PDF отчета гап-анализа"""
     try:
         if analysis_id not in analysis_storage:
@@ -276,22 +272,12 @@ async def download_gap_analysis_pdf(analysis_id: str, _: bool = Depends(auth_sys
         analysis_data = analysis_storage[analysis_id]
         analysis_result = analysis_data['analysis_result'] if isinstance(analysis_data, dict) else analysis_data
         
-        # Генерируем PDF отчет
-        pdf_generator = GapAnalysisPDFGenerator()
-        pdf_buffer = pdf_generator.generate_pdf(analysis_result)
-        
-        # Сохраняем PDF в файл
-        report_path = f"/tmp/gap_analysis_report_{analysis_id}.pdf"
-        with open(report_path, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
+        # Рендерим PDF вне event loop (или берем готовый из кэша)
+        rendered = await services.pdf_renderer.get_or_render("gap_analysis", analysis_id, analysis_result)
         
         filename = f"Gap_Analysis_Report_{analysis_id[:8]}.pdf"
         
-        return FileResponse(
-            path=report_path,
-            filename=filename,
-            media_type='application/pdf'
-        )
+        return services.pdf_renderer.build_response(rendered, filename, request)
         
     except Exception as e:
         logger.error(f"Ошибка при генерации PDF: {e}")
@@ -300,7 +286,7 @@ async def download_gap_analysis_pdf(analysis_id: str, _: bool = Depends(auth_sys
 # ================== RESUME REWRITER ==================
 
 @app.post("/adapt-resume/{analysis_id}")
-async def adapt_resume(analysis_id: str, _: bool = Depends(auth_system.require_auth)):
+async def adapt_resume(analysis_id: str, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
     """Адаптация резюме на основе GAP-анализа"""
     try:
         if analysis_id not in analysis_storage:
@@ -317,7 +303,7 @@ async def adapt_resume(analysis_id: str, _: bool = Depends(auth_system.require_a
         logger.info(f"Начало адаптации резюме для анализа {analysis_id}")
         
         # Вызов LLM сервиса для адаптации резюме
-        adapted_resume = await resume_rewriter.rewrite_resume(resume_data, gap_analysis_data)
+        adapted_resume = await services.resume_rewriter.rewrite_resume(resume_data, gap_analysis_data)
         
         if adapted_resume is None:
             raise HTTPException(500, "Не удалось адаптировать резюме")
@@ -331,6 +317,7 @@ async def adapt_resume(analysis_id: str, _: bool = Depends(auth_system.require_a
         }
         
         logger.info(f"Резюме успешно адаптировано: {adaptation_id}")
+        services.pdf_renderer.schedule_prerender("adapted_resume", adaptation_id, adapted_resume)
         
         return JSONResponse({
             "status": "success",
@@ -343,7 +330,7 @@ async def adapt_resume(analysis_id: str, _: bool = Depends(auth_system.require_a
         raise HTTPException(500, f"Ошибка адаптации резюме: {str(e)}")
 
 @app.get("/download-adapted-resume/{adaptation_id}")
-async def download_adapted_resume_pdf(adaptation_id: str, _: bool = Depends(auth_system.require_auth)):
+async def download_adapted_resume_pdf(adaptation_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
     """Скачивание PDF адаптированного резюме"""
     try:
         if adaptation_id not in adapted_resume_storage:
@@ -354,35 +341,12 @@ async def download_adapted_resume_pdf(adaptation_id: str, _: bool = Depends(auth
         
         logger.info(f"Генерация PDF для адаптированного резюме {adaptation_id}")
         
-        # Генерируем PDF с адаптированным резюме
-        # Используем тот же PDF генератор, что и для обычных резюме
-        from src.web_app.gap_analysis.pdf_generator import GapAnalysisPDFGenerator
-        pdf_generator = GapAnalysisPDFGenerator()
-        
-        # Создаем временную структуру для PDF генератора
-        temp_analysis = {
-            'resume_info': adapted_resume,
-            'match_percentage': 95,  # Высокий процент для адаптированного резюме
-            'hiring_recommendation': 'Рекомендуется к найму - резюме адаптировано под требования вакансии',
-            'key_strengths': ['Адаптированное резюме', 'Соответствует требованиям вакансии'],
-            'major_gaps': ['Минимальные'],
-            'next_steps': 'Отправить резюме работодателю'
-        }
-        
-        pdf_buffer = pdf_generator.generate_adapted_resume_pdf(adapted_resume)
-        
-        # Сохраняем PDF в файл
-        report_path = f"/tmp/adapted_resume_{adaptation_id}.pdf"
-        with open(report_path, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
+        # Генерируем PDF с адаптированным резюме тем же генератором, что и для гап-анализа
+        rendered = await services.pdf_renderer.get_or_render("adapted_resume", adaptation_id, adapted_resume)
         
         filename = f"Adapted_Resume_{adaptation_id[:8]}.pdf"
         
-        return FileResponse(
-            path=report_path,
-            filename=filename,
-            media_type='application/pdf'
-        )
+        return services.pdf_renderer.build_response(rendered, filename, request)
         
     except Exception as e:
         logger.error(f"Ошибка при генерации PDF адаптированного резюме: {e}")
@@ -392,9 +356,11 @@ async def download_adapted_resume_pdf(adaptation_id: str, _: bool = Depends(auth
 
 @app.post("/generate-cover-letter")
 async def generate_cover_letter(
+    request: Request,
     resume_file: UploadFile = File(...),
     vacancy_url: str = Form(...),
-    _: bool = Depends(auth_system.require_auth)
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
 ):
     """Генерация сопроводительного письма"""
     try:
@@ -403,7 +369,7 @@ async def generate_cover_letter(
             raise HTTPException(400, "Файл должен быть в формате PDF")
         
         # Сохранение загруженного файла
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file, trace_span("upload.resume_pdf"):
             content = await resume_file.read()
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
@@ -411,30 +377,30 @@ async def generate_cover_letter(
         try:
             # Парсинг PDF резюме
             logger.info("Парсинг PDF резюме...")
-            parsed_resume = pdf_parser.parse_pdf_resume(tmp_file_path)
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
             
             # Извлечение ID вакансии из URL
             vacancy_id = extract_vacancy_id(vacancy_url)
             if not vacancy_id:
                 raise HTTPException(400, "Некорректная ссылка на вакансию")
             
-            # Проверяем наличие токенов
-            if "hh_access_token" not in user_tokens or "hh_refresh_token" not in user_tokens:
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
                 raise HTTPException(400, "Необходима авторизация HH.ru")
             
             # Получение данных вакансии
             logger.info(f"Получение данных вакансии {vacancy_id}...")
-            hh_client = HHApiClient(user_tokens["hh_access_token"], user_tokens["hh_refresh_token"])
             vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
             
             # Парсинг данных вакансии
-            parsed_vacancy = vacancy_extractor.extract_vacancy_info(vacancy_data)
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
             
             # Генерация сопроводительного письма
             logger.info("Генерация сопроводительного письма...")
             resume_dict = parsed_resume.model_dump()
             vacancy_dict = parsed_vacancy.model_dump()
-            cover_letter_result = await cover_letter_generator.generate_enhanced_cover_letter(resume_dict, vacancy_dict)
+            cover_letter_result = await services.cover_letter_generator.generate_enhanced_cover_letter(resume_dict, vacancy_dict)
             
             if not cover_letter_result:
                 logger.error("Не удалось сгенерировать сопроводительное письмо")
@@ -443,6 +409,7 @@ async def generate_cover_letter(
             # Сохраняем результат для генерации PDF
             letter_id = f"letter_{hash(str(resume_dict) + str(vacancy_dict))}"
             cover_letter_storage[letter_id] = cover_letter_result
+            services.pdf_renderer.schedule_prerender("cover_letter", letter_id, cover_letter_result)
             
             # Форматирование результатов для веб-отображения
             formatted_result = format_cover_letter_for_web(cover_letter_result)
@@ -462,7 +429,7 @@ async def generate_cover_letter(
         raise HTTPException(500, f"Ошибка генерации: {str(e)}")
 
 @app.get("/download-cover-letter/{letter_id}")
-async def download_cover_letter_pdf(letter_id: str, _: bool = Depends(auth_system.require_auth)):
+async def download_cover_letter_pdf(letter_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
     """Скачивание PDF сопроводительного письма"""
     try:
         if letter_id not in cover_letter_storage:
@@ -470,22 +437,12 @@ async def download_cover_letter_pdf(letter_id: str, _: bool = Depends(auth_syste
         
         cover_letter_result = cover_letter_storage[letter_id]
         
-        # Генерируем PDF отчет
-        pdf_generator = CoverLetterPDFGenerator()
-        pdf_buffer = pdf_generator.generate_pdf(cover_letter_result)
-        
-        # Сохраняем PDF в файл
-        report_path = f"/tmp/cover_letter_report_{letter_id}.pdf"
-        with open(report_path, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
+        # Рендерим PDF вне event loop (или берем готовый из кэша)
+        rendered = await services.pdf_renderer.get_or_render("cover_letter", letter_id, cover_letter_result)
         
         filename = f"Cover_Letter_{letter_id[:8]}.pdf"
         
-        return FileResponse(
-            path=report_path,
-            filename=filename,
-            media_type='application/pdf'
-        )
+        return services.pdf_renderer.build_response(rendered, filename, request)
         
     except Exception as e:
         logger.error(f"Ошибка при генерации PDF: {e}")
@@ -495,9 +452,11 @@ async def download_cover_letter_pdf(letter_id: str, _: bool = Depends(auth_syste
 
 @app.post("/generate-interview-checklist")
 async def generate_interview_checklist(
+    request: Request,
     resume_file: UploadFile = File(...),
     vacancy_url: str = Form(...),
-    _: bool = Depends(auth_system.require_auth)
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
 ):
     """Генерация чек-листа подготовки к интервью"""
     try:
@@ -506,7 +465,7 @@ async def generate_interview_checklist(
             raise HTTPException(400, "Файл должен быть в формате PDF")
         
         # Сохранение загруженного файла
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file, trace_span("upload.resume_pdf"):
             content = await resume_file.read()
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
@@ -514,30 +473,30 @@ async def generate_interview_checklist(
         try:
             # Парсинг PDF резюме
             logger.info("Парсинг PDF резюме...")
-            parsed_resume = pdf_parser.parse_pdf_resume(tmp_file_path)
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
             
             # Извлечение ID вакансии из URL
             vacancy_id = extract_vacancy_id(vacancy_url)
             if not vacancy_id:
                 raise HTTPException(400, "Некорректная ссылка на вакансию")
             
-            # Проверяем наличие токенов
-            if "hh_access_token" not in user_tokens or "hh_refresh_token" not in user_tokens:
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
                 raise HTTPException(400, "Необходима авторизация HH.ru")
             
             # Получение данных вакансии
             logger.info(f"Получение данных вакансии {vacancy_id}...")
-            hh_client = HHApiClient(user_tokens["hh_access_token"], user_tokens["hh_refresh_token"])
             vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
             
             # Парсинг данных вакансии
-            parsed_vacancy = vacancy_extractor.extract_vacancy_info(vacancy_data)
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
             
             # Генерация чек-листа
             logger.info("Генерация чек-листа подготовки к интервью...")
             resume_dict = parsed_resume.model_dump()
             vacancy_dict = parsed_vacancy.model_dump()
-            checklist_result = await checklist_generator.generate_interview_checklist(resume_dict, vacancy_dict)
+            checklist_result = await services.checklist_generator.generate_interview_checklist(resume_dict, vacancy_dict)
             
             if not checklist_result:
                 logger.error("Не удалось сгенерировать чек-лист")
@@ -546,6 +505,7 @@ async def generate_interview_checklist(
             # Сохраняем результат для генерации PDF
             checklist_id = f"checklist_{hash(str(resume_dict) + str(vacancy_dict))}"
             checklist_storage[checklist_id] = checklist_result
+            services.pdf_renderer.schedule_prerender("interview_checklist", checklist_id, checklist_result)
             
             # Форматирование результатов для веб-отображения
             formatted_result = format_checklist_for_web(checklist_result)
@@ -565,7 +525,7 @@ async def generate_interview_checklist(
         raise HTTPException(500, f"Ошибка генерации: {str(e)}")
 
 @app.get("/download-interview-checklist/{checklist_id}")
-async def download_interview_checklist_pdf(checklist_id: str, _: bool = Depends(auth_system.require_auth)):
+async def download_interview_checklist_pdf(checklist_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
     """Скачивание PDF чек-листа"""
     try:
         if checklist_id not in checklist_storage:
@@ -573,22 +533,12 @@ async def download_interview_checklist_pdf(checklist_id: str, _: bool = Depends(
         
         checklist_result = checklist_storage[checklist_id]
         
-        # Генерируем PDF отчет
-        pdf_generator = InterviewChecklistPDFGenerator()
-        pdf_buffer = pdf_generator.generate_pdf(checklist_result)
-        
-        # Сохраняем PDF в файл
-        report_path = f"/tmp/interview_checklist_report_{checklist_id}.pdf"
-        with open(report_path, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
+        # Рендерим PDF вне event loop (или берем готовый из кэша)
+        rendered = await services.pdf_renderer.get_or_render("interview_checklist", checklist_id, checklist_result)
         
         filename = f"Interview_Checklist_{checklist_id[:8]}.pdf"
         
-        return FileResponse(
-            path=report_path,
-            filename=filename,
-            media_type='application/pdf'
-        )
+        return services.pdf_renderer.build_response(rendered, filename, request)
         
     except Exception as e:
         logger.error(f"Ошибка при генерации PDF: {e}")
@@ -598,6 +548,7 @@ async def download_interview_checklist_pdf(checklist_id: str, _: bool = Depends(
 
 @app.post("/start-interview-simulation")
 async def start_interview_simulation(
+    request: Request,
     resume_file: UploadFile = File(...),
     vacancy_url: str = Form(...),
     target_rounds: int = Form(5, ge=3, le=7),
@@ -607,7 +558,8 @@ async def start_interview_simulation(
     focus_areas: str = Form("[]"),  # JSON строка с массивом
     include_behavioral: bool = Form(True),
     include_technical: bool = Form(True),
-    _: bool = Depends(auth_system.require_auth)
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
 ):
     """Запуск симуляции интервью"""
     try:
@@ -641,7 +593,7 @@ async def start_interview_simulation(
             raise HTTPException(400, "Должен быть включен хотя бы один тип вопросов (поведенческие или технические)")
         
         # Сохранение загруженного файла
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file, trace_span("upload.resume_pdf"):
             content = await resume_file.read()
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
@@ -649,24 +601,24 @@ async def start_interview_simulation(
         try:
             # Парсинг PDF резюме
             logger.info("Парсинг PDF резюме...")
-            parsed_resume = pdf_parser.parse_pdf_resume(tmp_file_path)
+            parsed_resume = await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
             
             # Извлечение ID вакансии из URL
             vacancy_id = extract_vacancy_id(vacancy_url)
             if not vacancy_id:
                 raise HTTPException(400, "Некорректная ссылка на вакансию")
             
-            # Проверяем наличие токенов
-            if "hh_access_token" not in user_tokens or "hh_refresh_token" not in user_tokens:
+            # Клиент HH по токенам пользователя из хранилища
+            hh_client = await services.hh_user_client(hh_user_key(request))
+            if hh_client is None:
                 raise HTTPException(400, "Необходима авторизация HH.ru")
             
             # Получение данных вакансии
             logger.info(f"Получение данных вакансии {vacancy_id}...")
-            hh_client = HHApiClient(user_tokens["hh_access_token"], user_tokens["hh_refresh_token"])
             vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
             
             # Парсинг данных вакансии
-            parsed_vacancy = vacancy_extractor.extract_vacancy_info(vacancy_data)
+            parsed_vacancy = services.vacancy_extractor.extract_vacancy_info(vacancy_data)
             
             # Создание идентификатора симуляции
             simulation_id = f"sim_{hash(str(parsed_resume.model_dump()) + str(parsed_vacancy.model_dump()) + str(target_rounds))}"
@@ -693,7 +645,8 @@ async def start_interview_simulation(
                 simulation_id,
                 parsed_resume.model_dump(),
                 parsed_vacancy.model_dump(),
-                config
+                config,
+                services
             ))
             
             return JSONResponse({
@@ -734,7 +687,7 @@ async def get_simulation_result(simulation_id: str, _: bool = Depends(auth_syste
     })
 
 @app.get("/download-interview-simulation/{simulation_id}")
-async def download_interview_simulation_pdf(simulation_id: str, _: bool = Depends(auth_system.require_auth)):
+async def download_interview_simulation_pdf(simulation_id: str, request: Request, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
     """Скачивание PDF отчета симуляции интервью"""
     try:
         if simulation_id not in simulation_storage:
@@ -742,30 +695,261 @@ async def download_interview_simulation_pdf(simulation_id: str, _: bool = Depend
         
         simulation_result = simulation_storage[simulation_id]
         
-        # Импортируем PDF генератор
-        from src.llm_interview_simulation.pdf_generator import ProfessionalInterviewPDFGenerator
-        
-        # Генерируем PDF отчет
-        pdf_generator = ProfessionalInterviewPDFGenerator()
-        pdf_buffer = pdf_generator.generate_pdf(simulation_result)
-        
-        # Сохраняем PDF в файл
-        report_path = f"/tmp/interview_simulation_report_{simulation_id}.pdf"
-        with open(report_path, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
+        # Рендерим PDF вне event loop (или берем готовый из кэша)
+        rendered = await services.pdf_renderer.get_or_render("interview_simulation", simulation_id, simulation_result)
         
         filename = f"Interview_Simulation_{simulation_id[:8]}.pdf"
         
-        return FileResponse(
-            path=report_path,
-            filename=filename,
-            media_type='application/pdf'
-        )
+        return services.pdf_renderer.build_response(rendered, filename, request)
         
     except Exception as e:
         logger.error(f"Ошибка при генерации PDF симуляции: {e}")
         raise HTTPException(500, f"Ошибка генерации PDF: {str(e)}")
 
+# ================== FULL APPLICATION PACKAGE ==================
+
+# Функция пакета -> (тип PDF отчета, шаблон имени файла в архиве)
+PACKAGE_PDF_FILES = {
+    "gap_analysis": ("gap_analysis", "Gap_Analysis_Report.pdf"),
+    "cover_letter": ("cover_letter", "Cover_Letter.pdf"),
+    "interview_checklist": ("interview_checklist", "Interview_Checklist.pdf"),
+    "interview_simulation": ("interview_simulation", "Interview_Simulation.pdf"),
+}
+
+
+async def parse_resume_bytes(content: bytes, services: ServiceContainer):
+    """Однократный парсинг PDF резюме из байтов вне event loop"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+        tmp_file.write(content)
+        tmp_file_path = tmp_file.name
+    try:
+        logger.info("Парсинг PDF резюме...")
+        return await asyncio.to_thread(services.pdf_parser.parse_pdf_resume, tmp_file_path)
+    finally:
+        os.unlink(tmp_file_path)
+
+
+async def fetch_parsed_vacancy(vacancy_id: str, hh_client, services: ServiceContainer):
+    """Однократное получение и извлечение данных вакансии"""
+    logger.info(f"Получение данных вакансии {vacancy_id}...")
+    vacancy_data = await hh_client.request(f'vacancies/{vacancy_id}')
+    return services.vacancy_extractor.extract_vacancy_info(vacancy_data)
+
+
+async def package_gap_analysis(resume_dict: dict, vacancy_dict: dict, analysis_id: str, services: ServiceContainer) -> dict:
+    """Гап-анализ в составе пакета документов"""
+    analysis_result = await services.llm_gap_analyzer.gap_analysis(resume_dict, vacancy_dict)
+    if not analysis_result:
+        raise Exception("Не удалось выполнить гап-анализ")
+    
+    analysis_storage[analysis_id] = {
+        'analysis_result': analysis_result,
+        'resume_data': resume_dict,
+        'vacancy_data': vacancy_dict
+    }
+    services.pdf_renderer.schedule_prerender("gap_analysis", analysis_id, analysis_result)
+    return {"analysis": format_gap_analysis_for_web(analysis_result), "analysis_id": analysis_id}
+
+
+async def package_cover_letter(resume_dict: dict, vacancy_dict: dict, letter_id: str, services: ServiceContainer) -> dict:
+    """Сопроводительное письмо в составе пакета документов"""
+    cover_letter_result = await services.cover_letter_generator.generate_enhanced_cover_letter(resume_dict, vacancy_dict)
+    if not cover_letter_result:
+        raise Exception("Не удалось сгенерировать сопроводительное письмо")
+    
+    cover_letter_storage[letter_id] = cover_letter_result
+    services.pdf_renderer.schedule_prerender("cover_letter", letter_id, cover_letter_result)
+    return {"cover_letter": format_cover_letter_for_web(cover_letter_result), "letter_id": letter_id}
+
+
+async def package_interview_checklist(resume_dict: dict, vacancy_dict: dict, checklist_id: str, services: ServiceContainer) -> dict:
+    """Чек-лист подготовки в составе пакета документов"""
+    checklist_result = await services.checklist_generator.generate_interview_checklist(resume_dict, vacancy_dict)
+    if not checklist_result:
+        raise Exception("Не удалось сгенерировать чек-лист")
+    
+    checklist_storage[checklist_id] = checklist_result
+    services.pdf_renderer.schedule_prerender("interview_checklist", checklist_id, checklist_result)
+    return {"checklist": format_checklist_for_web(checklist_result), "checklist_id": checklist_id}
+
+
+async def run_package_feature(package_id: str, feature: str, coro) -> dict:
+    """Выполнение одной функции пакета; ошибка не прерывает остальные функции"""
+    package = application_package_storage[package_id]
+    try:
+        result = await coro
+        package["features"][feature] = "completed"
+        return {"event": feature, "status": "success", **result}
+    except Exception as e:
+        logger.error(f"Ошибка функции {feature} в пакете {package_id}: {e}")
+        package["features"][feature] = "error"
+        return {"event": feature, "status": "error", "message": str(e)}
+
+
+@app.post("/full-application-package")
+async def full_application_package(
+    request: Request,
+    resume_file: UploadFile = File(...),
+    vacancy_url: str = Form(...),
+    include_simulation: bool = Form(False),
+    target_rounds: int = Form(5, ge=3, le=7),
+    difficulty_level: str = Form("medium"),
+    hr_persona: str = Form("professional"),
+    _: bool = Depends(auth_system.require_auth),
+    services: ServiceContainer = Depends(get_services)
+):
+    """
+    Полный пакет документов для отклика на вакансию.
+    
+    Резюме парсится один раз, вакансия загружается один раз, затем гап-анализ,
+    сопроводительное письмо и чек-лист выполняются параллельно. Результаты
+    возвращаются потоком NDJSON по мере готовности каждой функции; симуляция
+    интервью (опционально) ставится в фоновую очередь.
+    """
+    if not resume_file.filename.endswith('.pdf'):
+        raise HTTPException(400, "Файл должен быть в формате PDF")
+    
+    if difficulty_level not in ["easy", "medium", "hard"]:
+        raise HTTPException(400, "Неверный уровень сложности. Доступны: easy, medium, hard")
+    
+    if hr_persona not in ["professional", "friendly", "strict", "technical"]:
+        raise HTTPException(400, "Неверный тип HR. Доступны: professional, friendly, strict, technical")
+    
+    vacancy_id = extract_vacancy_id(vacancy_url)
+    if not vacancy_id:
+        raise HTTPException(400, "Некорректная ссылка на вакансию")
+    
+    hh_client = await services.hh_user_client(hh_user_key(request))
+    if hh_client is None:
+        raise HTTPException(400, "Необходима авторизация HH.ru")
+    
+    try:
+        # Парсинг резюме и загрузка вакансии выполняются один раз и параллельно
+        with trace_span("upload.resume_pdf"):
+            content = await resume_file.read()
+        parsed_resume, parsed_vacancy = await asyncio.gather(
+            parse_resume_bytes(content, services),
+            fetch_parsed_vacancy(vacancy_id, hh_client, services)
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при подготовке данных пакета: {e}")
+        raise HTTPException(500, f"Ошибка подготовки данных: {str(e)}")
+    
+    resume_dict = parsed_resume.model_dump()
+    vacancy_dict = parsed_vacancy.model_dump()
+    base_hash = hash(str(resume_dict) + str(vacancy_dict))
+    package_id = f"package_{base_hash}"
+    
+    feature_coros = {
+        "gap_analysis": package_gap_analysis(resume_dict, vacancy_dict, f"gap_{base_hash}", services),
+        "cover_letter": package_cover_letter(resume_dict, vacancy_dict, f"letter_{base_hash}", services),
+        "interview_checklist": package_interview_checklist(resume_dict, vacancy_dict, f"checklist_{base_hash}", services),
+    }
+    application_package_storage[package_id] = {
+        "ids": {
+            "gap_analysis": f"gap_{base_hash}",
+            "cover_letter": f"letter_{base_hash}",
+            "interview_checklist": f"checklist_{base_hash}",
+        },
+        "features": {feature: "running" for feature in feature_coros}
+    }
+    
+    # Задачи создаются сразу, чтобы результаты сохранились даже при обрыве соединения
+    tasks = []
+    for feature, coro in feature_coros.items():
+        task = asyncio.create_task(run_package_feature(package_id, feature, coro))
+        package_tasks.add(task)
+        task.add_done_callback(package_tasks.discard)
+        tasks.append(task)
+    
+    simulation_id = None
+    if include_simulation:
+        simulation_id = f"sim_{hash(str(resume_dict) + str(vacancy_dict) + str(target_rounds))}"
+        simulation_progress_storage[simulation_id] = {
+            "status": "starting",
+            "progress": 0,
+            "message": "Симуляция поставлена в очередь..."
+        }
+        application_package_storage[package_id]["ids"]["interview_simulation"] = simulation_id
+        config = {
+            "target_rounds": target_rounds,
+            "difficulty_level": difficulty_level,
+            "hr_persona": hr_persona,
+            "include_behavioral": True,
+            "include_technical": True
+        }
+        simulation_task = asyncio.create_task(run_simulation_background(simulation_id, resume_dict, vacancy_dict, config, services))
+        package_tasks.add(simulation_task)
+        simulation_task.add_done_callback(package_tasks.discard)
+    
+    async def event_stream():
+        yield json.dumps({
+            "event": "package",
+            "status": "started",
+            "package_id": package_id,
+            "features": list(feature_coros),
+            "simulation_id": simulation_id
+        }, ensure_ascii=False) + "\n"
+        
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        
+        yield json.dumps({
+            "event": "done",
+            "package_id": package_id,
+            "features": application_package_storage[package_id]["features"],
+            "download_url": f"/download-application-package/{package_id}"
+        }, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@app.get("/download-application-package/{package_id}")
+async def download_application_package(package_id: str, _: bool = Depends(auth_system.require_auth), services: ServiceContainer = Depends(get_services)):
+    """Скачивание ZIP архива со всеми готовыми PDF отчетами пакета"""
+    if package_id not in application_package_storage:
+        raise HTTPException(404, "Пакет документов не найден")
+    
+    try:
+        ids = application_package_storage[package_id]["ids"]
+        payloads = {
+            "gap_analysis": (analysis_storage.get(ids["gap_analysis"]) or {}).get('analysis_result'),
+            "cover_letter": cover_letter_storage.get(ids["cover_letter"]),
+            "interview_checklist": checklist_storage.get(ids["interview_checklist"]),
+            "interview_simulation": simulation_storage.get(ids.get("interview_simulation")),
+        }
+        ready = {feature: payload for feature, payload in payloads.items() if payload is not None}
+        if not ready:
+            raise HTTPException(404, "Отчеты пакета еще не готовы")
+        
+        # Все отчеты рендерятся параллельно (или берутся из кэша)
+        rendered_reports = await asyncio.gather(*[
+            services.pdf_renderer.get_or_render(PACKAGE_PDF_FILES[feature][0], ids[feature], payload)
+            for feature, payload in ready.items()
+        ])
+        
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zip_file:
+            for feature, rendered in zip(ready, rendered_reports):
+                zip_file.writestr(PACKAGE_PDF_FILES[feature][1], rendered.content)
+        content = archive.getvalue()
+        
+        return Response(
+            content=content,
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f'attachment; filename="Application_Package_{package_id[:16]}.zip"',
+                "Content-Length": str(len(content))
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ошибка при сборке архива пакета: {e}")
+        raise HTTPException(500, f"Ошибка сборки архива: {str(e)}")
+
 # ================== ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ ==================
 
 async def update_simulation_progress(simulation_id: str, round_num: int, total_rounds: int):
@@ -777,7 +961,7 @@ async def update_simulation_progress(simulation_id: str, round_num: int, total_r
         "message": f"Раунд {round_num}/{total_rounds}: генерация вопросов и ответов..."
     }
 
-async def run_simulation_background(simulation_id: str, resume_dict: dict, vacancy_dict: dict, config: dict):
+async def run_simulation_background(simulation_id: str, resume_dict: dict, vacancy_dict: dict, config: dict, services: ServiceContainer):
     """Запуск симуляции в фоновом режиме"""
     try:
         # Обновляем прогресс
@@ -816,8 +1000,6 @@ async def run_simulation_background(simulation_id: str, resume_dict: dict, vacan
         validated_config["include_behavioral"] = config.get("include_behavioral", True)
         validated_config["include_technical"] = config.get("include_technical", True)
         
-        interview_simulator.set_custom_config(validated_config)
-        
         simulation_progress_storage[simulation_id] = {
             "status": "running",
             "progress": 30,
@@ -831,11 +1013,11 @@ async def run_simulation_background(simulation_id: str, resume_dict: dict, vacan
         
         # Запуск симуляции
         logger.info("Запуск метода simulate_interview...")
-        simulation_result = await interview_simulator.simulate_interview(
+        simulation_result = await services.interview_simulator.simulate_interview(
             resume_dict, 
             vacancy_dict,
             progress_callback=progress_callback,
-            config_overrides=config
+            config_overrides=validated_config
         )
         
         logger.info(f"Результат симуляции: {type(simulation_result)}")
@@ -861,6 +1043,7 @@ async def run_simulation_background(simulation_id: str, resume_dict: dict, vacan
         
         # Сохраняем результат
         simulation_storage[simulation_id] = simulation_result
+        services.pdf_renderer.schedule_prerender("interview_simulation", simulation_id, simulation_result)
         
         simulation_progress_storage[simulation_id] = {
             "status": "completed",
@@ -883,6 +1066,7 @@ def extract_vacancy_id(vacancy_url: str) -> str:
     match = re.search(pattern, vacancy_url)
     return match.group(1) if match else None
 
+@traced("web.format_gap_analysis_for_web")
 def format_gap_analysis_for_web(analysis: EnhancedResumeTailoringAnalysis) -> dict:
     """Форматирование результатов гап-анализа для веб-отображения"""
     return {
@@ -951,6 +1135,7 @@ def format_gap_analysis_for_web(analysis: EnhancedResumeTailoringAnalysis) -> di
         "next_steps": analysis.next_steps
     }
 
+@traced("web.format_cover_letter_for_web")
 def format_cover_letter_for_web(cover_letter) -> dict:
     """Форматирование результатов сопроводительного письма для веб-отображения"""
     return {
@@ -1018,6 +1203,7 @@ def assemble_full_letter_text(cover_letter) -> str:
     
     return "\n".join(parts)
 
+@traced("web.format_checklist_for_web")
 def format_checklist_for_web(checklist) -> dict:
     """Форматирование результатов чек-листа для веб-отображения"""
     
@@ -1134,6 +1320,7 @@ def format_checklist_for_web(checklist) -> dict:
             "general_recommendations": [checklist.final_recommendations] if hasattr(checklist, 'final_recommendations') else []
         }
 
+@traced("web.format_simulation_for_web")
 def format_simulation_for_web(simulation) -> dict:
     """Форматирование результатов симуляции для веб-отображения"""
     if simulation is None:
@@ -1199,8 +1386,50 @@ def format_simulation_for_web(simulation) -> dict:
 
 # ================== МОНИТОРИНГ ==================
 
+# ================== МЕТРИКИ ==================
+
+metrics_registry.register_gauge_callback(
+    "app_result_store_size", "Количество результатов в хранилищах веб-приложения",
+    lambda: {
+        (("store", "analysis"),): len(analysis_storage),
+        (("store", "cover_letter"),): len(cover_letter_storage),
+        (("store", "checklist"),): len(checklist_storage),
+        (("store", "simulation"),): len(simulation_storage),
+        (("store", "adapted_resume"),): len(adapted_resume_storage),
+        (("store", "application_package"),): len(application_package_storage),
+    }
+)
+metrics_registry.register_gauge_callback(
+    "app_queue_depth", "Глубина фоновых очередей веб-приложения",
+    lambda: {
+        (("queue", "package_tasks"),): len(package_tasks),
+        (("queue", "simulations_running"),): sum(
+            1 for progress in simulation_progress_storage.values()
+            if progress.get("status") in ("starting", "running")
+        ),
+        (("queue", "pdf_render_in_flight"),): app.state.services.pdf_renderer.in_flight_count,
+    }
+)
+metrics_registry.register_gauge_callback(
+    "pdf_cache_bytes", "Размер кэша готовых PDF в байтах",
+    lambda: app.state.services.pdf_renderer.cache.total_bytes
+)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Метрики в текстовом формате Prometheus (после входа или по METRICS_TOKEN)"""
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/debug/event-loop")
+async def event_loop_debug():
+    """Задержка event loop и стеки последних блокировок (требует авторизации)"""
+    return loop_monitor.stats(include_stacks=True)
+
+
 @app.get("/health")
-async def health_check():
+async def health_check(services: ServiceContainer = Depends(get_services)):
     """Health check endpoint для мониторинга"""
     try:
         return {
@@ -1212,7 +1441,10 @@ async def health_check():
                 "auth_system": "ok",
                 "templates": "ok",
                 "storage": "ok"
-            }
+            },
+            "event_loop": loop_monitor.stats(),
+            "services": services.stats(),
+            "feature_apps": feature_apps
         }
     except Exception as e:
         return {
@@ -1224,5 +1456,8 @@ async def health_check():
 # Добавляем маршруты панели мониторинга
 add_health_dashboard_routes(app, auth_system.templates)
 
+# Приложения функций в этом же процессе (/apps/<функция>) на общих сервисах и кэшах
+feature_apps = mount_feature_apps(app)
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=3000)
\ No newline at end of file
@@ -0,0 +1,21 @@
+# tests/benchmarks/__init__.py
+"""
+Микро-бенчмарки CPU-нагруженных участков: экстракторы HH, форматтеры промптов,
+анализ профиля кандидата, поиск красных флагов, подготовка gap-анализа для веба
+и генераторы PDF отчетов.
+
+Входные данные — сохраненные ответы в tests/ с масштабированием описаний
+от 1x до 100x. Результат — JSON отчет (время и CPU на вызов по каждому
+масштабу), который можно сравнить с предыдущим отчетом.
+
+Полный прогон занимает несколько минут: генерация PDF на 100x описаний
+измеряется одним вызовом, если он дольше --min-time.
+
+Запуск:
+    python -m tests.benchmarks --report benchmarks.json
+    python -m tests.benchmarks --filter formatter --scales 1,10,100
+    python -m tests.benchmarks --compare benchmarks.json --tolerance 0.2
+
+Профиль холодного старта (импорт и время до первого /health) — tests/benchmarks/startup.py:
+    python -m tests.benchmarks.startup
+"""
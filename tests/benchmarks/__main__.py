@@ -0,0 +1,7 @@
+# tests/benchmarks/__main__.py
+import sys
+
+from tests.benchmarks.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# tests/benchmarks/cases.py
+"""
+Реестр бенчмарков.
+
+Кейс — имя, группа и фабрика setup(scale) -> callable без аргументов.
+Подготовка входа (парсинг фикстур, сборка моделей) не входит в измерение,
+кроме кейсов экстракторов, где парсинг и есть измеряемая работа.
+"""
+
+import contextlib
+import io
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from tests.benchmarks import inputs
+
+# Импорт веб-приложения и движка оценки требует настроек сервисов
+for _name, _value in {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "OPENAI_MODEL_NAME": "gpt-4.1",
+    "HH_CLIENT_ID": "benchmark",
+    "HH_CLIENT_SECRET": "benchmark",
+    "HH_REDIRECT_URI": "http://localhost/callback",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    group: str
+    setup: Callable[[int], Callable[[], Any]]
+    # Больший масштаб недостижим в работе сервиса (например, ограничен схемой LLM)
+    max_scale: Optional[int] = None
+    max_scale_reason: str = ""
+
+
+CASES: List[BenchmarkCase] = []
+
+
+def case(name: str, group: str, max_scale: Optional[int] = None, max_scale_reason: str = ""):
+    def decorator(setup: Callable[[int], Callable[[], Any]]):
+        CASES.append(BenchmarkCase(name, group, setup, max_scale, max_scale_reason))
+        return setup
+    return decorator
+
+
+def quiet(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Подавляет отладочный print измеряемого кода (иначе измеряется вывод в терминал)."""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+
+# ---------- парсеры HH ----------
+
+@case("extract_vacancy_info", "parsers")
+def _extract_vacancy(scale: int):
+    from src.parsers.vacancy_extractor import VacancyExtractor
+    extractor, raw = VacancyExtractor(), inputs.raw_vacancy(scale)
+    return lambda: extractor.extract_vacancy_info(raw)
+
+
+@case("extract_resume_info", "parsers")
+def _extract_resume(scale: int):
+    from src.parsers.resume_extractor import ResumeExtractor
+    extractor, raw = ResumeExtractor(), inputs.raw_resume(scale)
+    return lambda: extractor.extract_resume_info(raw)
+
+
+# ---------- форматтеры промптов (с бюджетом токенов, как в сервисах) ----------
+
+def _formatter_case(name: str, module: str, resume_func: str, vacancy_func: str) -> None:
+    @case(name, "formatters")
+    def setup(scale: int):
+        import importlib
+        formatter = importlib.import_module(module)
+        format_resume, format_vacancy = getattr(formatter, resume_func), getattr(formatter, vacancy_func)
+        resume, vacancy = inputs.parsed_resume(scale), inputs.parsed_vacancy(scale)
+        return quiet(lambda: (format_resume(resume), format_vacancy(vacancy)))
+
+
+_formatter_case("formatter.gap_analyzer", "src.llm_gap_analyzer.formatter",
+                "format_resume_data", "format_vacancy_data")
+_formatter_case("formatter.cover_letter", "src.llm_cover_letter.formatter",
+                "format_resume_for_cover_letter", "format_vacancy_for_cover_letter")
+_formatter_case("formatter.interview_checklist", "src.llm_interview_checklist.formatter",
+                "format_resume_for_interview_prep", "format_vacancy_for_interview_prep")
+_formatter_case("formatter.interview_simulation", "src.llm_interview_simulation.formatter",
+                "format_resume_for_interview_simulation", "format_vacancy_for_interview_simulation")
+
+
+@case("formatter.resume_rewriter", "formatters")
+def _rewriter_formatter(scale: int):
+    from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
+    from src.llm_resume_rewriter.formatter import format_gap_analysis_data, format_resume_data
+    resume = inputs.parsed_resume(scale)
+    gap = inputs.llm_result(EnhancedResumeTailoringAnalysis, inputs.GAP_RESPONSE, scale).model_dump()
+    return quiet(lambda: (format_resume_data(resume), format_gap_analysis_data(gap)))
+
+
+# ---------- анализ кандидата и оценка интервью ----------
+
+@case("SmartCandidateAnalyzer.analyze_candidate_profile", "analysis")
+def _candidate_profile(scale: int):
+    from src.llm_interview_simulation.formatter import SmartCandidateAnalyzer
+    analyzer, resume = SmartCandidateAnalyzer(), inputs.parsed_resume(scale)
+    return quiet(lambda: analyzer.analyze_candidate_profile(resume))
+
+
+@case("ProfessionalAssessmentEngine._detect_red_flags", "analysis")
+def _red_flags(scale: int):
+    from src.llm_interview_simulation.assessment_engine import ProfessionalAssessmentEngine
+    from src.llm_interview_simulation.formatter import SmartCandidateAnalyzer
+    engine = ProfessionalAssessmentEngine()
+    profile = quiet(lambda: SmartCandidateAnalyzer().analyze_candidate_profile(inputs.parsed_resume(1)))()
+    messages = inputs.dialog_messages(scale)
+    return lambda: engine._detect_red_flags(messages, profile)
+
+
+@case("format_gap_analysis_for_web", "analysis")
+def _gap_for_web(scale: int):
+    from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
+    from src.web_app.unified_app.main import format_gap_analysis_for_web
+    analysis = inputs.llm_result(EnhancedResumeTailoringAnalysis, inputs.GAP_RESPONSE, scale)
+    # Форматтер копирует ссылки на строки, его работа растет с числом требований и рекомендаций
+    inputs.scale_lists(analysis, ("requirements_analysis", "critical_recommendations", "important_recommendations",
+                                  "optional_recommendations", "key_strengths", "major_gaps", "next_steps"), scale)
+    return lambda: format_gap_analysis_for_web(analysis)
+
+
+# ---------- генераторы PDF (ReportLab) ----------
+
+@case("GapAnalysisPDFGenerator.generate_pdf", "pdf")
+def _gap_pdf(scale: int):
+    from src.models.gap_analysis_models import EnhancedResumeTailoringAnalysis
+    from src.web_app.gap_analysis.pdf_generator import GapAnalysisPDFGenerator
+    generator = GapAnalysisPDFGenerator()
+    analysis = inputs.llm_result(EnhancedResumeTailoringAnalysis, inputs.GAP_RESPONSE, scale)
+    return lambda: generator.generate_pdf(analysis)
+
+
+@case("GapAnalysisPDFGenerator.generate_adapted_resume_pdf", "pdf")
+def _adapted_resume_pdf(scale: int):
+    from src.models.resume_models import ResumeInfo
+    from src.web_app.gap_analysis.pdf_generator import GapAnalysisPDFGenerator
+    generator = GapAnalysisPDFGenerator()
+    resume = ResumeInfo.model_validate(inputs.parsed_resume(scale))
+    return lambda: generator.generate_adapted_resume_pdf(resume)
+
+
+# Разделы письма выводятся ячейками таблицы, которые не переносятся между
+# страницами; длина разделов ограничена max_length схемы EnhancedCoverLetter
+@case("CoverLetterPDFGenerator.generate_pdf", "pdf", max_scale=1,
+      max_scale_reason="длина разделов письма ограничена схемой EnhancedCoverLetter")
+def _cover_pdf(scale: int):
+    from src.models.cover_letter_models import EnhancedCoverLetter
+    from src.web_app.cover_letter.pdf_generator import CoverLetterPDFGenerator
+    generator = CoverLetterPDFGenerator()
+    letter = inputs.llm_result(EnhancedCoverLetter, inputs.COVER_RESPONSE, scale)
+    return lambda: generator.generate_pdf(letter)
+
+
+@case("InterviewChecklistPDFGenerator.generate_pdf", "pdf")
+def _checklist_pdf(scale: int):
+    from src.models.interview_checklist_models import ProfessionalInterviewChecklist
+    from src.web_app.interview_checklist.pdf_generator import InterviewChecklistPDFGenerator
+    generator = InterviewChecklistPDFGenerator()
+    checklist = inputs.llm_result(ProfessionalInterviewChecklist, inputs.CHECKLIST_RESPONSE, scale)
+    return lambda: generator.generate_pdf(checklist)
+
+
+@case("ProfessionalInterviewPDFGenerator.generate_pdf", "pdf")
+def _simulation_pdf(scale: int):
+    from src.llm_interview_simulation.pdf_generator import ProfessionalInterviewPDFGenerator
+    generator = ProfessionalInterviewPDFGenerator()
+    simulation = quiet(lambda: inputs.interview_simulation(scale))()
+    return lambda: generator.generate_pdf(simulation)
+
+
+def select(patterns: List[str]) -> List[BenchmarkCase]:
+    """Кейсы, имя или группа которых содержит один из шаблонов (пустой список — все)."""
+    if not patterns:
+        return list(CASES)
+    return [item for item in CASES if any(p in item.name or p == item.group for p in patterns)]
+
+
+def groups() -> Dict[str, List[str]]:
+    result: Dict[str, List[str]] = {}
+    for item in CASES:
+        result.setdefault(item.group, []).append(item.name)
+    return result
@@ -0,0 +1,147 @@
+# tests/benchmarks/inputs.py
+"""
+Входные данные бенчмарков из сохраненных ответов HH и LLM с масштабированием.
+
+scale — во сколько раз увеличиваются описания: описание вакансии, описания
+мест работы и раздел «о себе» резюме, длинные текстовые поля результатов LLM;
+для кода, который обходит списки результата, — и число элементов списков (scale_lists).
+"""
+
+import copy
+import functools
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Type
+
+from pydantic import BaseModel
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+FIXTURES = TESTS_DIR / "test_models_res_vac"
+RAW_RESUME = FIXTURES / "fetched_resume_6d807532ff0ed6b79f0039ed1f63386d724a62.json"
+RAW_VACANCY = FIXTURES / "fetched_vacancy_120234346.json"
+GAP_RESPONSE = TESTS_DIR / "debug_gap" / "debug_response_gap.json"
+COVER_RESPONSE = TESTS_DIR / "debug_cover" / "debug_response_cover_letter.json"
+CHECKLIST_RESPONSE = TESTS_DIR / "debug_interview_checklist" / "debug_response_interview_checklist.json"
+
+# Строки длиннее порога считаются описаниями и масштабируются
+LONG_TEXT_THRESHOLD = 80
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def scale_text(text: str, scale: int) -> str:
+    return text if scale <= 1 or not text else "\n".join([text] * scale)
+
+
+def raw_vacancy(scale: int) -> Dict[str, Any]:
+    """Ответ HH по вакансии с описанием x scale."""
+    vacancy = copy.deepcopy(_load(RAW_VACANCY))
+    vacancy["description"] = scale_text(vacancy.get("description", ""), scale)
+    return vacancy
+
+
+def raw_resume(scale: int) -> Dict[str, Any]:
+    """Ответ HH по резюме с описаниями опыта и «о себе» x scale."""
+    resume = copy.deepcopy(_load(RAW_RESUME))
+    for item in resume.get("experience", []):
+        item["description"] = scale_text(item.get("description") or "", scale)
+    resume["skills"] = scale_text(resume.get("skills") or "", scale)
+    return resume
+
+
+@functools.lru_cache(maxsize=None)
+def _parsed(scale: int):
+    from src.parsers.resume_extractor import ResumeExtractor
+    from src.parsers.vacancy_extractor import VacancyExtractor
+
+    resume = ResumeExtractor().extract_resume_info(raw_resume(scale)).model_dump()
+    vacancy = VacancyExtractor().extract_vacancy_info(raw_vacancy(scale)).model_dump()
+    return resume, vacancy
+
+
+def parsed_resume(scale: int) -> Dict[str, Any]:
+    return copy.deepcopy(_parsed(scale)[0])
+
+
+def parsed_vacancy(scale: int) -> Dict[str, Any]:
+    return copy.deepcopy(_parsed(scale)[1])
+
+
+def scale_model(model: BaseModel, scale: int) -> BaseModel:
+    """
+    Масштабирует длинные строки модели на месте, без повторной валидации:
+    ограничения max_length схемы LLM не должны мешать проверке больших входов.
+    """
+    for name in type(model).model_fields:
+        value = getattr(model, name)
+        if isinstance(value, BaseModel):
+            scale_model(value, scale)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, BaseModel):
+                    scale_model(item, scale)
+                elif isinstance(item, str) and len(item) > LONG_TEXT_THRESHOLD:
+                    value[index] = scale_text(item, scale)
+        elif isinstance(value, str) and len(value) > LONG_TEXT_THRESHOLD:
+            setattr(model, name, scale_text(value, scale))
+    return model
+
+
+def llm_result(model: Type[BaseModel], path: Path, scale: int) -> BaseModel:
+    """
+    Результат LLM из сохраненного ответа, приведенный к текущей схеме модели
+    (как синтетический транспорт OpenAI), с масштабированными текстами.
+    """
+    from src.security.openai_transport import conform_to_schema
+
+    schema = model.model_json_schema()
+    data = conform_to_schema(schema, schema.get("$defs", {}), _load(path))
+    return scale_model(model.model_validate(data), scale)
+
+
+def scale_lists(model: BaseModel, fields: Iterable[str], scale: int) -> BaseModel:
+    """Повторяет элементы списков модели x scale (копии, без повторной валидации)."""
+    if scale <= 1:
+        return model
+    for name in fields:
+        items = getattr(model, name)
+        setattr(model, name, [
+            item.model_copy(deep=True) if isinstance(item, BaseModel) else item
+            for _ in range(scale) for item in items
+        ])
+    return model
+
+
+def dialog_messages(scale: int, rounds: int = 5) -> List[Any]:
+    """Диалог интервью: вопросы HR и ответы кандидата из описаний опыта x scale."""
+    from src.models.interview_simulation_models import DialogMessage, QuestionType
+
+    descriptions = [item["description"] for item in _load(RAW_RESUME).get("experience", []) if item.get("description")]
+    messages = []
+    for number in range(1, rounds + 1):
+        messages.append(DialogMessage(
+            speaker="HR", round_number=number, question_type=list(QuestionType)[number % len(QuestionType)],
+            message=f"Расскажите о проекте номер {number}: какие задачи вы решали и какой был результат?"
+        ))
+        answer = descriptions[number % len(descriptions)] if descriptions else "Ну в общем как-то так."
+        messages.append(DialogMessage(speaker="Candidate", round_number=number, message=scale_text(answer, scale)))
+    return messages
+
+
+def interview_simulation(scale: int):
+    """Результат симуляции интервью для PDF генератора."""
+    from src.llm_interview_simulation.formatter import SmartCandidateAnalyzer
+    from src.models.interview_simulation_models import InterviewSimulation
+    from src.security.openai_transport import conform_to_schema
+
+    schema = InterviewSimulation.model_json_schema()
+    data = conform_to_schema(schema, schema.get("$defs", {}))
+    data["candidate_profile"] = SmartCandidateAnalyzer().analyze_candidate_profile(parsed_resume(1)).model_dump()
+    data["dialog_messages"] = [message.model_dump() for message in dialog_messages(scale)]
+    data["interview_config"]["target_rounds"] = 5
+    for key in ("hr_assessment", "candidate_performance_analysis", "improvement_recommendations"):
+        data[key] = scale_text("Кандидат показал уверенные знания и опыт внедрения LLM решений в production.", scale)
+    return InterviewSimulation.model_validate(data)
@@ -0,0 +1,187 @@
+# tests/benchmarks/runner.py
+"""
+CLI микро-бенчмарков: прогон кейсов по масштабам, JSON отчет и сравнение.
+
+Код возврата: 0 — без регрессий (или сравнение не запрашивалось),
+1 — есть регрессии относительно --compare, 2 — кейс завершился ошибкой.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from tests.benchmarks.cases import BenchmarkCase, groups, select
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def parse_scales(value: str) -> List[int]:
+    scales = [int(part) for part in value.split(",") if part.strip()]
+    if not scales or any(scale < 1 for scale in scales):
+        raise argparse.ArgumentTypeError("Масштабы — целые числа >= 1: 1,10,100")
+    return scales
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Микро-бенчмарки парсеров, форматтеров и генераторов PDF")
+    parser.add_argument("--filter", action="append", default=[], help="подстрока имени кейса или группа (можно несколько)")
+    parser.add_argument("--scales", type=parse_scales, default=[1, 10, 100], help="масштабы описаний: 1,10,100")
+    parser.add_argument("--min-time", type=float, default=0.5, help="минимальное время измерения кейса, секунды")
+    parser.add_argument("--max-rounds", type=int, default=1000, help="максимум повторов кейса")
+    parser.add_argument("--min-rounds", type=int, default=3, help="минимум повторов кейса")
+    parser.add_argument("--report", type=Path, help="файл JSON отчета")
+    parser.add_argument("--compare", type=Path, help="предыдущий отчет для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="допустимое замедление медианы относительно --compare")
+    parser.add_argument("--list", action="store_true", help="показать кейсы и выйти")
+    return parser.parse_args(argv)
+
+
+def measure(func: Callable[[], Any], min_time: float, min_rounds: int, max_rounds: int) -> Dict[str, Any]:
+    """
+    Прогрев и повторы до min_time; время одного вызова в миллисекундах.
+
+    Если прогревочный вызов сам дольше min_time (PDF на 100x — минуты),
+    он засчитывается как единственный замер.
+    """
+    cpu_started, started = time.process_time(), time.perf_counter()
+    func()
+    wall: List[float] = [time.perf_counter() - started]
+    cpu: List[float] = [time.process_time() - cpu_started]
+
+    if wall[0] < min_time:
+        wall.clear()
+        cpu.clear()
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            deadline = time.perf_counter() + min_time
+            while len(wall) < max_rounds and (len(wall) < min_rounds or time.perf_counter() < deadline):
+                cpu_started, started = time.process_time(), time.perf_counter()
+                func()
+                wall.append(time.perf_counter() - started)
+                cpu.append(time.process_time() - cpu_started)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    to_ms = lambda value: round(value * 1000, 3)
+    return {
+        "rounds": len(wall),
+        "mean_ms": to_ms(statistics.fmean(wall)),
+        "median_ms": to_ms(statistics.median(wall)),
+        "min_ms": to_ms(min(wall)),
+        "max_ms": to_ms(max(wall)),
+        "stdev_ms": to_ms(statistics.stdev(wall)) if len(wall) > 1 else 0.0,
+        "cpu_mean_ms": to_ms(statistics.fmean(cpu)),
+    }
+
+
+def output_size(result: Any) -> int:
+    """Размер результата: символы строки/кортежа строк или байты PDF."""
+    if hasattr(result, "getbuffer"):
+        return result.getbuffer().nbytes
+    if isinstance(result, str):
+        return len(result)
+    if isinstance(result, tuple):
+        return sum(output_size(item) for item in result)
+    return len(json.dumps(result.model_dump() if hasattr(result, "model_dump") else result, ensure_ascii=False, default=str))
+
+
+def run_case(item: BenchmarkCase, scale: int, args: argparse.Namespace) -> Dict[str, Any]:
+    func = item.setup(scale)
+    stats = measure(func, args.min_time, args.min_rounds, args.max_rounds)
+    stats["output_size"] = output_size(func())
+    return stats
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(report: Dict[str, Any], previous: Dict[str, Any], tolerance: float) -> List[str]:
+    """Регрессии медианы относительно предыдущего отчета (пустой список — регрессий нет)."""
+    regressions = []
+    for name, scales in report["results"].items():
+        for scale, stats in scales.items():
+            reference = previous.get("results", {}).get(name, {}).get(scale)
+            if not reference or "median_ms" not in stats:
+                continue
+            # 0.05 мс — абсолютный допуск на шум таймера для быстрых кейсов
+            if stats["median_ms"] > reference["median_ms"] * (1 + tolerance) + 0.05:
+                regressions.append(f"{name} x{scale}: {stats['median_ms']} мс > {reference['median_ms']} мс (+{tolerance:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.list:
+        for group, names in groups().items():
+            print(f"{group}:")
+            for name in names:
+                print(f"  {name}")
+        return 0
+
+    # Логи сервисов не должны попадать в измерение
+    logging.disable(logging.CRITICAL)
+    cases = select(args.filter)
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "scales": args.scales,
+            "min_time_s": args.min_time,
+        },
+        "results": {},
+    }
+
+    failed = False
+    print(f"{'кейс':<56}{'x':>5}{'median мс':>12}{'mean мс':>12}{'cpu мс':>10}{'rounds':>8}")
+    for item in cases:
+        results = report["results"].setdefault(item.name, {})
+        for scale in args.scales:
+            if item.max_scale and scale > item.max_scale:
+                results[str(scale)] = {"skipped": item.max_scale_reason}
+                continue
+            try:
+                stats = run_case(item, scale, args)
+            except Exception as e:
+                failed = True
+                results[str(scale)] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"{item.name:<56}{scale:>5}  ошибка: {type(e).__name__}: {e}")
+                continue
+            results[str(scale)] = stats
+            print(f"{item.name:<56}{scale:>5}{stats['median_ms']:>12}{stats['mean_ms']:>12}"
+                  f"{stats['cpu_mean_ms']:>10}{stats['rounds']:>8}", flush=True)
+
+    if args.report:
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nОтчет сохранен: {args.report}")
+
+    if failed:
+        return 2
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, previous, args.tolerance)
+        if regressions:
+            print("\nРегрессии:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nРегрессий нет")
+    return 0
@@ -0,0 +1,215 @@
+# tests/benchmarks/startup.py
+"""
+Профиль холодного старта веб-приложения.
+
+Два замера:
+    imports — `python -X importtime -c "import <модуль>"`: самые дорогие импорты
+              (собственное и накопленное время) и сумма по пакетам верхнего уровня;
+    health  — запуск uvicorn в отдельном процессе и время до первого ответа 200
+              на /health (time-to-first-healthy), медиана по --runs запускам.
+
+Запуск:
+    python -m tests.benchmarks.startup
+    python -m tests.benchmarks.startup --mode imports --top 30
+    python -m tests.benchmarks.startup --mode health --runs 5 --report startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_MODULE = "src.web_app.unified_app.main"
+DEFAULT_APP = "src.web_app.unified_app.main:app"
+
+# Строка -X importtime: "import time:  self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _environment() -> Dict[str, str]:
+    """Окружение дочерних процессов: обязательные настройки сервисов, если не заданы."""
+    env = dict(os.environ)
+    env.setdefault("PYTHONPATH", str(PROJECT_ROOT))
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    env.setdefault("OPENAI_MODEL_NAME", "gpt-4.1")
+    env.setdefault("HH_CLIENT_ID", "benchmark")
+    env.setdefault("HH_CLIENT_SECRET", "benchmark")
+    env.setdefault("HH_REDIRECT_URI", "http://localhost/callback")
+    env.setdefault("LOGS_PATH", str(Path(os.getenv("TMPDIR", "/tmp")) / "startup_profile_logs"))
+    return env
+
+
+def profile_imports(module: str, top: int) -> Dict[str, Any]:
+    """Разбор вывода -X importtime для импорта модуля в чистом процессе."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=_environment(), capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Импорт {module} завершился ошибкой:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({"module": name, "self_ms": int(self_us) / 1000,
+                            "cumulative_ms": int(cumulative_us) / 1000, "depth": len(indent) // 2})
+
+    by_package: Dict[str, float] = defaultdict(float)
+    for entry in entries:
+        by_package[entry["module"].split(".")[0]] += entry["self_ms"]
+    target = next((entry for entry in entries if entry["module"] == module), None)
+
+    round_ms = lambda value: round(value, 1)
+    return {
+        "module": module,
+        "process_wall_ms": round_ms(wall * 1000),
+        "import_ms": round_ms(target["cumulative_ms"]) if target else None,
+        "modules_imported": len(entries),
+        "top_cumulative": [
+            {"module": e["module"], "cumulative_ms": round_ms(e["cumulative_ms"])}
+            for e in sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:top]
+        ],
+        "top_self": [
+            {"module": e["module"], "self_ms": round_ms(e["self_ms"])}
+            for e in sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top]
+        ],
+        "by_package": {
+            name: round_ms(ms) for name, ms in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_json(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            if response.status == 200:
+                return json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        pass
+    return None
+
+
+def measure_health(app: str, timeout: float, wait_warmup: bool) -> Dict[str, Any]:
+    """Один холодный старт: время от запуска процесса до первого /health = 200 (и до конца прогрева)."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--no-access-log",
+         "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=_environment(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        healthy_s = warmed_s = None
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Процесс приложения завершился:\n{process.stderr.read().decode()[-2000:]}")
+            body = _get_json(url)
+            if body is not None:
+                elapsed = time.perf_counter() - started
+                healthy_s = healthy_s or elapsed
+                warmup = body.get("services", {}).get("warmup")
+                if not wait_warmup or warmup in (None, "done", "disabled", "failed"):
+                    warmed_s = elapsed
+                    break
+            time.sleep(0.01)
+        if healthy_s is None:
+            raise RuntimeError(f"/health не ответил за {timeout} с")
+        return {"healthy_s": round(healthy_s, 3), "warmed_s": round(warmed_s, 3) if warmed_s else None}
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def profile_health(app: str, runs: int, timeout: float, wait_warmup: bool) -> Dict[str, Any]:
+    samples = [measure_health(app, timeout, wait_warmup) for _ in range(runs)]
+    healthy = [sample["healthy_s"] for sample in samples]
+    warmed = [sample["warmed_s"] for sample in samples if sample["warmed_s"] is not None]
+    return {
+        "app": app,
+        "runs": samples,
+        "healthy_median_s": round(statistics.median(healthy), 3),
+        "warmed_median_s": round(statistics.median(warmed), 3) if warmed else None,
+    }
+
+
+def print_imports(report: Dict[str, Any], top: int) -> None:
+    print(f"Импорт {report['module']}: {report['import_ms']} мс "
+          f"(процесс целиком {report['process_wall_ms']} мс, модулей: {report['modules_imported']})")
+    print(f"\nНакопленное время, топ {top}:")
+    for entry in report["top_cumulative"]:
+        print(f"  {entry['cumulative_ms']:>9.1f} мс  {entry['module']}")
+    print(f"\nСобственное время, топ {top}:")
+    for entry in report["top_self"]:
+        print(f"  {entry['self_ms']:>9.1f} мс  {entry['module']}")
+    print("\nПо пакетам (сумма собственного времени):")
+    for name, ms in report["by_package"].items():
+        print(f"  {ms:>9.1f} мс  {name}")
+
+
+def print_health(report: Dict[str, Any]) -> None:
+    print(f"\nВремя до первого /health = 200 ({report['app']}):")
+    for index, sample in enumerate(report["runs"], 1):
+        warmed = f", прогрев завершен: {sample['warmed_s']} с" if sample["warmed_s"] is not None else ""
+        print(f"  запуск {index}: {sample['healthy_s']} с{warmed}")
+    print(f"  медиана: {report['healthy_median_s']} с")
+    if report["warmed_median_s"] is not None:
+        print(f"  медиана до конца прогрева: {report['warmed_median_s']} с")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Профиль импорта и холодного старта веб-приложения")
+    parser.add_argument("--mode", choices=("all", "imports", "health"), default="all")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="модуль для -X importtime")
+    parser.add_argument("--app", default=DEFAULT_APP, help="приложение uvicorn для замера /health")
+    parser.add_argument("--top", type=int, default=20, help="строк в таблицах импорта")
+    parser.add_argument("--runs", type=int, default=3, help="холодных запусков для замера /health")
+    parser.add_argument("--timeout", type=float, default=60, help="ожидание /health, секунды")
+    parser.add_argument("--wait-warmup", action="store_true", help="ждать также окончания прогрева сервисов")
+    parser.add_argument("--report", type=Path, help="файл JSON отчета")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report: Dict[str, Any] = {}
+    if args.mode in ("all", "imports"):
+        report["imports"] = profile_imports(args.module, args.top)
+        print_imports(report["imports"], args.top)
+    if args.mode in ("all", "health"):
+        report["health"] = profile_health(args.app, args.runs, args.timeout, args.wait_warmup)
+        print_health(report["health"])
+    if args.report:
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nОтчет сохранен: {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -73,13 +73,8 @@ def debug_system_prompt(resume_json_path: str, vacancy_json_path: str) -> None:
         # Создаем генератор
         cover_letter_generator = EnhancedLLMCoverLetterGenerator()
         
-        # Получаем контекст и данные в dict формате
-        resume_dict = parsed_resume.model_dump()
-        vacancy_dict = parsed_vacancy.model_dump()
-        context = cover_letter_generator._analyze_vacancy_context(vacancy_dict)
-        
-        # Используем новый метод для создания системного промпта с полным контекстом
-        system_prompt = cover_letter_generator._create_system_prompt(context, resume_dict, vacancy_dict)
+        # Системный промпт статичен, контекст передается в пользовательском промпте
+        system_prompt = cover_letter_generator._create_system_prompt()
         
         print(system_prompt)
         print(f"\n📊 Длина системного промпта: {len(system_prompt)} символов")
@@ -235,7 +230,8 @@ def debug_user_prompt(resume_json_path: str, vacancy_json_path: str) -> None:
         vacancy_dict = parsed_vacancy.model_dump()
         
         # Используем новый метод для создания пользовательского промпта
-        user_prompt = cover_letter_generator._create_user_prompt(resume_dict, vacancy_dict)
+        context = cover_letter_generator._analyze_vacancy_context(vacancy_dict)
+        user_prompt = cover_letter_generator._create_user_prompt(resume_dict, vacancy_dict, context)
         
         print(user_prompt)
         print(f"\n📊 Длина пользовательского промпта: {len(user_prompt)} символов")
@@ -277,8 +273,8 @@ def debug_full_messages(resume_json_path: str, vacancy_json_path: str) -> None:
         
         # Анализируем контекст и создаем промпты как в generate_enhanced_cover_letter
         context = cover_letter_generator._analyze_vacancy_context(vacancy_dict)
-        system_prompt = cover_letter_generator._create_system_prompt(context, resume_dict, vacancy_dict)
-        user_prompt = cover_letter_generator._create_user_prompt(resume_dict, vacancy_dict)
+        system_prompt = cover_letter_generator._create_system_prompt()
+        user_prompt = cover_letter_generator._create_user_prompt(resume_dict, vacancy_dict, context)
         
         # Формируем messages как в generate_enhanced_cover_letter
         messages = [
@@ -353,8 +349,8 @@ def debug_prompt_components(resume_json_path: str, vacancy_json_path: str) -> No
         
         print("\n🔸 3. ИСПОЛЬЗУЕМЫЕ МЕТОДЫ КЛАССА:")
         print(f"   • cover_letter_generator._analyze_vacancy_context(vacancy_dict)")
-        print(f"   • cover_letter_generator._create_system_prompt(context, resume_dict, vacancy_dict)")
-        print(f"   • cover_letter_generator._create_user_prompt(resume_dict, vacancy_dict)")
+        print(f"   • cover_letter_generator._create_system_prompt()")
+        print(f"   • cover_letter_generator._create_user_prompt(resume_dict, vacancy_dict, context)")
         
         print("\n🔸 4. ИСПОЛЬЗУЕМЫЕ ФОРМАТТЕРЫ:")
         print(f"   • format_resume_for_cover_letter(resume_dict)")
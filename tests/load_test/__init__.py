@@ -0,0 +1,13 @@
+# tests/load_test/__init__.py
+"""
+Нагрузочное тестирование объединенного веб-приложения.
+
+Поднимает приложение вместе с локальным стендом HH (src/hh_local_server),
+callback сервером и синтетическим транспортом OpenAI, прогоняет смешанные
+сценарии пользователей и сравнивает результат с сохраненным baseline.
+
+Запуск:
+    python -m tests.load_test --users 8 --duration 60
+    python -m tests.load_test --users 8 --duration 60 --save-baseline
+    python -m tests.load_test --app-url http://127.0.0.1:3000   # уже запущенный стек
+"""
@@ -0,0 +1,7 @@
+# tests/load_test/__main__.py
+import sys
+
+from tests.load_test.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
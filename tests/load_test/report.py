@@ -0,0 +1,176 @@
+# tests/load_test/report.py
+"""
+Сбор показателей прогона и сравнение с baseline.
+
+Задержка event loop приложения оценивается зондом: легкий GET /health
+выполняется каждые PROBE_INTERVAL секунд, его латентность сверх латентности
+в простое — время ожидания обработчика в очереди event loop. Дополнительно
+в отчет попадают собственные показатели приложения (event_loop в /health,
+src/utils/loop_monitor.py) с местами блокирующих вызовов.
+"""
+
+import asyncio
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+PROBE_INTERVAL = 0.25
+RSS_INTERVAL = 1.0
+
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))]
+
+
+def summarize(samples: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """count/p50/p95/p99/max (по умолчанию в миллисекундах)."""
+    return {
+        "count": len(samples),
+        "p50": round(percentile(samples, 0.5) * scale, 1),
+        "p95": round(percentile(samples, 0.95) * scale, 1),
+        "p99": round(percentile(samples, 0.99) * scale, 1),
+        "max": round(max(samples, default=0) * scale, 1),
+    }
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """RSS процесса вместе с дочерними (пул рендеринга PDF), байты."""
+    try:
+        import psutil
+        process = psutil.Process(pid)
+        return sum(p.memory_info().rss for p in [process, *process.children(recursive=True)])
+    except ImportError:
+        status = Path(f"/proc/{pid}/status")
+        if not status.exists():
+            return None
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except Exception:
+        return None
+    return None
+
+
+class Monitor:
+    """Фоновые зонды: латентность /health и RSS процесса приложения."""
+
+    def __init__(self, base_url: str, pid: Optional[int]):
+        self.base_url = base_url
+        self.pid = pid
+        self.idle_probe: float = 0.0
+        self.probes: List[float] = []
+        self.rss: List[int] = []
+        self.app_event_loop: Dict[str, Any] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    async def _probe_once(self, session: aiohttp.ClientSession) -> float:
+        started = time.perf_counter()
+        async with session.get(f"{self.base_url}/health") as response:
+            await response.read()
+        return time.perf_counter() - started
+
+    async def calibrate(self, samples: int = 20) -> None:
+        """Латентность /health в простое (вычитается из зондов под нагрузкой)."""
+        async with aiohttp.ClientSession() as session:
+            measured = [await self._probe_once(session) for _ in range(samples)]
+        self.idle_probe = percentile(measured, 0.5)
+
+    async def _probe_loop(self) -> None:
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    self.probes.append(await self._probe_once(session))
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(PROBE_INTERVAL)
+
+    async def _rss_loop(self) -> None:
+        while True:
+            value = process_rss(self.pid) if self.pid else None
+            if value:
+                self.rss.append(value)
+            await asyncio.sleep(RSS_INTERVAL)
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._probe_loop()), asyncio.create_task(self._rss_loop())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{self.base_url}/health") as response:
+                    self.app_event_loop = (await response.json()).get("event_loop", {})
+        except (aiohttp.ClientError, ValueError):
+            pass
+
+    def event_loop_lag(self) -> Dict[str, float]:
+        return summarize([max(0.0, probe - self.idle_probe) for probe in self.probes])
+
+    def rss_mb(self) -> Dict[str, float]:
+        if not self.rss:
+            return {}
+        to_mb = lambda value: round(value / 1024 / 1024, 1)
+        return {"start": to_mb(self.rss[0]), "peak": to_mb(max(self.rss)), "end": to_mb(self.rss[-1])}
+
+
+def build_report(config: Dict[str, Any], recorder, monitor: Monitor, elapsed: float) -> Dict[str, Any]:
+    total = sum(len(samples) for samples in recorder.latencies.values())
+    errors = sum(recorder.errors.values())
+    return {
+        "config": config,
+        "duration_s": round(elapsed, 1),
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0,
+        "endpoints": {
+            label: {**summarize(samples), "errors": recorder.errors.get(label, 0)}
+            for label, samples in sorted(recorder.latencies.items())
+        },
+        "scenarios": {
+            name: {
+                **summarize(recorder.scenarios.get(name, [])),
+                "per_minute": round(len(recorder.scenarios.get(name, [])) / elapsed * 60, 2) if elapsed else 0,
+                "errors": recorder.scenario_errors.get(name, 0),
+            }
+            for name in sorted(set(recorder.scenarios) | set(recorder.scenario_errors))
+        },
+        "event_loop_lag_ms": monitor.event_loop_lag(),
+        "app_event_loop": monitor.app_event_loop,
+        "rss_mb": monitor.rss_mb(),
+    }
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Регрессии относительно baseline (пустой список — регрессий нет)."""
+    regressions = []
+
+    def check_higher(name: str, current: float, reference: float, floor: float = 0.0) -> None:
+        # floor — абсолютный допуск для малых значений (шум измерения)
+        if reference and current > reference * (1 + tolerance) + floor:
+            regressions.append(f"{name}: {current} > {reference} (+{tolerance:.0%})")
+
+    for label, reference in baseline.get("endpoints", {}).items():
+        current = report["endpoints"].get(label)
+        if current is None:
+            continue
+        check_higher(f"{label} p95 мс", current["p95"], reference["p95"], floor=20)
+        if current["errors"] > reference.get("errors", 0):
+            regressions.append(f"{label}: ошибок {current['errors']} > {reference.get('errors', 0)}")
+
+    for name, reference in baseline.get("scenarios", {}).items():
+        current = report["scenarios"].get(name)
+        if current and reference.get("per_minute") and current["per_minute"] < reference["per_minute"] * (1 - tolerance):
+            regressions.append(f"сценарий {name}: {current['per_minute']}/мин < {reference['per_minute']}/мин (-{tolerance:.0%})")
+
+    check_higher("event loop lag p95 мс", report["event_loop_lag_ms"]["p95"],
+                 baseline.get("event_loop_lag_ms", {}).get("p95", 0), floor=20)
+    check_higher("RSS peak МБ", report["rss_mb"].get("peak", 0), baseline.get("rss_mb", {}).get("peak", 0))
+    return regressions
@@ -0,0 +1,148 @@
+# tests/load_test/runner.py
+"""
+CLI нагрузочного теста: запуск стека, прогон пользователей, отчет и baseline.
+
+Код возврата: 0 — без регрессий, 1 — есть регрессии относительно baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiohttp
+
+from tests.load_test.report import Monitor, build_report, compare_with_baseline
+from tests.load_test.scenarios import DEFAULT_MIX, Recorder, VirtualUser, authorize_hh, build_resume_pdf, login
+from tests.load_test.stack import TestStack
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """gap=3,cover=2,checklist=2,simulation=1"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Неизвестный сценарий: {name}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест объединенного веб-приложения")
+    parser.add_argument("--users", type=int, default=8, help="одновременных пользователей")
+    parser.add_argument("--duration", type=float, default=60, help="длительность нагрузки, секунды")
+    parser.add_argument("--ramp-up", type=float, default=5, help="время подключения всех пользователей, секунды")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="веса сценариев: gap=3,cover=2,checklist=2,simulation=1")
+    parser.add_argument("--llm-latency-scale", type=float, default=1.0, help="множитель синтетической латентности LLM")
+    parser.add_argument("--hh-latency-ms", type=float, default=150, help="медиана латентности стенда HH")
+    parser.add_argument("--app-url", help="адрес уже запущенного приложения (стек не поднимается)")
+    parser.add_argument("--password", default="load-test", help="пароль демо-доступа (DEMO_PASSWORD)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", type=Path, help="файл JSON отчета")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить отчет как baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое ухудшение относительно baseline")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stack: Optional[TestStack] = None
+    base_url, pid = args.app_url, None
+    if not base_url:
+        stack = TestStack(llm_latency_scale=args.llm_latency_scale, hh_latency_ms=args.hh_latency_ms,
+                          demo_password=args.password)
+        print(f"Запуск стека (логи: {stack.logs_dir})...")
+        await stack.start()
+        base_url, pid = stack.app_url, stack.app_pid
+
+    try:
+        resume_pdf = build_resume_pdf()
+        recorder = Recorder()
+        monitor = Monitor(base_url, pid)
+        await monitor.calibrate()
+
+        sessions = []
+        for index in range(args.users):
+            session = aiohttp.ClientSession(
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                timeout=aiohttp.ClientTimeout(total=600)
+            )
+            await login(base_url, session, args.password)
+            # Токены HH хранятся по сессии: каждый пользователь авторизуется сам
+            await authorize_hh(base_url, session)
+            sessions.append(session)
+
+        print(f"Нагрузка: {args.users} пользователей, {args.duration:.0f} с, сценарии {args.mix}")
+        monitor.start()
+        started = time.monotonic()
+        stop_at = started + args.duration
+
+        async def user_loop(index: int, session: aiohttp.ClientSession) -> None:
+            await asyncio.sleep(args.ramp_up * index / max(1, args.users))
+            user = VirtualUser(base_url, session, recorder, resume_pdf, random.Random(args.seed + index))
+            await user.run(args.mix, stop_at)
+
+        try:
+            await asyncio.gather(*(user_loop(index, session) for index, session in enumerate(sessions)))
+        finally:
+            elapsed = time.monotonic() - started
+            await monitor.stop()
+            for session in sessions:
+                await session.close()
+
+        config = {key: value for key, value in vars(args).items() if key in (
+            "users", "duration", "mix", "llm_latency_scale", "hh_latency_ms", "seed")}
+        return build_report(config, recorder, monitor, elapsed)
+    finally:
+        if stack is not None:
+            stack.stop()
+
+
+def print_report(report: dict) -> None:
+    print(f"\nЗапросов: {report['requests']} ({report['throughput_rps']} rps), ошибок: {report['errors']}")
+    print(f"{'эндпоинт':<48}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>5}")
+    for label, stats in report["endpoints"].items():
+        print(f"{label:<48}{stats['count']:>7}{stats['p50']:>9}{stats['p95']:>9}{stats['p99']:>9}{stats['errors']:>5}")
+    for name, stats in report["scenarios"].items():
+        print(f"сценарий {name}: {stats['per_minute']}/мин, p95 {stats['p95']} мс, ошибок {stats['errors']}")
+    print(f"event loop lag, мс: {report['event_loop_lag_ms']}")
+    app_loop = report.get("app_event_loop") or {}
+    if app_loop.get("enabled"):
+        print(f"event loop приложения, мс: {app_loop['lag_ms']}, блокировок: {app_loop['blocked_total']}")
+        for block in app_loop.get("recent_blocks", []):
+            print(f"  блокировка {block['duration_ms']} мс: {block['location']}")
+    print(f"RSS, МБ: {report['rss_mb']}")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.report:
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Baseline сохранен: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Baseline {args.baseline} не найден, сравнение пропущено")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("config") != report["config"]:
+        print("Внимание: параметры прогона отличаются от baseline, сравнение может быть некорректным")
+    regressions = compare_with_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print("\nРегрессии относительно baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nРегрессий относительно baseline нет")
+    return 0
@@ -0,0 +1,184 @@
+# tests/load_test/scenarios.py
+"""
+Сценарии виртуальных пользователей веб-приложения.
+
+Каждый пользователь — отдельная сессия (cookie авторизации), выбирающая
+сценарии по весам: загрузка PDF резюме + ссылка на вакансию, опрос прогресса
+симуляции и скачивание PDF отчетов.
+"""
+
+import asyncio
+import io
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+RESUME_FIXTURE = PROJECT_ROOT / "tests" / "test_models_res_vac" / "fetched_resume_6d807532ff0ed6b79f0039ed1f63386d724a62.json"
+FONT_PATH = PROJECT_ROOT / "fonts" / "dejavu-sans" / "DejaVuSans.ttf"
+
+DEFAULT_MIX = {"gap": 3, "cover": 2, "checklist": 2, "simulation": 1}
+SIMULATION_POLL_INTERVAL = 1.0
+SIMULATION_TIMEOUT = 300
+
+
+def build_resume_pdf() -> bytes:
+    """PDF резюме из сохраненного ответа HH (текст для pdfplumber)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    pdfmetrics.registerFont(TTFont("DejaVuSans", str(FONT_PATH)))
+    style = ParagraphStyle("resume", fontName="DejaVuSans", fontSize=10, leading=13)
+    resume = json.loads(RESUME_FIXTURE.read_text(encoding="utf-8"))
+
+    lines = [f"{resume.get('last_name', '')} {resume.get('first_name', '')}", resume.get("title", "")]
+    for item in resume.get("experience", []):
+        lines.append(f"{item.get('position', '')} — {item.get('company', '')} ({item.get('start', '')} — {item.get('end') or 'н.в.'})")
+        lines.extend(line for line in (item.get("description") or "").split("\n") if line.strip())
+    lines.append("Навыки: " + ", ".join(resume.get("skill_set", [])))
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build([
+        Paragraph(line.replace("&", "&amp;").replace("<", "&lt;"), style) for line in lines if line
+    ])
+    return buffer.getvalue()
+
+
+class Recorder:
+    """Латентности запросов по эндпоинтам и итоги сценариев."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.scenarios: Dict[str, List[float]] = defaultdict(list)
+        self.scenario_errors: Dict[str, int] = defaultdict(int)
+
+    def observe(self, label: str, seconds: float, ok: bool) -> None:
+        self.latencies[label].append(seconds)
+        if not ok:
+            self.errors[label] += 1
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """/download-gap-analysis/gap_123 -> /download-gap-analysis/:id"""
+    return f"{method} {re.sub(r'/(gap|letter|checklist|sim|adapted|package)_[^/]+', '/:id', path)}"
+
+
+class VirtualUser:
+    """Сессия одного пользователя веб-приложения."""
+
+    def __init__(self, base_url: str, session: aiohttp.ClientSession, recorder: Recorder,
+                 resume_pdf: bytes, rng: random.Random):
+        self.base_url = base_url
+        self.session = session
+        self.recorder = recorder
+        self.resume_pdf = resume_pdf
+        self.rng = rng
+
+    async def _request(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        started = time.perf_counter()
+        ok = False
+        try:
+            async with self.session.request(method, f"{self.base_url}{path}", **kwargs) as response:
+                body = await response.read()
+                ok = response.status < 400
+                response.body = body
+                return response
+        finally:
+            self.recorder.observe(endpoint_label(method, path), time.perf_counter() - started, ok)
+
+    def _form(self, **fields) -> aiohttp.FormData:
+        # Разные id вакансий дают разные синтетические варианты на стенде HH
+        vacancy_id = self.rng.randint(100000000, 100000000 + 10000)
+        form = aiohttp.FormData()
+        form.add_field("resume_file", self.resume_pdf, filename="resume.pdf", content_type="application/pdf")
+        form.add_field("vacancy_url", f"https://hh.ru/vacancy/{vacancy_id}")
+        for name, value in fields.items():
+            form.add_field(name, str(value))
+        return form
+
+    async def _json(self, method: str, path: str, **kwargs) -> Optional[dict]:
+        response = await self._request(method, path, **kwargs)
+        if response.status >= 400:
+            raise RuntimeError(f"{method} {path}: {response.status}")
+        return json.loads(response.body)
+
+    async def _download(self, path: str) -> None:
+        response = await self._request("GET", path)
+        if response.status >= 400:
+            raise RuntimeError(f"GET {path}: {response.status}")
+
+    # ---------- сценарии ----------
+
+    async def gap(self) -> None:
+        result = await self._json("POST", "/gap-analysis", data=self._form())
+        await self._download(f"/download-gap-analysis/{result['analysis_id']}")
+
+    async def cover(self) -> None:
+        result = await self._json("POST", "/generate-cover-letter", data=self._form())
+        await self._download(f"/download-cover-letter/{result['letter_id']}")
+
+    async def checklist(self) -> None:
+        result = await self._json("POST", "/generate-interview-checklist", data=self._form())
+        await self._download(f"/download-interview-checklist/{result['checklist_id']}")
+
+    async def simulation(self) -> None:
+        started = await self._json("POST", "/start-interview-simulation", data=self._form(target_rounds=3))
+        simulation_id = started["simulation_id"]
+        deadline = time.monotonic() + SIMULATION_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(SIMULATION_POLL_INTERVAL)
+            progress = await self._json("GET", f"/simulation-progress/{simulation_id}")
+            if progress.get("status") == "completed":
+                break
+            if progress.get("status") == "error":
+                raise RuntimeError(f"Симуляция {simulation_id}: {progress.get('message')}")
+        else:
+            raise RuntimeError(f"Симуляция {simulation_id} не завершилась за {SIMULATION_TIMEOUT} с")
+        await self._json("GET", f"/simulation-result/{simulation_id}")
+        await self._download(f"/download-interview-simulation/{simulation_id}")
+
+    async def run(self, mix: Dict[str, int], stop_at: float) -> None:
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        while time.monotonic() < stop_at:
+            name = self.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                await getattr(self, name)()
+                self.recorder.scenarios[name].append(time.perf_counter() - started)
+            except Exception:
+                self.recorder.scenario_errors[name] += 1
+                await asyncio.sleep(1)
+
+
+async def login(base_url: str, session: aiohttp.ClientSession, password: str) -> None:
+    """Вход по паролю демо-доступа (cookie сохраняется в сессии)."""
+    async with session.post(f"{base_url}/login", data={"password": password}, allow_redirects=False) as response:
+        if response.status != 302:
+            raise RuntimeError(f"Вход не выполнен: {response.status}")
+
+
+async def authorize_hh(base_url: str, session: aiohttp.ClientSession) -> None:
+    """
+    OAuth HH через стенд: /auth/hh -> authorize стенда -> callback сервер -> /auth/tokens.
+    """
+    async with session.post(f"{base_url}/auth/hh") as response:
+        auth_url = (await response.json())["auth_url"]
+    async with aiohttp.ClientSession() as browser:
+        async with browser.get(auth_url) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Callback сервер не принял код: {response.status}")
+    async with session.get(f"{base_url}/auth/tokens") as response:
+        result = await response.json()
+        if not result.get("success"):
+            raise RuntimeError(f"Авторизация HH не выполнена: {result.get('message')}")
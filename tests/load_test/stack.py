@@ -0,0 +1,111 @@
+# tests/load_test/stack.py
+"""
+Запуск тестового стека: локальный стенд HH, callback сервер и веб-приложение.
+
+Каждый сервис — отдельный процесс с собственным окружением, поэтому RSS
+приложения измеряется без учета нагрузочного клиента.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@dataclass
+class TestStack:
+    """Процессы тестового стека и их адреса."""
+    llm_latency_scale: float = 1.0
+    hh_latency_ms: float = 150
+    app_url: str = ""
+    app_pid: Optional[int] = None
+    demo_password: str = "load-test"
+    logs_dir: Path = field(default_factory=lambda: Path(tempfile.mkdtemp(prefix="load_test_")))
+    _processes: List[subprocess.Popen] = field(default_factory=list)
+
+    def _environment(self, hh_port: int, callback_port: int) -> Dict[str, str]:
+        env = dict(os.environ)
+        hh_url = f"http://127.0.0.1:{hh_port}/"
+        env.update({
+            "PYTHONPATH": str(PROJECT_ROOT),
+            "LOGS_PATH": str(self.logs_dir),
+            "DEMO_PASSWORD": self.demo_password,
+            # LLM — синтетические ответы без сети (src/security/openai_transport.py)
+            "OPENAI_TRANSPORT_MODE": "synthetic",
+            "OPENAI_TRANSPORT_LATENCY_SCALE": str(self.llm_latency_scale),
+            # HH — локальный стенд (src/hh_local_server)
+            "HH_API_BASE_URL": hh_url,
+            "HH_OAUTH_BASE_URL": hh_url,
+            "HH_REDIRECT_URI": f"http://127.0.0.1:{callback_port}/callback",
+            "HH_LOCAL_PORT": str(hh_port),
+            "HH_LOCAL_LATENCY_MS": str(self.hh_latency_ms),
+            "CALLBACK_LOCAL_HOST": "127.0.0.1",
+            "CALLBACK_LOCAL_PORT": str(callback_port),
+            # Токены HH пользователей — отдельная база прогона
+            "HH_TOKEN_STORE_PATH": str(self.logs_dir / "hh_tokens.sqlite3"),
+        })
+        # Обязательные настройки сервисов, если не заданы
+        env.setdefault("OPENAI_API_KEY", "sk-load-test")
+        env.setdefault("OPENAI_MODEL_NAME", "gpt-4.1")
+        env.setdefault("HH_CLIENT_ID", "load-test")
+        env.setdefault("HH_CLIENT_SECRET", "load-test")
+        return env
+
+    def _spawn(self, name: str, args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+        log = open(self.logs_dir / f"{name}.log", "wb")
+        process = subprocess.Popen([sys.executable, *args], cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        self._processes.append(process)
+        return process
+
+    async def _wait_healthy(self, url: str, timeout: float = 60) -> None:
+        deadline = time.monotonic() + timeout
+        async with aiohttp.ClientSession() as session:
+            while time.monotonic() < deadline:
+                try:
+                    async with session.get(f"{url}/health") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.3)
+        raise RuntimeError(f"Сервис {url} не запустился за {timeout} с, логи: {self.logs_dir}")
+
+    async def start(self) -> None:
+        hh_port, callback_port, app_port = free_port(), free_port(), free_port()
+        env = self._environment(hh_port, callback_port)
+        self._spawn("hh_local_server", ["-m", "src.hh_local_server.main"], env)
+        self._spawn("callback_server", ["-m", "src.callback_local_server.main"], env)
+        app = self._spawn("unified_app", [
+            "-m", "uvicorn", "src.web_app.unified_app.main:app",
+            "--host", "127.0.0.1", "--port", str(app_port), "--no-access-log",
+        ], env)
+        self.app_url = f"http://127.0.0.1:{app_port}"
+        self.app_pid = app.pid
+        for url in (f"http://127.0.0.1:{hh_port}", f"http://127.0.0.1:{callback_port}", self.app_url):
+            await self._wait_healthy(url)
+
+    def stop(self) -> None:
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes.clear()